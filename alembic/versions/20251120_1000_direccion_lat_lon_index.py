@@ -0,0 +1,34 @@
+"""direccion_lat_lon_index
+
+Revision ID: 20251120_1000_dir_lat_lon
+Revises: 20251112_1400_refactor_paciente
+Create Date: 2025-11-20 10:00:00.000000
+
+Índice compuesto (latitud, longitud) en direccion para el prefiltro por
+caja envolvente de la búsqueda por cercanía. Parcial: sólo direcciones
+geolocalizadas.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20251120_1000_dir_lat_lon"
+down_revision = "20251112_1400_refactor_paciente"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_direccion_lat_lon",
+        "direccion",
+        ["latitud", "longitud"],
+        unique=False,
+        schema="athome",
+        postgresql_where=sa.text("latitud IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_direccion_lat_lon", table_name="direccion", schema="athome")
@@ -0,0 +1,32 @@
+"""usuario_apellido_index
+
+Revision ID: 20251121_1000_usuario_apellido
+Revises: 20251120_1000_dir_lat_lon
+Create Date: 2025-11-21 10:00:00.000000
+
+Índice (apellido, id) en usuario para la paginación por cursor de
+profesionales: el ORDER BY apellido y el predicado de búsqueda por clave
+se resuelven recorriendo el índice en lugar de ordenar toda la tabla.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20251121_1000_usuario_apellido"
+down_revision = "20251120_1000_dir_lat_lon"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_usuario_apellido_id",
+        "usuario",
+        ["apellido", "id"],
+        unique=False,
+        schema="athome",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_usuario_apellido_id", table_name="usuario", schema="athome")
@@ -0,0 +1,100 @@
+"""nombre_normalizado_trgm
+
+Revision ID: 20251122_1000_nombre_normalizado
+Revises: 20251121_1000_usuario_apellido
+Create Date: 2025-11-22 10:00:00.000000
+
+Columnas `nombre_normalizado` (sin acentos, minúsculas) en provincia,
+departamento, barrio y especialidad para las búsquedas por subcadena:
+1. Extensiones pg_trgm y unaccent
+2. Columna nueva, poblada desde `nombre` y luego NOT NULL
+3. Trigger que la recalcula en cada INSERT/UPDATE de `nombre` (cubre los
+   seeds por SQL crudo; el ORM además la completa al asignar `nombre`)
+4. Índice GIN de trigramas para los LIKE '%...%'
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20251122_1000_nombre_normalizado"
+down_revision = "20251121_1000_usuario_apellido"
+branch_labels = None
+depends_on = None
+
+TABLAS = {
+    "provincia": 50,
+    "departamento": 50,
+    "barrio": 50,
+    "especialidad": 80,
+}
+
+
+def upgrade() -> None:
+    # 1. Extensiones
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION athome.normalizar_nombre() RETURNS trigger AS $$
+        BEGIN
+            NEW.nombre_normalizado := lower(unaccent(NEW.nombre));
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+    )
+
+    for tabla, largo in TABLAS.items():
+        # 2. Columna + backfill + NOT NULL
+        with op.batch_alter_table(tabla, schema="athome") as batch_op:
+            batch_op.add_column(
+                sa.Column("nombre_normalizado", sa.VARCHAR(length=largo), nullable=True)
+            )
+
+        op.execute(
+            f"UPDATE athome.{tabla} SET nombre_normalizado = lower(unaccent(nombre))"
+        )
+
+        with op.batch_alter_table(tabla, schema="athome") as batch_op:
+            batch_op.alter_column(
+                "nombre_normalizado",
+                existing_type=sa.VARCHAR(length=largo),
+                nullable=False,
+            )
+
+        # 3. Trigger
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{tabla}_nombre_normalizado
+            BEFORE INSERT OR UPDATE OF nombre ON athome.{tabla}
+            FOR EACH ROW EXECUTE FUNCTION athome.normalizar_nombre()
+        """
+        )
+
+        # 4. Índice de trigramas
+        op.create_index(
+            f"ix_{tabla}_nombre_normalizado_trgm",
+            tabla,
+            ["nombre_normalizado"],
+            unique=False,
+            schema="athome",
+            postgresql_using="gin",
+            postgresql_ops={"nombre_normalizado": "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    for tabla in TABLAS:
+        op.drop_index(
+            f"ix_{tabla}_nombre_normalizado_trgm", table_name=tabla, schema="athome"
+        )
+        op.execute(
+            f"DROP TRIGGER IF EXISTS trg_{tabla}_nombre_normalizado ON athome.{tabla}"
+        )
+        with op.batch_alter_table(tabla, schema="athome") as batch_op:
+            batch_op.drop_column("nombre_normalizado")
+
+    op.execute("DROP FUNCTION IF EXISTS athome.normalizar_nombre()")
+    # Las extensiones se dejan: pueden estar en uso por otros objetos
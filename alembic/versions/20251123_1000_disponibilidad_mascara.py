@@ -0,0 +1,82 @@
+"""disponibilidad_dias_mascara
+
+Revision ID: 20251123_1000_disp_mascara
+Revises: 20251122_1000_nombre_normalizado
+Create Date: 2025-11-23 10:00:00.000000
+
+Reemplaza `disponibilidad.dias_semana` (texto separado por comas, con
+nombres en español o números 1-7) por `dias_mascara`: un SMALLINT con el bit
+(dia - 1) encendido por cada DiaSemana (lunes = 1, ..., domingo = 64).
+1. Columna nueva, poblada desde el texto (sin acentos ni mayúsculas)
+2. NOT NULL + CHECK de rango
+3. Se elimina la columna de texto
+La búsqueda por día pasa a ser `dias_mascara & bit <> 0`, sin parsear filas.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20251123_1000_disp_mascara"
+down_revision = "20251122_1000_nombre_normalizado"
+branch_labels = None
+depends_on = None
+
+DIAS = ["lunes", "martes", "miercoles", "jueves", "viernes", "sabado", "domingo"]
+
+_VALORES = ", ".join(
+    f"('{nombre}', {n}), ('{n}', {n})" for n, nombre in enumerate(DIAS, start=1)
+)
+
+
+def upgrade() -> None:
+    # 1. Columna + backfill
+    with op.batch_alter_table("disponibilidad", schema="athome") as batch_op:
+        batch_op.add_column(sa.Column("dias_mascara", sa.SmallInteger(), nullable=True))
+
+    op.execute(
+        f"""
+        UPDATE athome.disponibilidad d
+        SET dias_mascara = COALESCE((
+            SELECT bit_or(1 << (m.n - 1))
+            FROM unnest(string_to_array(d.dias_semana, ',')) AS t(dia)
+            JOIN (VALUES {_VALORES}) AS m(nombre, n)
+              ON m.nombre = lower(unaccent(trim(t.dia)))
+        ), 0)::smallint
+    """
+    )
+
+    # 2. NOT NULL + rango
+    with op.batch_alter_table("disponibilidad", schema="athome") as batch_op:
+        batch_op.alter_column(
+            "dias_mascara", existing_type=sa.SmallInteger(), nullable=False
+        )
+        batch_op.create_check_constraint(
+            "ck_disp_dias_mascara", "dias_mascara BETWEEN 0 AND 127"
+        )
+
+    # 3. Fuera el texto
+    with op.batch_alter_table("disponibilidad", schema="athome") as batch_op:
+        batch_op.drop_column("dias_semana")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("disponibilidad", schema="athome") as batch_op:
+        batch_op.add_column(sa.Column("dias_semana", sa.Text(), nullable=True))
+
+    nombres = ", ".join(f"({n}, '{nombre}')" for n, nombre in enumerate(DIAS, start=1))
+    op.execute(
+        f"""
+        UPDATE athome.disponibilidad d
+        SET dias_semana = COALESCE((
+            SELECT string_agg(m.nombre, ',' ORDER BY m.n)
+            FROM (VALUES {nombres}) AS m(n, nombre)
+            WHERE d.dias_mascara & (1 << (m.n - 1)) <> 0
+        ), '')
+    """
+    )
+
+    with op.batch_alter_table("disponibilidad", schema="athome") as batch_op:
+        batch_op.alter_column("dias_semana", existing_type=sa.Text(), nullable=False)
+        batch_op.drop_constraint("ck_disp_dias_mascara", type_="check")
+        batch_op.drop_column("dias_mascara")
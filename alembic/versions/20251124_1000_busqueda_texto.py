@@ -0,0 +1,158 @@
+"""busqueda_texto
+
+Revision ID: 20251124_1000_busqueda_texto
+Revises: 20251123_1000_disp_mascara
+Create Date: 2025-11-24 10:00:00.000000
+
+Búsqueda por texto libre sobre publicaciones y perfiles de profesionales:
+1. Columna `busqueda` (tsvector, configuración 'spanish', sin acentos) en
+   publicacion (titulo peso A, descripcion peso B) y en profesional
+   (nombre y apellido del usuario, peso A)
+2. Triggers que la recalculan en cada escritura:
+   - publicacion: al insertar o cambiar titulo/descripcion
+   - profesional: al insertar o cambiar de usuario
+   - usuario: al cambiar nombre/apellido actualiza su profesional
+3. Backfill de las filas existentes
+4. Índices GIN para el operador @@
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20251124_1000_busqueda_texto"
+down_revision = "20251123_1000_disp_mascara"
+branch_labels = None
+depends_on = None
+
+_VECTOR_PUBLICACION = """
+    setweight(to_tsvector('spanish', unaccent(coalesce({fila}.titulo, ''))), 'A')
+    || setweight(to_tsvector('spanish', unaccent(coalesce({fila}.descripcion, ''))), 'B')
+"""
+
+_VECTOR_PERFIL = """
+    setweight(
+        to_tsvector(
+            'spanish',
+            unaccent(coalesce({fila}.nombre, '') || ' ' || coalesce({fila}.apellido, ''))
+        ),
+        'A'
+    )
+"""
+
+
+def upgrade() -> None:
+    # unaccent ya la crea 20251122_1000_nombre_normalizado
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+
+    # 1. Columnas
+    for tabla in ("publicacion", "profesional"):
+        with op.batch_alter_table(tabla, schema="athome") as batch_op:
+            batch_op.add_column(
+                sa.Column("busqueda", postgresql.TSVECTOR(), nullable=True)
+            )
+
+    # 2. Triggers
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION athome.publicacion_busqueda() RETURNS trigger AS $$
+        BEGIN
+            NEW.busqueda := {_VECTOR_PUBLICACION.format(fila="NEW")};
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_publicacion_busqueda
+        BEFORE INSERT OR UPDATE OF titulo, descripcion ON athome.publicacion
+        FOR EACH ROW EXECUTE FUNCTION athome.publicacion_busqueda()
+    """
+    )
+
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION athome.profesional_busqueda() RETURNS trigger AS $$
+        BEGIN
+            SELECT {_VECTOR_PERFIL.format(fila="u")} INTO NEW.busqueda
+            FROM athome.usuario u WHERE u.id = NEW.usuario_id;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_profesional_busqueda
+        BEFORE INSERT OR UPDATE OF usuario_id ON athome.profesional
+        FOR EACH ROW EXECUTE FUNCTION athome.profesional_busqueda()
+    """
+    )
+
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION athome.usuario_busqueda() RETURNS trigger AS $$
+        BEGIN
+            UPDATE athome.profesional
+            SET busqueda = {_VECTOR_PERFIL.format(fila="NEW")}
+            WHERE usuario_id = NEW.id;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_usuario_busqueda
+        AFTER UPDATE OF nombre, apellido ON athome.usuario
+        FOR EACH ROW EXECUTE FUNCTION athome.usuario_busqueda()
+    """
+    )
+
+    # 3. Backfill
+    op.execute(
+        f"UPDATE athome.publicacion SET busqueda = "
+        f"{_VECTOR_PUBLICACION.format(fila='publicacion')}"
+    )
+    op.execute(
+        f"""
+        UPDATE athome.profesional p SET busqueda = {_VECTOR_PERFIL.format(fila="u")}
+        FROM athome.usuario u WHERE u.id = p.usuario_id
+    """
+    )
+
+    # 4. Índices GIN
+    op.create_index(
+        "ix_pub_busqueda",
+        "publicacion",
+        ["busqueda"],
+        unique=False,
+        schema="athome",
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_profesional_busqueda",
+        "profesional",
+        ["busqueda"],
+        unique=False,
+        schema="athome",
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_profesional_busqueda", table_name="profesional", schema="athome")
+    op.drop_index("ix_pub_busqueda", table_name="publicacion", schema="athome")
+
+    op.execute("DROP TRIGGER IF EXISTS trg_usuario_busqueda ON athome.usuario")
+    op.execute("DROP TRIGGER IF EXISTS trg_profesional_busqueda ON athome.profesional")
+    op.execute("DROP TRIGGER IF EXISTS trg_publicacion_busqueda ON athome.publicacion")
+    op.execute("DROP FUNCTION IF EXISTS athome.usuario_busqueda()")
+    op.execute("DROP FUNCTION IF EXISTS athome.profesional_busqueda()")
+    op.execute("DROP FUNCTION IF EXISTS athome.publicacion_busqueda()")
+
+    for tabla in ("profesional", "publicacion"):
+        with op.batch_alter_table(tabla, schema="athome") as batch_op:
+            batch_op.drop_column("busqueda")
@@ -0,0 +1,102 @@
+"""puntaje_profesional
+
+Revision ID: 20251125_1000_puntaje
+Revises: 20251124_1000_busqueda_texto
+Create Date: 2025-11-25 10:00:00.000000
+
+Resumen de valoraciones y puntaje de ranking por profesional:
+1. Columnas valoraciones_cantidad, valoraciones_suma y puntaje en profesional
+   (las mantiene ValoracionRepository en cada alta/edición/baja)
+2. Backfill de los contadores desde valoracion
+3. Backfill del puntaje con la misma fórmula que app.domain.ranking
+4. Índice (puntaje DESC, id) para el top-K y la paginación por puntaje
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20251125_1000_puntaje"
+down_revision = "20251124_1000_busqueda_texto"
+branch_labels = None
+depends_on = None
+
+# Constantes de app.domain.ranking al momento de esta revisión
+PROMEDIO_PREVIO = 3.5
+PESO_PREVIO = 5
+PESO_VALORACION = 0.8
+PESO_VERIFICADO = 0.2
+PUNTAJE_INICIAL = 0.5
+
+
+def upgrade() -> None:
+    # 1. Columnas
+    with op.batch_alter_table("profesional", schema="athome") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "valoraciones_cantidad",
+                sa.Integer(),
+                nullable=False,
+                server_default=sa.text("0"),
+            )
+        )
+        batch_op.add_column(
+            sa.Column(
+                "valoraciones_suma",
+                sa.Integer(),
+                nullable=False,
+                server_default=sa.text("0"),
+            )
+        )
+        batch_op.add_column(
+            sa.Column(
+                "puntaje",
+                sa.Float(),
+                nullable=False,
+                server_default=sa.text(str(PUNTAJE_INICIAL)),
+            )
+        )
+
+    # 2. Contadores
+    op.execute(
+        """
+        UPDATE athome.profesional p
+        SET valoraciones_cantidad = v.cantidad, valoraciones_suma = v.suma
+        FROM (
+            SELECT profesional_id, COUNT(*) AS cantidad, SUM(puntuacion) AS suma
+            FROM athome.valoracion
+            GROUP BY profesional_id
+        ) v
+        WHERE v.profesional_id = p.id
+    """
+    )
+
+    # 3. Puntaje: promedio bayesiano normalizado a [0, 1] + bono de verificado
+    op.execute(
+        f"""
+        UPDATE athome.profesional
+        SET puntaje = {PESO_VALORACION} * (
+                ({PESO_PREVIO} * {PROMEDIO_PREVIO} + valoraciones_suma)::float
+                / ({PESO_PREVIO} + valoraciones_cantidad) - 1
+            ) / 4
+            + CASE WHEN verificado THEN {PESO_VERIFICADO} ELSE 0 END
+    """
+    )
+
+    # 4. Índice
+    op.create_index(
+        "ix_profesional_puntaje",
+        "profesional",
+        [sa.text("puntaje DESC"), "id"],
+        unique=False,
+        schema="athome",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_profesional_puntaje", table_name="profesional", schema="athome")
+
+    with op.batch_alter_table("profesional", schema="athome") as batch_op:
+        batch_op.drop_column("puntaje")
+        batch_op.drop_column("valoraciones_suma")
+        batch_op.drop_column("valoraciones_cantidad")
@@ -0,0 +1,74 @@
+"""consulta_sin_solapamiento
+
+Revision ID: 20251126_1000_consulta_excl
+Revises: 20251125_1000_puntaje
+Create Date: 2025-11-26 10:00:00.000000
+
+Solapamiento de consultas controlado por la base:
+1. Columna `cancelada` en consulta (copia de estado = 'cancelada', la
+   mantiene ConsultaRepository) y backfill desde estado_consulta
+2. Restricción de exclusión GiST: un profesional no puede tener dos
+   consultas no canceladas cuyos rangos [fecha + hora_inicio, fecha + hora_fin)
+   se solapen (el rango es semiabierto: una consulta puede empezar a la hora
+   en que termina otra). btree_gist aporta el operador = sobre uuid dentro
+   del GiST.
+
+Si ya hay consultas solapadas, el paso 2 falla: cancelarlas antes de migrar.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20251126_1000_consulta_excl"
+down_revision = "20251125_1000_puntaje"
+branch_labels = None
+depends_on = None
+
+# app.infra.persistence.agenda.EXCLUSION_SOLAPAMIENTO al momento de esta revisión
+EXCLUSION_SOLAPAMIENTO = "ex_consulta_solapamiento"
+
+
+def upgrade() -> None:
+    # 1. Columna
+    with op.batch_alter_table("consulta", schema="athome") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "cancelada",
+                sa.Boolean(),
+                nullable=False,
+                server_default=sa.text("false"),
+            )
+        )
+
+    op.execute(
+        """
+        UPDATE athome.consulta c
+        SET cancelada = true
+        FROM athome.estado_consulta e
+        WHERE e.id = c.estado_id AND e.codigo = 'cancelada'
+    """
+    )
+
+    # 2. Restricción de exclusión
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        f"""
+        ALTER TABLE athome.consulta
+        ADD CONSTRAINT {EXCLUSION_SOLAPAMIENTO}
+        EXCLUDE USING gist (
+            profesional_id WITH =,
+            tsrange(fecha + hora_inicio, fecha + hora_fin) WITH &&
+        )
+        WHERE (NOT cancelada)
+    """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        f"ALTER TABLE athome.consulta DROP CONSTRAINT IF EXISTS {EXCLUSION_SOLAPAMIENTO}"
+    )
+
+    with op.batch_alter_table("consulta", schema="athome") as batch_op:
+        batch_op.drop_column("cancelada")
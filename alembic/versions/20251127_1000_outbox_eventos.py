@@ -0,0 +1,78 @@
+"""outbox_eventos
+
+Revision ID: 20251127_1000_outbox_eventos
+Revises: 20251126_1000_consulta_excl
+Create Date: 2025-11-27 10:00:00.000000
+
+La tabla evento pasa a ser el outbox de los eventos de consultas: se escriben
+en la misma transacción que el cambio de la consulta y un despachador los
+entrega después.
+1. Columnas creado_en, despachado_en (NULL = pendiente), intentos,
+   proximo_intento (reintentos con espera creciente) y ultimo_error
+2. Los eventos existentes se marcan despachados (ya se notificaron en su
+   momento, al publicarse en el request)
+3. Índice parcial de pendientes por proximo_intento, el orden en que el
+   despachador los toma
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20251127_1000_outbox_eventos"
+down_revision = "20251126_1000_consulta_excl"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 1. Columnas
+    with op.batch_alter_table("evento", schema="athome") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "creado_en",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            )
+        )
+        batch_op.add_column(
+            sa.Column("despachado_en", sa.DateTime(timezone=True), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column(
+                "intentos", sa.Integer(), nullable=False, server_default=sa.text("0")
+            )
+        )
+        batch_op.add_column(
+            sa.Column(
+                "proximo_intento",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            )
+        )
+        batch_op.add_column(sa.Column("ultimo_error", sa.Text(), nullable=True))
+
+    # 2. Eventos previos al outbox
+    op.execute("UPDATE athome.evento SET despachado_en = creado_en")
+
+    # 3. Índice de pendientes
+    op.create_index(
+        "ix_evento_pendiente",
+        "evento",
+        ["proximo_intento"],
+        schema="athome",
+        postgresql_where=sa.text("despachado_en IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_evento_pendiente", table_name="evento", schema="athome")
+
+    with op.batch_alter_table("evento", schema="athome") as batch_op:
+        batch_op.drop_column("ultimo_error")
+        batch_op.drop_column("proximo_intento")
+        batch_op.drop_column("intentos")
+        batch_op.drop_column("despachado_en")
+        batch_op.drop_column("creado_en")
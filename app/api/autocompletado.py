@@ -0,0 +1,32 @@
+"""
+Trie de autocompletado de ubicaciones y especialidades.
+
+Vive en el proceso: se construye desde la base en la primera consulta y
+después se mantiene al día como observer de los DireccionRepository y
+CatalogoRepository creados por la API (también los que usan internamente
+los repositorios de profesionales y pacientes).
+"""
+
+from app.domain.strategies.autocompletado import TrieAutocompletado
+from app.infra.repositories.catalogo_repository import CatalogoRepository
+from app.infra.repositories.direccion_repository import DireccionRepository
+
+trie_autocompletado = TrieAutocompletado()
+
+
+def get_trie_autocompletado() -> TrieAutocompletado:
+    """Dependency injection: el trie compartido por el proceso"""
+    return trie_autocompletado
+
+
+def asegurar_trie(
+    trie: TrieAutocompletado,
+    direccion_repo: DireccionRepository,
+    catalogo_repo: CatalogoRepository,
+) -> None:
+    """Construye el trie desde los repositorios si todavía no está listo"""
+    if trie.listo:
+        return
+    trie.construir(
+        direccion_repo.listar_sugerencias() + catalogo_repo.listar_sugerencias()
+    )
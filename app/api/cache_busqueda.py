@@ -0,0 +1,25 @@
+"""
+Cache de resultados de búsqueda (opcional).
+
+Se habilita con BUSQUEDA_CACHE_TTL > 0 (segundos de vigencia de cada
+entrada); BUSQUEDA_CACHE_MAX fija la cantidad máxima de entradas. Se adjunta
+como observer de cada ProfesionalRepository creado por la API para que las
+escrituras invaliden las búsquedas afectadas.
+"""
+
+import os
+from typing import Optional
+
+from app.domain.strategies.cache import CacheBusquedas
+
+CACHE_TTL_SEGUNDOS = float(os.getenv("BUSQUEDA_CACHE_TTL", "0"))
+CACHE_MAX_ENTRADAS = int(os.getenv("BUSQUEDA_CACHE_MAX", "512"))
+
+cache_busquedas = CacheBusquedas(
+    capacidad=CACHE_MAX_ENTRADAS, ttl_segundos=CACHE_TTL_SEGUNDOS
+)
+
+
+def get_cache_busquedas() -> Optional[CacheBusquedas]:
+    """Dependency injection: la cache si está habilitada, si no None"""
+    return cache_busquedas if CACHE_TTL_SEGUNDOS > 0 else None
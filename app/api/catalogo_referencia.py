@@ -0,0 +1,64 @@
+"""
+Snapshot de datos de referencia (especialidades y jerarquía de ubicaciones).
+
+Vive en el proceso: se arma en el primer pedido y se descarta cuando los
+DireccionRepository / CatalogoRepository creados por la API agregan filas.
+CATALOGO_SNAPSHOT_TTL (segundos, 0 = sin vencimiento) acota cuánto tarda un
+worker en ver las altas hechas por otro.
+
+Los endpoints de referencia responden con el ETag del snapshot y contestan
+304 a un If-None-Match que coincide, sin consultar la base.
+"""
+
+import os
+from typing import Optional
+
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse
+
+from app.domain.strategies.snapshot import CacheCatalogo, SnapshotCatalogo
+from app.infra.repositories.catalogo_repository import CatalogoRepository
+from app.infra.repositories.direccion_repository import DireccionRepository
+
+CATALOGO_TTL_SEGUNDOS = float(os.getenv("CATALOGO_SNAPSHOT_TTL", "300"))
+
+cache_catalogo = CacheCatalogo(ttl_segundos=CATALOGO_TTL_SEGUNDOS or None)
+
+
+def get_cache_catalogo() -> CacheCatalogo:
+    """Dependency injection: el snapshot compartido por el proceso"""
+    return cache_catalogo
+
+
+def obtener_snapshot(
+    cache: CacheCatalogo,
+    catalogo_repo: CatalogoRepository,
+    direccion_repo: DireccionRepository,
+) -> SnapshotCatalogo:
+    """El snapshot vigente; si no hay, se lee de los repositorios"""
+
+    def cargar():
+        especialidades = [
+            (e.id, e.nombre) for e in catalogo_repo.listar_especialidades()
+        ]
+        return (especialidades, *direccion_repo.listar_jerarquia())
+
+    return cache.obtener(cargar)
+
+
+def _coincide(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidatos = {valor.strip() for valor in if_none_match.split(",")}
+    # La comparación débil también vale para If-None-Match (RFC 9110)
+    return "*" in candidatos or etag in candidatos or f"W/{etag}" in candidatos
+
+
+def respuesta_referencia(
+    request: Request, snapshot: SnapshotCatalogo, contenido: dict
+) -> Response:
+    """JSON con el ETag del snapshot, o 304 si el cliente ya tiene esa versión"""
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if _coincide(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(contenido, headers=headers)
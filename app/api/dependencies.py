@@ -2,6 +2,7 @@
 Dependencias compartidas para los endpoints de la API
 """
 
+import os
 from typing import Generator
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
@@ -16,11 +17,32 @@ from app.infra.repositories.direccion_repository import DireccionRepository
 from app.infra.repositories.catalogo_repository import CatalogoRepository
 from app.services.auth_service import AuthService
 from app.api.policies import IntegrityPolicies
+from app.api.indice_busqueda import get_indice_profesionales
+from app.api.cache_busqueda import get_cache_busquedas
+from app.api.autocompletado import get_trie_autocompletado
+from app.api.catalogo_referencia import get_cache_catalogo
 from app.api.exceptions import ForbiddenException
 from fastapi.security import OAuth2PasswordBearer
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Emails (separados por coma) con acceso a las operaciones de administración
+ADMIN_EMAILS = {
+    email.strip().lower()
+    for email in os.getenv("ADMIN_EMAILS", "").split(",")
+    if email.strip()
+}
+
+
+def _observar_catalogo(repo):
+    """
+    Adjunta a un repositorio de direcciones o de catálogo lo que escucha sus
+    altas: el trie de autocompletado y el snapshot de datos de referencia.
+    """
+    repo.attach(get_trie_autocompletado())
+    repo.attach(get_cache_catalogo())
+    return repo
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -37,8 +59,22 @@ def get_db() -> Generator[Session, None, None]:
 def get_profesional_repository(
     db: Session = Depends(get_db),
 ) -> ProfesionalRepository:
-    """Dependency para el repositorio de profesionales"""
-    return ProfesionalRepository(db)
+    """
+    Dependency para el repositorio de profesionales.
+    Si el índice de búsqueda en memoria o la cache de búsquedas están
+    habilitados, se adjuntan como observers para que las escrituras los
+    mantengan actualizados. Su repositorio de direcciones también se
+    observa (las altas crean provincias, barrios...).
+    """
+    repo = ProfesionalRepository(db)
+    _observar_catalogo(repo.direccion_repo)
+    indice = get_indice_profesionales()
+    if indice is not None:
+        repo.attach(indice)
+    cache = get_cache_busquedas()
+    if cache is not None:
+        repo.attach(cache)
+    return repo
 
 
 def get_consulta_repository(
@@ -52,28 +88,37 @@ def get_paciente_repository(
     db: Session = Depends(get_db),
 ) -> PacienteRepository:
     """Dependency para el repositorio de pacientes"""
-    return PacienteRepository(db)
+    repo = PacienteRepository(db)
+    _observar_catalogo(repo.direccion_repo)
+    return repo
 
 
 def get_valoracion_repository(
     db: Session = Depends(get_db),
 ) -> ValoracionRepository:
-    """Dependency para el repositorio de valoraciones"""
-    return ValoracionRepository(db)
+    """
+    Dependency para el repositorio de valoraciones.
+    Recibe el de profesionales (con sus observers) para que el índice y la
+    cache de búsqueda se enteren de los cambios de puntaje.
+    """
+    return ValoracionRepository(db, get_profesional_repository(db))
 
 
 def get_direccion_repository(
     db: Session = Depends(get_db),
 ) -> DireccionRepository:
-    """Dependency para el repositorio de direcciones"""
-    return DireccionRepository(db)
+    """Dependency para el repositorio de direcciones (con sus observers de catálogo)"""
+    return _observar_catalogo(DireccionRepository(db))
 
 
 def get_catalogo_repository(
     db: Session = Depends(get_db),
 ) -> CatalogoRepository:
-    """Dependency para el repositorio de catálogo (especialidades, publicaciones)"""
-    return CatalogoRepository(db)
+    """
+    Dependency para el repositorio de catálogo (especialidades, publicaciones),
+    con sus observers de catálogo.
+    """
+    return _observar_catalogo(CatalogoRepository(db))
 
 
 def get_integrity_policies():
@@ -167,3 +212,21 @@ async def get_current_solicitante(
         )
 
     return current_user
+
+
+async def get_current_admin(
+    current_user=Depends(get_current_user),
+):
+    """
+    Obtiene el usuario autenticado y verifica que sea administrador
+    (su email figura en ADMIN_EMAILS).
+
+    Raises:
+        ForbiddenException: Si el usuario no es administrador
+    """
+    if (getattr(current_user, "email", "") or "").lower() not in ADMIN_EMAILS:
+        raise ForbiddenException(
+            "Se requiere ser administrador para acceder a este recurso"
+        )
+
+    return current_user
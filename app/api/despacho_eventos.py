@@ -0,0 +1,41 @@
+"""
+Despacho del outbox de eventos dentro del proceso de la API.
+
+Al iniciar la app se lanza DespachadorEventos como tarea asyncio y al
+apagarla se detiene (terminando el lote en curso). EVENTOS_DESPACHO=0 lo
+deshabilita, p. ej. si el despacho corre como proceso aparte
+(scripts/database/despachar_eventos.py); EVENTOS_INTERVALO_S fija cada
+cuánto se consulta la tabla cuando no hay pendientes.
+"""
+
+import asyncio
+import os
+from typing import Optional
+
+from app.api.event_bus import event_bus, vaciar_notificaciones
+from app.infra.persistence.database import SessionLocal
+from app.services.despacho_eventos import DespachadorEventos
+
+DESPACHO_HABILITADO = os.getenv("EVENTOS_DESPACHO", "1") == "1"
+INTERVALO_S = float(os.getenv("EVENTOS_INTERVALO_S", "1"))
+
+despachador = DespachadorEventos(SessionLocal, event_bus, vaciar=vaciar_notificaciones)
+
+# Se crean al iniciar: el Event queda atado al loop del lifespan
+_detener: Optional[asyncio.Event] = None
+_tarea: Optional[asyncio.Task] = None
+
+
+def iniciar_despacho() -> None:
+    global _detener, _tarea
+    if DESPACHO_HABILITADO and _tarea is None:
+        _detener = asyncio.Event()
+        _tarea = asyncio.create_task(despachador.ejecutar(_detener, INTERVALO_S))
+
+
+async def detener_despacho() -> None:
+    global _detener, _tarea
+    if _tarea is not None:
+        _detener.set()
+        await _tarea
+        _detener, _tarea = None, None
@@ -1,29 +1,108 @@
 """
 Event Bus: Sistema centralizado de publicación de eventos.
 
-Desacopla el dominio de los observadores. Los eventos se publican
-desde los routers y los observadores se suscriben sin que el dominio
-lo sepa.
+Desacopla el dominio de los observadores. Los eventos de consultas los
+escriben los routers en el outbox (tabla evento) y se los entrega a estos
+suscriptores el despachador (app.api.despacho_eventos); los observadores se
+suscriben sin que el dominio lo sepa.
+
+El bus es asincrónico (EventBusAsincrono): el despachador encola cada lote
+del outbox con acuse y los handlers corren en EVENTOS_BUS_WORKERS hilos, que
+se lanzan al iniciar la app y se drenan al apagarla (hasta
+EVENTOS_BUS_DRENAJE_S segundos). Con 0 workers los handlers corren en línea.
+EVENTOS_BUS_CAPACIDAD acota la cola y EVENTOS_BUS_POLITICA decide qué pasa
+si se llena: "bloquear", "descartar_antiguo" o "volcar" (al archivo
+EVENTOS_BUS_VOLCADO).
+
+Con SMTP_HOST definido las notificaciones salen por email real
+(NotificadorEmailAgrupado: un resumen por destinatario por lote del outbox,
+por un pool de SMTP_CONEXIONES conexiones); si no, NotificadorEmail las
+simula por consola.
 """
 
-from app.domain.observers.observadores import EventBus, NotificadorEmail
+import asyncio
+import os
+from typing import Dict, List, Tuple
+from uuid import UUID
+
+from app.domain.observers.bus_asincrono import EventBusAsincrono
+from app.domain.observers.observadores import NotificadorEmail
+from app.infra.persistence.database import SessionLocal
+from app.infra.repositories.consulta_repository import ConsultaRepository
+from app.services.notificaciones_email import (
+    EVENTOS_NOTIFICABLES,
+    NotificadorEmailAgrupado,
+    PoolSmtp,
+)
+
+BUS_WORKERS = int(os.getenv("EVENTOS_BUS_WORKERS", "2"))
+BUS_CAPACIDAD = int(os.getenv("EVENTOS_BUS_CAPACIDAD", "1000"))
+BUS_POLITICA = os.getenv("EVENTOS_BUS_POLITICA", "bloquear")
+BUS_VOLCADO = os.getenv("EVENTOS_BUS_VOLCADO", "eventos_bus.jsonl")
+BUS_DRENAJE_S = float(os.getenv("EVENTOS_BUS_DRENAJE_S", "10"))
+
+SMTP_HOST = os.getenv("SMTP_HOST")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "25"))
+SMTP_USUARIO = os.getenv("SMTP_USUARIO")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "0") == "1"
+SMTP_CONEXIONES = int(os.getenv("SMTP_CONEXIONES", "4"))
+SMTP_REMITENTE = os.getenv("SMTP_REMITENTE", "notificaciones@athomered.com")
+
+event_bus = EventBusAsincrono(
+    capacidad=BUS_CAPACIDAD,
+    workers=BUS_WORKERS,
+    politica=BUS_POLITICA,
+    archivo_volcado=BUS_VOLCADO if BUS_POLITICA == "volcar" else None,
+)
+
 
-event_bus = EventBus()
+def _destinatarios(consulta_ids: List[UUID]) -> Dict[UUID, List[str]]:
+    session = SessionLocal()
+    try:
+        return ConsultaRepository(session).destinatarios(consulta_ids)
+    finally:
+        session.close()
 
-notificador_email = NotificadorEmail()
 
-_EVENTOS_NOTIFICABLES = [
-    "cita.creada",
-    "cita.confirmada",
-    "cita.cancelada",
-    "cita.reprogramada",
-    "cita.completada",
-]
+if SMTP_HOST:
+    notificador_email = NotificadorEmailAgrupado(
+        PoolSmtp(
+            SMTP_HOST,
+            SMTP_PORT,
+            usuario=SMTP_USUARIO,
+            password=SMTP_PASSWORD,
+            starttls=SMTP_STARTTLS,
+            tamano=SMTP_CONEXIONES,
+        ),
+        _destinatarios,
+        remitente=SMTP_REMITENTE,
+    )
+else:
+    notificador_email = NotificadorEmail()
 
-for evento in _EVENTOS_NOTIFICABLES:
+for evento in EVENTOS_NOTIFICABLES:
     event_bus.suscribir_observer(evento, notificador_email)
 
 
-def get_event_bus() -> EventBus:
+def get_event_bus() -> EventBusAsincrono:
     """Dependency injection para obtener el event bus"""
     return event_bus
+
+
+def vaciar_notificaciones() -> List[Tuple[object, Exception]]:
+    """Envía los emails acumulados; para el despachador, al final de cada lote"""
+    if isinstance(notificador_email, NotificadorEmailAgrupado):
+        return notificador_email.vaciar()
+    return []
+
+
+def iniciar_bus() -> None:
+    event_bus.iniciar()
+
+
+async def detener_bus() -> None:
+    """Drena la cola y manda los emails pendientes, en un hilo"""
+    await asyncio.to_thread(event_bus.detener, BUS_DRENAJE_S)
+    if isinstance(notificador_email, NotificadorEmailAgrupado):
+        await asyncio.to_thread(notificador_email.cerrar)
@@ -0,0 +1,30 @@
+"""
+Índice de búsqueda en memoria (opcional).
+
+Se habilita con BUSQUEDA_INDICE_MEMORIA=1. Se construye a partir de los
+profesionales activos en la primera búsqueda y después se mantiene al día
+como observer de cada ProfesionalRepository creado por la API.
+"""
+
+import os
+from typing import Optional
+
+from app.domain.strategies.indice import IndiceProfesionales
+from app.infra.repositories.profesional_repository import ProfesionalRepository
+
+INDICE_HABILITADO = os.getenv("BUSQUEDA_INDICE_MEMORIA", "0") == "1"
+
+indice_profesionales = IndiceProfesionales()
+
+
+def get_indice_profesionales() -> Optional[IndiceProfesionales]:
+    """Dependency injection: el índice si está habilitado, si no None"""
+    return indice_profesionales if INDICE_HABILITADO else None
+
+
+def asegurar_indice(
+    indice: Optional[IndiceProfesionales], repo: ProfesionalRepository
+) -> None:
+    """Construye el índice desde el repositorio si todavía no está listo"""
+    if indice is not None and not indice.listo:
+        indice.construir(repo.listar_activos())
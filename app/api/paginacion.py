@@ -0,0 +1,96 @@
+"""
+Paginación por cursor (keyset) para listados y búsquedas.
+
+El cursor es opaco para el cliente: base64 (url-safe) de la clave de orden
+del último elemento de la página, etiquetada con el orden al que pertenece
+("apellido" → (apellido, id), "distancia" → (distancia_km, id),
+"relevancia" → (relevancia, id) de la búsqueda por texto, "puntaje" →
+(puntaje, id) del ranking por valoraciones). Así un
+cursor de una búsqueda por cercanía no se puede reusar en un listado.
+
+Para saber si hay página siguiente se pide un elemento de más (limite + 1):
+si vuelve, la página se corta y se emite `siguiente_cursor`.
+"""
+
+import base64
+import binascii
+import json
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+from uuid import UUID
+
+from app.api.exceptions import BusinessRuleException
+from app.domain.entities.usuarios import Profesional
+from app.domain.geo import distancia_a
+
+ORDEN_APELLIDO = "apellido"
+ORDEN_DISTANCIA = "distancia"
+ORDEN_RELEVANCIA = "relevancia"
+ORDEN_PUNTAJE = "puntaje"
+
+T = TypeVar("T")
+
+
+def codificar_cursor(orden: str, valor, id: UUID) -> str:
+    crudo = json.dumps([orden, valor, str(id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, orden: str) -> Tuple:
+    """Devuelve la clave (valor, id) o lanza BusinessRuleException si es inválido"""
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        etiqueta, valor, id = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        if etiqueta != orden:
+            raise ValueError(etiqueta)
+        if orden in (ORDEN_DISTANCIA, ORDEN_RELEVANCIA, ORDEN_PUNTAJE):
+            valor = float(valor)
+        elif not isinstance(valor, str):
+            raise ValueError(valor)
+        return valor, UUID(id)
+    except (ValueError, TypeError, binascii.Error):
+        raise BusinessRuleException("Cursor de paginación inválido.")
+
+
+def clave_apellido(profesional: Profesional) -> Tuple[str, UUID]:
+    return profesional.apellido, profesional.id
+
+
+def clave_distancia(
+    latitud: float, longitud: float
+) -> Callable[[Profesional], Tuple[float, UUID]]:
+    def clave(profesional: Profesional) -> Tuple[float, UUID]:
+        return distancia_a(profesional, latitud, longitud), profesional.id
+
+    return clave
+
+
+def clave_puntaje(profesional: Profesional) -> Tuple[float, UUID]:
+    return profesional.puntaje, profesional.id
+
+
+def clave_relevancia(
+    relevancias: Dict[UUID, float],
+) -> Callable[[Profesional], Tuple[float, UUID]]:
+    """Clave de la búsqueda por texto, con la relevancia que informó la estrategia"""
+
+    def clave(profesional: Profesional) -> Tuple[float, UUID]:
+        return relevancias[profesional.id], profesional.id
+
+    return clave
+
+
+def cortar_pagina(
+    items: List[T],
+    limite: Optional[int],
+    orden: str,
+    clave: Callable[[T], Tuple],
+) -> Tuple[List[T], Optional[str]]:
+    """
+    Recibe hasta limite + 1 elementos; devuelve la página y el cursor a la
+    siguiente (None si era la última).
+    """
+    if not limite or len(items) <= limite:
+        return items, None
+    pagina = items[:limite]
+    valor, id = clave(pagina[-1])
+    return pagina, codificar_cursor(orden, valor, id)
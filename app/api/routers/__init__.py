@@ -7,5 +7,6 @@ from . import profesionales
 from . import consultas
 from . import pacientes
 from . import busqueda
+from . import eventos
 
-__all__ = ["auth", "profesionales", "consultas", "pacientes", "busqueda"]
+__all__ = ["auth", "profesionales", "consultas", "pacientes", "busqueda", "eventos"]
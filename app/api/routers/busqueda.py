@@ -3,50 +3,85 @@ Router para búsqueda de profesionales
 Implementa las estrategias de búsqueda del dominio
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from dataclasses import replace
+from fastapi import APIRouter, Depends, Query, Request
+from typing import Literal, Optional
 from uuid import UUID
 
 from app.api.schemas import (
+    AutocompletadoResponse,
     BusquedaProfesionalRequest,
     BusquedaProfesionalResponse,
+    BusquedaLoteRequest,
+    BusquedaLoteResponse,
+    FacetasResponse,
 )
 from app.api.dependencies import (
     get_profesional_repository,
     get_direccion_repository,
     get_catalogo_repository,
+    get_consulta_repository,
 )
 from app.api.exceptions import ResourceNotFoundException, BusinessRuleException
+from app.api.indice_busqueda import get_indice_profesionales, asegurar_indice
+from app.api.cache_busqueda import get_cache_busquedas
+from app.api.autocompletado import asegurar_trie, get_trie_autocompletado
+from app.api.catalogo_referencia import (
+    get_cache_catalogo,
+    obtener_snapshot,
+    respuesta_referencia,
+)
+from app.api.vistas import (
+    VISTA_COMPLETA,
+    VISTA_RESUMEN,
+    Vista,
+    respuesta_resumen,
+    resumir,
+)
+from app.api.paginacion import (
+    ORDEN_APELLIDO,
+    ORDEN_DISTANCIA,
+    ORDEN_PUNTAJE,
+    ORDEN_RELEVANCIA,
+    clave_apellido,
+    clave_distancia,
+    clave_puntaje,
+    clave_relevancia,
+    cortar_pagina,
+    decodificar_cursor,
+)
 from app.infra.repositories.profesional_repository import ProfesionalRepository
 from app.infra.repositories.direccion_repository import DireccionRepository
 from app.infra.repositories.catalogo_repository import CatalogoRepository
+from app.infra.repositories.consulta_repository import ConsultaRepository
 
-from app.domain.entities.catalogo import FiltroBusqueda
+from app.domain.entities.catalogo import FiltroBusqueda, NodoUbicacion
 from app.domain.strategies.buscador import Buscador
+from app.domain.strategies.indice import IndiceProfesionales
+from app.domain.strategies.cache import CacheBusquedas
+from app.domain.strategies.facetas import Facetador
+from app.domain.strategies.lote import BusquedaEnLote
+from app.domain.strategies.libres import DURACION_MINUTOS, BuscadorLibres
+from app.domain.strategies.autocompletado import LIMITE_MAXIMO, TrieAutocompletado
+from app.domain.strategies.snapshot import CacheCatalogo
 from app.domain.strategies.estrategia import (
     BusquedaPorZona,
     BusquedaPorEspecialidad,
     BusquedaCombinada,
+    BusquedaPorCercania,
+    BusquedaPorTexto,
 )
 
 router = APIRouter()
 
 
-@router.post("/profesionales", response_model=BusquedaProfesionalResponse)
-def buscar_profesionales(
-    criterios: BusquedaProfesionalRequest,
-    repo: ProfesionalRepository = Depends(get_profesional_repository),
-    catalogo_repo: CatalogoRepository = Depends(get_catalogo_repository),
-):
+def _armar_filtro(
+    criterios: BusquedaProfesionalRequest, catalogo_repo: CatalogoRepository
+) -> FiltroBusqueda:
     """
-    Busca profesionales según múltiples criterios.
-
-    Utiliza el patrón Strategy del dominio para aplicar filtros:
-    - Por especialidad (ID o nombre - se valida que exista)
-    - Por ubicación (provincia/departamento/barrio)
-    - Por disponibilidad (día de la semana)
-    - Solo verificados/activos
+    Valida la combinación de criterios, resuelve la especialidad (por id o
+    nombre, debe existir) y arma el FiltroBusqueda del dominio.
     """
-
     if criterios.departamento and not criterios.provincia:
         raise BusinessRuleException(
             "Se debe especificar la provincia si se indica el departamento."
@@ -57,6 +92,70 @@ def buscar_profesionales(
             "Se debe especificar el departamento si se indica el barrio."
         )
 
+    if (criterios.latitud is None) != (criterios.longitud is None):
+        raise BusinessRuleException("Se deben indicar latitud y longitud juntas.")
+
+    if (criterios.radio_km or criterios.ordenar_por_distancia) and (
+        criterios.latitud is None
+    ):
+        raise BusinessRuleException(
+            "Se debe indicar latitud y longitud para buscar u ordenar por cercanía."
+        )
+
+    if (criterios.hora_desde or criterios.hora_hasta) and not (
+        criterios.dia_semana or criterios.fecha
+    ):
+        raise BusinessRuleException(
+            "Se debe especificar el día de la semana o la fecha si se indica una "
+            "franja horaria."
+        )
+
+    if criterios.fecha and criterios.dia_semana:
+        raise BusinessRuleException(
+            "No se puede indicar fecha y día de la semana a la vez."
+        )
+
+    if criterios.duracion_minutos and not criterios.fecha:
+        raise BusinessRuleException(
+            "Se debe especificar la fecha si se indica la duración."
+        )
+
+    if criterios.fecha and criterios.incluir_total:
+        raise BusinessRuleException(
+            "El total no se calcula al buscar libres en una fecha."
+        )
+
+    if (
+        criterios.hora_desde
+        and criterios.hora_hasta
+        and criterios.hora_desde >= criterios.hora_hasta
+    ):
+        raise BusinessRuleException("hora_desde debe ser anterior a hora_hasta.")
+
+    if criterios.texto and criterios.radio_km:
+        raise BusinessRuleException(
+            "La búsqueda por texto no se puede combinar con la de cercanía."
+        )
+
+    if criterios.ordenar_por_puntaje and criterios.ordenar_por_distancia:
+        raise BusinessRuleException(
+            "No se puede ordenar por puntaje y por distancia a la vez."
+        )
+
+    if (
+        criterios.ordenar_por_puntaje
+        and (criterios.limite or criterios.cursor)
+        and (criterios.texto or criterios.latitud is not None)
+    ):
+        raise BusinessRuleException(
+            "Para paginar ordenando por puntaje no se puede indicar texto ni punto."
+        )
+
+    if criterios.ordenar_por_distancia and criterios.limite and not criterios.radio_km:
+        raise BusinessRuleException(
+            "Para paginar ordenando por distancia se debe indicar radio_km."
+        )
+
     especialidad_id = criterios.especialidad_id
     especialidad_nombre = criterios.nombre_especialidad
 
@@ -79,107 +178,366 @@ def buscar_profesionales(
             )
         especialidad_nombre = especialidad.nombre
 
-    filtro = FiltroBusqueda(
+    return FiltroBusqueda(
         id_especialidad=especialidad_id,
         nombre_especialidad=especialidad_nombre,
         provincia=criterios.provincia,
         departamento=criterios.departamento,
         barrio=criterios.barrio,
+        texto=(criterios.texto or "").strip() or None,
+        ordenar_por_distancia=criterios.ordenar_por_distancia,
+        ordenar_por_puntaje=criterios.ordenar_por_puntaje,
+        latitud=criterios.latitud,
+        longitud=criterios.longitud,
+        radio_km=criterios.radio_km,
+        limite=criterios.limite,
+        dia_semana=criterios.dia_semana,
+        hora_desde=criterios.hora_desde,
+        hora_hasta=criterios.hora_hasta,
+        fecha=criterios.fecha,
+        duracion_minutos=(
+            criterios.duracion_minutos or DURACION_MINUTOS if criterios.fecha else None
+        ),
     )
 
-    if (filtro.id_especialidad or filtro.nombre_especialidad) and (
+
+@router.post("/profesionales", response_model=BusquedaProfesionalResponse)
+def buscar_profesionales(
+    criterios: BusquedaProfesionalRequest,
+    repo: ProfesionalRepository = Depends(get_profesional_repository),
+    catalogo_repo: CatalogoRepository = Depends(get_catalogo_repository),
+    indice: Optional[IndiceProfesionales] = Depends(get_indice_profesionales),
+    cache: Optional[CacheBusquedas] = Depends(get_cache_busquedas),
+    consulta_repo: ConsultaRepository = Depends(get_consulta_repository),
+    vista: Vista = Query(VISTA_COMPLETA, description="completa | resumen"),
+):
+    """
+    Busca profesionales según múltiples criterios.
+
+    Utiliza el patrón Strategy del dominio para aplicar filtros:
+    - Por especialidad (ID o nombre - se valida que exista)
+    - Por ubicación (provincia/departamento/barrio)
+    - Por disponibilidad (día de la semana y, opcional, franja horaria)
+    - Libres en una fecha (`fecha`): con un hueco de `duracion_minutos`
+      (60 por defecto) dentro de hora_desde/hora_hasta, descontando las
+      consultas ya reservadas
+    - Solo verificados/activos
+    - Por cercanía (latitud/longitud + radio_km, con `limite` opcional)
+    - Por texto libre sobre perfiles y publicaciones (`texto`), combinable
+      con los filtros de especialidad, ubicación y disponibilidad
+
+    Con `ordenar_por_puntaje` los resultados van del mejor al peor puntaje
+    precalculado por profesional (promedio bayesiano de valoraciones y
+    verificación); si además hay latitud/longitud, pondera la cercanía.
+
+    Si el índice en memoria está habilitado, las estrategias lo usan en
+    lugar de consultar la base de datos. Si la cache de búsquedas está
+    habilitada, un mismo filtro se responde desde ella hasta que vence o
+    un cambio de perfil lo invalida.
+
+    Con `limite` la respuesta es una página ordenada por (apellido, id), o
+    por (distancia, id) en la búsqueda por cercanía o por (relevancia, id) en
+    la búsqueda por texto, o por (puntaje, id) con `ordenar_por_puntaje`, y
+    trae `siguiente_cursor`
+    si quedan resultados. Al paginar, `total` sólo se calcula (con un COUNT
+    aparte) si se pide `incluir_total`; con `fecha` no se calcula, y cada
+    página se completa pidiendo más candidatos hasta juntar `limite` libres.
+
+    Con `?vista=resumen` cada profesional trae sólo id, nombre, apellido,
+    verificado, provincia, barrio, especialidades y valoraciones: se proyectan
+    esas columnas en SQL, sin armar el perfil completo.
+    """
+
+    filtro = _armar_filtro(criterios, catalogo_repo)
+
+    orden, clave = ORDEN_APELLIDO, clave_apellido
+    if filtro.texto:
+        estrategia = BusquedaPorTexto()
+        orden = ORDEN_RELEVANCIA
+    elif filtro.tiene_punto and filtro.radio_km:
+        estrategia = BusquedaPorCercania(indice)
+        orden, clave = ORDEN_DISTANCIA, clave_distancia(filtro.latitud, filtro.longitud)
+    elif (filtro.id_especialidad or filtro.nombre_especialidad) and (
         filtro.provincia or filtro.departamento or filtro.barrio
     ):
-        estrategia = BusquedaCombinada()
+        estrategia = BusquedaCombinada(indice)
     elif filtro.id_especialidad or filtro.nombre_especialidad:
-        estrategia = BusquedaPorEspecialidad()
+        estrategia = BusquedaPorEspecialidad(indice)
     elif filtro.provincia or filtro.departamento or filtro.barrio:
-        estrategia = BusquedaPorZona()
+        estrategia = BusquedaPorZona(indice)
+    elif filtro.dia_semana or filtro.fecha:
+        # Sólo disponibilidad: la combinada sin otros filtros recorre a todos
+        estrategia = BusquedaCombinada(indice)
     else:
         raise BusinessRuleException(
             "Se debe especificar un criterio de búsqueda válido."
         )
 
-    buscador = Buscador(repo, estrategia)
-    profesionales = buscador.buscar(filtro)
+    if filtro.ordenar_por_puntaje and not (filtro.texto or filtro.tiene_punto):
+        orden, clave = ORDEN_PUNTAJE, clave_puntaje
+
+    if criterios.cursor:
+        filtro = replace(filtro, despues_de=decodificar_cursor(criterios.cursor, orden))
+
+    asegurar_indice(indice, repo)
+    buscador = Buscador(repo, estrategia, cache=cache)
+
+    # Un elemento de más indica si hay página siguiente
+    consulta = replace(filtro, limite=filtro.limite + 1) if filtro.limite else filtro
+    # El cursor por distancia necesita las coordenadas del perfil completo
+    resumen = vista == VISTA_RESUMEN and orden != ORDEN_DISTANCIA
+    if filtro.fecha:
+        libres = BuscadorLibres(buscador, consulta_repo)
+        if orden == ORDEN_RELEVANCIA:
+            clave = clave_relevancia(libres.relevancias)
+        resultado = libres.buscar(consulta, clave, resumen=resumen)
+    else:
+        if resumen:
+            resultado = buscador.buscar_resumen(consulta)
+        else:
+            resultado = buscador.buscar(consulta)
+        if orden == ORDEN_RELEVANCIA:
+            clave = clave_relevancia(estrategia.relevancias)
+    profesionales, siguiente_cursor = cortar_pagina(
+        resultado, filtro.limite, orden, clave
+    )
+
+    if filtro.limite is None and filtro.despues_de is None:
+        total = len(profesionales)
+    elif criterios.incluir_total:
+        total = buscador.contar(filtro)
+    else:
+        total = None
+
+    criterios_aplicados = dict(filtro.__dict__)
+    criterios_aplicados.pop("despues_de")
+
+    if vista == VISTA_RESUMEN:
+        return respuesta_resumen(
+            resumir(profesionales),
+            extra={
+                "total": total,
+                "criterios_aplicados": criterios_aplicados,
+                "siguiente_cursor": siguiente_cursor,
+            },
+        )
 
     return BusquedaProfesionalResponse(
         profesionales=profesionales,
-        total=len(profesionales),
-        criterios_aplicados=filtro.__dict__,
+        total=total,
+        criterios_aplicados=criterios_aplicados,
+        siguiente_cursor=siguiente_cursor,
+    )
+
+
+@router.post("/lote", response_model=BusquedaLoteResponse)
+def buscar_en_lote(
+    lote: BusquedaLoteRequest,
+    repo: ProfesionalRepository = Depends(get_profesional_repository),
+    catalogo_repo: CatalogoRepository = Depends(get_catalogo_repository),
+    indice: Optional[IndiceProfesionales] = Depends(get_indice_profesionales),
+    cache: Optional[CacheBusquedas] = Depends(get_cache_busquedas),
+):
+    """
+    Resuelve varios filtros de especialidad, ubicación y disponibilidad en un
+    solo request (hasta 50), por ejemplo para armar un mapa de cobertura.
+
+    Cada filtro admite los criterios y validaciones de /profesionales salvo
+    texto, cercanía, cursor y fecha; con `limite` trae los primeros por (apellido,
+    id), o por puntaje con `ordenar_por_puntaje`. Todos se evalúan en una
+    sola consulta y cada perfil se carga una vez aunque aparezca en varios
+    resultados. Los resultados vienen en el orden de los filtros.
+    """
+    filtros = []
+    for posicion, criterios in enumerate(lote.filtros):
+        try:
+            filtro = _armar_filtro(criterios, catalogo_repo)
+            if filtro.texto or filtro.tiene_punto or criterios.cursor:
+                raise BusinessRuleException(
+                    "La búsqueda en lote no admite texto, cercanía ni cursor."
+                )
+            if filtro.fecha:
+                raise BusinessRuleException("La búsqueda en lote no admite fecha.")
+        except (BusinessRuleException, ResourceNotFoundException) as e:
+            raise type(e)(f"Filtro {posicion}: {e}")
+        filtros.append(filtro)
+
+    asegurar_indice(indice, repo)
+    resultados = BusquedaEnLote(repo, indice=indice, cache=cache).buscar(filtros)
+
+    return BusquedaLoteResponse(
+        resultados=[
+            {
+                "profesionales": profesionales,
+                "total": None if filtro.limite else len(profesionales),
+            }
+            for filtro, profesionales in zip(filtros, resultados)
+        ]
     )
 
 
+@router.post("/facetas", response_model=FacetasResponse)
+def contar_facetas(
+    criterios: BusquedaProfesionalRequest,
+    repo: ProfesionalRepository = Depends(get_profesional_repository),
+    catalogo_repo: CatalogoRepository = Depends(get_catalogo_repository),
+    indice: Optional[IndiceProfesionales] = Depends(get_indice_profesionales),
+    cache: Optional[CacheBusquedas] = Depends(get_cache_busquedas),
+):
+    """
+    Cantidad de profesionales por especialidad, provincia y departamento
+    que cumplen los filtros de especialidad, ubicación y disponibilidad
+    (mismos criterios y validaciones que /profesionales; sin filtros, los
+    totales generales).
+
+    Se calcula con una sola consulta agregada, o desde el índice en memoria
+    si está habilitado, y se cachea junto a las búsquedas.
+    """
+    filtro = _armar_filtro(criterios, catalogo_repo)
+    if filtro.texto or filtro.radio_km:
+        raise BusinessRuleException(
+            "Las facetas no se calculan para búsquedas por texto ni por cercanía."
+        )
+    if filtro.fecha:
+        raise BusinessRuleException(
+            "Las facetas no se calculan para libres en una fecha."
+        )
+
+    asegurar_indice(indice, repo)
+    facetas = Facetador(repo, indice=indice, cache=cache).contar(filtro)
+
+    return FacetasResponse(
+        **facetas,
+        criterios_aplicados={
+            "id_especialidad": filtro.id_especialidad,
+            "nombre_especialidad": filtro.nombre_especialidad,
+            "provincia": filtro.provincia,
+            "departamento": filtro.departamento,
+            "barrio": filtro.barrio,
+            "dia_semana": filtro.dia_semana,
+            "hora_desde": filtro.hora_desde,
+            "hora_hasta": filtro.hora_hasta,
+        },
+    )
+
+
+@router.get("/cache/estadisticas")
+def estadisticas_cache(
+    cache: Optional[CacheBusquedas] = Depends(get_cache_busquedas),
+):
+    """
+    Contadores de la cache de búsquedas (aciertos, fallos, desalojos...).
+    """
+    if cache is None:
+        return {"habilitada": False}
+    return {"habilitada": True, **cache.estadisticas()}
+
+
+@router.get("/autocompletar", response_model=AutocompletadoResponse)
+def autocompletar(
+    q: str = Query(..., min_length=1, max_length=100, description="Prefijo"),
+    tipo: Optional[
+        Literal["provincia", "departamento", "barrio", "especialidad"]
+    ] = Query(None, description="Restringir a un tipo de sugerencia"),
+    limite: int = Query(10, ge=1, le=LIMITE_MAXIMO),
+    trie: TrieAutocompletado = Depends(get_trie_autocompletado),
+    direccion_repo: DireccionRepository = Depends(get_direccion_repository),
+    catalogo_repo: CatalogoRepository = Depends(get_catalogo_repository),
+):
+    """
+    Sugerencias de provincias, departamentos, barrios y especialidades con
+    alguna palabra que empiece con `q` (sin distinguir acentos ni
+    mayúsculas). Se resuelve sobre un trie en memoria que se arma en la
+    primera consulta; no consulta la base después.
+    """
+    asegurar_trie(trie, direccion_repo, catalogo_repo)
+    sugerencias = trie.sugerir(q, limite=limite, tipos=(tipo,) if tipo else None)
+    return AutocompletadoResponse(consulta=q, sugerencias=sugerencias)
+
+
+def _nodo(nodo: NodoUbicacion) -> dict:
+    return {"id": str(nodo.id), "nombre": nodo.nombre}
+
+
 @router.get("/especialidades")
 def listar_especialidades(
+    request: Request,
     repo: CatalogoRepository = Depends(get_catalogo_repository),
+    direccion_repo: DireccionRepository = Depends(get_direccion_repository),
+    cache: CacheCatalogo = Depends(get_cache_catalogo),
 ):
     """
-    Lista todas las especialidades disponibles desde la base de datos.
+    Lista todas las especialidades disponibles (desde el snapshot de
+    referencia; ETag / If-None-Match).
     """
-    especialidades = repo.listar_especialidades()
-    return {
-        "especialidades": [
-            {"id": esp.id, "nombre": esp.nombre} for esp in especialidades
-        ]
-    }
+    snapshot = obtener_snapshot(cache, repo, direccion_repo)
+    return respuesta_referencia(
+        request,
+        snapshot,
+        {
+            "especialidades": [
+                {"id": id, "nombre": nombre} for id, nombre in snapshot.especialidades
+            ]
+        },
+    )
 
 
 @router.get("/ubicaciones/provincias")
 def listar_provincias(
+    request: Request,
     repo: DireccionRepository = Depends(get_direccion_repository),
+    catalogo_repo: CatalogoRepository = Depends(get_catalogo_repository),
+    cache: CacheCatalogo = Depends(get_cache_catalogo),
 ):
     """
-    Lista todas las provincias disponibles desde la base de datos.
+    Lista todas las provincias disponibles (desde el snapshot de
+    referencia; ETag / If-None-Match).
     """
-    provincias = repo.listar_provincias()
-    return {
-        "provincias": [
-            {"id": str(provincia.id), "nombre": provincia.nombre}
-            for provincia in provincias
-        ]
-    }
+    snapshot = obtener_snapshot(cache, catalogo_repo, repo)
+    return respuesta_referencia(
+        request,
+        snapshot,
+        {"provincias": [_nodo(provincia) for provincia in snapshot.provincias]},
+    )
 
 
 @router.get("/ubicaciones/provincias/{provincia_id}/departamentos")
 def listar_departamentos(
     provincia_id: UUID,
+    request: Request,
     repo: DireccionRepository = Depends(get_direccion_repository),
+    catalogo_repo: CatalogoRepository = Depends(get_catalogo_repository),
+    cache: CacheCatalogo = Depends(get_cache_catalogo),
 ):
     """
     Lista todos los departamentos de una provincia específica.
     """
-    try:
-        departamentos = repo.listar_departamentos(provincia_id)
-        return {
+    snapshot = obtener_snapshot(cache, catalogo_repo, repo)
+    return respuesta_referencia(
+        request,
+        snapshot,
+        {
             "departamentos": [
-                {"id": str(depto.id), "nombre": depto.nombre} for depto in departamentos
+                _nodo(depto) for depto in snapshot.departamentos_de(provincia_id)
             ]
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error al listar departamentos: {str(e)}",
-        )
+        },
+    )
 
 
 @router.get("/ubicaciones/departamentos/{departamento_id}/barrios")
 def listar_barrios(
     departamento_id: UUID,
+    request: Request,
     repo: DireccionRepository = Depends(get_direccion_repository),
+    catalogo_repo: CatalogoRepository = Depends(get_catalogo_repository),
+    cache: CacheCatalogo = Depends(get_cache_catalogo),
 ):
     """
     Lista todos los barrios de un departamento específico.
     """
-    try:
-        barrios = repo.listar_barrios(departamento_id)
-        return {
-            "barrios": [
-                {"id": str(barrio.id), "nombre": barrio.nombre} for barrio in barrios
-            ]
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error al listar barrios: {str(e)}",
-        )
+    snapshot = obtener_snapshot(cache, catalogo_repo, repo)
+    return respuesta_referencia(
+        request,
+        snapshot,
+        {"barrios": [_nodo(barrio) for barrio in snapshot.barrios_de(departamento_id)]},
+    )
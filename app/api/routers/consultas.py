@@ -16,7 +16,6 @@ from app.api.dependencies import (
     get_db,
     get_current_user,
 )
-from app.api.event_bus import get_event_bus
 from app.api.policies import IntegrityPolicies
 from app.api.exceptions import (
     BusinessRuleException,
@@ -27,7 +26,7 @@ from app.api.exceptions import (
 from app.infra.repositories.consulta_repository import ConsultaRepository
 from app.infra.repositories.profesional_repository import ProfesionalRepository
 from app.infra.repositories.paciente_repository import PacienteRepository
-from app.domain.entities.agenda import Cita
+from app.domain.entities.agenda import Cita, HorarioNoDisponible
 from app.domain.enumeraciones import EstadoCita
 from app.domain.value_objects.objetos_valor import Ubicacion
 from app.domain.eventos import (
@@ -37,7 +36,6 @@ from app.domain.eventos import (
     CitaCompletada,
     CitaReprogramada,
 )
-from app.domain.observers.observadores import EventBus, NotificadorEmail
 
 router = APIRouter()
 
@@ -70,7 +68,6 @@ def crear_consulta(
     prof_repo: ProfesionalRepository = Depends(get_profesional_repository),
     pac_repo: PacienteRepository = Depends(get_paciente_repository),
     db: Session = Depends(get_db),
-    event_bus: EventBus = Depends(get_event_bus),
 ):
     """
     Crea una nueva consulta/cita en estado PENDIENTE.
@@ -79,10 +76,11 @@ def crear_consulta(
     - Profesional verificado y activo
     - Paciente pertenece al solicitante
     - Solicitante activo
-    - Disponibilidad horaria (evita solapamientos)
     - Fecha y horarios válidos
+    - Disponibilidad horaria: la base rechaza solapamientos (409 Conflict)
 
-    Publica evento CitaCreada en el EventBus para notificaciones.
+    El evento CitaCreada se escribe en el outbox junto con la consulta; el
+    despachador lo entrega después a los suscriptores (notificaciones).
     """
     try:
         policies = IntegrityPolicies()
@@ -125,21 +123,6 @@ def crear_consulta(
                 detail="No se pueden crear consultas en fechas pasadas",
             )
 
-        # Validación 3: Verificar disponibilidad (anti-double booking)
-        consultas_existentes = repo.listar_por_profesional(
-            profesional_id=data.profesional_id,
-            desde=data.fecha,
-            hasta=data.fecha,
-            solo_activas=True,
-        )
-
-        for c in consultas_existentes:
-            if (data.hora_inicio < c.hora_fin) and (data.hora_fin > c.hora_inicio):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="El profesional no está disponible en el horario seleccionado",
-                )
-
         ubicacion = Ubicacion(
             provincia=data.ubicacion.provincia,
             departamento=data.ubicacion.departamento,
@@ -163,18 +146,18 @@ def crear_consulta(
             notas="",
         )
 
-        cita_creada = repo.crear(cita)
-
         evento = CitaCreada(
-            cita_id=cita_creada.id,
+            cita_id=cita.id,
             profesional_id=data.profesional_id,
             paciente_id=data.paciente_id,
             solicitante_id=data.solicitante_id,
         )
-        event_bus.publicar(evento)
+        cita_creada = repo.crear(cita, eventos=[evento])
 
         return _cita_to_response(cita_creada)
 
+    except HorarioNoDisponible as e:
+        raise ConflictException(str(e))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except (
@@ -300,6 +283,8 @@ def actualizar_consulta(
 
         return _cita_to_response(consulta_actualizada)
 
+    except HorarioNoDisponible as e:
+        raise ConflictException(str(e))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -308,7 +293,6 @@ def actualizar_consulta(
 def confirmar_consulta(
     consulta_id: UUID,
     repo: ConsultaRepository = Depends(get_consulta_repository),
-    event_bus: EventBus = Depends(get_event_bus),
     current_user=Depends(get_current_user),
 ):
     """
@@ -321,11 +305,11 @@ def confirmar_consulta(
 
     Cuando se confirma:
     1. Valida que la cita le pertenezca al usuario autenticado
-    2. Adjunta el NotificadorEmail (Observer) para enviar notificaciones
-    3. Cambia el estado a CONFIRMADA
-    4. Publica evento CitaConfirmada con el ID y rol del confirmante
+    2. Cambia el estado a CONFIRMADA
+    3. Escribe en el outbox, en la misma transacción, el evento
+       CitaConfirmada con el ID y rol del confirmante
 
-    El Observer enviará automáticamente emails a ambas partes.
+    El despachador de eventos enviará los emails a ambas partes.
     """
     consulta = repo.obtener_por_id(consulta_id)
 
@@ -345,21 +329,18 @@ def confirmar_consulta(
         )
 
     try:
-        notificador = NotificadorEmail()
-        consulta.attach(notificador)
-
         rol = "paciente" if es_paciente else "profesional"
         confirmado_por = f"{rol}:{current_user.id}"
 
         consulta.confirmar(confirmado_por=confirmado_por)
 
-        consulta_actualizada = repo.actualizar(consulta)
-
         evento = CitaConfirmada(cita_id=consulta_id, confirmado_por=confirmado_por)
-        event_bus.publicar(evento)
+        consulta_actualizada = repo.actualizar(consulta, eventos=[evento])
 
         return _cita_to_response(consulta_actualizada)
 
+    except HorarioNoDisponible as e:
+        raise ConflictException(str(e))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -369,7 +350,6 @@ def cancelar_consulta(
     consulta_id: UUID,
     motivo: str = None,
     repo: ConsultaRepository = Depends(get_consulta_repository),
-    event_bus: EventBus = Depends(get_event_bus),
     current_user=Depends(get_current_user),
 ):
     """
@@ -380,7 +360,7 @@ def cancelar_consulta(
     - **Paciente**: Puede cancelar si es el dueño de la cita
     - **Profesional**: Puede cancelar si es el asignado a la cita
 
-    El Observer enviará notificaciones automáticas a ambas partes.
+    El despachador de eventos enviará las notificaciones a ambas partes.
     """
     consulta = repo.obtener_por_id(consulta_id)
 
@@ -400,19 +380,15 @@ def cancelar_consulta(
         )
 
     try:
-        notificador = NotificadorEmail()
-        consulta.attach(notificador)
-
         rol = "paciente" if es_paciente else "profesional"
         cancelado_por = f"{rol}:{current_user.id}"
 
         consulta.cancelar(motivo=motivo, cancelado_por=cancelado_por)
-        repo.actualizar(consulta)
 
         evento = CitaCancelada(
             cita_id=consulta_id, motivo=motivo, cancelado_por=cancelado_por
         )
-        event_bus.publicar(evento)
+        repo.actualizar(consulta, eventos=[evento])
 
         return None
 
@@ -425,7 +401,6 @@ def completar_consulta(
     consulta_id: UUID,
     notas_finales: str = None,
     repo: ConsultaRepository = Depends(get_consulta_repository),
-    event_bus: EventBus = Depends(get_event_bus),
     current_user=Depends(get_current_user),
 ):
     """
@@ -434,7 +409,7 @@ def completar_consulta(
     **Requiere autenticación**: Solo el **Profesional** puede completar.
 
     El profesional completa la cita después de brindar el servicio.
-    El Observer enviará notificaciones al paciente confirmando la finalización.
+    El despachador de eventos notificará al paciente la finalización.
     """
     consulta = repo.obtener_por_id(consulta_id)
 
@@ -451,17 +426,15 @@ def completar_consulta(
         )
 
     try:
-        notificador = NotificadorEmail()
-        consulta.attach(notificador)
-
         consulta.completar(notas_finales=notas_finales)
-        consulta_actualizada = repo.actualizar(consulta)
 
         evento = CitaCompletada(cita_id=consulta_id, notas=notas_finales)
-        event_bus.publicar(evento)
+        consulta_actualizada = repo.actualizar(consulta, eventos=[evento])
 
         return _cita_to_response(consulta_actualizada)
 
+    except HorarioNoDisponible as e:
+        raise ConflictException(str(e))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -471,7 +444,6 @@ def reprogramar_consulta(
     consulta_id: UUID,
     data: ConsultaUpdate,
     repo: ConsultaRepository = Depends(get_consulta_repository),
-    event_bus: EventBus = Depends(get_event_bus),
     current_user=Depends(get_current_user),
 ):
     """
@@ -482,7 +454,8 @@ def reprogramar_consulta(
     - **Paciente**: Puede reprogramar si es el dueño de la cita
     - **Profesional**: Puede reprogramar si es el asignado a la cita
 
-    El Observer enviará notificaciones a ambas partes con el nuevo horario.
+    El despachador de eventos notificará a ambas partes el nuevo horario.
+    Si el nuevo horario se solapa con otra consulta del profesional: 409.
     """
     consulta = repo.obtener_por_id(consulta_id)
 
@@ -510,25 +483,22 @@ def reprogramar_consulta(
     try:
         fecha_anterior = f"{consulta.fecha} {consulta.hora_inicio}-{consulta.hora_fin}"
 
-        notificador = NotificadorEmail()
-        consulta.attach(notificador)
-
         consulta.reprogramar(
             nueva_fecha=data.fecha,
             nueva_hora_inicio=data.hora_inicio,
             nueva_hora_fin=data.hora_fin,
         )
-        consulta_actualizada = repo.actualizar(consulta)
-
         fecha_nueva = f"{data.fecha} {data.hora_inicio}-{data.hora_fin}"
         evento = CitaReprogramada(
             cita_id=consulta_id,
             fecha_anterior=fecha_anterior,
             fecha_nueva=fecha_nueva,
         )
-        event_bus.publicar(evento)
+        consulta_actualizada = repo.actualizar(consulta, eventos=[evento])
 
         return _cita_to_response(consulta_actualizada)
 
+    except HorarioNoDisponible as e:
+        raise ConflictException(str(e))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
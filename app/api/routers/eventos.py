@@ -0,0 +1,24 @@
+"""
+Router del bus de eventos (métricas)
+"""
+
+from fastapi import APIRouter, Depends
+
+from app.api.event_bus import get_event_bus, notificador_email
+from app.domain.observers.bus_asincrono import EventBusAsincrono
+from app.services.notificaciones_email import NotificadorEmailAgrupado
+
+router = APIRouter()
+
+
+@router.get("/estadisticas")
+def estadisticas_bus(event_bus: EventBusAsincrono = Depends(get_event_bus)):
+    """
+    Estado del bus de eventos: profundidad de la cola, publicados,
+    descartados, volcados y latencia de cada handler; con SMTP, además,
+    los resúmenes enviados y las sesiones abiertas.
+    """
+    estadisticas = event_bus.estadisticas()
+    if isinstance(notificador_email, NotificadorEmailAgrupado):
+        estadisticas["notificaciones"] = notificador_email.estadisticas()
+    return estadisticas
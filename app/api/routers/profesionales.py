@@ -2,11 +2,24 @@
 Router para gestión de profesionales
 """
 
-from typing import List
+import io
+from datetime import date
+from typing import List, Literal, Optional
 from uuid import UUID, uuid4
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
 
 from app.api.schemas import (
+    HuecoSchema,
+    ImportacionResponse,
     ProfesionalCreate,
     ProfesionalResponse,
     ProfesionalUpdate,
@@ -14,9 +27,18 @@ from app.api.schemas import (
 from app.api.dependencies import (
     get_profesional_repository,
     get_catalogo_repository,
+    get_consulta_repository,
     get_current_user,
+    get_current_admin,
+)
+from app.api.exceptions import BusinessRuleException, ResourceNotFoundException
+from app.api.paginacion import (
+    ORDEN_APELLIDO,
+    clave_apellido,
+    cortar_pagina,
+    decodificar_cursor,
 )
-from app.api.exceptions import ResourceNotFoundException
+from app.api.vistas import VISTA_COMPLETA, VISTA_RESUMEN, Vista, respuesta_resumen
 from app.infra.repositories.profesional_repository import ProfesionalRepository
 from app.infra.repositories.catalogo_repository import CatalogoRepository
 from app.domain.entities.usuarios import Profesional
@@ -26,9 +48,20 @@ from app.domain.value_objects.objetos_valor import (
     Matricula,
 )
 from app.domain.enumeraciones import DiaSemana
+from app.domain.huecos import calcular_huecos
+from app.infra.repositories.consulta_repository import ConsultaRepository
+from app.services.importacion_profesionales import (
+    FORMATO_CSV,
+    FORMATO_JSONL,
+    ImportadorProfesionales,
+    leer_filas,
+)
 
 router = APIRouter()
 
+# Rango máximo de GET /profesionales/{id}/huecos
+MAX_DIAS_HUECOS = 62
+
 
 @router.post(
     "/",
@@ -104,6 +137,77 @@ def crear_profesional(
         return profesional_creado
 
 
+@router.post("/importar", response_model=ImportacionResponse)
+def importar_profesionales(
+    archivo: UploadFile = File(..., description="CSV o JSONL (UTF-8)"),
+    formato: Optional[Literal["csv", "jsonl"]] = Query(
+        None, description="Por defecto, según la extensión del archivo"
+    ),
+    desde_fila: int = Query(1, ge=1, description="Para retomar una importación"),
+    tamano_lote: int = Query(500, ge=1, le=5000),
+    repo: ProfesionalRepository = Depends(get_profesional_repository),
+    catalogo_repo: CatalogoRepository = Depends(get_catalogo_repository),
+    current_user=Depends(get_current_admin),
+):
+    """
+    Alta masiva de profesionales (ver app.services.importacion_profesionales
+    para el formato). El archivo se procesa en streaming y en lotes; cada
+    lote confirmado queda guardado aunque uno posterior falle. Requiere ser
+    administrador.
+    """
+    if formato is None:
+        nombre = (archivo.filename or "").lower()
+        if nombre.endswith(".csv"):
+            formato = FORMATO_CSV
+        elif nombre.endswith((".jsonl", ".ndjson")):
+            formato = FORMATO_JSONL
+        else:
+            raise BusinessRuleException(
+                "No se pudo deducir el formato del archivo: indicar formato=csv|jsonl."
+            )
+
+    texto = io.TextIOWrapper(archivo.file, encoding="utf-8-sig", newline="")
+    importador = ImportadorProfesionales(repo, catalogo_repo, tamano_lote=tamano_lote)
+    try:
+        return importador.importar(leer_filas(texto, formato), desde_fila=desde_fila)
+    except UnicodeDecodeError:
+        raise BusinessRuleException("El archivo debe estar codificado en UTF-8.")
+    finally:
+        texto.detach()
+
+
+@router.get("/{profesional_id}/huecos", response_model=List[HuecoSchema])
+def huecos_profesional(
+    profesional_id: UUID,
+    desde: date,
+    hasta: date,
+    duracion: int = Query(60, ge=30, le=240, description="Minutos"),
+    repo: ProfesionalRepository = Depends(get_profesional_repository),
+    consulta_repo: ConsultaRepository = Depends(get_consulta_repository),
+):
+    """
+    Franjas libres del profesional entre `desde` y `hasta` (inclusive) en
+    las que entra una consulta de `duracion` minutos: sus disponibilidades
+    semanales menos las consultas no canceladas. Dos queries para todo el
+    rango (hasta MAX_DIAS_HUECOS días).
+    """
+    if hasta < desde:
+        raise BusinessRuleException("hasta debe ser igual o posterior a desde")
+    if (hasta - desde).days >= MAX_DIAS_HUECOS:
+        raise BusinessRuleException(
+            f"El rango no puede superar los {MAX_DIAS_HUECOS} días"
+        )
+
+    disponibilidades = repo.obtener_disponibilidades(profesional_id)
+    if disponibilidades is None:
+        raise ResourceNotFoundException(
+            f"Profesional con ID {profesional_id} no encontrado"
+        )
+    ocupadas = consulta_repo.listar_ocupadas(profesional_id, desde, hasta)
+
+    return calcular_huecos(disponibilidades, ocupadas, desde, hasta, duracion)
+
+
 @router.get("/{profesional_id}", response_model=ProfesionalResponse)
 def obtener_profesional(
     profesional_id: UUID,
@@ -126,12 +230,53 @@ def obtener_profesional(
 
 @router.get("/", response_model=List[ProfesionalResponse])
 def listar_profesionales(
+    response: Response,
     solo_activos: bool = True,
+    limite: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = None,
+    incluir_total: bool = False,
+    vista: Vista = Query(VISTA_COMPLETA, description="completa | resumen"),
     repo: ProfesionalRepository = Depends(get_profesional_repository),
 ):
     """
     Lista todos los profesionales activos.
+
+    Con `limite` (y `cursor`) devuelve una página ordenada por (apellido, id).
+    El cursor de la página siguiente viaja en el header `X-Siguiente-Cursor`
+    y, si se pide `incluir_total`, el total en `X-Total-Count`; el cuerpo
+    sigue siendo la lista de profesionales.
+
+    Con `?vista=resumen` cada elemento trae sólo los datos de la tarjeta del
+    listado (ver app.api.vistas), proyectados en SQL.
     """
+    resumen = vista == VISTA_RESUMEN
+
+    if limite or cursor:
+        despues_de = decodificar_cursor(cursor, ORDEN_APELLIDO) if cursor else None
+        listar = repo.listar_resumen if resumen else repo.listar_pagina
+        profesionales, siguiente_cursor = cortar_pagina(
+            listar(
+                limite + 1 if limite else None,
+                despues_de=despues_de,
+                solo_activos=solo_activos,
+            ),
+            limite,
+            ORDEN_APELLIDO,
+            clave_apellido,
+        )
+        cabeceras = {}
+        if siguiente_cursor:
+            cabeceras["X-Siguiente-Cursor"] = siguiente_cursor
+        if incluir_total:
+            cabeceras["X-Total-Count"] = str(repo.contar(solo_activos))
+        if resumen:
+            return respuesta_resumen(profesionales, headers=cabeceras)
+        response.headers.update(cabeceras)
+        return profesionales
+
+    if resumen:
+        return respuesta_resumen(repo.listar_resumen(solo_activos=solo_activos))
+
     if solo_activos:
         profesionales = repo.listar_activos()
     else:
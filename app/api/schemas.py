@@ -5,7 +5,7 @@ Estos son los DTOs (Data Transfer Objects) de la API
 
 from datetime import date, time, datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import List, Optional, Union
 from uuid import UUID
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
 
@@ -85,6 +85,9 @@ class ProfesionalResponse(UsuarioBase):
     especialidades: List[EspecialidadSchema]
     disponibilidades: List[DisponibilidadSchema]
     matriculas: List[MatriculaSchema]
+    cantidad_valoraciones: int = 0
+    promedio_valoraciones: float = 0.0
+    puntaje: Optional[float] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -100,6 +103,29 @@ class ProfesionalUpdate(BaseModel):
     disponibilidades: Optional[List[DisponibilidadSchema]] = None
 
 
+class ErrorFilaSchema(BaseModel):
+    """Fila del archivo de importación que no se pudo dar de alta"""
+
+    fila: int
+    mensaje: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ImportacionResponse(BaseModel):
+    """Resumen de una importación masiva de profesionales"""
+
+    leidas: int
+    importadas: int
+    omitidas: int = Field(description="Filas con email ya registrado")
+    errores: List[ErrorFilaSchema]
+    ultima_fila: int = Field(
+        description="Última fila confirmada: para retomar, desde_fila = ultima_fila + 1"
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class PacienteCreate(BaseModel):
     """Schema para crear paciente (sin email/celular - los tiene el Solicitante)"""
 
@@ -185,6 +211,16 @@ class ConsultaUpdate(BaseModel):
     notas: Optional[str] = None
 
 
+class HuecoSchema(BaseModel):
+    """Franja libre de la agenda de un profesional"""
+
+    fecha: date
+    hora_inicio: time
+    hora_fin: time
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class BusquedaProfesionalRequest(BaseModel):
     """Schema para búsqueda de profesionales"""
 
@@ -193,19 +229,119 @@ class BusquedaProfesionalRequest(BaseModel):
     provincia: Optional[str] = None
     departamento: Optional[str] = None
     barrio: Optional[str] = None
+    texto: Optional[str] = Field(
+        None,
+        max_length=200,
+        description="Texto libre sobre perfiles y publicaciones (orden por relevancia)",
+    )
     dia_semana: Optional[int] = Field(
         None, ge=1, le=7, description="1=Lunes, 7=Domingo (ISO 8601)"
     )
+    hora_desde: Optional[time] = Field(
+        None,
+        description="Inicio de la franja que debe cubrir (requiere dia_semana o fecha)",
+    )
+    hora_hasta: Optional[time] = Field(
+        None,
+        description="Fin de la franja que debe cubrir (requiere dia_semana o fecha)",
+    )
+    fecha: Optional[date] = Field(
+        None, description="Libres en esa fecha, descontando sus consultas"
+    )
+    duracion_minutos: Optional[int] = Field(
+        None,
+        ge=30,
+        le=240,
+        description="Hueco libre mínimo en la fecha (requiere fecha; 60 por defecto)",
+    )
     solo_verificados: bool = True
     solo_activos: bool = True
+    latitud: Optional[float] = Field(None, ge=-90, le=90)
+    longitud: Optional[float] = Field(None, ge=-180, le=180)
+    radio_km: Optional[float] = Field(
+        None, gt=0, le=500, description="Búsqueda por cercanía al punto"
+    )
+    limite: Optional[int] = Field(
+        None, ge=1, le=100, description="Tamaño de página (k más cercanos en cercanía)"
+    )
+    cursor: Optional[str] = Field(
+        None, description="siguiente_cursor de la página anterior"
+    )
+    incluir_total: bool = Field(
+        False, description="Calcula el total con un COUNT aparte al paginar"
+    )
+    ordenar_por_distancia: bool = False
+    ordenar_por_puntaje: bool = Field(
+        False,
+        description="Ordena por valoraciones y verificación (y cercanía si hay punto)",
+    )
 
 
 class BusquedaProfesionalResponse(BaseModel):
     """Schema para resultado de búsqueda"""
 
     profesionales: List[ProfesionalResponse]
-    total: int
+    total: Optional[int] = None
     criterios_aplicados: dict
+    siguiente_cursor: Optional[str] = None
+
+
+class BusquedaLoteRequest(BaseModel):
+    """Schema para búsqueda en lote: varios filtros en un solo request"""
+
+    filtros: List[BusquedaProfesionalRequest] = Field(..., min_length=1, max_length=50)
+
+
+class ResultadoLoteResponse(BaseModel):
+    """Resultado de uno de los filtros del lote"""
+
+    profesionales: List[ProfesionalResponse]
+    total: Optional[int] = None
+
+
+class BusquedaLoteResponse(BaseModel):
+    """Resultados en el mismo orden que los filtros del request"""
+
+    resultados: List[ResultadoLoteResponse]
+
+
+class ConteoFacetaSchema(BaseModel):
+    """Cantidad de profesionales con un valor de faceta"""
+
+    nombre: str
+    cantidad: int
+    id: Optional[int] = Field(None, description="ID de la especialidad")
+    provincia: Optional[str] = Field(None, description="Provincia del departamento")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class FacetasResponse(BaseModel):
+    """Conteos por faceta para el filtro de búsqueda"""
+
+    especialidad: List[ConteoFacetaSchema]
+    provincia: List[ConteoFacetaSchema]
+    departamento: List[ConteoFacetaSchema]
+    criterios_aplicados: dict
+
+
+class SugerenciaSchema(BaseModel):
+    """Opción de autocompletado (ubicación o especialidad)"""
+
+    tipo: str
+    id: Union[int, UUID]
+    nombre: str
+    provincia: Optional[str] = Field(None, description="Provincia del nodo")
+    departamento: Optional[str] = Field(None, description="Departamento del barrio")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AutocompletadoResponse(BaseModel):
+    """Sugerencias para el prefijo consultado, las más cortas primero"""
+
+    consulta: str
+    sugerencias: List[SugerenciaSchema]
 
 
 class ValoracionCreate(BaseModel):
@@ -0,0 +1,68 @@
+"""
+Vistas de los listados de profesionales.
+
+"completa" (default) devuelve ProfesionalResponse: el perfil entero,
+validado por Pydantic. "resumen" devuelve sólo lo que muestra una tarjeta de
+resultado (ResumenProfesional): el repositorio lo proyecta con un SELECT de
+columnas y acá se serializa directo a JSON, sin hidratar entidades ORM ni
+pasar por el response_model.
+"""
+
+from typing import Iterable, List, Literal, Optional, Union
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.domain.entities.usuarios import Profesional, ResumenProfesional
+
+VISTA_COMPLETA = "completa"
+VISTA_RESUMEN = "resumen"
+
+Vista = Literal["completa", "resumen"]
+
+
+def resumir(
+    items: Iterable[Union[Profesional, ResumenProfesional]],
+) -> List[ResumenProfesional]:
+    """Pasa a ResumenProfesional lo que todavía sea un perfil completo"""
+    return [
+        (
+            p
+            if isinstance(p, ResumenProfesional)
+            else ResumenProfesional.desde_profesional(p)
+        )
+        for p in items
+    ]
+
+
+def serializar_resumen(resumen: ResumenProfesional) -> dict:
+    return {
+        "id": str(resumen.id),
+        "nombre": resumen.nombre,
+        "apellido": resumen.apellido,
+        "verificado": resumen.verificado,
+        "provincia": resumen.provincia,
+        "barrio": resumen.barrio,
+        "especialidades": list(resumen.especialidades),
+        "cantidad_valoraciones": resumen.cantidad_valoraciones,
+        "promedio_valoraciones": resumen.promedio_valoraciones,
+        "puntaje": resumen.puntaje,
+    }
+
+
+def respuesta_resumen(
+    resumenes: Iterable[ResumenProfesional],
+    extra: Optional[dict] = None,
+    headers: Optional[dict] = None,
+) -> JSONResponse:
+    """
+    Lista de resúmenes como JSON. Con `extra` el cuerpo es ese dict con la
+    lista en "profesionales" (respuesta de búsqueda); sin él, la lista sola.
+    """
+    profesionales = [serializar_resumen(r) for r in resumenes]
+    if extra is None:
+        return JSONResponse(content=profesionales, headers=headers)
+    return JSONResponse(
+        content={**jsonable_encoder(extra), "profesionales": profesionales},
+        headers=headers,
+    )
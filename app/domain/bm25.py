@@ -0,0 +1,104 @@
+from __future__ import annotations
+import re
+from collections import Counter
+from math import log
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+from app.domain.texto import normalizar_texto
+
+"""
+Ranking BM25 en memoria para la búsqueda por texto libre.
+
+Es el respaldo de la búsqueda full-text de PostgreSQL (tsvector + GIN) cuando
+la base no la tiene (SQLite en desarrollo y tests). Los términos se
+normalizan igual que el resto de las búsquedas (sin acentos, minúsculas) y se
+descartan las palabras vacías del español más comunes; no hay stemming.
+
+Cada documento es una lista de campos (texto, peso): el peso multiplica la
+frecuencia del término en ese campo, así un título puede contar más que la
+descripción.
+"""
+
+K1 = 1.2
+B = 0.75
+
+PALABRAS_VACIAS = frozenset(
+    """
+    a al algo como con de del el en es esta este la las lo los mas me mi muy
+    no o para pero por que se sin sobre su sus te tu un una unas uno unos y ya
+    """.split()
+)
+
+_PALABRA = re.compile(r"\w+")
+
+
+def terminos(texto: str) -> List[str]:
+    """Términos normalizados de `texto`, sin palabras vacías"""
+    return [
+        t
+        for t in _PALABRA.findall(normalizar_texto(texto or ""))
+        if t not in PALABRAS_VACIAS
+    ]
+
+
+class IndiceBM25:
+    """Posting lists término → {documento: frecuencia} y largo de cada documento"""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[Hashable, float]] = {}
+        self._largos: Dict[Hashable, float] = {}
+        self._terminos: Dict[Hashable, List[str]] = {}
+        self._largo_total = 0.0
+
+    def __len__(self) -> int:
+        return len(self._largos)
+
+    def agregar(self, doc_id: Hashable, campos: Iterable[Tuple[str, float]]) -> None:
+        """Alta (o reemplazo) de un documento formado por campos (texto, peso)"""
+        self.quitar(doc_id)
+        frecuencias: Counter = Counter()
+        for texto, peso in campos:
+            for termino in terminos(texto):
+                frecuencias[termino] += peso
+        for termino, tf in frecuencias.items():
+            self._postings.setdefault(termino, {})[doc_id] = tf
+        largo = sum(frecuencias.values())
+        self._largos[doc_id] = largo
+        self._terminos[doc_id] = list(frecuencias)
+        self._largo_total += largo
+
+    def quitar(self, doc_id: Hashable) -> None:
+        largo = self._largos.pop(doc_id, None)
+        if largo is None:
+            return
+        self._largo_total -= largo
+        for termino in self._terminos.pop(doc_id):
+            docs = self._postings[termino]
+            del docs[doc_id]
+            if not docs:
+                del self._postings[termino]
+
+    def puntuar(self, consulta: str) -> Dict[Hashable, float]:
+        """Puntaje BM25 de cada documento que contiene algún término de la consulta"""
+        if not self._largos:
+            return {}
+
+        total = len(self._largos)
+        largo_medio = self._largo_total / total or 1.0
+        puntajes: Dict[Hashable, float] = {}
+        for termino in set(terminos(consulta)):
+            docs = self._postings.get(termino)
+            if not docs:
+                continue
+            n = len(docs)
+            idf = log(1 + (total - n + 0.5) / (n + 0.5))
+            for doc_id, tf in docs.items():
+                norma = K1 * (1 - B + B * self._largos[doc_id] / largo_medio)
+                puntajes[doc_id] = puntajes.get(doc_id, 0.0) + idf * (
+                    tf * (K1 + 1) / (tf + norma)
+                )
+        return puntajes
+
+    def rankear(self, consulta: str) -> List[Tuple[Hashable, float]]:
+        """(doc_id, puntaje) ordenados por puntaje descendente y luego doc_id"""
+        return sorted(self.puntuar(consulta).items(), key=lambda par: (-par[1], par[0]))
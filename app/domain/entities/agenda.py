@@ -1,7 +1,8 @@
 from __future__ import annotations
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
 from datetime import date, time, datetime, timedelta
-from typing import List
+from typing import Dict, Iterable, List, Tuple
 from uuid import UUID
 
 from ..value_objects.objetos_valor import Ubicacion
@@ -15,6 +16,66 @@ from ..eventos import (
 from ..observers.observadores import Subject
 
 
+class HorarioNoDisponible(Exception):
+    """El profesional ya tiene una consulta no cancelada que se solapa con el horario"""
+
+    def __init__(
+        self,
+        profesional_id: UUID,
+        fecha: date,
+        hora_inicio: time,
+        hora_fin: time,
+        mensaje: str = None,
+    ):
+        super().__init__(
+            mensaje
+            or f"El profesional no está disponible el {fecha} de {hora_inicio:%H:%M} "
+            f"a {hora_fin:%H:%M}"
+        )
+        self.profesional_id = profesional_id
+        self.fecha = fecha
+        self.hora_inicio = hora_inicio
+        self.hora_fin = hora_fin
+
+
+class AgendaOcupada(HorarioNoDisponible):
+    """Otra reserva del mismo profesional y día no liberó la agenda a tiempo"""
+
+    def __init__(
+        self, profesional_id: UUID, fecha: date, hora_inicio: time, hora_fin: time
+    ):
+        super().__init__(
+            profesional_id,
+            fecha,
+            hora_inicio,
+            hora_fin,
+            mensaje=f"Hay otra reserva en curso para el profesional el {fecha}; "
+            "intentar nuevamente",
+        )
+
+
+def _desde_medianoche(hora: time) -> timedelta:
+    return timedelta(hours=hora.hour, minutes=hora.minute, seconds=hora.second)
+
+
+def _minuto_del_dia(hora: time) -> int:
+    return hora.hour * 60 + hora.minute
+
+
+def _minuto(fecha: date, hora: time) -> int:
+    """Minutos desde el origen del calendario: ordena fechas y horas juntas"""
+    return fecha.toordinal() * 24 * 60 + _minuto_del_dia(hora)
+
+
+@dataclass(frozen=True, slots=True)
+class Hueco:
+    """Franja libre de la agenda de un profesional en un día"""
+
+    fecha: date
+    hora_inicio: time
+    hora_fin: time
+
+
 @dataclass
 class Cita(Subject):
     """
@@ -44,9 +105,7 @@ class Cita(Subject):
         if self.hora_inicio >= self.hora_fin:
             raise ValueError("hora_inicio debe ser anterior a hora_fin")
 
-        duracion = datetime.combine(date.today(), self.hora_fin) - datetime.combine(
-            date.today(), self.hora_inicio
-        )
+        duracion = self.duracion
         if duracion < timedelta(minutes=30):
             raise ValueError("La cita debe durar al menos 30 minutos")
 
@@ -56,9 +115,7 @@ class Cita(Subject):
     @property
     def duracion(self) -> timedelta:
         """Duración de la cita"""
-        return datetime.combine(date.today(), self.hora_fin) - datetime.combine(
-            date.today(), self.hora_inicio
-        )
+        return _desde_medianoche(self.hora_fin) - _desde_medianoche(self.hora_inicio)
 
     @property
     def esta_pendiente(self) -> bool:
@@ -202,14 +259,126 @@ class Cita(Subject):
         Returns:
             True si hay conflicto, False en caso contrario
         """
-        for otra in otras_citas:
-            if otra.fecha != self.fecha or otra.esta_cancelada:
-                continue
-
-            if self.hora_inicio < otra.hora_fin and self.hora_fin > otra.hora_inicio:
-                return True
-
-        return False
+        agenda = Agenda.de_citas(self.profesional_id, otras_citas)
+        return not agenda.disponible(self.fecha, self.hora_inicio, self.hora_fin)
 
     def __str__(self) -> str:
         return f"Cita({self.id}) - {self.fecha} {self.hora_inicio}-{self.hora_fin} [{self.estado.value}]"
+
+
+class Agenda:
+    """
+    Consultas no canceladas de un profesional como intervalos [inicio, fin)
+    en minutos absolutos, en listas paralelas ordenadas por inicio.
+
+    Un intervalo [s, e) se solapa con [a, b) si s < b y e > a. Como ningún
+    intervalo dura más que el más largo guardado, los que pueden cumplir
+    e > a empiezan después de a - mas_larga: la consulta es una búsqueda
+    binaria más el recorrido de esa ventana (O(log n + k), con k acotado por
+    lo que entra en una consulta). Agregar y quitar buscan la posición en
+    O(log n) pero insertan o borran en las listas en O(n) (corrimiento): con
+    las consultas de uno o pocos días por agenda, n es chico.
+
+    No exige que las consultas ya cargadas no se solapen entre sí (datos
+    previos a la restricción de la base): sólo lo controla `agregar`.
+    """
+
+    def __init__(
+        self,
+        profesional_id: UUID,
+        consultas: Iterable[Tuple[UUID, date, time, time]] = (),
+    ):
+        self.profesional_id = profesional_id
+        ordenadas = sorted(
+            (_minuto(fecha, desde), _minuto(fecha, hasta), cita_id)
+            for cita_id, fecha, desde, hasta in consultas
+        )
+        self._inicios: List[int] = [inicio for inicio, _, _ in ordenadas]
+        self._fines: List[int] = [fin for _, fin, _ in ordenadas]
+        self._ids: List[UUID] = [cita_id for _, _, cita_id in ordenadas]
+        self._por_id: Dict[UUID, int] = {
+            cita_id: inicio for inicio, _, cita_id in ordenadas
+        }
+        self._mas_larga = max((fin - inicio for inicio, fin, _ in ordenadas), default=0)
+
+    @classmethod
+    def de_citas(cls, profesional_id: UUID, citas: Iterable[Cita]) -> "Agenda":
+        """Agenda con las citas no canceladas de `citas`"""
+        return cls(
+            profesional_id,
+            (
+                (c.id, c.fecha, c.hora_inicio, c.hora_fin)
+                for c in citas
+                if not c.esta_cancelada
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, cita_id: UUID) -> bool:
+        return cita_id in self._por_id
+
+    def _solapa(self, inicio: int, fin: int, excluir_id: UUID = None) -> bool:
+        desde = bisect_right(self._inicios, inicio - self._mas_larga)
+        hasta = bisect_left(self._inicios, fin)
+        return any(
+            self._fines[i] > inicio and self._ids[i] != excluir_id
+            for i in range(desde, hasta)
+        )
+
+    def disponible(
+        self, fecha: date, hora_inicio: time, hora_fin: time, excluir_id: UUID = None
+    ) -> bool:
+        """True si ninguna consulta (salvo `excluir_id`) se solapa con el horario"""
+        return not self._solapa(
+            _minuto(fecha, hora_inicio), _minuto(fecha, hora_fin), excluir_id
+        )
+
+    def conflictos(self, candidatos: Iterable[Tuple[date, time, time]]) -> List[bool]:
+        """
+        Para cada (fecha, hora_inicio, hora_fin) de `candidatos`, si choca con
+        alguna consulta: O(m log n) para m candidatos.
+        """
+        return [
+            self._solapa(_minuto(fecha, desde), _minuto(fecha, hasta))
+            for fecha, desde, hasta in candidatos
+        ]
+
+    def quitar(self, cita_id: UUID) -> bool:
+        """Libera el horario de la cita; False si no estaba en la agenda"""
+        inicio = self._por_id.pop(cita_id, None)
+        if inicio is None:
+            return False
+        posicion = bisect_left(self._inicios, inicio)
+        while self._ids[posicion] != cita_id:
+            posicion += 1
+        del self._inicios[posicion], self._fines[posicion], self._ids[posicion]
+        return True
+
+    def agregar(self, cita: Cita) -> None:
+        """
+        Ocupa el horario de la cita (si ya estaba, lo mueve: reprogramación;
+        si está cancelada, lo libera).
+
+        Raises:
+            HorarioNoDisponible: Si se solapa con otra consulta de la agenda
+        """
+        if cita.esta_cancelada:
+            self.quitar(cita.id)
+            return
+        inicio = _minuto(cita.fecha, cita.hora_inicio)
+        fin = _minuto(cita.fecha, cita.hora_fin)
+        if self._solapa(inicio, fin, excluir_id=cita.id):
+            raise HorarioNoDisponible(
+                self.profesional_id, cita.fecha, cita.hora_inicio, cita.hora_fin
+            )
+
+        self.quitar(cita.id)
+        # Posición en O(log n); insert corre el resto de las listas, O(n)
+        posicion = bisect_right(self._inicios, inicio)
+        self._inicios.insert(posicion, inicio)
+        self._fines.insert(posicion, fin)
+        self._ids.insert(posicion, cita.id)
+        self._por_id[cita.id] = inicio
+        self._mas_larga = max(self._mas_larga, fin - inicio)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Optional, List, Tuple, Union
+from uuid import UUID
 from decimal import Decimal
-from datetime import date
+from datetime import date, time
 
 
 @dataclass
@@ -53,3 +54,80 @@ class FiltroBusqueda:
     provincia: Optional[str] = None
     texto: Optional[str] = None
     ordenar_por_distancia: bool = False
+    # Ranking por puntaje (valoraciones + verificación, y cercanía si hay punto)
+    ordenar_por_puntaje: bool = False
+    latitud: Optional[float] = None
+    longitud: Optional[float] = None
+    radio_km: Optional[float] = None
+    limite: Optional[int] = None
+    # Clave de orden del último resultado de la página anterior:
+    # (apellido, id) o, en la búsqueda por cercanía, (distancia_km, id)
+    despues_de: Optional[Tuple] = None
+    # Disponibilidad: día (DiaSemana, 1 = lunes) y franja que debe cubrir
+    dia_semana: Optional[int] = None
+    hora_desde: Optional[time] = None
+    hora_hasta: Optional[time] = None
+    # Fecha concreta: libres en ella (franjas menos consultas) con un hueco de
+    # `duracion_minutos` dentro de hora_desde/hora_hasta
+    fecha: Optional[date] = None
+    duracion_minutos: Optional[int] = None
+
+    @property
+    def tiene_punto(self) -> bool:
+        return self.latitud is not None and self.longitud is not None
+
+
+FACETA_ESPECIALIDAD = "especialidad"
+FACETA_PROVINCIA = "provincia"
+FACETA_DEPARTAMENTO = "departamento"
+FACETAS = (FACETA_ESPECIALIDAD, FACETA_PROVINCIA, FACETA_DEPARTAMENTO)
+
+
+@dataclass(frozen=True)
+class ConteoFaceta:
+    """
+    Cantidad de profesionales que cumplen un filtro y tienen un valor de
+    faceta: una especialidad (con su id), una provincia o un departamento
+    (con su provincia, porque los nombres se repiten entre provincias).
+    """
+
+    faceta: str
+    nombre: str
+    cantidad: int
+    id: Optional[int] = None
+    provincia: Optional[str] = None
+
+
+SUGERENCIA_PROVINCIA = "provincia"
+SUGERENCIA_DEPARTAMENTO = "departamento"
+SUGERENCIA_BARRIO = "barrio"
+SUGERENCIA_ESPECIALIDAD = "especialidad"
+TIPOS_SUGERENCIA = (
+    SUGERENCIA_PROVINCIA,
+    SUGERENCIA_DEPARTAMENTO,
+    SUGERENCIA_BARRIO,
+    SUGERENCIA_ESPECIALIDAD,
+)
+
+
+@dataclass(frozen=True)
+class Sugerencia:
+    """
+    Opción de autocompletado: un nodo de la jerarquía de ubicaciones (con
+    sus ancestros, porque los nombres se repiten) o una especialidad.
+    """
+
+    tipo: str
+    id: Union[int, UUID]
+    nombre: str
+    provincia: Optional[str] = None
+    departamento: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class NodoUbicacion:
+    """Provincia, departamento o barrio: `padre_id` es el nivel superior"""
+
+    id: UUID
+    nombre: str
+    padre_id: Optional[UUID] = None
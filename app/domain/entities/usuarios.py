@@ -6,6 +6,7 @@ from typing import List, Optional
 from uuid import UUID
 
 from ..value_objects.objetos_valor import Ubicacion, Disponibilidad, Matricula
+from ..ranking import PUNTAJE_INICIAL
 from .catalogo import Especialidad
 
 
@@ -46,12 +47,18 @@ class Profesional(Usuario):
 
     REGLA DE NEGOCIO: Todo profesional debe tener al menos una matrícula activa.
     Las matrículas se almacenan en la tabla 'matricula' (relación 1:N).
+
+    `cantidad_valoraciones`, `promedio_valoraciones` y `puntaje` vienen del
+    resumen que la base mantiene por profesional (ver app.domain.ranking).
     """
 
     verificado: bool = False
     especialidades: List[Especialidad] = field(default_factory=list)
     disponibilidades: List[Disponibilidad] = field(default_factory=list)
     matriculas: List[Matricula] = field(default_factory=list)
+    cantidad_valoraciones: int = 0
+    promedio_valoraciones: float = 0.0
+    puntaje: float = PUNTAJE_INICIAL
 
     def agregar_disponibilidad(self, d: Disponibilidad) -> None:
         self.disponibilidades.append(d)
@@ -66,6 +73,43 @@ class Profesional(Usuario):
             self.matriculas.append(m)
 
 
+@dataclass(frozen=True, slots=True)
+class ResumenProfesional:
+    """
+    Proyección de lectura de un Profesional para listados: sólo lo que se
+    muestra en una tarjeta de resultado. El repositorio la arma con un SELECT
+    de columnas, sin hidratar el perfil completo (matrículas,
+    disponibilidades, dirección).
+    """
+
+    id: UUID
+    nombre: str
+    apellido: str
+    verificado: bool
+    provincia: Optional[str]
+    barrio: Optional[str]
+    especialidades: tuple[str, ...]
+    cantidad_valoraciones: int
+    promedio_valoraciones: float
+    puntaje: float
+
+    @classmethod
+    def desde_profesional(cls, profesional: Profesional) -> "ResumenProfesional":
+        ubicacion = profesional.ubicacion
+        return cls(
+            id=profesional.id,
+            nombre=profesional.nombre,
+            apellido=profesional.apellido,
+            verificado=profesional.verificado,
+            provincia=(ubicacion.provincia or None) if ubicacion else None,
+            barrio=(ubicacion.barrio or None) if ubicacion else None,
+            especialidades=tuple(e.nombre for e in profesional.especialidades),
+            cantidad_valoraciones=profesional.cantidad_valoraciones,
+            promedio_valoraciones=profesional.promedio_valoraciones,
+            puntaje=profesional.puntaje,
+        )
+
+
 @dataclass
 class Solicitante(Usuario):
     """
@@ -1,9 +1,13 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, Optional, TYPE_CHECKING
 from uuid import UUID
 from datetime import datetime
 
+if TYPE_CHECKING:
+    from .entities.catalogo import Sugerencia
+    from .entities.usuarios import Profesional
+
 
 @dataclass
 class Event:
@@ -85,3 +89,56 @@ class CitaCompletada(Event):
         super().__init__(
             tipo="cita.completada", cita_id=cita_id, datos={"notas": notas}
         )
+
+
+@dataclass
+class ProfesionalActualizado(Event):
+    """
+    Cambió el perfil de un profesional (alta, edición, baja lógica o verificación).
+    `anterior` es el perfil previo al cambio, si existía.
+    """
+
+    def __init__(
+        self, profesional: "Profesional", anterior: Optional["Profesional"] = None
+    ):
+        super().__init__(
+            tipo="profesional.actualizado",
+            cita_id=None,
+            datos={"profesional_id": str(profesional.id)},
+        )
+        self.profesional = profesional
+        self.anterior = anterior
+
+
+@dataclass
+class ProfesionalEliminado(Event):
+    """Se eliminó físicamente un profesional"""
+
+    def __init__(self, profesional_id: UUID, anterior: Optional["Profesional"] = None):
+        super().__init__(
+            tipo="profesional.eliminado",
+            cita_id=None,
+            datos={"profesional_id": str(profesional_id)},
+        )
+        self.profesional_id = profesional_id
+        self.anterior = anterior
+
+
+@dataclass
+class CatalogoAmpliado(Event):
+    """
+    Se creó una provincia, departamento, barrio o especialidad nueva;
+    `sugerencia` la describe para el autocompletado.
+    """
+
+    def __init__(self, sugerencia: "Sugerencia"):
+        super().__init__(
+            tipo="catalogo.ampliado",
+            cita_id=None,
+            datos={
+                "tipo": sugerencia.tipo,
+                "id": str(sugerencia.id),
+                "nombre": sugerencia.nombre,
+            },
+        )
+        self.sugerencia = sugerencia
@@ -0,0 +1,70 @@
+from __future__ import annotations
+from math import asin, cos, radians, sin, sqrt
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from app.domain.entities.usuarios import Profesional
+
+"""
+Utilidades geográficas para la búsqueda por cercanía.
+
+Las distancias son sobre la esfera (haversine). La caja envolvente sirve
+como prefiltro barato (rango de latitud/longitud) antes de calcular la
+distancia exacta; no contempla el antimeridiano, que no es un caso real
+para direcciones en Argentina.
+"""
+
+RADIO_TIERRA_KM = 6371.0088
+KM_POR_GRADO_LATITUD = 111.195
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distancia en km entre dos puntos (grados decimales)"""
+    phi1, phi2 = radians(lat1), radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = radians(lon2 - lon1)
+    a = sin(dphi / 2) ** 2 + cos(phi1) * cos(phi2) * sin(dlambda / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * asin(min(1.0, sqrt(a)))
+
+
+def caja_envolvente(
+    latitud: float, longitud: float, radio_km: float
+) -> Tuple[float, float, float, float]:
+    """
+    Rectángulo (lat_min, lat_max, lon_min, lon_max) que contiene el círculo
+    de `radio_km` alrededor del punto.
+    """
+    delta_lat = radio_km / KM_POR_GRADO_LATITUD
+    lat_min = max(-90.0, latitud - delta_lat)
+    lat_max = min(90.0, latitud + delta_lat)
+
+    # El grado de longitud se achica hacia los polos: se usa la latitud
+    # más alejada del ecuador dentro de la caja para no quedarse corto.
+    lat_extrema = min(89.9, max(abs(lat_min), abs(lat_max)))
+    delta_lon = radio_km / (KM_POR_GRADO_LATITUD * cos(radians(lat_extrema)))
+    lon_min = max(-180.0, longitud - delta_lon)
+    lon_max = min(180.0, longitud + delta_lon)
+
+    return lat_min, lat_max, lon_min, lon_max
+
+
+def distancia_a(
+    profesional: "Profesional", latitud: float, longitud: float
+) -> Optional[float]:
+    """Distancia en km del profesional al punto, o None si no está geolocalizado"""
+    ubicacion = profesional.ubicacion
+    if ubicacion is None or ubicacion.latitud is None or ubicacion.longitud is None:
+        return None
+    return haversine_km(latitud, longitud, ubicacion.latitud, ubicacion.longitud)
+
+
+def ordenar_por_distancia(
+    profesionales: Iterable["Profesional"], latitud: float, longitud: float
+) -> List["Profesional"]:
+    """Ordena del más cercano al más lejano; los no geolocalizados van al final"""
+
+    def clave(profesional: "Profesional") -> Tuple[bool, float]:
+        distancia = distancia_a(profesional, latitud, longitud)
+        return (distancia is None, distancia or 0.0)
+
+    return sorted(profesionales, key=clave)
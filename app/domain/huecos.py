@@ -0,0 +1,202 @@
+from __future__ import annotations
+from collections import defaultdict
+from datetime import date, time, timedelta
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from app.domain.entities.agenda import Hueco
+from app.domain.enumeraciones import DiaSemana
+from app.domain.value_objects.objetos_valor import Disponibilidad
+
+"""
+Cálculo de huecos libres en la agenda de un profesional.
+
+Las franjas se manejan como intervalos semiabiertos [inicio, fin) de
+minutos desde la medianoche. Para cada día del rango, los huecos son las
+franjas semanales de ese día (Disponibilidad) menos las consultas no
+canceladas de esa fecha: una resta por barrido sobre listas ordenadas, lineal
+en la cantidad de intervalos. Todo el rango sale de dos listas ya leídas
+(disponibilidades y consultas ordenadas), sin consultar nada por día.
+
+Para muchos profesionales en una fecha ("quién está libre el día D entre
+T1 y T2") el día se discretiza en ranuras de MINUTOS_POR_RANURA: cada
+profesional es un entero de 96 bits (franjas | ... & ventana & ~consultas)
+y tener un hueco de N ranuras es tener N bits seguidos en 1, que se prueba
+con log2(N) AND/shift sobre el entero. Es conservador: una franja que no
+empieza o termina en una ranura se recorta a las ranuras completas, y una
+consulta ocupa todas las ranuras que toca.
+"""
+
+Intervalo = Tuple[int, int]
+
+MINUTOS_POR_RANURA = 15
+MINUTOS_POR_DIA = 24 * 60
+
+
+def minutos(hora: time) -> int:
+    return hora.hour * 60 + hora.minute
+
+
+def a_hora(minuto: int) -> time:
+    return time(minuto // 60, minuto % 60)
+
+
+def unir(intervalos: Iterable[Intervalo]) -> List[Intervalo]:
+    """Ordena y une los intervalos que se solapan o se tocan"""
+    unidos: List[Intervalo] = []
+    for inicio, fin in sorted(intervalos):
+        if unidos and inicio <= unidos[-1][1]:
+            if fin > unidos[-1][1]:
+                unidos[-1] = (unidos[-1][0], fin)
+        else:
+            unidos.append((inicio, fin))
+    return unidos
+
+
+def restar(libres: List[Intervalo], ocupados: List[Intervalo]) -> List[Intervalo]:
+    """
+    `libres` menos `ocupados`, ambos ordenados y sin solapamientos internos
+    (ver `unir`). Un solo barrido: O(len(libres) + len(ocupados)).
+    """
+    resultado: List[Intervalo] = []
+    j = 0
+    for inicio, fin in libres:
+        while j < len(ocupados) and ocupados[j][1] <= inicio:
+            j += 1
+
+        cursor = inicio
+        k = j
+        while k < len(ocupados) and ocupados[k][0] < fin:
+            ocupado_inicio, ocupado_fin = ocupados[k]
+            if ocupado_inicio > cursor:
+                resultado.append((cursor, ocupado_inicio))
+            cursor = max(cursor, ocupado_fin)
+            k += 1
+        # Un ocupado que sigue más allá de `fin` puede tapar la franja siguiente:
+        # `j` no lo saltea
+        if cursor < fin:
+            resultado.append((cursor, fin))
+    return resultado
+
+
+def franjas_semanales(
+    disponibilidades: Iterable[Disponibilidad],
+) -> Dict[DiaSemana, List[Intervalo]]:
+    """Franjas de atención por día de la semana, unidas y ordenadas"""
+    por_dia: Dict[DiaSemana, List[Intervalo]] = defaultdict(list)
+    for disponibilidad in disponibilidades:
+        franja = (minutos(disponibilidad.hora_inicio), minutos(disponibilidad.hora_fin))
+        for dia in disponibilidad.dias_semana:
+            por_dia[DiaSemana(dia)].append(franja)
+    return {dia: unir(franjas) for dia, franjas in por_dia.items()}
+
+
+def calcular_huecos(
+    disponibilidades: Iterable[Disponibilidad],
+    ocupadas: Iterable[Tuple[date, time, time]],
+    desde: date,
+    hasta: date,
+    duracion_minutos: int,
+) -> List[Hueco]:
+    """
+    Huecos de al menos `duracion_minutos` entre `desde` y `hasta` (inclusive).
+
+    Args:
+        disponibilidades: Franjas semanales del profesional
+        ocupadas: (fecha, hora_inicio, hora_fin) de sus consultas no canceladas
+        desde: Primer día del rango
+        hasta: Último día del rango
+        duracion_minutos: Duración mínima de un hueco
+
+    Returns:
+        Huecos ordenados por fecha y hora
+    """
+    semana = franjas_semanales(disponibilidades)
+
+    ocupadas_por_fecha: Dict[date, List[Intervalo]] = defaultdict(list)
+    for fecha, hora_inicio, hora_fin in ocupadas:
+        if desde <= fecha <= hasta:
+            ocupadas_por_fecha[fecha].append((minutos(hora_inicio), minutos(hora_fin)))
+
+    huecos: List[Hueco] = []
+    fecha = desde
+    while fecha <= hasta:
+        franjas = semana.get(DiaSemana(fecha.isoweekday()))
+        if franjas:
+            libres = restar(franjas, unir(ocupadas_por_fecha.get(fecha, ())))
+            huecos.extend(
+                Hueco(fecha, a_hora(inicio), a_hora(fin))
+                for inicio, fin in libres
+                if fin - inicio >= duracion_minutos
+            )
+        fecha += timedelta(days=1)
+    return huecos
+
+
+def mascara_ranuras(inicio: int, fin: int, completas: bool = True) -> int:
+    """
+    Bits de las ranuras del día dentro de [inicio, fin) (en minutos): sólo
+    las que entran completas o, con `completas=False`, todas las que toca.
+    """
+    if completas:
+        desde, hasta = -(-inicio // MINUTOS_POR_RANURA), fin // MINUTOS_POR_RANURA
+    else:
+        desde, hasta = inicio // MINUTOS_POR_RANURA, -(-fin // MINUTOS_POR_RANURA)
+    if hasta <= desde:
+        return 0
+    return ((1 << (hasta - desde)) - 1) << desde
+
+
+def tiene_racha(bits: int, largo: int) -> bool:
+    """True si `bits` tiene al menos `largo` bits seguidos en 1"""
+    # Tras cada paso el bit i sigue en 1 sólo si empieza una racha de
+    # `cubierto` unos; duplicar el salto llega a `largo` en log2(largo) pasos
+    cubierto = 1
+    while cubierto < largo and bits:
+        salto = min(cubierto, largo - cubierto)
+        bits &= bits >> salto
+        cubierto += salto
+    return bits != 0
+
+
+def libres_en_fecha(
+    franjas: Dict[Hashable, Iterable[Tuple[time, time]]],
+    ocupadas: Dict[Hashable, Iterable[Tuple[time, time]]],
+    duracion_minutos: int,
+    hora_desde: Optional[time] = None,
+    hora_hasta: Optional[time] = None,
+) -> Set[Hashable]:
+    """
+    De los profesionales de `franjas`, los que tienen un hueco de al menos
+    `duracion_minutos` dentro de [hora_desde, hora_hasta].
+
+    Args:
+        franjas: Franjas de atención de cada profesional para el día de la
+            semana de la fecha
+        ocupadas: (hora_inicio, hora_fin) de sus consultas no canceladas
+            de la fecha
+        duracion_minutos: Duración del hueco buscado
+        hora_desde: Inicio de la ventana (por defecto, el día entero)
+        hora_hasta: Fin de la ventana
+
+    Returns:
+        Ids de los profesionales libres
+    """
+    ventana = mascara_ranuras(
+        minutos(hora_desde) if hora_desde else 0,
+        minutos(hora_hasta) if hora_hasta else MINUTOS_POR_DIA,
+    )
+    largo = max(1, -(-duracion_minutos // MINUTOS_POR_RANURA))
+
+    libres: Set[Hashable] = set()
+    for profesional_id, suyas in franjas.items():
+        bits = 0
+        for hora_inicio, hora_fin in suyas:
+            bits |= mascara_ranuras(minutos(hora_inicio), minutos(hora_fin))
+        bits &= ventana
+        for hora_inicio, hora_fin in ocupadas.get(profesional_id, ()):
+            bits &= ~mascara_ranuras(
+                minutos(hora_inicio), minutos(hora_fin), completas=False
+            )
+        if tiene_racha(bits, largo):
+            libres.add(profesional_id)
+    return libres
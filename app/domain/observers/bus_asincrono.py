@@ -0,0 +1,431 @@
+from __future__ import annotations
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime
+from logging import getLogger
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from app.domain.eventos import Event
+
+from .observadores import EventBus
+
+"""
+EventBus asincrónico: publicar encola el evento y vuelve enseguida; un pool
+de hilos lo consume y corre los handlers fuera del hilo del request (los
+observadores hacen I/O bloqueante: email, logs).
+
+La cola es acotada (`capacidad`). Si está llena, según `politica`:
+- "bloquear": publicar espera a que se libere lugar (contrapresión sobre
+  quien publica).
+- "descartar_antiguo": se descarta el evento más viejo de la cola para
+  hacer lugar al nuevo.
+- "volcar": el evento se agrega al `archivo_volcado` (JSON, una línea con
+  tipo, cita_id, datos y timestamp por evento) y los workers lo vuelven a
+  encolar cuando hay lugar. Mientras el archivo tenga pendientes los eventos
+  nuevos también van ahí, para no alterar el orden; lo que quede al apagar o
+  de una ejecución anterior se entrega al iniciar, como Event base.
+
+encolar es publicar con acuse: devuelve un Future que se resuelve cuando
+todos los handlers terminaron (con el primer error si alguno falló). Lo usa
+el despachador del outbox, que espera los de su lote antes de marcarlos.
+Una entrega con acuse no se vuelca (el outbox ya la persiste): con la cola
+llena espera lugar, y si se descarta o el bus se detiene sin procesarla su
+Future falla y el despachador la reintenta.
+
+Sin iniciar (o con `workers=0`) publicar y encolar corren los handlers en
+línea, como EventBus.
+
+estadisticas() da la profundidad de la cola, los contadores y la latencia
+de cada handler (sobre las últimas MUESTRAS_LATENCIA ejecuciones).
+"""
+
+logger = getLogger(__name__)
+
+POLITICAS = ("bloquear", "descartar_antiguo", "volcar")
+CAPACIDAD = 1000
+WORKERS = 2
+MUESTRAS_LATENCIA = 500
+# Cada cuánto un worker ocioso revisa el volcado y si debe terminar
+ESPERA_WORKER_S = 0.1
+
+
+class _Latencia:
+    """Latencias de un handler: totales y una ventana de las últimas"""
+
+    def __init__(self):
+        self.llamadas = 0
+        self.errores = 0
+        self.total_s = 0.0
+        self.maxima_s = 0.0
+        self.muestras: Deque[float] = deque(maxlen=MUESTRAS_LATENCIA)
+
+    def registrar(self, segundos: float, fallo: bool) -> None:
+        self.llamadas += 1
+        self.errores += fallo
+        self.total_s += segundos
+        self.maxima_s = max(self.maxima_s, segundos)
+        self.muestras.append(segundos)
+
+    def resumen(self) -> dict:
+        ordenadas = sorted(self.muestras)
+
+        def percentil(p: float) -> float:
+            if not ordenadas:
+                return 0.0
+            return ordenadas[min(int(p * len(ordenadas)), len(ordenadas) - 1)]
+
+        return {
+            "llamadas": self.llamadas,
+            "errores": self.errores,
+            "promedio_ms": 1000 * self.total_s / self.llamadas if self.llamadas else 0,
+            "p50_ms": 1000 * percentil(0.50),
+            "p95_ms": 1000 * percentil(0.95),
+            "maxima_ms": 1000 * self.maxima_s,
+        }
+
+
+class _Volcado:
+    """Eventos desbordados de la cola, en orden, en un archivo JSON lines"""
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        self._leido = 0
+        self.pendientes = 0
+        if os.path.exists(ruta):
+            with open(ruta, "rb") as f:
+                while self._cargar(f) is not None:
+                    self.pendientes += 1
+
+    @staticmethod
+    def _cargar(f):
+        linea = f.readline()
+        if not linea:
+            return None
+        registro = json.loads(linea)
+        return (
+            Event(
+                tipo=registro["tipo"],
+                cita_id=UUID(registro["cita_id"]) if registro["cita_id"] else None,
+                datos=registro["datos"],
+                timestamp=datetime.fromisoformat(registro["timestamp"]),
+            ),
+        )
+
+    @staticmethod
+    def _guardar(f, evt) -> None:
+        registro = {
+            "tipo": evt.tipo,
+            "cita_id": str(evt.cita_id) if evt.cita_id else None,
+            "datos": evt.datos,
+            "timestamp": evt.timestamp.isoformat(),
+        }
+        f.write(json.dumps(registro, default=str).encode() + b"\n")
+
+    def agregar(self, evt) -> None:
+        with self._lock:
+            with open(self.ruta, "ab") as f:
+                self._guardar(f, evt)
+            self.pendientes += 1
+
+    def tomar(self, limite: int) -> list:
+        """Hasta `limite` eventos, los más viejos primero"""
+        with self._lock:
+            if not self.pendientes or limite <= 0:
+                return []
+            eventos = []
+            with open(self.ruta, "rb") as f:
+                f.seek(self._leido)
+                while len(eventos) < limite:
+                    registro = self._cargar(f)
+                    if registro is None:
+                        break
+                    eventos.append(registro[0])
+                self._leido = f.tell()
+            self.pendientes -= len(eventos)
+            if not self.pendientes:
+                open(self.ruta, "wb").close()
+                self._leido = 0
+            return eventos
+
+    def anteponer(self, eventos: list) -> None:
+        """Agrega `eventos` delante de los pendientes (son más viejos)"""
+        with self._lock:
+            restantes = []
+            if self.pendientes:
+                with open(self.ruta, "rb") as f:
+                    f.seek(self._leido)
+                    while (registro := self._cargar(f)) is not None:
+                        restantes.append(registro[0])
+            with open(self.ruta, "wb") as f:
+                for evt in eventos + restantes:
+                    self._guardar(f, evt)
+            self._leido = 0
+            self.pendientes = len(eventos) + len(restantes)
+
+
+# Elemento de la cola: el evento y, si se encoló con acuse, su Future
+_Entrega = Tuple[object, Optional[Future]]
+
+
+class EventBusAsincrono(EventBus):
+    """EventBus con cola acotada y pool de workers (ver docstring del módulo)"""
+
+    def __init__(
+        self,
+        capacidad: int = CAPACIDAD,
+        workers: int = WORKERS,
+        politica: str = "bloquear",
+        archivo_volcado: Optional[str] = None,
+    ):
+        super().__init__()
+        if politica not in POLITICAS:
+            raise ValueError(f"Política desconocida: {politica}")
+        if politica == "volcar" and not archivo_volcado:
+            raise ValueError("La política 'volcar' requiere archivo_volcado")
+
+        self.capacidad = capacidad
+        self.workers = workers
+        self.politica = politica
+        self._cola: queue.Queue = queue.Queue(maxsize=capacidad)
+        self._volcado = _Volcado(archivo_volcado) if politica == "volcar" else None
+        self._hilos: List[threading.Thread] = []
+        self._drenando = threading.Event()
+        # Vencido el drenaje: los workers ocupados terminan tras su handler
+        self._cortado = threading.Event()
+        self._activo = False
+
+        self._lock = threading.Lock()
+        self._latencias: Dict[str, _Latencia] = {}
+        self.publicados = 0
+        self.procesados = 0
+        self.descartados = 0
+        self.volcados = 0
+        self.profundidad_maxima = 0
+
+    @property
+    def activo(self) -> bool:
+        return self._activo
+
+    def iniciar(self) -> None:
+        """Lanza los workers; desde acá publicar encola"""
+        if self._activo or self.workers <= 0:
+            return
+        self._drenando.clear()
+        self._cortado.clear()
+        self._hilos = [
+            threading.Thread(target=self._trabajar, name=f"event-bus-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        self._activo = True
+        for hilo in self._hilos:
+            hilo.start()
+
+    def detener(self, timeout_s: Optional[float] = None) -> int:
+        """
+        Deja de encolar (publicar vuelve a ser en línea), espera a que los
+        workers vacíen la cola y el volcado, y los termina.
+
+        Returns:
+            Eventos que quedaron sin procesar al vencer `timeout_s` (con la
+            política "volcar" quedan en el archivo para el próximo inicio)
+        """
+        if not self._activo:
+            return 0
+        self._activo = False
+        self._drenando.set()
+
+        limite = None if timeout_s is None else time.monotonic() + timeout_s
+        for hilo in self._hilos:
+            restante = None if limite is None else max(limite - time.monotonic(), 0)
+            hilo.join(restante)
+        vivos = [hilo for hilo in self._hilos if hilo.is_alive()]
+        self._hilos = vivos
+        if vivos:
+            self._cortado.set()
+
+        sin_procesar = self._vaciar_cola()
+        if not vivos:
+            # Lo que un publicar concurrente encoló después de la salida
+            for entrega in sin_procesar:
+                self._procesar(entrega)
+            return 0
+
+        # Las entregas con acuse las reintenta quien las encoló
+        for _, futuro in sin_procesar:
+            if futuro is not None:
+                futuro.set_exception(RuntimeError("EventBus detenido"))
+        sin_procesar = [evt for evt, futuro in sin_procesar if futuro is None]
+        pendientes = len(sin_procesar)
+        if self._volcado is not None:
+            self._volcado.anteponer(sin_procesar)
+            pendientes = self._volcado.pendientes
+        logger.error(
+            f"EventBus detenido con {len(vivos)} workers ocupados y "
+            f"{pendientes} eventos sin procesar"
+        )
+        return pendientes
+
+    def publicar(self, evt) -> None:
+        """Encola el evento (o lo procesa en línea si el bus no está activo)"""
+        if not self._activo:
+            self._despachar(evt)
+            return
+
+        self._poner_en_cola(evt, None)
+
+    def encolar(self, evt) -> Future:
+        """
+        Encola el evento con acuse (o lo procesa en línea si el bus no está
+        activo).
+
+        Returns:
+            Future que se resuelve cuando corrieron todos los handlers; si
+            alguno falló, con el primer error (como entregar)
+        """
+        if not self._activo:
+            return super().encolar(evt)
+        futuro: Future = Future()
+        self._poner_en_cola(evt, futuro)
+        return futuro
+
+    def _poner_en_cola(self, evt, futuro: Optional[Future]) -> None:
+        with self._lock:
+            self.publicados += 1
+
+        if self.politica == "bloquear" or (
+            self.politica == "volcar" and futuro is not None
+        ):
+            self._cola.put((evt, futuro))
+        elif self.politica == "descartar_antiguo":
+            self._encolar_descartando((evt, futuro))
+        elif self._volcado.pendientes or not self._poner((evt, None)):
+            self._volcado.agregar(evt)
+            with self._lock:
+                self.volcados += 1
+
+        with self._lock:
+            self.profundidad_maxima = max(self.profundidad_maxima, self._cola.qsize())
+
+    def _poner(self, entrega: _Entrega) -> bool:
+        try:
+            self._cola.put_nowait(entrega)
+            return True
+        except queue.Full:
+            return False
+
+    def _encolar_descartando(self, entrega: _Entrega) -> None:
+        while not self._poner(entrega):
+            try:
+                descartado, futuro = self._cola.get_nowait()
+            except queue.Empty:
+                continue
+            self._cola.task_done()
+            with self._lock:
+                self.descartados += 1
+            tipo = getattr(descartado, "tipo", "?")
+            logger.warning(f"Cola de eventos llena: se descarta {tipo}")
+            if futuro is not None:
+                futuro.set_exception(
+                    RuntimeError(f"Cola de eventos llena: se descartó {tipo}")
+                )
+
+    def _recargar(self) -> bool:
+        """Pasa eventos del volcado a la cola mientras haya lugar"""
+        if self._volcado is None or not self._volcado.pendientes:
+            return False
+        if self._cortado.is_set():
+            return False
+        lugar = self.capacidad - self._cola.qsize()
+        eventos = self._volcado.tomar(lugar)
+        for i, evt in enumerate(eventos):
+            if not self._poner((evt, None)):
+                # Otro hilo ocupó el lugar: lo que no entró se procesa acá
+                for resto in eventos[i:]:
+                    self._procesar((resto, None))
+                break
+        return bool(eventos)
+
+    def _vaciar_cola(self) -> list:
+        eventos = []
+        while True:
+            try:
+                eventos.append(self._cola.get_nowait())
+            except queue.Empty:
+                return eventos
+            self._cola.task_done()
+
+    def _procesar(self, entrega: _Entrega) -> None:
+        evt, futuro = entrega
+        try:
+            errores = self._despachar(evt)
+        except Exception as e:
+            errores = [e]
+        with self._lock:
+            self.procesados += 1
+        if futuro is None:
+            return
+        if errores:
+            futuro.set_exception(errores[0])
+        else:
+            futuro.set_result(None)
+
+    def _trabajar(self) -> None:
+        while not self._cortado.is_set():
+            try:
+                entrega = self._cola.get(timeout=ESPERA_WORKER_S)
+            except queue.Empty:
+                if self._recargar():
+                    continue
+                if self._drenando.is_set():
+                    return
+                continue
+            try:
+                self._procesar(entrega)
+            except Exception:
+                logger.exception("Error en worker del EventBus")
+            finally:
+                self._cola.task_done()
+            self._recargar()
+
+    def _ejecutar(self, handler: Callable, evt) -> None:
+        inicio = time.perf_counter()
+        fallo = True
+        try:
+            handler(evt)
+            fallo = False
+        finally:
+            nombre = f"{getattr(evt, 'tipo', 'desconocido')}:" + getattr(
+                handler, "__qualname__", repr(handler)
+            )
+            with self._lock:
+                latencia = self._latencias.setdefault(nombre, _Latencia())
+                latencia.registrar(time.perf_counter() - inicio, fallo)
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            return {
+                "activo": self._activo,
+                "politica": self.politica,
+                "workers": len(self._hilos) if self._activo else 0,
+                "capacidad": self.capacidad,
+                "profundidad": self._cola.qsize(),
+                "profundidad_maxima": self.profundidad_maxima,
+                "volcados_pendientes": (
+                    self._volcado.pendientes if self._volcado is not None else 0
+                ),
+                "publicados": self.publicados,
+                "procesados": self.procesados,
+                "descartados": self.descartados,
+                "volcados": self.volcados,
+                "handlers": {
+                    nombre: latencia.resumen()
+                    for nombre, latencia in sorted(self._latencias.items())
+                },
+            }
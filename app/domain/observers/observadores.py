@@ -1,5 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
 from typing import List, Callable, Dict
 from logging import getLogger
 
@@ -174,21 +175,49 @@ class EventBus:
             self._suscriptores[tipo_evento] = []
         self._suscriptores[tipo_evento].append(handler)
 
-    def publicar(self, evt) -> None:
-        """Publicar evento a todos los suscriptores"""
+    def _despachar(self, evt) -> List[Exception]:
         tipo_evento = getattr(evt, "tipo", "desconocido")
+        errores: List[Exception] = []
 
-        if tipo_evento in self._suscriptores:
-            for handler in self._suscriptores[tipo_evento]:
-                try:
-                    handler(evt)
-                except Exception as e:
-                    logger.error(f"Error procesando evento {tipo_evento}: {str(e)}")
+        for handler in self._suscriptores.get(tipo_evento, []):
+            try:
+                self._ejecutar(handler, evt)
+            except Exception as e:
+                logger.error(f"Error procesando evento {tipo_evento}: {str(e)}")
+                errores.append(e)
+        return errores
+
+    def _ejecutar(self, handler: Callable, evt) -> None:
+        handler(evt)
+
+    def publicar(self, evt) -> None:
+        """Publicar evento a todos los suscriptores"""
+        self._despachar(evt)
+
+    def entregar(self, evt) -> None:
+        """
+        Como publicar, pero si algún suscriptor falla (después de correr
+        todos) lanza el primer error: para quien reintenta la entrega.
+        """
+        errores = self._despachar(evt)
+        if errores:
+            raise errores[0]
+
+    def encolar(self, evt) -> Future:
+        """
+        Como entregar, pero el resultado queda en un Future (acá ya resuelto:
+        EventBus entrega en línea; EventBusAsincrono lo resuelve un worker).
+        """
+        futuro: Future = Future()
+        try:
+            self.entregar(evt)
+        except Exception as e:
+            futuro.set_exception(e)
+        else:
+            futuro.set_result(None)
+        return futuro
 
     def suscribir_observer(self, tipo_evento: str, observer: Observer) -> None:
         """Suscribir Observer tradicional a un tipo de evento"""
 
-        def handler(evt):
-            observer.update(evt)
-
-        self.suscribir(tipo_evento, handler)
+        self.suscribir(tipo_evento, observer.update)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from app.domain.geo import distancia_a
+
+if TYPE_CHECKING:
+    from app.domain.entities.usuarios import Profesional
+
+"""
+Puntaje de ranking de profesionales para ordenar resultados de búsqueda.
+
+El puntaje base combina el promedio bayesiano de valoraciones (las
+puntuaciones 1-5 se "encogen" hacia PROMEDIO_PREVIO como si cada profesional
+ya tuviera PESO_PREVIO valoraciones de ese valor, así dos 5 no superan a
+cuarenta 4,8) y un bono por estar verificado. Queda en [0, 1].
+
+Sólo depende de (cantidad, suma, verificado), que se guardan por profesional
+y se actualizan con cada valoración: el puntaje se persiste en la columna
+`profesional.puntaje` (indexada) y ordenar por él es una única query.
+
+La cercanía depende del punto de cada búsqueda, así que no se precalcula:
+`puntaje_compuesto` la pondera al ordenar los resultados ya traídos.
+"""
+
+PROMEDIO_PREVIO = 3.5
+PESO_PREVIO = 5
+
+PESO_VALORACION = 0.8
+PESO_VERIFICADO = 0.2
+
+PESO_CERCANIA = 0.3
+# A esta distancia la cercanía vale la mitad que estando en el mismo punto
+ESCALA_CERCANIA_KM = 5.0
+
+
+def promedio_bayesiano(cantidad: int, suma: int) -> float:
+    return (PESO_PREVIO * PROMEDIO_PREVIO + suma) / (PESO_PREVIO + cantidad)
+
+
+def puntaje_base(cantidad: int, suma: int, verificado: bool) -> float:
+    """Puntaje persistido: valoraciones (bayesiano, normalizado) + verificación"""
+    calidad = (promedio_bayesiano(cantidad, suma) - 1) / 4
+    return PESO_VALORACION * calidad + (PESO_VERIFICADO if verificado else 0.0)
+
+
+# Profesional sin valoraciones ni verificación (default de la columna)
+PUNTAJE_INICIAL = puntaje_base(0, 0, False)
+
+
+def puntaje_compuesto(
+    profesional: "Profesional",
+    latitud: Optional[float] = None,
+    longitud: Optional[float] = None,
+) -> float:
+    """Puntaje base ponderado con la cercanía al punto, si se indica uno"""
+    if latitud is None or longitud is None:
+        return profesional.puntaje
+    distancia = distancia_a(profesional, latitud, longitud)
+    cercania = 0.0 if distancia is None else 1 / (1 + distancia / ESCALA_CERCANIA_KM)
+    return (1 - PESO_CERCANIA) * profesional.puntaje + PESO_CERCANIA * cercania
+
+
+def ordenar_por_puntaje(
+    profesionales: Iterable["Profesional"],
+    latitud: Optional[float] = None,
+    longitud: Optional[float] = None,
+) -> List["Profesional"]:
+    """Del mayor puntaje (compuesto) al menor; a igual puntaje, por id"""
+
+    def clave(profesional: "Profesional") -> Tuple[float, UUID]:
+        return -puntaje_compuesto(profesional, latitud, longitud), profesional.id
+
+    return sorted(profesionales, key=clave)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+import heapq
+from bisect import insort
+from itertools import islice
+from threading import RLock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.domain.entities.catalogo import Sugerencia
+from app.domain.observers.observadores import Observer
+from app.domain.texto import normalizar_texto
+
+"""
+Autocompletado de ubicaciones y especialidades con un trie en memoria.
+
+Cada nombre se inserta normalizado (sin acentos, minúsculas) una vez por
+cada palabra con la que empieza un sufijo suyo: "Villa Crespo" queda bajo
+"villa crespo" y bajo "crespo", así "cres" también lo encuentra.
+
+Cada nodo guarda, por tipo de sugerencia, las LIMITE_MAXIMO mejores del
+subárbol ya ordenadas (nombre más corto primero, después alfabético):
+sugerir es bajar por el prefijo y leer esa lista, sin recorrer el subárbol.
+Con varios tipos se mezclan las listas ya ordenadas.
+
+Se construye una vez desde DireccionRepository y CatalogoRepository y se
+mantiene al día como Observer de los eventos `catalogo.ampliado` que
+publican al crear nodos nuevos. No se quitan entradas: la jerarquía y las
+especialidades no se borran desde la API.
+"""
+
+LIMITE_MAXIMO = 20
+
+_Clave = Tuple[int, str, str, str]
+
+
+def _normalizar(texto: str) -> str:
+    return " ".join(normalizar_texto(texto).split())
+
+
+def _orden(sugerencia: Sugerencia) -> _Clave:
+    nombre = _normalizar(sugerencia.nombre)
+    return len(nombre), nombre, sugerencia.tipo, str(sugerencia.id)
+
+
+class _Nodo:
+    __slots__ = ("hijos", "mejores")
+
+    def __init__(self):
+        self.hijos: Dict[str, _Nodo] = {}
+        self.mejores: Dict[str, List[Tuple[_Clave, Sugerencia]]] = {}
+
+
+class TrieAutocompletado(Observer):
+    """Trie por prefijo sobre nombres de provincias, departamentos, barrios y especialidades"""
+
+    def __init__(self):
+        self._lock = RLock()
+        self._listo = False
+        self._limpiar()
+
+    def _limpiar(self) -> None:
+        self._raiz = _Nodo()
+        self._claves: set = set()
+
+    @property
+    def listo(self) -> bool:
+        """True una vez construido"""
+        return self._listo
+
+    def __len__(self) -> int:
+        return len(self._claves)
+
+    def construir(self, sugerencias: Iterable[Sugerencia]) -> None:
+        """Reconstruye el trie completo"""
+        with self._lock:
+            self._limpiar()
+            for sugerencia in sugerencias:
+                self._agregar(sugerencia)
+            self._listo = True
+
+    def invalidar(self) -> None:
+        """Descarta el contenido; se vuelve a construir en la próxima consulta"""
+        with self._lock:
+            self._limpiar()
+            self._listo = False
+
+    def agregar(self, sugerencia: Sugerencia) -> None:
+        with self._lock:
+            self._agregar(sugerencia)
+
+    def update(self, evt) -> None:
+        """Observer: incorpora los nodos que crean los repositorios"""
+        if not self._listo:
+            return
+
+        if getattr(evt, "tipo", "desconocido") == "catalogo.ampliado":
+            self.agregar(evt.sugerencia)
+
+    def _agregar(self, sugerencia: Sugerencia) -> None:
+        identidad = (sugerencia.tipo, sugerencia.id)
+        if identidad in self._claves:
+            return
+        self._claves.add(identidad)
+
+        entrada = (_orden(sugerencia), sugerencia)
+        palabras = _normalizar(sugerencia.nombre).split(" ")
+        for i in range(len(palabras)):
+            nodo = self._raiz
+            self._anotar(nodo, sugerencia.tipo, entrada)
+            for letra in " ".join(palabras[i:]):
+                nodo = nodo.hijos.setdefault(letra, _Nodo())
+                self._anotar(nodo, sugerencia.tipo, entrada)
+
+    @staticmethod
+    def _anotar(nodo: _Nodo, tipo: str, entrada: Tuple[_Clave, Sugerencia]) -> None:
+        mejores = nodo.mejores.setdefault(tipo, [])
+        # Un nombre con dos palabras de igual prefijo pasa dos veces por el nodo
+        if entrada in mejores:
+            return
+        if len(mejores) == LIMITE_MAXIMO:
+            if entrada[0] >= mejores[-1][0]:
+                return
+            mejores.pop()
+        insort(mejores, entrada, key=lambda e: e[0])
+
+    def sugerir(
+        self,
+        prefijo: str,
+        limite: int = 10,
+        tipos: Optional[Iterable[str]] = None,
+    ) -> List[Sugerencia]:
+        """Hasta `limite` sugerencias cuyo nombre tiene una palabra que empieza con `prefijo`"""
+        prefijo = _normalizar(prefijo)
+        limite = min(limite, LIMITE_MAXIMO)
+        if not prefijo or limite <= 0:
+            return []
+
+        with self._lock:
+            nodo = self._raiz
+            for letra in prefijo:
+                nodo = nodo.hijos.get(letra)
+                if nodo is None:
+                    return []
+            listas = [
+                lista
+                for tipo, lista in nodo.mejores.items()
+                if tipos is None or tipo in tipos
+            ]
+            mezcla = heapq.merge(*listas, key=lambda e: e[0])
+            return [sugerencia for _, sugerencia in islice(mezcla, limite)]
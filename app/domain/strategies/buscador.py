@@ -1,9 +1,13 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
+from typing import Optional
 
 from app.domain.entities.catalogo import FiltroBusqueda
-from app.domain.entities.usuarios import Profesional
+from app.domain.entities.usuarios import Profesional, ResumenProfesional
+from app.domain.geo import ordenar_por_distancia
+from app.domain.ranking import ordenar_por_puntaje
 from app.infra.repositories.profesional_repository import ProfesionalRepository
+from .cache import CacheBusquedas
 from .estrategia import EstrategiaBusqueda
 
 
@@ -12,10 +16,51 @@ class Buscador:
     repo: ProfesionalRepository
     estrategia: EstrategiaBusqueda
     profesionales: list[Profesional] = field(default_factory=list)
+    cache: Optional[CacheBusquedas] = None
 
     def cambiar_estrategia(self, estrategia: EstrategiaBusqueda) -> None:
         self.estrategia = estrategia
 
+    def _usa_cache(self, filtro: FiltroBusqueda) -> bool:
+        # Las búsquedas por texto dependen de publicaciones, cuyos cambios no
+        # publican eventos que invaliden la cache: siempre se resuelven
+        return self.cache is not None and not filtro.texto
+
     def buscar(self, filtro: FiltroBusqueda) -> list[Profesional]:
-        self.profesionales = self.estrategia.buscar(self.repo, filtro)
+        clave = (type(self.estrategia).__name__, filtro)
+        if self._usa_cache(filtro):
+            cacheado = self.cache.obtener(clave)
+            if cacheado is not None:
+                self.profesionales = cacheado
+                return self.profesionales
+
+        profesionales = self.estrategia.buscar(self.repo, filtro)
+        if filtro.ordenar_por_puntaje:
+            # Puntaje precalculado; con un punto se pondera además la cercanía
+            profesionales = ordenar_por_puntaje(
+                profesionales, filtro.latitud, filtro.longitud
+            )
+        elif filtro.ordenar_por_distancia and filtro.tiene_punto:
+            profesionales = ordenar_por_distancia(
+                profesionales, filtro.latitud, filtro.longitud
+            )
+
+        if self._usa_cache(filtro):
+            self.cache.guardar(clave, profesionales)
+        self.profesionales = profesionales
         return self.profesionales
+
+    def buscar_resumen(self, filtro: FiltroBusqueda) -> list[ResumenProfesional]:
+        """
+        Vista resumen del resultado. No pasa por la cache (guarda perfiles
+        completos). Con un punto, el orden por distancia o puntaje compuesto
+        necesita las coordenadas: se busca completo y se resume.
+        """
+        if filtro.tiene_punto:
+            return [
+                ResumenProfesional.desde_profesional(p) for p in self.buscar(filtro)
+            ]
+        return self.estrategia.buscar_resumen(self.repo, filtro)
+
+    def contar(self, filtro: FiltroBusqueda) -> int:
+        return self.estrategia.contar(self.repo, filtro)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import RLock
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from app.domain.entities.catalogo import FiltroBusqueda
+from app.domain.entities.usuarios import Profesional
+from app.domain.observers.observadores import Observer
+from app.domain.texto import normalizar_texto
+
+"""
+Cache de resultados de búsqueda delante de Buscador.buscar.
+
+La clave es (estrategia, FiltroBusqueda): el filtro es un dataclass
+congelado y por lo tanto hasheable. Cada entrada vence a los `ttl_segundos`
+y, con la cache llena, se desaloja la menos usada recientemente (LRU).
+
+Invalidación por etiquetas: cada entrada queda registrada bajo una etiqueta
+de especialidad (id, nombre normalizado o "*" si el filtro no la restringe)
+y una de provincia (nombre normalizado o "*"). Como Observer del
+ProfesionalRepository, ante un cambio de perfil se descartan las entradas
+cuyas dos etiquetas podrían coincidir con el perfil anterior o el nuevo;
+el resto sigue vigente. Los cambios hechos por otros procesos (o por fuera
+del repositorio) sólo los cubre el TTL.
+"""
+
+_TODAS = "*"
+
+Clave = Tuple[str, FiltroBusqueda]
+
+
+@dataclass
+class _Entrada:
+    resultado: List[Profesional]
+    vence: float
+    especialidad: Hashable
+    provincia: str
+
+
+def _etiqueta_especialidad(filtro: FiltroBusqueda) -> Hashable:
+    if filtro.id_especialidad:
+        return filtro.id_especialidad
+    if filtro.nombre_especialidad:
+        return normalizar_texto(filtro.nombre_especialidad)
+    return _TODAS
+
+
+def _etiqueta_provincia(filtro: FiltroBusqueda) -> str:
+    return normalizar_texto(filtro.provincia) if filtro.provincia else _TODAS
+
+
+class CacheBusquedas(Observer):
+    """Resultados de búsqueda con TTL, LRU e invalidación por etiquetas"""
+
+    def __init__(
+        self,
+        capacidad: int = 512,
+        ttl_segundos: float = 60.0,
+        reloj: Callable[[], float] = time.monotonic,
+    ):
+        self.capacidad = capacidad
+        self.ttl_segundos = ttl_segundos
+        self._reloj = reloj
+        self._lock = RLock()
+        self._entradas: "OrderedDict[Clave, _Entrada]" = OrderedDict()
+        self._por_especialidad: Dict[Hashable, Set[Clave]] = {}
+        self._por_provincia: Dict[str, Set[Clave]] = {}
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.vencidas = 0
+        self.invalidaciones = 0
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def obtener(self, clave: Clave) -> Optional[List[Profesional]]:
+        """Resultado cacheado (copia de la lista) o None si no está o venció"""
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return None
+            if entrada.vence <= self._reloj():
+                self._quitar(clave)
+                self.vencidas += 1
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return list(entrada.resultado)
+
+    def guardar(self, clave: Clave, resultado: List[Profesional]) -> None:
+        if self.capacidad <= 0:
+            return
+        _, filtro = clave
+        with self._lock:
+            self._quitar(clave)
+            entrada = _Entrada(
+                resultado=list(resultado),
+                vence=self._reloj() + self.ttl_segundos,
+                especialidad=_etiqueta_especialidad(filtro),
+                provincia=_etiqueta_provincia(filtro),
+            )
+            self._entradas[clave] = entrada
+            self._por_especialidad.setdefault(entrada.especialidad, set()).add(clave)
+            self._por_provincia.setdefault(entrada.provincia, set()).add(clave)
+
+            while len(self._entradas) > self.capacidad:
+                menos_usada = next(iter(self._entradas))
+                self._quitar(menos_usada)
+                self.desalojos += 1
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+            self._por_especialidad.clear()
+            self._por_provincia.clear()
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            return {
+                "entradas": len(self._entradas),
+                "capacidad": self.capacidad,
+                "ttl_segundos": self.ttl_segundos,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+                "vencidas": self.vencidas,
+                "invalidaciones": self.invalidaciones,
+            }
+
+    def update(self, evt) -> None:
+        """Observer: invalida lo que pudo cambiar con el perfil modificado"""
+        tipo_evento = getattr(evt, "tipo", "desconocido")
+
+        if tipo_evento == "profesional.actualizado":
+            perfiles = [evt.profesional, evt.anterior]
+        elif tipo_evento == "profesional.eliminado":
+            if evt.anterior is None:
+                with self._lock:
+                    self.invalidaciones += len(self._entradas)
+                    self.limpiar()
+                return
+            perfiles = [evt.anterior]
+        else:
+            return
+
+        self.invalidar(p for p in perfiles if p is not None)
+
+    def invalidar(self, perfiles: Iterable[Profesional]) -> None:
+        """Descarta las entradas cuyas etiquetas coinciden con algún perfil"""
+        ids, especialidades, provincias = set(), set(), set()
+        for perfil in perfiles:
+            for especialidad in perfil.especialidades:
+                ids.add(especialidad.id)
+                especialidades.add(normalizar_texto(especialidad.nombre))
+            if perfil.ubicacion and perfil.ubicacion.provincia:
+                provincias.add(normalizar_texto(perfil.ubicacion.provincia))
+
+        with self._lock:
+            por_especialidad = set()
+            for etiqueta, claves in self._por_especialidad.items():
+                if (
+                    etiqueta == _TODAS
+                    or etiqueta in ids
+                    or (
+                        isinstance(etiqueta, str)
+                        and any(etiqueta in nombre for nombre in especialidades)
+                    )
+                ):
+                    por_especialidad |= claves
+
+            por_provincia = set()
+            for etiqueta, claves in self._por_provincia.items():
+                if etiqueta == _TODAS or any(etiqueta in p for p in provincias):
+                    por_provincia |= claves
+
+            for clave in por_especialidad & por_provincia:
+                self._quitar(clave)
+                self.invalidaciones += 1
+
+    def _quitar(self, clave: Clave) -> None:
+        entrada = self._entradas.pop(clave, None)
+        if entrada is None:
+            return
+        for indice, etiqueta in (
+            (self._por_especialidad, entrada.especialidad),
+            (self._por_provincia, entrada.provincia),
+        ):
+            claves = indice.get(etiqueta)
+            if claves is not None:
+                claves.discard(clave)
+                if not claves:
+                    del indice[etiqueta]
@@ -1,9 +1,12 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List
-from app.domain.entities.usuarios import Profesional
+from dataclasses import replace
+from typing import Dict, List, Optional
+from uuid import UUID
+from app.domain.entities.usuarios import Profesional, ResumenProfesional
 from app.domain.entities.catalogo import FiltroBusqueda
 from app.infra.repositories.profesional_repository import ProfesionalRepository
+from .indice import IndiceProfesionales
 
 """
 Estrategias de búsqueda de profesionales (Patrón Strategy - GoF)
@@ -18,9 +21,77 @@ Ventajas de esta arquitectura:
   el repositorio maneja persistencia
 - Fácil de extender: Agregar nuevas estrategias sin modificar código existente
 - Testeable: Se puede mockear el repositorio para tests unitarios
+
+Las estrategias concretas aceptan un IndiceProfesionales opcional: si está
+construido, resuelven la búsqueda en memoria en lugar de ir al repositorio.
+
+BusquedaPorCercania responde "los k profesionales activos más cercanos a un
+punto dentro de un radio" (opcionalmente de una especialidad): con el índice
+recorre su grilla de celdas; sin él, el repositorio prefiltra por caja
+envolvente en SQL y calcula la distancia exacta sólo sobre esos candidatos.
+
+Paginación: si el filtro trae `limite`/`despues_de`, las estrategias los
+pasan al repositorio (o al índice), que resuelve la página por clave en SQL.
+`contar` da el total de la búsqueda sin traer los perfiles.
+
+Disponibilidad: con `dia_semana` (y opcionalmente `hora_desde`/`hora_hasta`)
+todas las estrategias se quedan con los profesionales que atienden ese día en
+esa franja; el repositorio lo resuelve con un AND binario sobre la máscara de
+días de la tabla disponibilidad.
+
+BusquedaPorTexto resuelve `filtro.texto` contra perfiles y publicaciones
+(full-text de PostgreSQL o BM25 en memoria como respaldo), combinado con los
+filtros de zona, especialidad y disponibilidad. Los resultados vienen por
+relevancia y la estrategia guarda la de cada uno para armar el cursor.
+
+Con `ordenar_por_puntaje`, las estrategias de zona, especialidad y combinada
+piden al repositorio (o al índice) el orden (puntaje desc, id), que sale de
+la columna precalculada `profesional.puntaje`; la página también se resuelve
+por esa clave.
+
+Vista resumen: `buscar_resumen` devuelve ResumenProfesional. Las estrategias
+de zona, especialidad y combinada la resuelven con una proyección de columnas
+en el repositorio (buscar_resumen), sin hidratar perfiles; el resto (y el
+índice en memoria, que ya tiene los perfiles) resume el resultado de `buscar`.
 """
 
 
+def _paginacion(filtro: FiltroBusqueda) -> dict:
+    """Argumentos de paginación para el repositorio, sólo si se pagina"""
+    if filtro.limite is None and filtro.despues_de is None:
+        return {}
+    return {"limite": filtro.limite, "despues_de": filtro.despues_de}
+
+
+def _combinados(filtro: FiltroBusqueda) -> dict:
+    """Filtros de zona y especialidad en el formato de buscar_combinado"""
+    return {
+        "especialidad_id": filtro.id_especialidad,
+        "especialidad_nombre": filtro.nombre_especialidad,
+        "provincia": filtro.provincia,
+        "departamento": filtro.departamento,
+        "barrio": filtro.barrio,
+    }
+
+
+def _orden(filtro: FiltroBusqueda) -> dict:
+    """Orden por puntaje para el repositorio, sólo si se pide"""
+    if not filtro.ordenar_por_puntaje:
+        return {}
+    return {"por_puntaje": True}
+
+
+def _disponibilidad(filtro: FiltroBusqueda) -> dict:
+    """Argumentos de disponibilidad para el repositorio, sólo si se filtra"""
+    if filtro.dia_semana is None:
+        return {}
+    return {
+        "dia_semana": filtro.dia_semana,
+        "hora_desde": filtro.hora_desde,
+        "hora_hasta": filtro.hora_hasta,
+    }
+
+
 class EstrategiaBusqueda(ABC):
     @abstractmethod
     def buscar(
@@ -28,36 +99,231 @@ class EstrategiaBusqueda(ABC):
     ) -> List[Profesional]:
         pass
 
+    def contar(self, repo: ProfesionalRepository, filtro: FiltroBusqueda) -> int:
+        """Total de resultados sin paginar; las estrategias concretas lo abaratan"""
+        return len(self.buscar(repo, replace(filtro, limite=None, despues_de=None)))
+
+    def buscar_resumen(
+        self, repo: ProfesionalRepository, filtro: FiltroBusqueda
+    ) -> List[ResumenProfesional]:
+        """Vista resumen; por defecto resume los perfiles completos de `buscar`"""
+        return [
+            ResumenProfesional.desde_profesional(p) for p in self.buscar(repo, filtro)
+        ]
+
+
+class EstrategiaIndexable(EstrategiaBusqueda):
+    """Estrategia que puede resolverse contra el índice en memoria"""
+
+    def __init__(self, indice: Optional[IndiceProfesionales] = None):
+        self.indice = indice
 
-class BusquedaPorZona(EstrategiaBusqueda):
+    @property
+    def usa_indice(self) -> bool:
+        return self.indice is not None and self.indice.listo
+
+    def _contar(self, repo: ProfesionalRepository, **criterios) -> int:
+        if self.usa_indice:
+            return self.indice.contar(**criterios)
+        return repo.contar_combinado(**criterios)
+
+    def _resumir(
+        self, repo: ProfesionalRepository, filtro: FiltroBusqueda, **criterios
+    ) -> List[ResumenProfesional]:
+        if self.usa_indice:
+            return super().buscar_resumen(repo, filtro)
+        return repo.buscar_resumen(
+            **criterios,
+            **_paginacion(filtro),
+            **_disponibilidad(filtro),
+            **_orden(filtro),
+        )
+
+
+class BusquedaPorZona(EstrategiaIndexable):
     def buscar(
         self, repo: ProfesionalRepository, filtro: FiltroBusqueda
     ) -> list[Profesional]:
+        if self.usa_indice:
+            return self.indice.buscar(
+                provincia=filtro.provincia,
+                departamento=filtro.departamento,
+                barrio=filtro.barrio,
+                **_paginacion(filtro),
+                **_disponibilidad(filtro),
+                **_orden(filtro),
+            )
         return repo.buscar_por_ubicacion(
             provincia=filtro.provincia,
             departamento=filtro.departamento,
             barrio=filtro.barrio,
+            **_paginacion(filtro),
+            **_disponibilidad(filtro),
+            **_orden(filtro),
         )
 
+    def contar(self, repo: ProfesionalRepository, filtro: FiltroBusqueda) -> int:
+        return self._contar(
+            repo,
+            provincia=filtro.provincia,
+            departamento=filtro.departamento,
+            barrio=filtro.barrio,
+            **_disponibilidad(filtro),
+        )
 
-class BusquedaPorEspecialidad(EstrategiaBusqueda):
+    def buscar_resumen(
+        self, repo: ProfesionalRepository, filtro: FiltroBusqueda
+    ) -> List[ResumenProfesional]:
+        return self._resumir(
+            repo,
+            filtro,
+            provincia=filtro.provincia,
+            departamento=filtro.departamento,
+            barrio=filtro.barrio,
+        )
+
+
+class BusquedaPorEspecialidad(EstrategiaIndexable):
     def buscar(
         self, repo: ProfesionalRepository, filtro: FiltroBusqueda
     ) -> list[Profesional]:
+        if self.usa_indice:
+            if not (filtro.id_especialidad or filtro.nombre_especialidad):
+                return []
+            return self.indice.buscar(
+                especialidad_id=filtro.id_especialidad,
+                especialidad_nombre=filtro.nombre_especialidad,
+                **_paginacion(filtro),
+                **_disponibilidad(filtro),
+                **_orden(filtro),
+            )
         return repo.buscar_por_especialidad(
             especialidad_id=filtro.id_especialidad,
             especialidad_nombre=filtro.nombre_especialidad,
+            **_paginacion(filtro),
+            **_disponibilidad(filtro),
+            **_orden(filtro),
         )
 
+    def contar(self, repo: ProfesionalRepository, filtro: FiltroBusqueda) -> int:
+        if not (filtro.id_especialidad or filtro.nombre_especialidad):
+            return 0
+        return self._contar(
+            repo,
+            especialidad_id=filtro.id_especialidad,
+            especialidad_nombre=filtro.nombre_especialidad,
+            **_disponibilidad(filtro),
+        )
 
-class BusquedaCombinada(EstrategiaBusqueda):
+    def buscar_resumen(
+        self, repo: ProfesionalRepository, filtro: FiltroBusqueda
+    ) -> List[ResumenProfesional]:
+        if not (filtro.id_especialidad or filtro.nombre_especialidad):
+            return []
+        return self._resumir(
+            repo,
+            filtro,
+            especialidad_id=filtro.id_especialidad,
+            especialidad_nombre=filtro.nombre_especialidad,
+        )
+
+
+class BusquedaCombinada(EstrategiaIndexable):
     def buscar(
         self, repo: ProfesionalRepository, filtro: FiltroBusqueda
     ) -> list[Profesional]:
+        if self.usa_indice:
+            return self.indice.buscar(
+                especialidad_id=filtro.id_especialidad,
+                especialidad_nombre=filtro.nombre_especialidad,
+                provincia=filtro.provincia,
+                departamento=filtro.departamento,
+                barrio=filtro.barrio,
+                **_paginacion(filtro),
+                **_disponibilidad(filtro),
+                **_orden(filtro),
+            )
         return repo.buscar_combinado(
             especialidad_id=filtro.id_especialidad,
             especialidad_nombre=filtro.nombre_especialidad,
             provincia=filtro.provincia,
             departamento=filtro.departamento,
             barrio=filtro.barrio,
+            **_paginacion(filtro),
+            **_disponibilidad(filtro),
+            **_orden(filtro),
+        )
+
+    def contar(self, repo: ProfesionalRepository, filtro: FiltroBusqueda) -> int:
+        return self._contar(
+            repo,
+            especialidad_id=filtro.id_especialidad,
+            especialidad_nombre=filtro.nombre_especialidad,
+            provincia=filtro.provincia,
+            departamento=filtro.departamento,
+            barrio=filtro.barrio,
+            **_disponibilidad(filtro),
+        )
+
+    def buscar_resumen(
+        self, repo: ProfesionalRepository, filtro: FiltroBusqueda
+    ) -> List[ResumenProfesional]:
+        return self._resumir(repo, filtro, **_combinados(filtro))
+
+
+class BusquedaPorCercania(EstrategiaIndexable):
+    def buscar(
+        self, repo: ProfesionalRepository, filtro: FiltroBusqueda
+    ) -> list[Profesional]:
+        if not filtro.tiene_punto or not filtro.radio_km:
+            return []
+
+        parametros = dict(
+            latitud=filtro.latitud,
+            longitud=filtro.longitud,
+            radio_km=filtro.radio_km,
+            limite=filtro.limite,
+            especialidad_id=filtro.id_especialidad,
+            especialidad_nombre=filtro.nombre_especialidad,
+            provincia=filtro.provincia,
+            departamento=filtro.departamento,
+            barrio=filtro.barrio,
+        )
+        if filtro.despues_de is not None:
+            parametros["despues_de"] = filtro.despues_de
+        parametros.update(_disponibilidad(filtro))
+        if self.usa_indice:
+            return self.indice.cercanos(**parametros)
+        return repo.buscar_cercanos(**parametros)
+
+
+class BusquedaPorTexto(EstrategiaBusqueda):
+    """
+    Texto libre sobre perfiles y publicaciones. No usa el índice en memoria:
+    las publicaciones no forman parte del Profesional del dominio.
+    """
+
+    def __init__(self):
+        self.relevancias: Dict[UUID, float] = {}
+
+    def buscar(
+        self, repo: ProfesionalRepository, filtro: FiltroBusqueda
+    ) -> list[Profesional]:
+        if not filtro.texto or not filtro.texto.strip():
+            return []
+
+        resultados = repo.buscar_por_texto(
+            texto=filtro.texto,
+            **_combinados(filtro),
+            **_paginacion(filtro),
+            **_disponibilidad(filtro),
+        )
+        self.relevancias = {p.id: relevancia for p, relevancia in resultados}
+        return [p for p, _ in resultados]
+
+    def contar(self, repo: ProfesionalRepository, filtro: FiltroBusqueda) -> int:
+        if not filtro.texto or not filtro.texto.strip():
+            return 0
+        return repo.contar_por_texto(
+            texto=filtro.texto, **_combinados(filtro), **_disponibilidad(filtro)
         )
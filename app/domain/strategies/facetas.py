@@ -0,0 +1,77 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from app.domain.entities.catalogo import FACETAS, ConteoFaceta, FiltroBusqueda
+from app.infra.repositories.profesional_repository import ProfesionalRepository
+from .cache import CacheBusquedas
+from .indice import IndiceProfesionales
+
+"""
+Conteo de facetas de búsqueda: para el filtro actual (especialidad, zona y
+disponibilidad), cuántos profesionales hay por especialidad, por provincia y
+por departamento.
+
+Con el índice en memoria construido se resuelve con popcount sobre sus
+posting lists; si no, el repositorio lo calcula en una sola consulta
+agregada. Si hay cache de búsquedas, el resultado se guarda en ella con las
+mismas etiquetas (e invalidación) que una búsqueda con ese filtro.
+"""
+
+# Clave de cache: no es el nombre de ninguna estrategia
+CLAVE_CACHE = "Facetas"
+
+
+def _criterios(filtro: FiltroBusqueda) -> dict:
+    return {
+        "especialidad_id": filtro.id_especialidad,
+        "especialidad_nombre": filtro.nombre_especialidad,
+        "provincia": filtro.provincia,
+        "departamento": filtro.departamento,
+        "barrio": filtro.barrio,
+        "dia_semana": filtro.dia_semana,
+        "hora_desde": filtro.hora_desde,
+        "hora_hasta": filtro.hora_hasta,
+    }
+
+
+def agrupar_facetas(conteos: List[ConteoFaceta]) -> Dict[str, List[ConteoFaceta]]:
+    """Conteos por faceta, de mayor a menor cantidad y luego por nombre"""
+    facetas: Dict[str, List[ConteoFaceta]] = {faceta: [] for faceta in FACETAS}
+    for conteo in sorted(conteos, key=lambda c: (-c.cantidad, c.nombre)):
+        facetas[conteo.faceta].append(conteo)
+    return facetas
+
+
+@dataclass
+class Facetador:
+    repo: ProfesionalRepository
+    indice: Optional[IndiceProfesionales] = None
+    cache: Optional[CacheBusquedas] = None
+
+    def contar(self, filtro: FiltroBusqueda) -> Dict[str, List[ConteoFaceta]]:
+        # Sólo importan los filtros: orden y página no cambian los conteos
+        filtro = FiltroBusqueda(
+            id_especialidad=filtro.id_especialidad,
+            nombre_especialidad=filtro.nombre_especialidad,
+            provincia=filtro.provincia,
+            departamento=filtro.departamento,
+            barrio=filtro.barrio,
+            dia_semana=filtro.dia_semana,
+            hora_desde=filtro.hora_desde,
+            hora_hasta=filtro.hora_hasta,
+        )
+        clave = (CLAVE_CACHE, filtro)
+        if self.cache is not None:
+            cacheado = self.cache.obtener(clave)
+            if cacheado is not None:
+                return agrupar_facetas(cacheado)
+
+        if self.indice is not None and self.indice.listo:
+            conteos = self.indice.facetas(**_criterios(filtro))
+        else:
+            conteos = self.repo.contar_facetas(**_criterios(filtro))
+
+        if self.cache is not None:
+            self.cache.guardar(clave, conteos)
+        return agrupar_facetas(conteos)
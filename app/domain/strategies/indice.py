@@ -0,0 +1,541 @@
+from __future__ import annotations
+import heapq
+from datetime import time
+from math import cos, floor, radians
+from threading import RLock
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from app.domain.entities.catalogo import (
+    FACETA_DEPARTAMENTO,
+    FACETA_ESPECIALIDAD,
+    FACETA_PROVINCIA,
+    ConteoFaceta,
+)
+from app.domain.entities.usuarios import Profesional
+from app.domain.geo import KM_POR_GRADO_LATITUD, caja_envolvente, haversine_km
+from app.domain.observers.observadores import Observer
+from app.domain.texto import normalizar_texto
+
+"""
+Índice invertido en memoria para la búsqueda de profesionales.
+
+Cada profesional activo recibe un número de documento (entero denso) y cada
+valor de filtro (especialidad, provincia, departamento, barrio) tiene su
+posting list guardada como bitset: un `int` de Python donde el bit `n` indica
+que el documento `n` contiene ese valor. Intersecar filtros es un AND de
+enteros y unir variantes de un mismo filtro es un OR.
+
+Los nombres se comparan normalizados (sin acentos, minúsculas) y por
+subcadena, igual que los filtros sobre `nombre_normalizado` del repositorio: la
+subcadena se resuelve contra el vocabulario (pocas claves), no contra los
+profesionales.
+
+Para la búsqueda por cercanía los profesionales geolocalizados se ubican
+además en una grilla de celdas de TAMANO_CELDA_GRADOS (un geohash simple):
+cada celda es otra posting list. Los k más cercanos se obtienen recorriendo
+anillos de celdas alrededor del punto y cortando en cuanto ninguna celda
+sin visitar puede tener a alguien más cerca que el k-ésimo encontrado.
+
+La disponibilidad se indexa por día de la semana (una posting list por
+DiaSemana, armada desde la máscara de días de cada franja); la ventana
+horaria se verifica después, sólo sobre los documentos de ese día.
+
+Las facetas (cantidad de resultados por especialidad, provincia y
+departamento) salen de AND + popcount entre el bitset del filtro y cada
+posting list; los departamentos se indexan además por (provincia,
+departamento) y se guardan los nombres originales para mostrarlos.
+
+El índice es un Observer: se mantiene al día con los eventos
+`profesional.actualizado` / `profesional.eliminado` que publica el repositorio.
+Vive en el proceso, así que con varios workers cada uno tiene su copia.
+"""
+
+_ESPECIALIDAD_ID = "especialidad_id"
+_ESPECIALIDAD = "especialidad"
+_PROVINCIA = "provincia"
+_DEPARTAMENTO = "departamento"
+_BARRIO = "barrio"
+_CELDA = "celda"
+_DIA = "dia"
+_DEPARTAMENTO_EN_PROVINCIA = "departamento_en_provincia"
+
+# ~5,5 km de lado en latitud; en longitud se achica con el coseno
+TAMANO_CELDA_GRADOS = 0.05
+
+
+def _bits(bitset: int) -> Iterable[int]:
+    """Itera los números de documento presentes en un bitset"""
+    while bitset:
+        bajo = bitset & -bitset
+        yield bajo.bit_length() - 1
+        bitset ^= bajo
+
+
+def _celda(latitud: float, longitud: float) -> Tuple[int, int]:
+    return (
+        floor(latitud / TAMANO_CELDA_GRADOS),
+        floor(longitud / TAMANO_CELDA_GRADOS),
+    )
+
+
+def _anillo(fila: int, columna: int, radio: int) -> Iterator[Tuple[int, int]]:
+    """Celdas a distancia de Chebyshev exactamente `radio` de (fila, columna)"""
+    if radio == 0:
+        yield fila, columna
+        return
+    for j in range(columna - radio, columna + radio + 1):
+        yield fila - radio, j
+        yield fila + radio, j
+    for i in range(fila - radio + 1, fila + radio):
+        yield i, columna - radio
+        yield i, columna + radio
+
+
+class IndiceProfesionales(Observer):
+    """Posting lists por especialidad y ubicación sobre profesionales activos"""
+
+    def __init__(self):
+        self._lock = RLock()
+        self._listo = False
+        self._limpiar()
+
+    def _limpiar(self) -> None:
+        self._documentos: List[Optional[Profesional]] = []
+        self._doc_por_id: Dict[UUID, int] = {}
+        self._libres: List[int] = []
+        self._todos = 0
+        self._postings: Dict[str, Dict[object, int]] = {
+            _ESPECIALIDAD_ID: {},
+            _ESPECIALIDAD: {},
+            _PROVINCIA: {},
+            _DEPARTAMENTO: {},
+            _BARRIO: {},
+            _CELDA: {},
+            _DIA: {},
+            _DEPARTAMENTO_EN_PROVINCIA: {},
+        }
+        # Nombre para mostrar de cada clave de faceta
+        self._etiquetas: Dict[str, Dict[object, object]] = {
+            _ESPECIALIDAD_ID: {},
+            _PROVINCIA: {},
+            _DEPARTAMENTO_EN_PROVINCIA: {},
+        }
+
+    @property
+    def listo(self) -> bool:
+        """True una vez construido; antes de eso las estrategias usan el repositorio"""
+        return self._listo
+
+    def __len__(self) -> int:
+        return len(self._doc_por_id)
+
+    def construir(self, profesionales: Iterable[Profesional]) -> None:
+        """Reconstruye el índice completo (p. ej. desde repo.listar_activos())"""
+        with self._lock:
+            self._limpiar()
+            for profesional in profesionales:
+                if profesional.activo:
+                    self._agregar(profesional)
+            self._listo = True
+
+    def invalidar(self) -> None:
+        """Descarta el contenido; se vuelve a construir en la próxima búsqueda"""
+        with self._lock:
+            self._limpiar()
+            self._listo = False
+
+    def indexar(self, profesional: Profesional) -> None:
+        """Alta o reemplazo de un profesional (los inactivos se quitan)"""
+        with self._lock:
+            self._quitar(profesional.id)
+            if profesional.activo:
+                self._agregar(profesional)
+
+    def quitar(self, profesional_id: UUID) -> None:
+        with self._lock:
+            self._quitar(profesional_id)
+
+    def update(self, evt) -> None:
+        """Observer: aplica los cambios de perfil publicados por el repositorio"""
+        if not self._listo:
+            return
+
+        tipo_evento = getattr(evt, "tipo", "desconocido")
+
+        if tipo_evento == "profesional.actualizado":
+            self.indexar(evt.profesional)
+        elif tipo_evento == "profesional.eliminado":
+            self.quitar(evt.profesional_id)
+
+    def _claves(self, profesional: Profesional) -> Dict[str, set]:
+        claves = {
+            _ESPECIALIDAD_ID: {e.id for e in profesional.especialidades},
+            _ESPECIALIDAD: {
+                normalizar_texto(e.nombre) for e in profesional.especialidades
+            },
+            _PROVINCIA: set(),
+            _DEPARTAMENTO: set(),
+            _BARRIO: set(),
+            _CELDA: set(),
+            _DIA: {
+                dia for disp in profesional.disponibilidades for dia in disp.dias_semana
+            },
+            _DEPARTAMENTO_EN_PROVINCIA: set(),
+        }
+        ubicacion = profesional.ubicacion
+        if ubicacion and ubicacion.barrio:
+            provincia = normalizar_texto(ubicacion.provincia)
+            departamento = normalizar_texto(ubicacion.departamento)
+            claves[_PROVINCIA].add(provincia)
+            claves[_DEPARTAMENTO].add(departamento)
+            claves[_BARRIO].add(normalizar_texto(ubicacion.barrio))
+            claves[_DEPARTAMENTO_EN_PROVINCIA].add((provincia, departamento))
+        if (
+            ubicacion
+            and ubicacion.latitud is not None
+            and ubicacion.longitud is not None
+        ):
+            claves[_CELDA].add(_celda(ubicacion.latitud, ubicacion.longitud))
+        return claves
+
+    def _etiquetas_de(self, profesional: Profesional) -> Dict[str, Dict]:
+        etiquetas = {
+            _ESPECIALIDAD_ID: {e.id: e.nombre for e in profesional.especialidades},
+            _PROVINCIA: {},
+            _DEPARTAMENTO_EN_PROVINCIA: {},
+        }
+        ubicacion = profesional.ubicacion
+        if ubicacion and ubicacion.barrio:
+            provincia = normalizar_texto(ubicacion.provincia)
+            departamento = normalizar_texto(ubicacion.departamento)
+            etiquetas[_PROVINCIA][provincia] = ubicacion.provincia
+            etiquetas[_DEPARTAMENTO_EN_PROVINCIA][(provincia, departamento)] = (
+                ubicacion.provincia,
+                ubicacion.departamento,
+            )
+        return etiquetas
+
+    def _agregar(self, profesional: Profesional) -> None:
+        if self._libres:
+            doc = self._libres.pop()
+            self._documentos[doc] = profesional
+        else:
+            doc = len(self._documentos)
+            self._documentos.append(profesional)
+
+        self._doc_por_id[profesional.id] = doc
+        bit = 1 << doc
+        self._todos |= bit
+
+        for campo, valores in self._claves(profesional).items():
+            postings = self._postings[campo]
+            for valor in valores:
+                postings[valor] = postings.get(valor, 0) | bit
+        for campo, etiquetas in self._etiquetas_de(profesional).items():
+            self._etiquetas[campo].update(etiquetas)
+
+    def _quitar(self, profesional_id: UUID) -> None:
+        doc = self._doc_por_id.pop(profesional_id, None)
+        if doc is None:
+            return
+
+        profesional = self._documentos[doc]
+        bit = 1 << doc
+        self._todos &= ~bit
+
+        for campo, valores in self._claves(profesional).items():
+            postings = self._postings[campo]
+            for valor in valores:
+                restante = postings.get(valor, 0) & ~bit
+                if restante:
+                    postings[valor] = restante
+                else:
+                    postings.pop(valor, None)
+                    self._etiquetas.get(campo, {}).pop(valor, None)
+
+        self._documentos[doc] = None
+        self._libres.append(doc)
+
+    def _por_subcadena(self, campo: str, texto: str) -> int:
+        """OR de las posting lists cuya clave contiene `texto` (normalizado)"""
+        buscado = normalizar_texto(texto)
+        resultado = 0
+        for clave, bitset in self._postings[campo].items():
+            if buscado in clave:
+                resultado |= bitset
+        return resultado
+
+    def _por_especialidad(
+        self, especialidad_id: Optional[int], especialidad_nombre: Optional[str]
+    ) -> int:
+        if especialidad_id:
+            return self._postings[_ESPECIALIDAD_ID].get(especialidad_id, 0)
+        if especialidad_nombre:
+            return self._por_subcadena(_ESPECIALIDAD, especialidad_nombre)
+        return self._todos
+
+    def _por_disponibilidad(
+        self,
+        dia_semana: Optional[int],
+        hora_desde: Optional[time],
+        hora_hasta: Optional[time],
+    ) -> int:
+        """Documentos que atienden `dia_semana` cubriendo la franja pedida"""
+        if not dia_semana:
+            return self._todos
+        resultado = self._postings[_DIA].get(dia_semana, 0)
+        if hora_desde is None and hora_hasta is None:
+            return resultado
+        for doc in _bits(resultado):
+            if not any(
+                disp.cubre(dia_semana, hora_desde, hora_hasta)
+                for disp in self._documentos[doc].disponibilidades
+            ):
+                resultado &= ~(1 << doc)
+        return resultado
+
+    def _resolver(
+        self,
+        especialidad_id: Optional[int],
+        especialidad_nombre: Optional[str],
+        provincia: Optional[str],
+        departamento: Optional[str],
+        barrio: Optional[str],
+        dia_semana: Optional[int] = None,
+        hora_desde: Optional[time] = None,
+        hora_hasta: Optional[time] = None,
+    ) -> int:
+        resultado = self._todos & self._por_especialidad(
+            especialidad_id, especialidad_nombre
+        )
+        if dia_semana:
+            resultado &= self._por_disponibilidad(dia_semana, hora_desde, hora_hasta)
+        if provincia:
+            resultado &= self._por_subcadena(_PROVINCIA, provincia)
+        if departamento:
+            resultado &= self._por_subcadena(_DEPARTAMENTO, departamento)
+        if barrio:
+            resultado &= self._por_subcadena(_BARRIO, barrio)
+        return resultado
+
+    def buscar(
+        self,
+        especialidad_id: Optional[int] = None,
+        especialidad_nombre: Optional[str] = None,
+        provincia: Optional[str] = None,
+        departamento: Optional[str] = None,
+        barrio: Optional[str] = None,
+        limite: Optional[int] = None,
+        despues_de: Optional[Tuple] = None,
+        dia_semana: Optional[int] = None,
+        hora_desde: Optional[time] = None,
+        hora_hasta: Optional[time] = None,
+        por_puntaje: bool = False,
+    ) -> List[Profesional]:
+        """
+        Misma semántica que ProfesionalRepository.buscar_combinado:
+        prioriza especialidad_id sobre especialidad_nombre y sin filtros
+        devuelve todos los profesionales activos. Con `limite`/`despues_de`
+        pagina sobre el mismo orden (apellido, id) que el repositorio, o
+        (puntaje desc, id) con `por_puntaje`.
+        """
+        with self._lock:
+            resultado = self._resolver(
+                especialidad_id,
+                especialidad_nombre,
+                provincia,
+                departamento,
+                barrio,
+                dia_semana,
+                hora_desde,
+                hora_hasta,
+            )
+            profesionales = [self._documentos[doc] for doc in _bits(resultado)]
+
+        if por_puntaje:
+            profesionales.sort(key=lambda p: (-p.puntaje, p.id))
+            if despues_de is not None:
+                puntaje, prof_id = despues_de
+                profesionales = [
+                    p for p in profesionales if (-p.puntaje, p.id) > (-puntaje, prof_id)
+                ]
+            return profesionales[:limite] if limite else profesionales
+
+        if not limite and despues_de is None:
+            return profesionales
+
+        profesionales.sort(key=lambda p: (p.apellido, p.id))
+        if despues_de is not None:
+            profesionales = [
+                p for p in profesionales if (p.apellido, p.id) > despues_de
+            ]
+        return profesionales[:limite] if limite else profesionales
+
+    def contar(
+        self,
+        especialidad_id: Optional[int] = None,
+        especialidad_nombre: Optional[str] = None,
+        provincia: Optional[str] = None,
+        departamento: Optional[str] = None,
+        barrio: Optional[str] = None,
+        dia_semana: Optional[int] = None,
+        hora_desde: Optional[time] = None,
+        hora_hasta: Optional[time] = None,
+    ) -> int:
+        """Total de `buscar` sin materializar la lista (popcount del bitset)"""
+        with self._lock:
+            return self._resolver(
+                especialidad_id,
+                especialidad_nombre,
+                provincia,
+                departamento,
+                barrio,
+                dia_semana,
+                hora_desde,
+                hora_hasta,
+            ).bit_count()
+
+    def facetas(
+        self,
+        especialidad_id: Optional[int] = None,
+        especialidad_nombre: Optional[str] = None,
+        provincia: Optional[str] = None,
+        departamento: Optional[str] = None,
+        barrio: Optional[str] = None,
+        dia_semana: Optional[int] = None,
+        hora_desde: Optional[time] = None,
+        hora_hasta: Optional[time] = None,
+    ) -> List[ConteoFaceta]:
+        """Misma semántica que ProfesionalRepository.contar_facetas"""
+        with self._lock:
+            resultado = self._resolver(
+                especialidad_id,
+                especialidad_nombre,
+                provincia,
+                departamento,
+                barrio,
+                dia_semana,
+                hora_desde,
+                hora_hasta,
+            )
+            conteos = []
+            for clave, bitset in self._postings[_ESPECIALIDAD_ID].items():
+                cantidad = (resultado & bitset).bit_count()
+                if cantidad:
+                    nombre = self._etiquetas[_ESPECIALIDAD_ID][clave]
+                    conteos.append(
+                        ConteoFaceta(FACETA_ESPECIALIDAD, nombre, cantidad, id=clave)
+                    )
+            for clave, bitset in self._postings[_PROVINCIA].items():
+                cantidad = (resultado & bitset).bit_count()
+                if cantidad:
+                    nombre = self._etiquetas[_PROVINCIA][clave]
+                    conteos.append(ConteoFaceta(FACETA_PROVINCIA, nombre, cantidad))
+            for clave, bitset in self._postings[_DEPARTAMENTO_EN_PROVINCIA].items():
+                cantidad = (resultado & bitset).bit_count()
+                if cantidad:
+                    prov, nombre = self._etiquetas[_DEPARTAMENTO_EN_PROVINCIA][clave]
+                    conteos.append(
+                        ConteoFaceta(
+                            FACETA_DEPARTAMENTO, nombre, cantidad, provincia=prov
+                        )
+                    )
+            return conteos
+
+    def cercanos(
+        self,
+        latitud: float,
+        longitud: float,
+        radio_km: float,
+        limite: Optional[int] = None,
+        especialidad_id: Optional[int] = None,
+        especialidad_nombre: Optional[str] = None,
+        despues_de: Optional[Tuple[float, UUID]] = None,
+        dia_semana: Optional[int] = None,
+        hora_desde: Optional[time] = None,
+        hora_hasta: Optional[time] = None,
+        provincia: Optional[str] = None,
+        departamento: Optional[str] = None,
+        barrio: Optional[str] = None,
+    ) -> List[Profesional]:
+        """
+        Profesionales activos a `radio_km` o menos del punto, ordenados por
+        (distancia, id) y como mucho `limite`; `despues_de` continúa desde
+        esa clave. Solo se calcula la distancia de los profesionales de las
+        celdas visitadas.
+        """
+        with self._lock:
+            permitidos = self._resolver(
+                especialidad_id,
+                especialidad_nombre,
+                provincia,
+                departamento,
+                barrio,
+                dia_semana,
+                hora_desde,
+                hora_hasta,
+            )
+            celdas = self._postings[_CELDA]
+            if not permitidos or not celdas:
+                return []
+
+            lat_min, lat_max, lon_min, lon_max = caja_envolvente(
+                latitud, longitud, radio_km
+            )
+            fila_min, col_min = _celda(lat_min, lon_min)
+            fila_max, col_max = _celda(lat_max, lon_max)
+            fila, columna = _celda(latitud, longitud)
+
+            # Cota inferior del lado de una celda dentro de la caja: cualquier
+            # celda del anillo r+1 en adelante está a más de r * lado_km.
+            lat_extrema = min(89.9, max(abs(lat_min), abs(lat_max)))
+            lado_km = (
+                TAMANO_CELDA_GRADOS
+                * KM_POR_GRADO_LATITUD
+                * min(1.0, cos(radians(lat_extrema)))
+            )
+
+            anillos = max(
+                fila - fila_min, fila_max - fila, columna - col_min, col_max - columna
+            )
+            if (2 * anillos + 1) ** 2 > 4 * len(celdas):
+                # Radio enorme frente a las celdas ocupadas: conviene recorrer
+                # sólo las ocupadas que caen en la caja, en un único anillo.
+                grupos = [
+                    [
+                        c
+                        for c in celdas
+                        if fila_min <= c[0] <= fila_max and col_min <= c[1] <= col_max
+                    ]
+                ]
+            else:
+                grupos = (list(_anillo(fila, columna, r)) for r in range(anillos + 1))
+
+            encontrados: List[Tuple[float, UUID, int]] = []
+            for radio, grupo in enumerate(grupos):
+                bits = 0
+                for celda in grupo:
+                    bits |= celdas.get(celda, 0)
+                for doc in _bits(bits & permitidos):
+                    profesional = self._documentos[doc]
+                    ubicacion = profesional.ubicacion
+                    distancia = haversine_km(
+                        latitud, longitud, ubicacion.latitud, ubicacion.longitud
+                    )
+                    if distancia > radio_km:
+                        continue
+                    clave = (distancia, profesional.id)
+                    if despues_de is not None and clave <= despues_de:
+                        continue
+                    encontrados.append((distancia, profesional.id, doc))
+
+                if limite and len(encontrados) >= limite:
+                    encontrados = heapq.nsmallest(limite, encontrados)
+                    if encontrados[-1][0] <= radio * lado_km:
+                        break
+
+            encontrados.sort()
+            if limite:
+                encontrados = encontrados[:limite]
+            return [self._documentos[doc] for _, _, doc in encontrados]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, Tuple
+from uuid import UUID
+
+from app.domain.entities.catalogo import FiltroBusqueda
+from app.domain.huecos import libres_en_fecha
+from app.infra.repositories.consulta_repository import ConsultaRepository
+from .buscador import Buscador
+
+"""
+Búsqueda de profesionales libres en una fecha concreta ("quién puede atender
+el día D entre T1 y T2 una consulta de N minutos").
+
+Los candidatos salen de la estrategia elegida, con el resto del filtro y el
+día de la semana de la fecha (sin franja: la ventana se evalúa después). De
+cada lote de candidatos se leen, con una query cada una, sus franjas de ese
+día y sus consultas no canceladas de la fecha, y libres_en_fecha descarta a
+los que no tienen un hueco de la duración pedida. Con `limite`, si un lote
+no alcanza para la página se pide el siguiente por keyset (despues_de = clave
+del último candidato), hasta llenarla o quedarse sin candidatos.
+"""
+
+DURACION_MINUTOS = 60
+TAMANO_LOTE = 200
+
+
+@dataclass
+class BuscadorLibres:
+    buscador: Buscador
+    consulta_repo: ConsultaRepository
+    tamano_lote: int = TAMANO_LOTE
+    # Relevancia de todos los candidatos vistos (búsqueda por texto): cada
+    # lote reemplaza la de la estrategia
+    relevancias: Dict[UUID, float] = field(default_factory=dict)
+
+    def _candidatos(self, filtro: FiltroBusqueda, resumen: bool) -> list:
+        if resumen:
+            candidatos = self.buscador.buscar_resumen(filtro)
+        else:
+            candidatos = self.buscador.buscar(filtro)
+        self.relevancias.update(getattr(self.buscador.estrategia, "relevancias", {}))
+        return candidatos
+
+    def _libres(self, candidatos: list, filtro: FiltroBusqueda) -> list:
+        ids = [c.id for c in candidatos]
+        libres = libres_en_fecha(
+            self.buscador.repo.franjas_del_dia(ids, filtro.fecha.isoweekday()),
+            self.consulta_repo.ocupadas_en_fecha(ids, filtro.fecha),
+            filtro.duracion_minutos or DURACION_MINUTOS,
+            filtro.hora_desde,
+            filtro.hora_hasta,
+        )
+        return [c for c in candidatos if c.id in libres]
+
+    def buscar(
+        self,
+        filtro: FiltroBusqueda,
+        clave: Callable[[object], Tuple],
+        resumen: bool = False,
+    ) -> list:
+        """
+        Candidatos de `filtro` libres en `filtro.fecha`, en el orden de la
+        estrategia. Con `limite`, hasta `limite` libres; `clave` da la clave
+        de orden (keyset) de un candidato para pedir el lote siguiente.
+        """
+        candidatos = replace(
+            filtro,
+            dia_semana=filtro.fecha.isoweekday(),
+            hora_desde=None,
+            hora_hasta=None,
+            fecha=None,
+            duracion_minutos=None,
+        )
+        if filtro.limite is None:
+            return self._libres(self._candidatos(candidatos, resumen), filtro)
+
+        lote = replace(candidatos, limite=max(filtro.limite, self.tamano_lote))
+        libres: list = []
+        while True:
+            pagina = self._candidatos(lote, resumen)
+            libres.extend(self._libres(pagina, filtro))
+            if len(libres) >= filtro.limite or len(pagina) < lote.limite:
+                return libres[: filtro.limite]
+            lote = replace(lote, despues_de=clave(pagina[-1]))
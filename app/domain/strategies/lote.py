@@ -0,0 +1,74 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from app.domain.entities.catalogo import FiltroBusqueda
+from app.domain.entities.usuarios import Profesional
+from app.infra.repositories.profesional_repository import ProfesionalRepository
+from .cache import CacheBusquedas
+from .indice import IndiceProfesionales
+
+"""
+Búsqueda en lote: muchos filtros de especialidad, zona y disponibilidad
+resueltos juntos (p. ej. un mapa de cobertura por especialidad y barrio).
+
+Los filtros repetidos se resuelven una sola vez. Los que están en la cache de
+búsquedas salen de ella; el resto va al índice en memoria si está construido
+o, si no, al repositorio, que los evalúa en una única consulta (UNION ALL
+etiquetada por filtro) y carga cada perfil una sola vez aunque aparezca en
+varios resultados.
+"""
+
+# Clave de cache: no es el nombre de ninguna estrategia
+CLAVE_CACHE = "BusquedaEnLote"
+
+
+def _criterios(filtro: FiltroBusqueda) -> dict:
+    criterios = {
+        "especialidad_id": filtro.id_especialidad,
+        "especialidad_nombre": filtro.nombre_especialidad,
+        "provincia": filtro.provincia,
+        "departamento": filtro.departamento,
+        "barrio": filtro.barrio,
+        "limite": filtro.limite,
+        "dia_semana": filtro.dia_semana,
+        "hora_desde": filtro.hora_desde,
+        "hora_hasta": filtro.hora_hasta,
+    }
+    if filtro.ordenar_por_puntaje:
+        criterios["por_puntaje"] = True
+    return criterios
+
+
+@dataclass
+class BusquedaEnLote:
+    repo: ProfesionalRepository
+    indice: Optional[IndiceProfesionales] = None
+    cache: Optional[CacheBusquedas] = None
+
+    def buscar(self, filtros: List[FiltroBusqueda]) -> List[List[Profesional]]:
+        """Resultado de cada filtro, en el mismo orden que `filtros`"""
+        resultados: Dict[FiltroBusqueda, List[Profesional]] = {}
+        pendientes: List[FiltroBusqueda] = []
+        for filtro in dict.fromkeys(filtros):
+            cacheado = self.cache.obtener((CLAVE_CACHE, filtro)) if self.cache else None
+            if cacheado is not None:
+                resultados[filtro] = cacheado
+            else:
+                pendientes.append(filtro)
+
+        if pendientes:
+            if self.indice is not None and self.indice.listo:
+                encontrados = [
+                    self.indice.buscar(**_criterios(filtro)) for filtro in pendientes
+                ]
+            else:
+                encontrados = self.repo.buscar_lote(
+                    [_criterios(filtro) for filtro in pendientes]
+                )
+            for filtro, profesionales in zip(pendientes, encontrados):
+                resultados[filtro] = profesionales
+                if self.cache is not None:
+                    self.cache.guardar((CLAVE_CACHE, filtro), profesionales)
+
+        return [resultados[filtro] for filtro in filtros]
@@ -0,0 +1,152 @@
+from __future__ import annotations
+import hashlib
+import time
+from dataclasses import dataclass
+from threading import RLock
+from types import MappingProxyType
+from typing import Callable, Iterable, Mapping, Optional, Tuple
+from uuid import UUID
+
+from app.domain.entities.catalogo import NodoUbicacion
+from app.domain.observers.observadores import Observer
+
+"""
+Snapshot versionado de los datos de referencia: especialidades, provincias,
+departamentos y barrios.
+
+Se arma con una lectura de cada tabla y queda inmutable (tuplas y mappings
+de sólo lectura agrupados por nivel superior), así los endpoints de
+referencia responden sin ir a la base. Cada snapshot lleva un número de
+versión (crece en cada reconstrucción dentro del proceso) y un ETag fuerte
+que es el hash del contenido: dos procesos con los mismos datos emiten el
+mismo ETag, y un cliente con ese ETag recibe 304.
+
+Como Observer de los repositorios de catálogo y direcciones, un evento
+`catalogo.ampliado` descarta el snapshot y el próximo pedido lo reconstruye.
+Las altas hechas por otros procesos sólo las cubre el TTL.
+"""
+
+Especialidades = Tuple[Tuple[int, str], ...]
+
+
+def _agrupar(
+    nodos: Iterable[NodoUbicacion],
+) -> Mapping[UUID, Tuple[NodoUbicacion, ...]]:
+    grupos: dict = {}
+    for nodo in nodos:
+        grupos.setdefault(nodo.padre_id, []).append(nodo)
+    return MappingProxyType({padre: tuple(hijos) for padre, hijos in grupos.items()})
+
+
+@dataclass(frozen=True)
+class SnapshotCatalogo:
+    version: int
+    etag: str
+    especialidades: Especialidades
+    provincias: Tuple[NodoUbicacion, ...]
+    # Por id de provincia / de departamento
+    departamentos: Mapping[UUID, Tuple[NodoUbicacion, ...]]
+    barrios: Mapping[UUID, Tuple[NodoUbicacion, ...]]
+
+    @classmethod
+    def armar(
+        cls,
+        version: int,
+        especialidades: Iterable[Tuple[int, str]],
+        provincias: Iterable[NodoUbicacion],
+        departamentos: Iterable[NodoUbicacion],
+        barrios: Iterable[NodoUbicacion],
+    ) -> "SnapshotCatalogo":
+        especialidades = tuple(especialidades)
+        provincias = tuple(provincias)
+        departamentos = tuple(departamentos)
+        barrios = tuple(barrios)
+
+        contenido = hashlib.sha256()
+        for nivel, filas in (
+            ("e", especialidades),
+            ("p", ((p.id, p.nombre) for p in provincias)),
+            ("d", ((d.id, d.nombre, d.padre_id) for d in departamentos)),
+            ("b", ((b.id, b.nombre, b.padre_id) for b in barrios)),
+        ):
+            for fila in filas:
+                contenido.update("|".join((nivel, *map(str, fila))).encode())
+                contenido.update(b"\n")
+
+        return cls(
+            version=version,
+            etag=f'"{contenido.hexdigest()[:32]}"',
+            especialidades=especialidades,
+            provincias=provincias,
+            departamentos=_agrupar(departamentos),
+            barrios=_agrupar(barrios),
+        )
+
+    def departamentos_de(self, provincia_id: UUID) -> Tuple[NodoUbicacion, ...]:
+        return self.departamentos.get(provincia_id, ())
+
+    def barrios_de(self, departamento_id: UUID) -> Tuple[NodoUbicacion, ...]:
+        return self.barrios.get(departamento_id, ())
+
+
+Carga = Tuple[
+    Iterable[Tuple[int, str]],
+    Iterable[NodoUbicacion],
+    Iterable[NodoUbicacion],
+    Iterable[NodoUbicacion],
+]
+
+
+class CacheCatalogo(Observer):
+    """Snapshot vigente del catálogo, con TTL opcional e invalidación por eventos"""
+
+    def __init__(
+        self,
+        ttl_segundos: Optional[float] = None,
+        reloj: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_segundos = ttl_segundos
+        self._reloj = reloj
+        self._lock = RLock()
+        self._snapshot: Optional[SnapshotCatalogo] = None
+        self._vence: Optional[float] = None
+        self._version = 0
+        self.construcciones = 0
+        self.invalidaciones = 0
+
+    def vigente(self) -> Optional[SnapshotCatalogo]:
+        """El snapshot actual, o None si no hay o venció"""
+        with self._lock:
+            if self._vence is not None and self._vence <= self._reloj():
+                self._snapshot = None
+                self._vence = None
+            return self._snapshot
+
+    def obtener(self, cargar: Callable[[], Carga]) -> SnapshotCatalogo:
+        """El snapshot vigente o, si no hay, uno nuevo armado con `cargar()`"""
+        snapshot = self.vigente()
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            # Otro hilo pudo haberlo armado mientras esperábamos el lock
+            if self._snapshot is not None:
+                return self._snapshot
+            self._version += 1
+            snapshot = SnapshotCatalogo.armar(self._version, *cargar())
+            self._snapshot = snapshot
+            if self.ttl_segundos:
+                self._vence = self._reloj() + self.ttl_segundos
+            self.construcciones += 1
+            return snapshot
+
+    def invalidar(self) -> None:
+        with self._lock:
+            self._snapshot = None
+            self._vence = None
+            self.invalidaciones += 1
+
+    def update(self, evt) -> None:
+        """Observer: una provincia, barrio o especialidad nueva cambia el catálogo"""
+        if getattr(evt, "tipo", "desconocido") == "catalogo.ampliado":
+            self.invalidar()
@@ -0,0 +1,16 @@
+from __future__ import annotations
+import unicodedata
+
+"""
+Normalización de texto para comparaciones de búsqueda.
+
+La misma función se usa al escribir las columnas `nombre_normalizado` del
+catálogo, al armar los filtros del repositorio y en el índice en memoria,
+así "Cordoba", "CÓRDOBA" y "Córdoba" se comparan igual en todos lados.
+"""
+
+
+def normalizar_texto(texto: str) -> str:
+    """Normaliza texto removiendo acentos y convirtiendo a minúsculas"""
+    nfkd = unicodedata.normalize("NFD", texto)
+    return "".join([c for c in nfkd if not unicodedata.combining(c)]).lower()
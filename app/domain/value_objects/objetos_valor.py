@@ -25,6 +25,25 @@ class Ubicacion:
             raise ValueError("longitud fuera de rango [-180, 180]")
 
 
+# Máscara de días: bit (dia - 1) por cada DiaSemana (lunes = 1, ..., domingo = 64).
+# La tabla precalculada hace que leer la máscara sea un acceso por índice.
+_DIAS_POR_MASCARA = tuple(
+    tuple(dia for dia in DiaSemana if mascara & (1 << (dia - 1)))
+    for mascara in range(128)
+)
+
+
+def dias_a_mascara(dias: List[DiaSemana]) -> int:
+    mascara = 0
+    for dia in dias:
+        mascara |= 1 << (DiaSemana(dia) - 1)
+    return mascara
+
+
+def mascara_a_dias(mascara: int) -> List[DiaSemana]:
+    return list(_DIAS_POR_MASCARA[mascara])
+
+
 @dataclass(frozen=True)
 class Disponibilidad:
     dias_semana: List[DiaSemana]
@@ -35,6 +54,35 @@ class Disponibilidad:
         if self.hora_inicio >= self.hora_fin:
             raise ValueError("hora_inicio debe ser < hora_fin")
 
+    @classmethod
+    def desde_mascara(
+        cls, mascara: int, hora_inicio: time, hora_fin: time
+    ) -> "Disponibilidad":
+        return cls(
+            dias_semana=mascara_a_dias(mascara),
+            hora_inicio=hora_inicio,
+            hora_fin=hora_fin,
+        )
+
+    @property
+    def mascara(self) -> int:
+        return dias_a_mascara(self.dias_semana)
+
+    def cubre(
+        self,
+        dia: DiaSemana,
+        desde: Optional[time] = None,
+        hasta: Optional[time] = None,
+    ) -> bool:
+        """True si atiende ese día y la franja [desde, hasta] entra en su horario"""
+        if not self.mascara & (1 << (dia - 1)):
+            return False
+        if desde is not None and desde < self.hora_inicio:
+            return False
+        if hasta is not None and hasta > self.hora_fin:
+            return False
+        return True
+
 
 @dataclass(frozen=True)
 class Vigencia:
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import uuid
-from datetime import date, time
-from typing import List, Dict, Any, TYPE_CHECKING
+from datetime import date, datetime, time, timezone
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 
 from sqlalchemy import (
     CheckConstraint,
+    DateTime,
     Index,
     ForeignKey,
     JSON,
+    SmallInteger,
     Text,
     UniqueConstraint,
     text,
@@ -16,6 +18,8 @@ from sqlalchemy import (
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.domain.enumeraciones import DiaSemana
+from app.domain.value_objects.objetos_valor import dias_a_mascara, mascara_a_dias
 from .base import Base, SCHEMA
 
 if TYPE_CHECKING:
@@ -28,6 +32,7 @@ class DisponibilidadORM(Base):
     __tablename__ = "disponibilidad"
     __table_args__ = (
         CheckConstraint("hora_inicio < hora_fin", name="ck_disp_horas"),
+        CheckConstraint("dias_mascara BETWEEN 0 AND 127", name="ck_disp_dias_mascara"),
         Index("ix_disp_profesional", "profesional_id"),
         {"schema": SCHEMA},
     )
@@ -42,7 +47,8 @@ class DisponibilidadORM(Base):
         ForeignKey(f"{SCHEMA}.profesional.id", ondelete="CASCADE"),
         nullable=False,
     )
-    dias_semana_text: Mapped[str] = mapped_column("dias_semana", Text, nullable=False)
+    # Bit (dia - 1) por cada DiaSemana: lunes = 1, martes = 2, ..., domingo = 64
+    dias_mascara: Mapped[int] = mapped_column(SmallInteger, nullable=False)
     hora_inicio: Mapped[time] = mapped_column(nullable=False)
     hora_fin: Mapped[time] = mapped_column(nullable=False)
 
@@ -51,12 +57,15 @@ class DisponibilidadORM(Base):
     )
 
     @property
-    def dias_semana(self) -> list[str]:
-        return [s for s in (self.dias_semana_text or "").split(",") if s]
+    def dias_semana(self) -> list[DiaSemana]:
+        return mascara_a_dias(self.dias_mascara or 0)
 
     @dias_semana.setter
-    def dias_semana(self, value: list[str]) -> None:
-        self.dias_semana_text = ",".join(value or [])
+    def dias_semana(self, value: list[DiaSemana]) -> None:
+        self.dias_mascara = dias_a_mascara(value or [])
+
+
+EXCLUSION_SOLAPAMIENTO = "ex_consulta_solapamiento"
 
 
 class EstadoConsultaORM(Base):
@@ -72,6 +81,9 @@ class EstadoConsultaORM(Base):
 
 
 class ConsultaORM(Base):
+    # En Postgres, la migración 20251126_1000_consulta_sin_solapamiento agrega
+    # la restricción de exclusión EXCLUSION_SOLAPAMIENTO (GiST): dos consultas
+    # no canceladas del mismo profesional no pueden solaparse
     __tablename__ = "consulta"
     __table_args__ = (
         CheckConstraint("hora_inicio < hora_fin", name="ck_consulta_horas"),
@@ -113,6 +125,11 @@ class ConsultaORM(Base):
     )
 
     notas: Mapped[str] = mapped_column(Text, nullable=False, server_default=text("''"))
+    # Copia de estado == cancelada (la restricción de exclusión no puede
+    # consultar estado_consulta); la mantiene ConsultaRepository
+    cancelada: Mapped[bool] = mapped_column(
+        nullable=False, server_default=text("false")
+    )
 
     paciente: Mapped["PacienteORM"] = relationship(
         "PacienteORM", back_populates="consultas"
@@ -131,9 +148,25 @@ class ConsultaORM(Base):
     )
 
 
+def _ahora() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class EventoORM(Base):
+    """
+    Outbox de eventos de consultas: se escriben en la transacción del cambio
+    y el despachador los entrega (despachado_en NULL = pendiente).
+    """
+
     __tablename__ = "evento"
-    __table_args__ = ({"schema": SCHEMA},)
+    __table_args__ = (
+        Index(
+            "ix_evento_pendiente",
+            "proximo_intento",
+            postgresql_where=text("despachado_en IS NULL"),
+        ),
+        {"schema": SCHEMA},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -151,6 +184,21 @@ class EventoORM(Base):
 
     datos: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
 
+    creado_en: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=_ahora
+    )
+    despachado_en: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    intentos: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default=text("0")
+    )
+    # Los fallidos se reintentan desde acá (espera creciente)
+    proximo_intento: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=_ahora
+    )
+    ultimo_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
     consulta: Mapped["ConsultaORM"] = relationship(
         "ConsultaORM",
         back_populates="eventos",
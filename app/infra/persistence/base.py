@@ -1,11 +1,34 @@
 from __future__ import annotations
 
-from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import MetaData
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import DeclarativeBase, validates
+from sqlalchemy import MetaData, Text
+
+from app.domain.texto import normalizar_texto
 
 SCHEMA = "athome"
 metadata = MetaData(schema=SCHEMA)
 
+# Columnas `busqueda` de texto libre. En PostgreSQL las completa un trigger
+# (migración 20251124_1000_busqueda_texto); en SQLite quedan vacías y la
+# búsqueda por texto usa el ranking BM25 en memoria (app.domain.bm25).
+TsVector = TSVECTOR().with_variant(Text(), "sqlite")
+
 
 class Base(DeclarativeBase):
     metadata = metadata
+
+
+class NombreNormalizadoMixin:
+    """
+    Mantiene `nombre_normalizado` (sin acentos, minúsculas) al asignar `nombre`.
+
+    Las búsquedas filtran por esa columna con LIKE, que en PostgreSQL usa un
+    índice GIN de trigramas. Las inserciones por SQL crudo (seeds) las cubre
+    el trigger que crea la migración 20251122_1000_nombre_normalizado.
+    """
+
+    @validates("nombre")
+    def _normalizar_nombre(self, key, nombre):
+        self.nombre_normalizado = normalizar_texto(nombre) if nombre else nombre
+        return nombre
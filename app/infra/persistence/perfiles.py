@@ -3,11 +3,12 @@ from __future__ import annotations
 import uuid
 from typing import List, Optional, TYPE_CHECKING
 
-from sqlalchemy import UniqueConstraint, ForeignKey, text
+from sqlalchemy import UniqueConstraint, Float, ForeignKey, Index, Integer, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base, SCHEMA
+from app.domain.ranking import PUNTAJE_INICIAL
+from .base import Base, SCHEMA, TsVector
 from .servicios import (
     profesional_especialidad,
 )
@@ -27,6 +28,8 @@ class ProfesionalORM(Base):
     __tablename__ = "profesional"
     __table_args__ = (
         UniqueConstraint("usuario_id", name="uq_profesional_usuario"),
+        Index("ix_profesional_busqueda", "busqueda", postgresql_using="gin"),
+        Index("ix_profesional_puntaje", text("puntaje DESC"), "id"),
         {"schema": SCHEMA},
     )
 
@@ -52,6 +55,21 @@ class ProfesionalORM(Base):
     verificado: Mapped[bool] = mapped_column(
         nullable=False, server_default=text("false")
     )
+    # Resumen de valoraciones, mantenido por ValoracionRepository en cada
+    # alta/edición/baja, y puntaje de ranking derivado (app.domain.ranking)
+    valoraciones_cantidad: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("0")
+    )
+    valoraciones_suma: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("0")
+    )
+    puntaje: Mapped[float] = mapped_column(
+        Float, nullable=False, server_default=text(str(PUNTAJE_INICIAL))
+    )
+    # Perfil para la búsqueda por texto: nombre y apellido del usuario (peso A)
+    busqueda: Mapped[Optional[str]] = mapped_column(
+        TsVector, nullable=True, deferred=True
+    )
 
     usuario: Mapped["UsuarioORM"] = relationship("UsuarioORM")
     direccion: Mapped[Optional["DireccionORM"]] = relationship("DireccionORM")
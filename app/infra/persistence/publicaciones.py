@@ -1,14 +1,14 @@
 from __future__ import annotations
 
 import uuid
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 from datetime import date
 
 from sqlalchemy import ForeignKey, text, Integer, Text, Date, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base, SCHEMA
+from .base import Base, SCHEMA, TsVector
 
 if TYPE_CHECKING:
     from .perfiles import ProfesionalORM
@@ -20,6 +20,7 @@ class PublicacionORM(Base):
     __table_args__ = (
         Index("ix_pub_profesional", "profesional_id"),
         Index("ix_pub_especialidad", "especialidad_id"),
+        Index("ix_pub_busqueda", "busqueda", postgresql_using="gin"),
         {"schema": SCHEMA},
     )
 
@@ -41,6 +42,10 @@ class PublicacionORM(Base):
     titulo: Mapped[str] = mapped_column(Text, nullable=False)
     descripcion: Mapped[str] = mapped_column(Text, nullable=False)
     fecha_publicacion: Mapped[date] = mapped_column(Date, nullable=False)
+    # titulo (peso A) + descripcion (peso B), configuración 'spanish'
+    busqueda: Mapped[Optional[str]] = mapped_column(
+        TsVector, nullable=True, deferred=True
+    )
 
     profesional: Mapped["ProfesionalORM"] = relationship(
         "ProfesionalORM", back_populates="publicaciones"
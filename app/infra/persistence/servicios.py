@@ -8,20 +8,29 @@ from sqlalchemy import Table, Column, Integer, Numeric, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, VARCHAR as Varchar
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base, SCHEMA
+from .base import Base, NombreNormalizadoMixin, SCHEMA
 
 if TYPE_CHECKING:
     from .perfiles import ProfesionalORM
 
 
-class EspecialidadORM(Base):
+class EspecialidadORM(NombreNormalizadoMixin, Base):
     __tablename__ = "especialidad"
-    __table_args__ = ({"schema": SCHEMA},)
+    __table_args__ = (
+        Index(
+            "ix_especialidad_nombre_normalizado_trgm",
+            "nombre_normalizado",
+            postgresql_using="gin",
+            postgresql_ops={"nombre_normalizado": "gin_trgm_ops"},
+        ),
+        {"schema": SCHEMA},
+    )
 
     id_especialidad: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True
     )
     nombre: Mapped[str] = mapped_column(Varchar(80), nullable=False, unique=True)
+    nombre_normalizado: Mapped[str] = mapped_column(Varchar(80), nullable=False)
     descripcion: Mapped[str] = mapped_column(Text, nullable=False)
     tarifa: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
 
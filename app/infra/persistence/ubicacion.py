@@ -14,13 +14,19 @@ from sqlalchemy import (
 from sqlalchemy.dialects.postgresql import UUID, VARCHAR as Varchar
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base, SCHEMA
+from .base import Base, NombreNormalizadoMixin, SCHEMA
 
 
-class ProvinciaORM(Base):
+class ProvinciaORM(NombreNormalizadoMixin, Base):
     __tablename__ = "provincia"
     __table_args__ = (
         UniqueConstraint("nombre", name="uq_provincia_nombre"),
+        Index(
+            "ix_provincia_nombre_normalizado_trgm",
+            "nombre_normalizado",
+            postgresql_using="gin",
+            postgresql_ops={"nombre_normalizado": "gin_trgm_ops"},
+        ),
         {"schema": SCHEMA},
     )
 
@@ -30,19 +36,26 @@ class ProvinciaORM(Base):
         server_default=text("gen_random_uuid()"),
     )
     nombre: Mapped[str] = mapped_column(Varchar(50), nullable=False)
+    nombre_normalizado: Mapped[str] = mapped_column(Varchar(50), nullable=False)
 
     departamentos: Mapped[List["DepartamentoORM"]] = relationship(
         back_populates="provincia", cascade="all, delete-orphan"
     )
 
 
-class DepartamentoORM(Base):
+class DepartamentoORM(NombreNormalizadoMixin, Base):
     __tablename__ = "departamento"
     __table_args__ = (
         UniqueConstraint(
             "provincia_id", "nombre", name="uq_departamento_provincia_nombre"
         ),
         Index("ix_departamento_provincia", "provincia_id"),
+        Index(
+            "ix_departamento_nombre_normalizado_trgm",
+            "nombre_normalizado",
+            postgresql_using="gin",
+            postgresql_ops={"nombre_normalizado": "gin_trgm_ops"},
+        ),
         {"schema": SCHEMA},
     )
 
@@ -57,6 +70,7 @@ class DepartamentoORM(Base):
         nullable=False,
     )
     nombre: Mapped[str] = mapped_column(Varchar(50), nullable=False)
+    nombre_normalizado: Mapped[str] = mapped_column(Varchar(50), nullable=False)
 
     provincia: Mapped["ProvinciaORM"] = relationship(back_populates="departamentos")
     barrios: Mapped[List["BarrioORM"]] = relationship(
@@ -64,13 +78,19 @@ class DepartamentoORM(Base):
     )
 
 
-class BarrioORM(Base):
+class BarrioORM(NombreNormalizadoMixin, Base):
     __tablename__ = "barrio"
     __table_args__ = (
         UniqueConstraint(
             "departamento_id", "nombre", name="uq_barrio_departamento_nombre"
         ),
         Index("ix_barrio_departamento", "departamento_id"),
+        Index(
+            "ix_barrio_nombre_normalizado_trgm",
+            "nombre_normalizado",
+            postgresql_using="gin",
+            postgresql_ops={"nombre_normalizado": "gin_trgm_ops"},
+        ),
         {"schema": SCHEMA},
     )
 
@@ -85,6 +105,7 @@ class BarrioORM(Base):
         nullable=False,
     )
     nombre: Mapped[str] = mapped_column(Varchar(50), nullable=False)
+    nombre_normalizado: Mapped[str] = mapped_column(Varchar(50), nullable=False)
 
     departamento: Mapped["DepartamentoORM"] = relationship(back_populates="barrios")
     direcciones: Mapped[List["DireccionORM"]] = relationship(
@@ -96,6 +117,12 @@ class DireccionORM(Base):
     __tablename__ = "direccion"
     __table_args__ = (
         Index("ix_direccion_barrio", "barrio_id"),
+        Index(
+            "ix_direccion_lat_lon",
+            "latitud",
+            "longitud",
+            postgresql_where=text("latitud IS NOT NULL"),
+        ),
         CheckConstraint(
             "(latitud is null and longitud is null) or (latitud between -90 and 90 and longitud between -180 and 180)",
             name="ck_dir_latlon",
@@ -5,6 +5,7 @@ from datetime import datetime
 from sqlalchemy import (
     UniqueConstraint,
     CheckConstraint,
+    Index,
     text,
     DateTime,
     String,
@@ -30,6 +31,7 @@ class UsuarioORM(Base):
             "(es_profesional = TRUE) OR (es_solicitante = TRUE)",
             name="ck_usuario_al_menos_un_rol",
         ),
+        Index("ix_usuario_apellido_id", "apellido", "id"),
         {"schema": SCHEMA},
     )
 
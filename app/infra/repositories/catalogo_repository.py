@@ -14,12 +14,20 @@ from uuid import UUID
 from decimal import Decimal
 from datetime import date
 
-from app.domain.entities.catalogo import Especialidad, Publicacion
+from app.domain.entities.catalogo import (
+    SUGERENCIA_ESPECIALIDAD,
+    Especialidad,
+    Publicacion,
+    Sugerencia,
+)
+from app.domain.eventos import CatalogoAmpliado
+from app.domain.observers.observadores import Subject
+from app.domain.texto import normalizar_texto
 from app.infra.persistence.servicios import EspecialidadORM
 from app.infra.persistence.publicaciones import PublicacionORM
 
 
-class CatalogoRepository:
+class CatalogoRepository(Subject):
     """
     Repositorio para gestionar especialidades, publicaciones y tarifas.
 
@@ -27,9 +35,13 @@ class CatalogoRepository:
     - Listar y buscar especialidades
     - Crear y consultar publicaciones de profesionales
     - Obtener tarifas vigentes por especialidad
+
+    Es también un Subject: cada especialidad nueva se notifica como
+    CatalogoAmpliado (lo escucha el autocompletado).
     """
 
     def __init__(self, session: Session):
+        super().__init__()
         self.session = session
 
     def _especialidad_to_domain(self, orm: EspecialidadORM) -> Especialidad:
@@ -60,6 +72,15 @@ class CatalogoRepository:
         )
         return [self._especialidad_to_domain(orm) for orm in orms]
 
+    def listar_sugerencias(self) -> List[Sugerencia]:
+        """Las especialidades como opciones de autocompletado"""
+        return [
+            Sugerencia(SUGERENCIA_ESPECIALIDAD, id, nombre)
+            for id, nombre in self.session.query(
+                EspecialidadORM.id_especialidad, EspecialidadORM.nombre
+            )
+        ]
+
     def obtener_especialidad_por_id(self, id: int) -> Optional[Especialidad]:
         """
         Busca una especialidad por su ID.
@@ -79,7 +100,7 @@ class CatalogoRepository:
 
     def obtener_especialidad_por_nombre(self, nombre: str) -> Optional[Especialidad]:
         """
-        Busca una especialidad por su nombre (case-insensitive).
+        Busca una especialidad por su nombre (sin distinguir mayúsculas ni acentos).
 
         Args:
             nombre: Nombre de la especialidad
@@ -89,7 +110,7 @@ class CatalogoRepository:
         """
         orm = (
             self.session.query(EspecialidadORM)
-            .filter(EspecialidadORM.nombre.ilike(nombre))
+            .filter(EspecialidadORM.nombre_normalizado == normalizar_texto(nombre))
             .first()
         )
         return self._especialidad_to_domain(orm) if orm else None
@@ -123,7 +144,15 @@ class CatalogoRepository:
         self.session.add(orm)
         self.session.flush()
 
-        return self._especialidad_to_domain(orm)
+        especialidad = self._especialidad_to_domain(orm)
+        self.notify(
+            CatalogoAmpliado(
+                Sugerencia(
+                    SUGERENCIA_ESPECIALIDAD, especialidad.id, especialidad.nombre
+                )
+            )
+        )
+        return especialidad
 
     def listar_publicaciones_por_profesional(
         self, profesional_id: UUID
@@ -1,18 +1,65 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import hashlib
+import os
+from threading import Lock
+from time import sleep
+from weakref import WeakKeyDictionary
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.orm import Session, aliased
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from uuid import UUID
-from datetime import date
+from datetime import date, time
 
-from app.domain.entities.agenda import Cita
+from app.domain.entities.agenda import (
+    Agenda,
+    AgendaOcupada,
+    Cita,
+    HorarioNoDisponible,
+)
 from app.domain.enumeraciones import EstadoCita
 from app.domain.value_objects.objetos_valor import Ubicacion
 from app.domain.eventos import Event
 from app.infra.persistence.agenda import (
+    EXCLUSION_SOLAPAMIENTO,
     ConsultaORM,
     EventoORM,
     EstadoConsultaORM,
 )
-from app.infra.persistence.perfiles import ProfesionalORM
+from app.infra.persistence.paciente import PacienteORM
+from app.infra.persistence.perfiles import ProfesionalORM, SolicitanteORM
+from app.infra.persistence.usuarios import UsuarioORM
+
+# Espera máxima por la agenda de un profesional (otra reserva del mismo día
+# en curso) y reintentos antes de rendirse con AgendaOcupada
+ESPERA_BLOQUEO_MS = int(os.getenv("CONSULTA_ESPERA_BLOQUEO_MS", "2000"))
+REINTENTOS_RESERVA = 3
+PAUSA_REINTENTO_S = 0.05
+
+# SQLSTATE de Postgres que justifican reintentar la transacción entera:
+# serialization_failure, deadlock_detected y lock_not_available (lock_timeout)
+_CODIGOS_REINTENTABLES = {"40001", "40P01", "55P03"}
+
+
+def clave_agenda(profesional_id: UUID, fecha: date) -> int:
+    """Clave bigint de pg_advisory_xact_lock para la agenda de un profesional en un día"""
+    resumen = hashlib.blake2b(
+        f"{profesional_id}:{fecha.isoformat()}".encode(), digest_size=8
+    ).digest()
+    return int.from_bytes(resumen, "big", signed=True)
+
+
+# Estados que no ocupan ni siguen activa una consulta (filtro solo_activas)
+ESTADOS_INACTIVOS = (EstadoCita.CANCELADA, EstadoCita.COMPLETADA)
+
+# Catálogo estado_consulta (código → id) de cada base, compartido por todas
+# las sesiones del proceso: son pocas filas que no cambian en ejecución
+_estados_por_motor: "WeakKeyDictionary[object, Dict[str, int]]" = WeakKeyDictionary()
+_estados_lock = Lock()
+
+
+def _codigo_sql(error: DBAPIError) -> Optional[str]:
+    """SQLSTATE del error del driver (psycopg2: pgcode, psycopg 3: sqlstate)"""
+    return getattr(error.orig, "pgcode", None) or getattr(error.orig, "sqlstate", None)
 
 
 class ConsultaRepository:
@@ -34,7 +81,7 @@ class ConsultaRepository:
         Returns:
             Entidad Cita del dominio
         """
-        estado_codigo = orm.estado.codigo if orm.estado else "pendiente"
+        estado_codigo = self._codigo_estado(orm.estado_id) or "pendiente"
 
         ubicacion = None
         if orm.direccion_servicio:
@@ -72,18 +119,7 @@ class ConsultaRepository:
         Returns:
             Modelo ORM de la consulta
         """
-        estado_orm = (
-            self.session.query(EstadoConsultaORM)
-            .filter(EstadoConsultaORM.codigo == cita.estado.value)
-            .first()
-        )
-
-        if not estado_orm:
-            estado_orm = EstadoConsultaORM(
-                codigo=cita.estado.value, descripcion=cita.estado.value.upper()
-            )
-            self.session.add(estado_orm)
-            self.session.flush()
+        estado_id = self._id_estado(cita.estado)
 
         if orm is None:
             orm = ConsultaORM(
@@ -93,18 +129,156 @@ class ConsultaRepository:
                 fecha=cita.fecha,
                 hora_inicio=cita.hora_inicio,
                 hora_fin=cita.hora_fin,
-                estado_id=estado_orm.id,
+                estado_id=estado_id,
                 notas=cita.notas,
             )
         else:
             orm.fecha = cita.fecha
             orm.hora_inicio = cita.hora_inicio
             orm.hora_fin = cita.hora_fin
-            orm.estado_id = estado_orm.id
+            orm.estado_id = estado_id
             orm.notas = cita.notas
 
+        orm.cancelada = cita.estado == EstadoCita.CANCELADA
         return orm
 
+    def _estados(self, recargar: bool = False) -> Dict[str, int]:
+        """
+        Código → id de estado_consulta de la base de esta sesión: se lee una
+        vez por motor (y se vuelve a leer con `recargar`, ante un id o código
+        que no figura).
+        """
+        bind = self.session.get_bind()
+        motor = getattr(bind, "engine", bind)
+        with _estados_lock:
+            estados = _estados_por_motor.get(motor)
+        if estados is None or recargar:
+            estados = dict(
+                self.session.execute(
+                    select(EstadoConsultaORM.codigo, EstadoConsultaORM.id)
+                ).all()
+            )
+            with _estados_lock:
+                _estados_por_motor[motor] = estados
+        return estados
+
+    def _codigo_estado(self, estado_id: Optional[int]) -> Optional[str]:
+        if estado_id is None:
+            return None
+        for recargar in (False, True):
+            for codigo, id_ in self._estados(recargar).items():
+                if id_ == estado_id:
+                    return codigo
+        return None
+
+    def _id_estado(self, estado: EstadoCita) -> int:
+        """
+        Id de estado_consulta para `estado`. Si la base todavía no lo tiene
+        se crea en un savepoint; si otra sesión lo creó a la vez, la
+        restricción única lo rechaza y se usa el de ella.
+        """
+        estado_id = self._estados().get(estado.value)
+        if estado_id is not None:
+            return estado_id
+        estado_id = self._estados(recargar=True).get(estado.value)
+        if estado_id is not None:
+            return estado_id
+
+        try:
+            with self.session.begin_nested():
+                nuevo = EstadoConsultaORM(
+                    codigo=estado.value, descripcion=estado.value.upper()
+                )
+                self.session.add(nuevo)
+        except IntegrityError:
+            pass
+        return self._estados(recargar=True)[estado.value]
+
+    def _ids_inactivos(self) -> List[int]:
+        estados = self._estados()
+        return [
+            estados[estado.value]
+            for estado in ESTADOS_INACTIVOS
+            if estado.value in estados
+        ]
+
+    def _bloquear_agenda(self, profesional_id: UUID, fecha: date) -> None:
+        """
+        Toma el advisory lock de la agenda del profesional en `fecha` hasta el
+        fin de la transacción, esperando a lo sumo ESPERA_BLOQUEO_MS.
+        """
+        self.session.execute(text(f"SET LOCAL lock_timeout = {ESPERA_BLOQUEO_MS}"))
+        self.session.execute(
+            select(func.pg_advisory_xact_lock(clave_agenda(profesional_id, fecha)))
+        )
+
+    def _guardar(
+        self,
+        cita: Cita,
+        aplicar: Callable[[], ConsultaORM],
+        ocupa_agenda: bool = True,
+    ) -> ConsultaORM:
+        """
+        Escribe el alta o la modificación de `cita` (lo que hace `aplicar`) y
+        confirma. Con `ocupa_agenda` en False (un cambio que no toca el
+        horario) no se bloquea ni se verifica la agenda.
+
+        En Postgres:
+        - Las escrituras sobre un mismo profesional y día se serializan con
+          pg_advisory_xact_lock (se libera con el commit o el rollback): dos
+          reservas simultáneas del mismo horario se resuelven en orden y la
+          segunda recibe HorarioNoDisponible.
+        - El solapamiento lo rechaza la restricción de exclusión en el mismo
+          INSERT/UPDATE, sin leer antes la agenda.
+        - Si se agota la espera del lock, hay deadlock o falla de
+          serialización, se deshace y se reintenta la transacción completa.
+
+        En otros motores (SQLite en los tests) no hay restricción ni lock, así
+        que el solapamiento se verifica contra la Agenda del día.
+
+        Raises:
+            HorarioNoDisponible: Si se solapa con otra consulta del profesional
+            AgendaOcupada: Si tras REINTENTOS_RESERVA intentos no obtuvo la agenda
+        """
+        es_postgres = self.session.get_bind().dialect.name == "postgresql"
+        ocupa_agenda = ocupa_agenda and cita.estado != EstadoCita.CANCELADA
+        conflicto = HorarioNoDisponible(
+            cita.profesional_id, cita.fecha, cita.hora_inicio, cita.hora_fin
+        )
+
+        for intento in range(1, REINTENTOS_RESERVA + 1):
+            try:
+                if es_postgres and ocupa_agenda:
+                    self._bloquear_agenda(cita.profesional_id, cita.fecha)
+
+                orm = aplicar()
+
+                if (
+                    not es_postgres
+                    and ocupa_agenda
+                    and not self.obtener_agenda(
+                        cita.profesional_id, cita.fecha
+                    ).disponible(
+                        cita.fecha, cita.hora_inicio, cita.hora_fin, excluir_id=cita.id
+                    )
+                ):
+                    self.session.rollback()
+                    raise conflicto
+
+                self.session.commit()
+                return orm
+            except DBAPIError as e:
+                self.session.rollback()
+                if EXCLUSION_SOLAPAMIENTO in str(e.orig):
+                    raise conflicto from e
+                if _codigo_sql(e) not in _CODIGOS_REINTENTABLES:
+                    raise
+                if intento == REINTENTOS_RESERVA:
+                    raise AgendaOcupada(
+                        cita.profesional_id, cita.fecha, cita.hora_inicio, cita.hora_fin
+                    ) from e
+                sleep(PAUSA_REINTENTO_S * intento)
+
     def obtener_por_id(self, id: UUID) -> Optional[Cita]:
         """
         Obtiene una cita por su ID.
@@ -149,14 +323,112 @@ class ConsultaRepository:
             query = query.filter(ConsultaORM.fecha <= hasta)
 
         if solo_activas:
-            query = query.join(EstadoConsultaORM).filter(
-                EstadoConsultaORM.codigo.notin_(["cancelada", "completada"])
-            )
+            query = query.filter(ConsultaORM.estado_id.notin_(self._ids_inactivos()))
 
         query = query.order_by(ConsultaORM.fecha, ConsultaORM.hora_inicio)
 
         return [self._to_domain(orm) for orm in query.all()]
 
+    def listar_ocupadas(
+        self, profesional_id: UUID, desde: date, hasta: date
+    ) -> List[Tuple[date, time, time]]:
+        """
+        (fecha, hora_inicio, hora_fin) de las consultas no canceladas del
+        profesional entre `desde` y `hasta`, ordenadas: una query de columnas,
+        sin hidratar las citas.
+        """
+        return [
+            tuple(fila)
+            for fila in self.session.execute(
+                select(ConsultaORM.fecha, ConsultaORM.hora_inicio, ConsultaORM.hora_fin)
+                .where(
+                    ConsultaORM.profesional_id == profesional_id,
+                    ConsultaORM.fecha.between(desde, hasta),
+                    ConsultaORM.cancelada.is_(False),
+                )
+                .order_by(ConsultaORM.fecha, ConsultaORM.hora_inicio)
+            )
+        ]
+
+    def obtener_agenda(
+        self, profesional_id: UUID, desde: date, hasta: Optional[date] = None
+    ) -> Agenda:
+        """
+        Agenda del profesional con sus consultas no canceladas entre `desde` y
+        `hasta` (por defecto, sólo `desde`): una query de columnas.
+        """
+        filas = self.session.execute(
+            select(
+                ConsultaORM.id,
+                ConsultaORM.fecha,
+                ConsultaORM.hora_inicio,
+                ConsultaORM.hora_fin,
+            ).where(
+                ConsultaORM.profesional_id == profesional_id,
+                ConsultaORM.fecha.between(desde, hasta or desde),
+                ConsultaORM.cancelada.is_(False),
+            )
+        )
+        return Agenda(profesional_id, (tuple(fila) for fila in filas))
+
+    def ocupadas_en_fecha(
+        self, profesional_ids: Iterable[UUID], fecha: date
+    ) -> Dict[UUID, List[Tuple[time, time]]]:
+        """
+        (hora_inicio, hora_fin) de las consultas no canceladas de `fecha` de
+        cada profesional de `profesional_ids`: una query para todos.
+        """
+        profesional_ids = list(profesional_ids)
+        ocupadas: Dict[UUID, List[Tuple[time, time]]] = {}
+        if not profesional_ids:
+            return ocupadas
+        filas = self.session.execute(
+            select(
+                ConsultaORM.profesional_id,
+                ConsultaORM.hora_inicio,
+                ConsultaORM.hora_fin,
+            ).where(
+                ConsultaORM.profesional_id.in_(profesional_ids),
+                ConsultaORM.fecha == fecha,
+                ConsultaORM.cancelada.is_(False),
+            )
+        )
+        for profesional_id, hora_inicio, hora_fin in filas:
+            ocupadas.setdefault(profesional_id, []).append((hora_inicio, hora_fin))
+        return ocupadas
+
+    def destinatarios(self, consulta_ids: Iterable[UUID]) -> Dict[UUID, List[str]]:
+        """
+        Emails a notificar de cada consulta de `consulta_ids` (el profesional
+        y el solicitante del paciente): una query para todas.
+        """
+        consulta_ids = list(consulta_ids)
+        if not consulta_ids:
+            return {}
+        usuario_profesional = aliased(UsuarioORM)
+        usuario_solicitante = aliased(UsuarioORM)
+        filas = self.session.execute(
+            select(
+                ConsultaORM.id,
+                usuario_profesional.email,
+                usuario_solicitante.email,
+            )
+            .join(ProfesionalORM, ProfesionalORM.id == ConsultaORM.profesional_id)
+            .join(
+                usuario_profesional, usuario_profesional.id == ProfesionalORM.usuario_id
+            )
+            .join(PacienteORM, PacienteORM.id == ConsultaORM.paciente_id)
+            .join(SolicitanteORM, SolicitanteORM.id == PacienteORM.solicitante_id)
+            .join(
+                usuario_solicitante, usuario_solicitante.id == SolicitanteORM.usuario_id
+            )
+            .where(ConsultaORM.id.in_(consulta_ids))
+        )
+        return {
+            consulta_id: [email_profesional, email_solicitante]
+            for consulta_id, email_profesional, email_solicitante in filas
+        }
+
     def listar_por_paciente(
         self, paciente_id: UUID, desde: date = None, solo_activas: bool = False
     ) -> List[Cita]:
@@ -179,27 +451,44 @@ class ConsultaRepository:
             query = query.filter(ConsultaORM.fecha >= desde)
 
         if solo_activas:
-            query = query.join(EstadoConsultaORM).filter(
-                EstadoConsultaORM.codigo.notin_(["cancelada", "completada"])
-            )
+            query = query.filter(ConsultaORM.estado_id.notin_(self._ids_inactivos()))
 
         query = query.order_by(ConsultaORM.fecha.desc(), ConsultaORM.hora_inicio)
 
         return [self._to_domain(orm) for orm in query.all()]
 
-    def crear(self, cita: Cita, direccion_id: Optional[UUID] = None) -> Cita:
+    def _agregar_eventos(self, eventos: Iterable[Event]) -> None:
+        """Encola los eventos en el outbox, dentro de la transacción en curso"""
+        for evento in eventos:
+            self.session.add(self._evento_orm(evento))
+
+    @staticmethod
+    def _evento_orm(evento: Event) -> EventoORM:
+        return EventoORM(
+            consulta_id=evento.cita_id, tipo=evento.tipo, datos=evento.datos
+        )
+
+    def crear(
+        self,
+        cita: Cita,
+        direccion_id: Optional[UUID] = None,
+        eventos: Iterable[Event] = (),
+    ) -> Cita:
         """
         Crea una nueva cita en la base de datos.
 
         Args:
             cita: Entidad Cita del dominio
             direccion_id: UUID de la dirección del servicio
+            eventos: Eventos del alta; se escriben en el outbox en la misma
+                transacción y los entrega el despachador
 
         Returns:
             Cita creada con datos actualizados
-        """
-        orm = self._to_orm(cita)
 
+        Raises:
+            HorarioNoDisponible: Si se solapa con otra consulta del profesional
+        """
         if direccion_id is None:
             prof_orm = (
                 self.session.query(ProfesionalORM)
@@ -212,31 +501,55 @@ class ConsultaRepository:
                 )
             direccion_id = prof_orm.direccion_id
 
-        orm.direccion_servicio_id = direccion_id
+        eventos = list(eventos)
 
-        self.session.add(orm)
-        self.session.commit()
+        def aplicar() -> ConsultaORM:
+            orm = self._to_orm(cita)
+            orm.direccion_servicio_id = direccion_id
+            self.session.add(orm)
+            self._agregar_eventos(eventos)
+            return orm
+
+        orm = self._guardar(cita, aplicar)
         self.session.refresh(orm)
 
         return self._to_domain(orm)
 
-    def actualizar(self, cita: Cita) -> Cita:
+    def actualizar(self, cita: Cita, eventos: Iterable[Event] = ()) -> Cita:
         """
         Actualiza una cita existente.
 
         Args:
             cita: Entidad Cita con datos actualizados
+            eventos: Eventos del cambio, al outbox en la misma transacción
 
         Returns:
             Cita actualizada o None si no existe
+
+        Raises:
+            HorarioNoDisponible: Si el nuevo horario se solapa con otra consulta
         """
         orm = self.session.query(ConsultaORM).filter(ConsultaORM.id == cita.id).first()
 
         if not orm:
             return None
 
-        orm = self._to_orm(cita, orm)
-        self.session.commit()
+        eventos = list(eventos)
+        # Confirmar o completar no mueve la consulta: no hace falta la agenda
+        cambia_horario = orm.cancelada or (
+            orm.profesional_id,
+            orm.fecha,
+            orm.hora_inicio,
+            orm.hora_fin,
+        ) != (cita.profesional_id, cita.fecha, cita.hora_inicio, cita.hora_fin)
+
+        def aplicar() -> ConsultaORM:
+            # Tras un rollback el objeto queda expirado: se vuelve a aplicar
+            orm = self._to_orm(cita, self.session.get(ConsultaORM, cita.id))
+            self._agregar_eventos(eventos)
+            return orm
+
+        orm = self._guardar(cita, aplicar, ocupa_agenda=cambia_horario)
         self.session.refresh(orm)
 
         return self._to_domain(orm)
@@ -261,48 +574,44 @@ class ConsultaRepository:
         return True
 
     def verificar_disponibilidad(
-        self, profesional_id: UUID, fecha: date, hora_inicio, hora_fin
+        self,
+        profesional_id: UUID,
+        fecha: date,
+        hora_inicio,
+        hora_fin,
+        excluir_id: Optional[UUID] = None,
     ) -> bool:
         """
         Verifica si el profesional está disponible en el horario indicado.
 
+        Para informar antes de reservar: crear/actualizar no la necesitan,
+        el solapamiento lo rechaza la base. Lee la agenda del día y la
+        consulta en memoria; para varios horarios del mismo profesional,
+        obtener_agenda y Agenda.conflictos.
+
         Args:
             profesional_id: UUID del profesional
             fecha: Fecha de la cita
             hora_inicio: Hora de inicio
             hora_fin: Hora de fin
+            excluir_id: Consulta a ignorar (la que se está reprogramando)
 
         Returns:
             True si está disponible, False si hay conflicto
         """
-        citas_existentes = (
-            self.session.query(ConsultaORM)
-            .join(EstadoConsultaORM)
-            .filter(
-                ConsultaORM.profesional_id == profesional_id,
-                ConsultaORM.fecha == fecha,
-                EstadoConsultaORM.codigo != "cancelada",
-            )
-            .all()
+        return self.obtener_agenda(profesional_id, fecha).disponible(
+            fecha, hora_inicio, hora_fin, excluir_id=excluir_id
         )
 
-        for cita_orm in citas_existentes:
-            if hora_inicio < cita_orm.hora_fin and hora_fin > cita_orm.hora_inicio:
-                return False
-
-        return True
-
     def guardar_evento(self, evento: Event) -> None:
         """
-        Persiste un evento del dominio.
+        Persiste un evento del dominio en el outbox, en su propia transacción
+        (los de un cambio de consulta van con crear/actualizar).
 
         Args:
             evento: Evento a persistir
         """
-        evento_orm = EventoORM(
-            consulta_id=evento.cita_id, tipo=evento.tipo, datos=evento.datos
-        )
-        self.session.add(evento_orm)
+        self.session.add(self._evento_orm(evento))
         self.session.commit()
 
     def obtener_eventos(self, cita_id: UUID) -> List[Event]:
@@ -1,7 +1,20 @@
+from sqlalchemy import event, insert, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as insert_postgresql
+from sqlalchemy.dialects.sqlite import insert as insert_sqlite
 from sqlalchemy.orm import Session
-from typing import List, Optional, Tuple
-from uuid import UUID
-
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+
+from app.domain.entities.catalogo import (
+    NodoUbicacion,
+    SUGERENCIA_BARRIO,
+    SUGERENCIA_DEPARTAMENTO,
+    SUGERENCIA_PROVINCIA,
+    Sugerencia,
+)
+from app.domain.eventos import CatalogoAmpliado
+from app.domain.observers.observadores import Subject
+from app.domain.texto import normalizar_texto
 from app.domain.value_objects.objetos_valor import Ubicacion
 from app.infra.persistence.ubicacion import (
     ProvinciaORM,
@@ -10,20 +23,52 @@ from app.infra.persistence.ubicacion import (
     DireccionORM,
 )
 
+_MEMO = "direccion_repository.jerarquia"
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _olvidar_jerarquia(session, previous_transaction) -> None:
+    """Los nodos creados en una transacción deshecha ya no existen"""
+    session.info.pop(_MEMO, None)
+
+
+def _ruta(ubicacion: Ubicacion) -> tuple:
+    return (
+        "ruta",
+        normalizar_texto(ubicacion.provincia.strip()),
+        normalizar_texto(ubicacion.departamento.strip()),
+        normalizar_texto(ubicacion.barrio.strip()),
+    )
+
+
+def _clave_direccion(barrio_id: UUID, ubicacion: Ubicacion) -> tuple:
+    return (
+        "direccion",
+        barrio_id,
+        ubicacion.calle.strip().lower(),
+        int(ubicacion.numero),
+    )
+
 
-class DireccionRepository:
+class DireccionRepository(Subject):
     """
     Repositorio para gestionar la jerarquía de ubicaciones:
     Provincia → Departamento → Barrio → Dirección
 
     Permite:
-    - Crear direcciones completas con toda la jerarquía
-    - Buscar o crear elementos de la jerarquía (evita duplicados)
+    - Crear direcciones completas con toda la jerarquía, de a una o muchas
+      a la vez (resolver_muchas)
+    - Buscar o crear elementos de la jerarquía (evita duplicados; lo ya
+      resuelto en la sesión no se vuelve a consultar)
     - Consultar catálogos (provincias, departamentos, barrios)
     - Convertir entre Ubicacion (value object) y DireccionORM
+
+    Es también un Subject: cada provincia, departamento o barrio nuevo se
+    notifica como CatalogoAmpliado (lo escucha el autocompletado).
     """
 
     def __init__(self, session: Session):
+        super().__init__()
         self.session = session
 
     def _to_domain(self, orm: DireccionORM) -> Ubicacion:
@@ -36,26 +81,46 @@ class DireccionRepository:
             numero=str(orm.numero),
         )
 
+    @property
+    def _memo(self) -> Dict[tuple, UUID]:
+        """
+        Ids ya resueltos en esta sesión: (tabla, id del padre, nombre
+        normalizado) para los nodos, ("ruta", provincia, departamento, barrio)
+        para el barrio de una ubicación y ("direccion", barrio_id, calle,
+        número) para las direcciones. Lo comparten todos los repositorios de
+        la sesión y se descarta si la transacción se deshace.
+        """
+        return self.session.info.setdefault(_MEMO, {})
+
+    def _memorizado(self, modelo, clave: tuple):
+        id = self._memo.get(clave)
+        return self.session.get(modelo, id) if id is not None else None
+
     def buscar_o_crear_provincia(self, nombre: str) -> ProvinciaORM:
         """
-        Busca una provincia por nombre (case-insensitive).
+        Busca una provincia por nombre (sin distinguir acentos ni mayúsculas).
         Si no existe, la crea.
         """
         nombre = nombre.strip().title()
+        clave = (ProvinciaORM.__tablename__, None, normalizar_texto(nombre))
 
-        provincia = (
+        provincia = self._memorizado(ProvinciaORM, clave) or (
             self.session.query(ProvinciaORM)
-            .filter(ProvinciaORM.nombre.ilike(nombre))
+            .filter(ProvinciaORM.nombre_normalizado == normalizar_texto(nombre))
             .first()
         )
 
-        if provincia:
-            return provincia
-
-        provincia = ProvinciaORM(nombre=nombre)
-        self.session.add(provincia)
-        self.session.flush()
+        if not provincia:
+            provincia = ProvinciaORM(nombre=nombre)
+            self.session.add(provincia)
+            self.session.flush()
+            self.notify(
+                CatalogoAmpliado(
+                    Sugerencia(SUGERENCIA_PROVINCIA, provincia.id, provincia.nombre)
+                )
+            )
 
+        self._memo[clave] = provincia.id
         return provincia
 
     def buscar_o_crear_departamento(
@@ -67,23 +132,33 @@ class DireccionRepository:
         """
 
         nombre = nombre.strip().title()
+        clave = (DepartamentoORM.__tablename__, provincia.id, normalizar_texto(nombre))
 
-        departamento = (
+        departamento = self._memorizado(DepartamentoORM, clave) or (
             self.session.query(DepartamentoORM)
             .filter(
-                DepartamentoORM.nombre.ilike(nombre),
+                DepartamentoORM.nombre_normalizado == normalizar_texto(nombre),
                 DepartamentoORM.provincia_id == provincia.id,
             )
             .first()
         )
 
-        if departamento:
-            return departamento
-
-        departamento = DepartamentoORM(nombre=nombre, provincia_id=provincia.id)
-        self.session.add(departamento)
-        self.session.flush()
+        if not departamento:
+            departamento = DepartamentoORM(nombre=nombre, provincia_id=provincia.id)
+            self.session.add(departamento)
+            self.session.flush()
+            self.notify(
+                CatalogoAmpliado(
+                    Sugerencia(
+                        SUGERENCIA_DEPARTAMENTO,
+                        departamento.id,
+                        departamento.nombre,
+                        provincia=provincia.nombre,
+                    )
+                )
+            )
 
+        self._memo[clave] = departamento.id
         return departamento
 
     def buscar_o_crear_barrio(
@@ -95,23 +170,34 @@ class DireccionRepository:
         """
 
         nombre = nombre.strip().title()
+        clave = (BarrioORM.__tablename__, departamento.id, normalizar_texto(nombre))
 
-        barrio = (
+        barrio = self._memorizado(BarrioORM, clave) or (
             self.session.query(BarrioORM)
             .filter(
-                BarrioORM.nombre.ilike(nombre),
+                BarrioORM.nombre_normalizado == normalizar_texto(nombre),
                 BarrioORM.departamento_id == departamento.id,
             )
             .first()
         )
 
-        if barrio:
-            return barrio
-
-        barrio = BarrioORM(nombre=nombre, departamento_id=departamento.id)
-        self.session.add(barrio)
-        self.session.flush()
+        if not barrio:
+            barrio = BarrioORM(nombre=nombre, departamento_id=departamento.id)
+            self.session.add(barrio)
+            self.session.flush()
+            self.notify(
+                CatalogoAmpliado(
+                    Sugerencia(
+                        SUGERENCIA_BARRIO,
+                        barrio.id,
+                        barrio.nombre,
+                        provincia=departamento.provincia.nombre,
+                        departamento=departamento.nombre,
+                    )
+                )
+            )
 
+        self._memo[clave] = barrio.id
         return barrio
 
     def crear_con_jerarquia(self, ubicacion: Ubicacion) -> DireccionORM:
@@ -124,6 +210,9 @@ class DireccionRepository:
         - Barrio
         - Dirección
 
+        Lo ya resuelto en la sesión no se vuelve a consultar: una ubicación
+        repetida no hace ninguna query.
+
         Args:
             ubicacion: Value object con los datos de ubicación
 
@@ -141,36 +230,253 @@ class DireccionRepository:
             direccion = repo.crear_con_jerarquia(ubicacion)
         """
 
-        provincia = self.buscar_o_crear_provincia(ubicacion.provincia)
+        ruta = _ruta(ubicacion)
+        barrio_id = self._memo.get(ruta)
+        if barrio_id is None:
+            provincia = self.buscar_o_crear_provincia(ubicacion.provincia)
 
-        departamento = self.buscar_o_crear_departamento(
-            ubicacion.departamento, provincia
-        )
+            departamento = self.buscar_o_crear_departamento(
+                ubicacion.departamento, provincia
+            )
 
-        barrio = self.buscar_o_crear_barrio(ubicacion.barrio, departamento)
+            barrio_id = self.buscar_o_crear_barrio(ubicacion.barrio, departamento).id
+            self._memo[ruta] = barrio_id
 
-        direccion = (
+        clave = _clave_direccion(barrio_id, ubicacion)
+        direccion = self._memorizado(DireccionORM, clave) or (
             self.session.query(DireccionORM)
             .filter(
-                DireccionORM.barrio_id == barrio.id,
+                DireccionORM.barrio_id == barrio_id,
                 DireccionORM.calle.ilike(ubicacion.calle),
                 DireccionORM.numero == int(ubicacion.numero),
             )
             .first()
         )
 
-        if direccion:
-            return direccion
+        if not direccion:
+            direccion = DireccionORM(
+                barrio_id=barrio_id,
+                calle=ubicacion.calle.strip(),
+                numero=int(ubicacion.numero),
+            )
+            self.session.add(direccion)
+            self.session.flush()
+
+        self._memo[clave] = direccion.id
+        return direccion
 
-        direccion = DireccionORM(
-            barrio_id=barrio.id,
-            calle=ubicacion.calle.strip(),
-            numero=int(ubicacion.numero),
-        )
-        self.session.add(direccion)
+    def resolver_muchas(self, ubicaciones: Sequence[Ubicacion]) -> List[DireccionORM]:
+        """
+        Como crear_con_jerarquia para muchas ubicaciones a la vez, con una
+        cantidad fija de queries: por nivel, un SELECT de los nodos que faltan
+        en la sesión y un INSERT … ON CONFLICT DO NOTHING RETURNING con los
+        que no existen; después lo mismo para las direcciones (sin ON
+        CONFLICT: la tabla no tiene clave única) y una carga de los DireccionORM.
+
+        Returns:
+            Las direcciones en el orden de `ubicaciones`
+        """
+        if not ubicaciones:
+            return []
+        # Lo pendiente en la sesión tiene que ser visible para los SELECT
         self.session.flush()
 
-        return direccion
+        nombres = [
+            (
+                u.provincia.strip().title(),
+                u.departamento.strip().title(),
+                u.barrio.strip().title(),
+            )
+            for u in ubicaciones
+        ]
+        rutas = [_ruta(u) for u in ubicaciones]
+
+        provincias = self._resolver_nivel(
+            ProvinciaORM,
+            None,
+            SUGERENCIA_PROVINCIA,
+            {(None, r[1]): (n[0], {}) for r, n in zip(rutas, nombres)},
+        )
+        ids_provincia = [provincias[(None, r[1])] for r in rutas]
+
+        departamentos = self._resolver_nivel(
+            DepartamentoORM,
+            "provincia_id",
+            SUGERENCIA_DEPARTAMENTO,
+            {
+                (p, r[2]): (n[1], {"provincia": n[0]})
+                for p, r, n in zip(ids_provincia, rutas, nombres)
+            },
+        )
+        ids_departamento = [
+            departamentos[(p, r[2])] for p, r in zip(ids_provincia, rutas)
+        ]
+
+        barrios = self._resolver_nivel(
+            BarrioORM,
+            "departamento_id",
+            SUGERENCIA_BARRIO,
+            {
+                (d, r[3]): (n[2], {"provincia": n[0], "departamento": n[1]})
+                for d, r, n in zip(ids_departamento, rutas, nombres)
+            },
+        )
+        ids_barrio = [barrios[(d, r[3])] for d, r in zip(ids_departamento, rutas)]
+        for ruta, barrio_id in zip(rutas, ids_barrio):
+            self._memo[ruta] = barrio_id
+
+        claves = [
+            _clave_direccion(barrio_id, u)
+            for barrio_id, u in zip(ids_barrio, ubicaciones)
+        ]
+        ids = self._resolver_direcciones(dict(zip(claves, ubicaciones)))
+
+        por_id = {
+            d.id: d
+            for d in self.session.query(DireccionORM).filter(
+                DireccionORM.id.in_(set(ids.values()))
+            )
+        }
+        return [por_id[ids[clave]] for clave in claves]
+
+    def _insert(self, modelo):
+        """INSERT del dialecto de la sesión (para ON CONFLICT DO NOTHING)"""
+        if self.session.get_bind().dialect.name == "postgresql":
+            return insert_postgresql(modelo.__table__)
+        return insert_sqlite(modelo.__table__)
+
+    def _resolver_nivel(
+        self,
+        modelo,
+        padre: Optional[str],
+        tipo_sugerencia: str,
+        pedidos: Dict[Tuple[Optional[UUID], str], Tuple[str, dict]],
+    ) -> Dict[Tuple[Optional[UUID], str], UUID]:
+        """
+        Ids de los nodos de un nivel, por (id del padre, nombre normalizado):
+        los de la sesión, después un SELECT y por último un INSERT de los que
+        falten. `pedidos` trae el nombre a guardar y los ancestros para el
+        aviso de cada nodo nuevo.
+        """
+        tabla = modelo.__tablename__
+        ids = {}
+        faltan = {}
+        for clave, pedido in pedidos.items():
+            id = self._memo.get((tabla, *clave))
+            if id is None:
+                faltan[clave] = pedido
+            else:
+                ids[clave] = id
+
+        if faltan:
+            ids.update(self._buscar_nodos(modelo, padre, faltan))
+            nuevos = {c: p for c, p in faltan.items() if c not in ids}
+            if nuevos:
+                creados = self._insertar_nodos(modelo, padre, nuevos)
+                ids.update(creados)
+                for clave, id in creados.items():
+                    nombre, ancestros = nuevos[clave]
+                    self.notify(
+                        CatalogoAmpliado(
+                            Sugerencia(tipo_sugerencia, id, nombre, **ancestros)
+                        )
+                    )
+                # Los que insertó otra transacción entre el SELECT y el INSERT
+                resto = {c: p for c, p in nuevos.items() if c not in ids}
+                if resto:
+                    ids.update(self._buscar_nodos(modelo, padre, resto))
+            for clave in faltan:
+                self._memo[(tabla, *clave)] = ids[clave]
+
+        return ids
+
+    @staticmethod
+    def _columnas_nodo(modelo, padre: Optional[str]) -> list:
+        columnas = [modelo.id, modelo.nombre_normalizado]
+        return columnas + [getattr(modelo, padre)] if padre else columnas
+
+    @staticmethod
+    def _por_clave(filas, padre: Optional[str]) -> Dict:
+        return {(fila[2] if padre else None, fila[1]): fila[0] for fila in filas}
+
+    def _buscar_nodos(self, modelo, padre: Optional[str], claves) -> Dict:
+        if padre is None:
+            condicion = modelo.nombre_normalizado.in_([nombre for _, nombre in claves])
+        else:
+            condicion = tuple_(getattr(modelo, padre), modelo.nombre_normalizado).in_(
+                list(claves)
+            )
+        consulta = select(*self._columnas_nodo(modelo, padre)).where(condicion)
+        return self._por_clave(self.session.execute(consulta), padre)
+
+    def _insertar_nodos(self, modelo, padre: Optional[str], nuevos) -> Dict:
+        filas = [
+            {
+                "nombre": nombre,
+                "nombre_normalizado": clave[1],
+                **({padre: clave[0]} if padre else {}),
+            }
+            for clave, (nombre, _) in nuevos.items()
+        ]
+        consulta = (
+            self._insert(modelo)
+            .values(filas)
+            .on_conflict_do_nothing()
+            .returning(*self._columnas_nodo(modelo, padre))
+        )
+        return self._por_clave(self.session.execute(consulta), padre)
+
+    def _resolver_direcciones(
+        self, pedidos: Dict[tuple, Ubicacion]
+    ) -> Dict[tuple, UUID]:
+        """Ids de las direcciones por clave: de la sesión, un SELECT y un INSERT"""
+        ids = {}
+        faltan = {}
+        for clave, ubicacion in pedidos.items():
+            id = self._memo.get(clave)
+            if id is None:
+                faltan[clave] = ubicacion
+            else:
+                ids[clave] = id
+        if not faltan:
+            return ids
+
+        consulta = select(
+            DireccionORM.id,
+            DireccionORM.barrio_id,
+            DireccionORM.calle,
+            DireccionORM.numero,
+        ).where(
+            tuple_(DireccionORM.barrio_id, DireccionORM.numero).in_(
+                list({(clave[1], clave[3]) for clave in faltan})
+            )
+        )
+        for id, barrio_id, calle, numero in self.session.execute(consulta):
+            clave = ("direccion", barrio_id, calle.strip().lower(), numero)
+            if clave in faltan:
+                ids.setdefault(clave, id)
+
+        # Ids generados acá: RETURNING no garantiza el orden de las filas
+        nuevas = {clave: uuid4() for clave in faltan if clave not in ids}
+        if nuevas:
+            self.session.execute(
+                insert(DireccionORM.__table__).values(
+                    [
+                        {
+                            "id": id,
+                            "barrio_id": clave[1],
+                            "calle": faltan[clave].calle.strip(),
+                            "numero": clave[3],
+                        }
+                        for clave, id in nuevas.items()
+                    ]
+                )
+            )
+            ids.update(nuevas)
+
+        for clave in faltan:
+            self._memo[clave] = ids[clave]
+        return ids
 
     def obtener_por_id(self, id: UUID) -> Optional[DireccionORM]:
         """Obtiene una dirección por su ID"""
@@ -226,6 +532,67 @@ class DireccionRepository:
             .all()
         )
 
+    def listar_jerarquia(
+        self,
+    ) -> Tuple[List[NodoUbicacion], List[NodoUbicacion], List[NodoUbicacion]]:
+        """
+        Provincias, departamentos y barrios completos (ordenados por nombre),
+        para el snapshot de datos de referencia: una query de columnas por nivel.
+        """
+        provincias = [
+            NodoUbicacion(id, nombre)
+            for id, nombre in self.session.query(
+                ProvinciaORM.id, ProvinciaORM.nombre
+            ).order_by(ProvinciaORM.nombre, ProvinciaORM.id)
+        ]
+        departamentos = [
+            NodoUbicacion(id, nombre, padre_id)
+            for id, nombre, padre_id in self.session.query(
+                DepartamentoORM.id, DepartamentoORM.nombre, DepartamentoORM.provincia_id
+            ).order_by(DepartamentoORM.nombre, DepartamentoORM.id)
+        ]
+        barrios = [
+            NodoUbicacion(id, nombre, padre_id)
+            for id, nombre, padre_id in self.session.query(
+                BarrioORM.id, BarrioORM.nombre, BarrioORM.departamento_id
+            ).order_by(BarrioORM.nombre, BarrioORM.id)
+        ]
+        return provincias, departamentos, barrios
+
+    def listar_sugerencias(self) -> List[Sugerencia]:
+        """
+        Toda la jerarquía (provincias, departamentos y barrios, con sus
+        ancestros) para construir el autocompletado: una query por nivel.
+        """
+        sugerencias = [
+            Sugerencia(SUGERENCIA_PROVINCIA, id, nombre)
+            for id, nombre in self.session.query(ProvinciaORM.id, ProvinciaORM.nombre)
+        ]
+        sugerencias.extend(
+            Sugerencia(SUGERENCIA_DEPARTAMENTO, id, nombre, provincia=provincia)
+            for id, nombre, provincia in self.session.query(
+                DepartamentoORM.id, DepartamentoORM.nombre, ProvinciaORM.nombre
+            ).join(DepartamentoORM.provincia)
+        )
+        sugerencias.extend(
+            Sugerencia(
+                SUGERENCIA_BARRIO,
+                id,
+                nombre,
+                provincia=provincia,
+                departamento=departamento,
+            )
+            for id, nombre, departamento, provincia in self.session.query(
+                BarrioORM.id,
+                BarrioORM.nombre,
+                DepartamentoORM.nombre,
+                ProvinciaORM.nombre,
+            )
+            .join(BarrioORM.departamento)
+            .join(DepartamentoORM.provincia)
+        )
+        return sugerencias
+
     def listar_direcciones_por_barrio(self, barrio_id: UUID) -> List[DireccionORM]:
         """Lista todas las direcciones de un barrio"""
         return (
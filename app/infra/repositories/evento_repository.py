@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import List
+
+from app.domain.eventos import Event
+from app.infra.persistence.agenda import EventoORM
+
+
+class EventoRepository:
+    """
+    Lado de lectura del outbox de eventos (tabla evento): los escribe
+    ConsultaRepository en la transacción de cada cambio de consulta y el
+    despachador los toma de acá.
+
+    reservar_pendientes bloquea las filas con FOR UPDATE SKIP LOCKED: varios
+    despachadores (procesos o workers) se reparten los pendientes sin tomar
+    dos veces el mismo. El bloqueo dura hasta el commit que los marca.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def reservar_pendientes(
+        self, limite: int, ahora: datetime, max_intentos: int
+    ) -> List[EventoORM]:
+        """Hasta `limite` pendientes cuyo próximo intento ya llegó, por antigüedad"""
+        return list(
+            self.session.scalars(
+                select(EventoORM)
+                .where(
+                    EventoORM.despachado_en.is_(None),
+                    EventoORM.proximo_intento <= ahora,
+                    EventoORM.intentos < max_intentos,
+                )
+                .order_by(EventoORM.proximo_intento, EventoORM.creado_en)
+                .limit(limite)
+                .with_for_update(skip_locked=True)
+            )
+        )
+
+    @staticmethod
+    def a_evento(orm: EventoORM) -> Event:
+        return Event(
+            tipo=orm.tipo,
+            cita_id=orm.consulta_id,
+            datos=orm.datos,
+            timestamp=orm.creado_en,
+        )
+
+    @staticmethod
+    def marcar_despachado(orm: EventoORM, ahora: datetime) -> None:
+        orm.despachado_en = ahora
+
+    @staticmethod
+    def marcar_fallido(
+        orm: EventoORM, error: Exception, ahora: datetime, espera: timedelta
+    ) -> None:
+        orm.intentos += 1
+        orm.ultimo_error = str(error)[:1000]
+        orm.proximo_intento = ahora + espera
+
+    def contar_pendientes(self, max_intentos: int) -> int:
+        """Pendientes que todavía se van a reintentar"""
+        return (
+            self.session.query(EventoORM)
+            .filter(
+                EventoORM.despachado_en.is_(None), EventoORM.intentos < max_intentos
+            )
+            .count()
+        )
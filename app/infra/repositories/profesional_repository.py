@@ -1,19 +1,58 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from uuid import UUID
-import unicodedata
-
-from app.domain.entities.usuarios import Profesional
-from app.domain.entities.catalogo import Especialidad
+from datetime import time, timedelta
+
+from sqlalchemy import (
+    Float,
+    Integer,
+    String,
+    and_,
+    cast,
+    func,
+    insert,
+    literal,
+    null,
+    or_,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.orm import (
+    Session,
+    Query,
+    aliased,
+    contains_eager,
+    joinedload,
+    selectinload,
+)
+from sqlalchemy.sql import Select
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
+
+from app.domain.entities.usuarios import Profesional, ResumenProfesional
+from app.domain.entities.catalogo import (
+    FACETA_DEPARTAMENTO,
+    FACETA_ESPECIALIDAD,
+    FACETA_PROVINCIA,
+    ConteoFaceta,
+    Especialidad,
+)
 from app.domain.value_objects.objetos_valor import (
     Ubicacion,
     Disponibilidad,
     Matricula,
+    dias_a_mascara,
 )
-from app.domain.enumeraciones import DiaSemana
+from app.domain.bm25 import IndiceBM25
+from app.domain.geo import caja_envolvente, haversine_km
+from app.domain.ranking import puntaje_base
+from app.domain.texto import normalizar_texto
+from app.domain.eventos import ProfesionalActualizado, ProfesionalEliminado
+from app.domain.observers.observadores import Subject
+from app.infra.persistence.agenda import DisponibilidadORM
 from app.infra.persistence.perfiles import ProfesionalORM
+from app.infra.persistence.publicaciones import PublicacionORM
 from app.infra.persistence.usuarios import UsuarioORM
-from app.infra.persistence.servicios import EspecialidadORM
+from app.infra.persistence.servicios import EspecialidadORM, profesional_especialidad
+from app.infra.persistence.matriculas import MatriculaORM
 from app.infra.persistence.ubicacion import (
     DireccionORM,
     BarrioORM,
@@ -24,46 +63,137 @@ from app.infra.persistence.ubicacion import (
 
 from app.infra.repositories.direccion_repository import DireccionRepository
 
-DIAS_NOMBRE_A_NUMERO = {
-    "lunes": DiaSemana.LUNES,
-    "martes": DiaSemana.MARTES,
-    "miercoles": DiaSemana.MIERCOLES,
-    "jueves": DiaSemana.JUEVES,
-    "viernes": DiaSemana.VIERNES,
-    "sabado": DiaSemana.SABADO,
-    "domingo": DiaSemana.DOMINGO,
-}
 
+# Plan de carga de las lecturas de profesionales.
+# Todo lo que recorre `_to_domain` se trae por adelantado para evitar N+1:
+# - relaciones muchos-a-uno (usuario, jerarquía de la dirección, provincia de la
+#   matrícula) con JOIN en la misma consulta; el de usuario es el JOIN explícito
+#   de `_query` (sin alias, así también sirve para ordenar por apellido);
+# - colecciones (especialidades, disponibilidades, matrículas) con SELECT ... IN,
+#   una consulta por colección sin importar la cantidad de resultados.
+CARGA_PROFESIONAL = (
+    contains_eager(ProfesionalORM.usuario),
+    joinedload(ProfesionalORM.direccion)
+    .joinedload(DireccionORM.barrio, innerjoin=True)
+    .joinedload(BarrioORM.departamento, innerjoin=True)
+    .joinedload(DepartamentoORM.provincia, innerjoin=True),
+    selectinload(ProfesionalORM.especialidades),
+    selectinload(ProfesionalORM.disponibilidades),
+    selectinload(ProfesionalORM.matriculas).joinedload(
+        MatriculaORM.provincia, innerjoin=True
+    ),
+)
 
-def _normalizar_texto(texto: str) -> str:
-    """Normaliza texto removiendo acentos y convirtiendo a minúsculas"""
-    nfkd = unicodedata.normalize("NFD", texto)
-    return "".join([c for c in nfkd if not unicodedata.combining(c)]).lower()
 
+def _contiene(columna_normalizada, texto: str):
+    """
+    Filtro por subcadena sin acentos ni mayúsculas sobre una columna
+    `nombre_normalizado`: LIKE '%texto%' (con los comodines del usuario
+    escapados), que en PostgreSQL resuelve el índice GIN de trigramas y en
+    SQLite funciona igual sin índice.
+    """
+    return columna_normalizada.contains(normalizar_texto(texto), autoescape=True)
+
+
+# Pesos del ranking BM25 de respaldo, análogos a los setweight del tsvector:
+# nombre y título (A) cuentan el doble que la descripción (B)
+PESO_BM25_A = 2.0
+PESO_BM25_B = 1.0
+
+
+def _filtrar_disponibilidad(
+    query: Query,
+    dia_semana: Optional[int],
+    hora_desde: Optional[time],
+    hora_hasta: Optional[time],
+) -> Query:
+    """
+    Deja los profesionales con alguna franja que incluya el día (bit
+    `dia_semana - 1` de `dias_mascara`, con un AND binario en el SQL) y que
+    cubra completa la ventana [hora_desde, hora_hasta]. Sin día no filtra.
+    """
+    if not dia_semana:
+        return query
+
+    condiciones = [DisponibilidadORM.dias_mascara.op("&")(1 << (dia_semana - 1)) != 0]
+    if hora_desde is not None:
+        condiciones.append(DisponibilidadORM.hora_inicio <= hora_desde)
+    if hora_hasta is not None:
+        condiciones.append(DisponibilidadORM.hora_fin >= hora_hasta)
+    return query.filter(ProfesionalORM.disponibilidades.any(and_(*condiciones)))
+
+
+class ProfesionalRepository(Subject):
+    """
+    Repositorio de profesionales.
+
+    Es también un Subject: cada alta, edición, baja o verificación notifica
+    un ProfesionalActualizado (o ProfesionalEliminado) a los observadores
+    adjuntos, por ejemplo el índice de búsqueda en memoria.
+    """
 
-class ProfesionalRepository:
     def __init__(self, session: Session):
+        super().__init__()
         self.session = session
         self.direccion_repo = DireccionRepository(session)
 
-    def _convertir_dia_a_enum(self, dia: str) -> DiaSemana:
-        """
-        Convierte un día en formato texto o número a DiaSemana enum.
-        Soporta nombres de días en español (con o sin acentos) y números (1-7).
-        """
-        dia_limpio = dia.strip()
+    def _query(self) -> Query:
+        """Query base de lectura: aplica el plan de carga CARGA_PROFESIONAL"""
+        return (
+            self.session.query(ProfesionalORM)
+            .join(ProfesionalORM.usuario)
+            .options(*CARGA_PROFESIONAL)
+        )
 
-        if dia_limpio.isdigit():
-            return DiaSemana(int(dia_limpio))
+    def _releer(self, id: UUID) -> Profesional:
+        """Relee un profesional recién escrito con el plan de carga completo"""
+        orm = self._query().populate_existing().filter(ProfesionalORM.id == id).one()
+        return self._to_domain(orm)
+
+    def _paginar(
+        self,
+        query: Query,
+        limite: Optional[int],
+        despues_de: Optional[Tuple],
+        por_puntaje: bool = False,
+    ) -> Query:
+        """
+        Paginación por clave (keyset) sobre el orden estable (apellido, id),
+        o (puntaje desc, id) con `por_puntaje` (índice ix_profesional_puntaje).
 
-        dia_normalizado = _normalizar_texto(dia_limpio)
+        El LIMIT y el predicado `clave > :cursor` van en el SQL, así
+        que cada página cuesta lo mismo sin importar cuántas se saltearon.
+        Sin límite ni cursor la query queda como estaba, salvo que se pida
+        el orden por puntaje.
+        """
+        if por_puntaje:
+            query = query.order_by(ProfesionalORM.puntaje.desc(), ProfesionalORM.id)
+            if despues_de is not None:
+                puntaje, prof_id = despues_de
+                query = query.filter(
+                    or_(
+                        ProfesionalORM.puntaje < puntaje,
+                        and_(
+                            ProfesionalORM.puntaje == puntaje,
+                            ProfesionalORM.id > prof_id,
+                        ),
+                    )
+                )
+            return query.limit(limite) if limite else query
 
-        if dia_normalizado in DIAS_NOMBRE_A_NUMERO:
-            return DIAS_NOMBRE_A_NUMERO[dia_normalizado]
+        if not limite and despues_de is None:
+            return query
 
-        raise ValueError(
-            f"Día no válido: '{dia}'. Debe ser un nombre de día en español o un número entre 1 y 7."
-        )
+        query = query.order_by(UsuarioORM.apellido, ProfesionalORM.id)
+        if despues_de is not None:
+            apellido, prof_id = despues_de
+            query = query.filter(
+                tuple_(UsuarioORM.apellido, ProfesionalORM.id)
+                > tuple_(apellido, prof_id)
+            )
+        if limite:
+            query = query.limit(limite)
+        return query
 
     def _to_domain(self, orm: ProfesionalORM) -> Profesional:
         """ORM → Dominio"""
@@ -98,14 +228,8 @@ class ProfesionalRepository:
                 for e in (orm.especialidades or [])
             ],
             disponibilidades=[
-                Disponibilidad(
-                    dias_semana=[
-                        self._convertir_dia_a_enum(d)
-                        for d in disp.dias_semana
-                        if d and d.strip()
-                    ],
-                    hora_inicio=disp.hora_inicio,
-                    hora_fin=disp.hora_fin,
+                Disponibilidad.desde_mascara(
+                    disp.dias_mascara, disp.hora_inicio, disp.hora_fin
                 )
                 for disp in (orm.disponibilidades or [])
             ],
@@ -118,25 +242,219 @@ class ProfesionalRepository:
                 )
                 for m in (orm.matriculas or [])
             ],
+            cantidad_valoraciones=orm.valoraciones_cantidad or 0,
+            promedio_valoraciones=(
+                orm.valoraciones_suma / orm.valoraciones_cantidad
+                if orm.valoraciones_cantidad
+                else 0.0
+            ),
+            puntaje=orm.puntaje,
         )
 
     def obtener_por_id(self, id: UUID) -> Optional[Profesional]:
-        orm = (
-            self.session.query(ProfesionalORM)
-            .filter(ProfesionalORM.id == str(id))
-            .first()
-        )
+        orm = self._query().filter(ProfesionalORM.id == id).first()
         return self._to_domain(orm) if orm else None
 
+    def obtener_disponibilidades(self, id: UUID) -> Optional[List[Disponibilidad]]:
+        """
+        Franjas semanales de un profesional, sin hidratar el perfil: una query
+        (profesional LEFT JOIN disponibilidad).
+
+        Returns:
+            Lista de disponibilidades (vacía si no cargó ninguna) o None si el
+            profesional no existe
+        """
+        filas = self.session.execute(
+            select(
+                ProfesionalORM.id,
+                DisponibilidadORM.dias_mascara,
+                DisponibilidadORM.hora_inicio,
+                DisponibilidadORM.hora_fin,
+            )
+            .outerjoin(
+                DisponibilidadORM, DisponibilidadORM.profesional_id == ProfesionalORM.id
+            )
+            .where(ProfesionalORM.id == id)
+        ).all()
+        if not filas:
+            return None
+        return [
+            Disponibilidad.desde_mascara(mascara, hora_inicio, hora_fin)
+            for _, mascara, hora_inicio, hora_fin in filas
+            if mascara is not None
+        ]
+
+    def franjas_del_dia(
+        self, ids: Iterable[UUID], dia_semana: int
+    ) -> Dict[UUID, List[Tuple[time, time]]]:
+        """
+        (hora_inicio, hora_fin) de las disponibilidades de cada profesional de
+        `ids` que atienden ese día de la semana: una query para todos.
+        """
+        ids = list(ids)
+        franjas: Dict[UUID, List[Tuple[time, time]]] = {}
+        if not ids:
+            return franjas
+        filas = self.session.execute(
+            select(
+                DisponibilidadORM.profesional_id,
+                DisponibilidadORM.hora_inicio,
+                DisponibilidadORM.hora_fin,
+            ).where(
+                DisponibilidadORM.profesional_id.in_(ids),
+                DisponibilidadORM.dias_mascara.op("&")(1 << (dia_semana - 1)) != 0,
+            )
+        )
+        for profesional_id, hora_inicio, hora_fin in filas:
+            franjas.setdefault(profesional_id, []).append((hora_inicio, hora_fin))
+        return franjas
+
     def listar_activos(self) -> List[Profesional]:
         """Para Strategy de búsqueda"""
-        orms = self.session.query(ProfesionalORM).filter(ProfesionalORM.activo).all()
+        orms = self._query().filter(ProfesionalORM.activo).all()
         return [self._to_domain(orm) for orm in orms]
 
     def listar_todos(self) -> List[Profesional]:
-        orms = self.session.query(ProfesionalORM).all()
+        orms = self._query().all()
+        return [self._to_domain(orm) for orm in orms]
+
+    def listar_pagina(
+        self,
+        limite: Optional[int],
+        despues_de: Optional[Tuple[str, UUID]] = None,
+        solo_activos: bool = True,
+    ) -> List[Profesional]:
+        """Una página de profesionales ordenados por (apellido, id)"""
+        query = self._query()
+        if solo_activos:
+            query = query.filter(ProfesionalORM.activo)
+        orms = self._paginar(query, limite, despues_de).all()
         return [self._to_domain(orm) for orm in orms]
 
+    def contar(self, solo_activos: bool = True) -> int:
+        """COUNT sin cargar perfiles (para el total de la paginación)"""
+        query = self.session.query(func.count(ProfesionalORM.id))
+        if solo_activos:
+            query = query.filter(ProfesionalORM.activo)
+        return query.scalar()
+
+    def _select_resumen(self) -> Select:
+        """
+        SELECT de las columnas de ResumenProfesional (Core, sin entidades
+        ORM). La ubicación va por OUTER JOIN con alias propios, así los
+        filtros de zona pueden sumar sus JOIN sin chocar.
+        """
+        direccion = aliased(DireccionORM)
+        barrio = aliased(BarrioORM)
+        departamento = aliased(DepartamentoORM)
+        provincia = aliased(ProvinciaORM)
+        return (
+            select(
+                ProfesionalORM.id,
+                UsuarioORM.nombre,
+                UsuarioORM.apellido,
+                ProfesionalORM.verificado,
+                provincia.nombre.label("provincia"),
+                barrio.nombre.label("barrio"),
+                ProfesionalORM.valoraciones_cantidad,
+                ProfesionalORM.valoraciones_suma,
+                ProfesionalORM.puntaje,
+            )
+            .join(ProfesionalORM.usuario)
+            .outerjoin(ProfesionalORM.direccion.of_type(direccion))
+            .outerjoin(direccion.barrio.of_type(barrio))
+            .outerjoin(barrio.departamento.of_type(departamento))
+            .outerjoin(departamento.provincia.of_type(provincia))
+        )
+
+    def _resumenes(self, query: Select) -> List[ResumenProfesional]:
+        """
+        Ejecuta un _select_resumen (ya filtrado y paginado) y le suma los
+        nombres de especialidad con un segundo SELECT ... IN: dos queries
+        en total, sin importar la cantidad de filas.
+        """
+        filas = self.session.execute(query).all()
+        if not filas:
+            return []
+
+        especialidades: Dict[UUID, List[str]] = {}
+        nombres = self.session.execute(
+            select(profesional_especialidad.c.profesional_id, EspecialidadORM.nombre)
+            .join(
+                EspecialidadORM,
+                EspecialidadORM.id_especialidad
+                == profesional_especialidad.c.especialidad_id,
+            )
+            .where(profesional_especialidad.c.profesional_id.in_([f.id for f in filas]))
+            .order_by(EspecialidadORM.nombre)
+        )
+        for prof_id, nombre in nombres:
+            especialidades.setdefault(prof_id, []).append(nombre)
+
+        return [
+            ResumenProfesional(
+                id=f.id,
+                nombre=f.nombre,
+                apellido=f.apellido,
+                verificado=f.verificado,
+                provincia=f.provincia,
+                barrio=f.barrio,
+                especialidades=tuple(especialidades.get(f.id, ())),
+                cantidad_valoraciones=f.valoraciones_cantidad,
+                promedio_valoraciones=(
+                    f.valoraciones_suma / f.valoraciones_cantidad
+                    if f.valoraciones_cantidad
+                    else 0.0
+                ),
+                puntaje=f.puntaje,
+            )
+            for f in filas
+        ]
+
+    def listar_resumen(
+        self,
+        limite: Optional[int] = None,
+        despues_de: Optional[Tuple] = None,
+        solo_activos: bool = True,
+        por_puntaje: bool = False,
+    ) -> List[ResumenProfesional]:
+        """listar_pagina en vista resumen (ver _select_resumen)"""
+        query = self._select_resumen()
+        if solo_activos:
+            query = query.filter(ProfesionalORM.activo)
+        return self._resumenes(self._paginar(query, limite, despues_de, por_puntaje))
+
+    def buscar_resumen(
+        self,
+        especialidad_id: Optional[int] = None,
+        especialidad_nombre: Optional[str] = None,
+        provincia: Optional[str] = None,
+        departamento: Optional[str] = None,
+        barrio: Optional[str] = None,
+        limite: Optional[int] = None,
+        despues_de: Optional[Tuple] = None,
+        dia_semana: Optional[int] = None,
+        hora_desde: Optional[time] = None,
+        hora_hasta: Optional[time] = None,
+        por_puntaje: bool = False,
+    ) -> List[ResumenProfesional]:
+        """
+        buscar_combinado en vista resumen: mismos filtros, orden y
+        paginación, pero proyectando sólo las columnas del listado.
+        """
+        query = self._filtrar_combinado(
+            self._select_resumen(),
+            especialidad_id,
+            especialidad_nombre,
+            provincia,
+            departamento,
+            barrio,
+            dia_semana,
+            hora_desde,
+            hora_hasta,
+        )
+        return self._resumenes(self._paginar(query, limite, despues_de, por_puntaje))
+
     def crear(
         self,
         profesional: Profesional,
@@ -192,13 +510,12 @@ class ProfesionalRepository:
             direccion_id=direccion_id,
             activo=profesional.activo,
             verificado=profesional.verificado,
+            puntaje=puntaje_base(0, 0, profesional.verificado),
         )
         self.session.add(orm)
         self.session.flush()
 
         if profesional.matriculas:
-            from datetime import timedelta
-
             for mat in profesional.matriculas:
                 provincia_orm = (
                     self.session.query(ProvinciaORM)
@@ -208,8 +525,6 @@ class ProfesionalRepository:
                 if not provincia_orm:
                     raise ValueError(f"Provincia '{mat.provincia}' no encontrada")
 
-                from app.infra.persistence.matriculas import MatriculaORM
-
                 mat_orm = MatriculaORM(
                     profesional_id=orm.id,
                     provincia_id=provincia_orm.id,
@@ -221,9 +536,166 @@ class ProfesionalRepository:
                 self.session.add(mat_orm)
 
         self.session.commit()
-        self.session.refresh(orm)
 
-        return self._to_domain(orm)
+        creado = self._releer(orm.id)
+        self.notify(ProfesionalActualizado(profesional=creado))
+        return creado
+
+    def emails_registrados(self, emails: Iterable[str]) -> Set[str]:
+        """De `emails`, los que ya tienen usuario (en minúsculas)"""
+        emails = {email.lower() for email in emails}
+        if not emails:
+            return set()
+        return set(
+            self.session.execute(
+                select(func.lower(UsuarioORM.email)).where(
+                    func.lower(UsuarioORM.email).in_(emails)
+                )
+            ).scalars()
+        )
+
+    def importar_lote(
+        self, profesionales: List[Profesional]
+    ) -> Tuple[Set[int], Dict[int, str]]:
+        """
+        Alta de muchos profesionales en una transacción, con una cantidad
+        fija de sentencias sin importar el tamaño del lote: direcciones con
+        DireccionRepository.resolver_muchas, provincias de las matrículas en
+        un SELECT y usuarios, perfiles, especialidades, matrículas y
+        disponibilidades en un INSERT de varias filas por tabla (ids
+        generados acá).
+
+        Se saltean los que tienen un email ya registrado (p. ej. de una
+        importación anterior del mismo archivo) y los que no se pueden dar de
+        alta (email repetido en el lote, provincia de matrícula inexistente);
+        el resto se confirma igual.
+
+        Returns:
+            (posiciones con email ya registrado, {posición: motivo} de los rechazados)
+        """
+        registrados = self.emails_registrados(p.email for p in profesionales)
+        ya_registrados: Set[int] = set()
+        rechazados: Dict[int, str] = {}
+        vistos: Set[str] = set()
+        for posicion, profesional in enumerate(profesionales):
+            email = profesional.email.lower()
+            if email in registrados:
+                ya_registrados.add(posicion)
+            elif email in vistos:
+                rechazados[posicion] = f"El email {profesional.email} está repetido"
+            vistos.add(email)
+
+        nombres_provincia = {
+            normalizar_texto(m.provincia.strip())
+            for p in profesionales
+            for m in p.matriculas
+        }
+        provincias = (
+            dict(
+                self.session.execute(
+                    select(ProvinciaORM.nombre_normalizado, ProvinciaORM.id).where(
+                        ProvinciaORM.nombre_normalizado.in_(nombres_provincia)
+                    )
+                ).all()
+            )
+            if nombres_provincia
+            else {}
+        )
+        for posicion, profesional in enumerate(profesionales):
+            for mat in profesional.matriculas:
+                if normalizar_texto(mat.provincia.strip()) not in provincias:
+                    rechazados.setdefault(
+                        posicion, f"Provincia '{mat.provincia}' no encontrada"
+                    )
+
+        aceptados = [
+            p
+            for posicion, p in enumerate(profesionales)
+            if posicion not in rechazados and posicion not in ya_registrados
+        ]
+        if not aceptados:
+            return ya_registrados, rechazados
+
+        con_ubicacion = [i for i, p in enumerate(aceptados) if p.ubicacion]
+        resueltas = self.direccion_repo.resolver_muchas(
+            [aceptados[i].ubicacion for i in con_ubicacion]
+        )
+        direcciones = {i: d.id for i, d in zip(con_ubicacion, resueltas)}
+
+        usuarios: List[dict] = []
+        perfiles: List[dict] = []
+        especialidades: List[dict] = []
+        matriculas: List[dict] = []
+        disponibilidades: List[dict] = []
+        for i, profesional in enumerate(aceptados):
+            usuario_id, profesional_id = uuid4(), uuid4()
+            usuarios.append(
+                {
+                    "id": usuario_id,
+                    "nombre": profesional.nombre,
+                    "apellido": profesional.apellido,
+                    "email": profesional.email,
+                    "celular": profesional.celular,
+                    "es_profesional": True,
+                    "es_solicitante": False,
+                    "activo": profesional.activo,
+                    "verificado": profesional.verificado,
+                }
+            )
+            perfiles.append(
+                {
+                    "id": profesional_id,
+                    "usuario_id": usuario_id,
+                    "direccion_id": direcciones.get(i),
+                    "activo": profesional.activo,
+                    "verificado": profesional.verificado,
+                    "puntaje": puntaje_base(0, 0, profesional.verificado),
+                }
+            )
+            especialidades.extend(
+                {"profesional_id": profesional_id, "especialidad_id": esp_id}
+                for esp_id in {e.id for e in profesional.especialidades}
+            )
+            matriculas.extend(
+                {
+                    "id": uuid4(),
+                    "profesional_id": profesional_id,
+                    "provincia_id": provincias[normalizar_texto(mat.provincia.strip())],
+                    "nro_matricula": mat.numero,
+                    "vigente_desde": mat.vigente_desde,
+                    "vigente_hasta": mat.vigente_hasta
+                    or (mat.vigente_desde + timedelta(days=3650)),
+                }
+                for mat in profesional.matriculas
+            )
+            disponibilidades.extend(
+                {
+                    "id": uuid4(),
+                    "profesional_id": profesional_id,
+                    "dias_mascara": dias_a_mascara(disp.dias_semana),
+                    "hora_inicio": disp.hora_inicio,
+                    "hora_fin": disp.hora_fin,
+                }
+                for disp in profesional.disponibilidades
+            )
+
+        for tabla, filas in (
+            (UsuarioORM.__table__, usuarios),
+            (ProfesionalORM.__table__, perfiles),
+            (profesional_especialidad, especialidades),
+            (MatriculaORM.__table__, matriculas),
+            (DisponibilidadORM.__table__, disponibilidades),
+        ):
+            if filas:
+                self.session.execute(insert(tabla), filas)
+
+        self.session.commit()
+
+        if self.observers:
+            ids = [perfil["id"] for perfil in perfiles]
+            for orm in self._query().filter(ProfesionalORM.id.in_(ids)):
+                self.notify(ProfesionalActualizado(profesional=self._to_domain(orm)))
+        return ya_registrados, rechazados
 
     def actualizar(
         self, profesional: Profesional, direccion_id: Optional[UUID] = None
@@ -249,15 +721,13 @@ class ProfesionalRepository:
             profesional.ubicacion = Ubicacion(...)
             prof_repo.actualizar(profesional)  # Crea nueva dirección
         """
-        orm = (
-            self.session.query(ProfesionalORM)
-            .filter(ProfesionalORM.id == profesional.id)
-            .first()
-        )
+        orm = self._query().filter(ProfesionalORM.id == profesional.id).first()
 
         if not orm:
             raise ValueError(f"Profesional con id {profesional.id} no encontrado")
 
+        anterior = self._to_domain(orm) if self.observers else None
+
         orm.usuario.nombre = profesional.nombre
         orm.usuario.apellido = profesional.apellido
         orm.usuario.email = profesional.email
@@ -266,6 +736,9 @@ class ProfesionalRepository:
 
         orm.activo = profesional.activo
         orm.verificado = profesional.verificado
+        orm.puntaje = puntaje_base(
+            orm.valoraciones_cantidad, orm.valoraciones_suma, orm.verificado
+        )
 
         if direccion_id:
             orm.direccion_id = direccion_id
@@ -281,68 +754,92 @@ class ProfesionalRepository:
                 orm.direccion_id = nueva_direccion.id
 
         self.session.commit()
-        self.session.refresh(orm)
 
-        return self._to_domain(orm)
+        actualizado = self._releer(orm.id)
+        self.notify(ProfesionalActualizado(profesional=actualizado, anterior=anterior))
+        return actualizado
 
     def eliminar(self, id: UUID) -> bool:
         """Elimina físicamente un profesional (NO RECOMENDADO)"""
-        orm = (
-            self.session.query(ProfesionalORM)
-            .filter(ProfesionalORM.id == str(id))
-            .first()
-        )
+        orm = self._query().filter(ProfesionalORM.id == id).first()
 
         if not orm:
             return False
 
+        anterior = self._to_domain(orm) if self.observers else None
+
         self.session.delete(orm)
         self.session.commit()
 
+        self.notify(ProfesionalEliminado(profesional_id=id, anterior=anterior))
         return True
 
     def desactivar(self, id: UUID) -> Optional[Profesional]:
         """Desactivación lógica (RECOMENDADO)"""
-        orm = (
-            self.session.query(ProfesionalORM)
-            .filter(ProfesionalORM.id == str(id))
-            .first()
-        )
+        orm = self._query().filter(ProfesionalORM.id == id).first()
 
         if not orm:
             return None
 
+        anterior = self._to_domain(orm) if self.observers else None
+
         orm.activo = False
         self.session.commit()
-        self.session.refresh(orm)
 
-        return self._to_domain(orm)
+        actualizado = self._releer(orm.id)
+        self.notify(ProfesionalActualizado(profesional=actualizado, anterior=anterior))
+        return actualizado
+
+    def refrescar(self, id: UUID) -> Optional[Profesional]:
+        """
+        Relee un profesional cuyo resumen cambió por fuera de este repositorio
+        (por ejemplo, una valoración nueva) y lo notifica a los observadores.
+        """
+        if not self.observers:
+            return None
+        orm = self._query().populate_existing().filter(ProfesionalORM.id == id).first()
+        if not orm:
+            return None
+        actualizado = self._to_domain(orm)
+        self.notify(ProfesionalActualizado(profesional=actualizado))
+        return actualizado
 
     def buscar_por_especialidad(
         self,
         especialidad_id: Optional[int] = None,
         especialidad_nombre: Optional[str] = None,
+        limite: Optional[int] = None,
+        despues_de: Optional[Tuple] = None,
+        dia_semana: Optional[int] = None,
+        hora_desde: Optional[time] = None,
+        hora_hasta: Optional[time] = None,
+        por_puntaje: bool = False,
     ) -> List[Profesional]:
         """
         Busca profesionales por especialidad (por ID o nombre).
         Prioriza búsqueda por ID si está disponible (más eficiente).
+        Con `limite`/`despues_de` devuelve una página (ver _paginar) y con
+        `dia_semana` (y opcionalmente la franja horaria) sólo los disponibles.
         """
-        query = (
-            self.session.query(ProfesionalORM)
-            .join(ProfesionalORM.especialidades)
-            .filter(ProfesionalORM.activo)
-        )
+        query = self._query().filter(ProfesionalORM.activo)
 
         if especialidad_id:
-            query = query.filter(EspecialidadORM.id_especialidad == especialidad_id)
+            query = query.filter(
+                ProfesionalORM.especialidades.any(
+                    EspecialidadORM.id_especialidad == especialidad_id
+                )
+            )
         elif especialidad_nombre:
             query = query.filter(
-                EspecialidadORM.nombre.ilike(f"%{especialidad_nombre}%")
+                ProfesionalORM.especialidades.any(
+                    _contiene(EspecialidadORM.nombre_normalizado, especialidad_nombre)
+                )
             )
         else:
             return []
 
-        orms = query.all()
+        query = _filtrar_disponibilidad(query, dia_semana, hora_desde, hora_hasta)
+        orms = self._paginar(query, limite, despues_de, por_puntaje).all()
         return [self._to_domain(orm) for orm in orms]
 
     def buscar_por_ubicacion(
@@ -350,14 +847,22 @@ class ProfesionalRepository:
         provincia: Optional[str] = None,
         departamento: Optional[str] = None,
         barrio: Optional[str] = None,
+        limite: Optional[int] = None,
+        despues_de: Optional[Tuple] = None,
+        dia_semana: Optional[int] = None,
+        hora_desde: Optional[time] = None,
+        hora_hasta: Optional[time] = None,
+        por_puntaje: bool = False,
     ) -> List[Profesional]:
         """
         Busca profesionales por ubicación (provincia, departamento, barrio)
 
         Usa la jerarquía: Direccion → Barrio → Departamento → Provincia
+        Con `limite`/`despues_de` devuelve una página (ver _paginar) y con
+        `dia_semana` (y opcionalmente la franja horaria) sólo los disponibles.
         """
         query = (
-            self.session.query(ProfesionalORM)
+            self._query()
             .join(ProfesionalORM.direccion)
             .join(DireccionORM.barrio)
             .join(BarrioORM.departamento)
@@ -366,28 +871,32 @@ class ProfesionalRepository:
         )
 
         if provincia:
-            query = query.filter(ProvinciaORM.nombre.ilike(f"%{provincia}%"))
+            query = query.filter(_contiene(ProvinciaORM.nombre_normalizado, provincia))
         if departamento:
-            query = query.filter(DepartamentoORM.nombre.ilike(f"%{departamento}%"))
+            query = query.filter(
+                _contiene(DepartamentoORM.nombre_normalizado, departamento)
+            )
         if barrio:
-            query = query.filter(BarrioORM.nombre.ilike(f"%{barrio}%"))
+            query = query.filter(_contiene(BarrioORM.nombre_normalizado, barrio))
 
-        orms = query.all()
+        query = _filtrar_disponibilidad(query, dia_semana, hora_desde, hora_hasta)
+        orms = self._paginar(query, limite, despues_de, por_puntaje).all()
         return [self._to_domain(orm) for orm in orms]
 
-    def buscar_combinado(
+    def _filtrar_combinado(
         self,
+        query: Query,
         especialidad_id: Optional[int] = None,
         especialidad_nombre: Optional[str] = None,
         provincia: Optional[str] = None,
         departamento: Optional[str] = None,
         barrio: Optional[str] = None,
-    ) -> List[Profesional]:
-        """
-        Busca profesionales por ubicación y/o especialidad.
-        Prioriza especialidad_id sobre especialidad_nombre.
-        """
-        query = self.session.query(ProfesionalORM).filter(ProfesionalORM.activo)
+        dia_semana: Optional[int] = None,
+        hora_desde: Optional[time] = None,
+        hora_hasta: Optional[time] = None,
+    ) -> Query:
+        """Filtros de buscar_combinado, compartidos con contar_combinado"""
+        query = query.filter(ProfesionalORM.activo)
 
         if provincia or departamento or barrio:
             query = (
@@ -398,41 +907,517 @@ class ProfesionalRepository:
             )
 
             if provincia:
-                query = query.filter(ProvinciaORM.nombre.ilike(f"%{provincia}%"))
+                query = query.filter(
+                    _contiene(ProvinciaORM.nombre_normalizado, provincia)
+                )
             if departamento:
-                query = query.filter(DepartamentoORM.nombre.ilike(f"%{departamento}%"))
+                query = query.filter(
+                    _contiene(DepartamentoORM.nombre_normalizado, departamento)
+                )
             if barrio:
-                query = query.filter(BarrioORM.nombre.ilike(f"%{barrio}%"))
+                query = query.filter(_contiene(BarrioORM.nombre_normalizado, barrio))
 
-        if especialidad_id or especialidad_nombre:
-            query = query.join(ProfesionalORM.especialidades)
+        if especialidad_id:
+            query = query.filter(
+                ProfesionalORM.especialidades.any(
+                    EspecialidadORM.id_especialidad == especialidad_id
+                )
+            )
+        elif especialidad_nombre:
+            query = query.filter(
+                ProfesionalORM.especialidades.any(
+                    _contiene(EspecialidadORM.nombre_normalizado, especialidad_nombre)
+                )
+            )
+
+        return _filtrar_disponibilidad(query, dia_semana, hora_desde, hora_hasta)
+
+    def buscar_combinado(
+        self,
+        especialidad_id: Optional[int] = None,
+        especialidad_nombre: Optional[str] = None,
+        provincia: Optional[str] = None,
+        departamento: Optional[str] = None,
+        barrio: Optional[str] = None,
+        limite: Optional[int] = None,
+        despues_de: Optional[Tuple] = None,
+        dia_semana: Optional[int] = None,
+        hora_desde: Optional[time] = None,
+        hora_hasta: Optional[time] = None,
+        por_puntaje: bool = False,
+    ) -> List[Profesional]:
+        """
+        Busca profesionales por ubicación, especialidad y/o disponibilidad.
+        Prioriza especialidad_id sobre especialidad_nombre.
+        Con `limite`/`despues_de` devuelve una página (ver _paginar).
+        """
+        query = self._filtrar_combinado(
+            self._query(),
+            especialidad_id,
+            especialidad_nombre,
+            provincia,
+            departamento,
+            barrio,
+            dia_semana,
+            hora_desde,
+            hora_hasta,
+        )
+        orms = self._paginar(query, limite, despues_de, por_puntaje).all()
+        return [self._to_domain(orm) for orm in orms]
+
+    def contar_combinado(
+        self,
+        especialidad_id: Optional[int] = None,
+        especialidad_nombre: Optional[str] = None,
+        provincia: Optional[str] = None,
+        departamento: Optional[str] = None,
+        barrio: Optional[str] = None,
+        dia_semana: Optional[int] = None,
+        hora_desde: Optional[time] = None,
+        hora_hasta: Optional[time] = None,
+    ) -> int:
+        """Total de buscar_combinado con un COUNT, sin cargar perfiles"""
+        query = self._filtrar_combinado(
+            self.session.query(ProfesionalORM),
+            especialidad_id,
+            especialidad_nombre,
+            provincia,
+            departamento,
+            barrio,
+            dia_semana,
+            hora_desde,
+            hora_hasta,
+        )
+        return query.with_entities(func.count(ProfesionalORM.id)).scalar()
+
+    def buscar_lote(self, filtros: List[dict]) -> List[List[Profesional]]:
+        """
+        Varias búsquedas combinadas en dos consultas. Cada elemento de
+        `filtros` lleva los argumentos de buscar_combinado (sin cursor).
+
+        1. Una sola sentencia con un SELECT (id, clave de orden) por filtro,
+           etiquetado con su posición y unido con UNION ALL; los que traen
+           `limite` lo aplican en su rama.
+        2. Los perfiles de todos los ids (sin repetir) se cargan una vez con
+           el plan de carga y se reparten entre los filtros, ordenados por
+           (apellido, id) o (puntaje desc, id) con `por_puntaje`.
+        """
+        if not filtros:
+            return []
+
+        ramas = []
+        for posicion, criterios in enumerate(filtros):
+            criterios = dict(criterios)
+            limite = criterios.pop("limite", None)
+            por_puntaje = criterios.pop("por_puntaje", False)
+            rama = self._filtrar_combinado(
+                select(
+                    literal(posicion, Integer).label("filtro"),
+                    ProfesionalORM.id.label("id"),
+                    UsuarioORM.apellido.label("apellido"),
+                    ProfesionalORM.puntaje.label("puntaje"),
+                )
+                .select_from(ProfesionalORM)
+                .join(ProfesionalORM.usuario),
+                **criterios,
+            )
+            if limite:
+                # LIMIT dentro de una rama de UNION requiere una subconsulta
+                rama = self._paginar(rama, limite, None, por_puntaje).subquery()
+                rama = select(*rama.c)
+            ramas.append(rama)
+
+        consulta = union_all(*ramas) if len(ramas) > 1 else ramas[0]
+        filas = self.session.execute(consulta).all()
+        if not filas:
+            return [[] for _ in filtros]
+
+        ids = {fila.id for fila in filas}
+        perfiles = {
+            orm.id: self._to_domain(orm)
+            for orm in self._query().filter(ProfesionalORM.id.in_(list(ids)))
+        }
+
+        por_filtro: List[list] = [[] for _ in filtros]
+        for fila in filas:
+            por_filtro[fila.filtro].append(fila)
+        resultados = []
+        for criterios, coincidencias in zip(filtros, por_filtro):
+            if criterios.get("por_puntaje"):
+                coincidencias.sort(key=lambda f: (-f.puntaje, f.id))
+            else:
+                coincidencias.sort(key=lambda f: (f.apellido, f.id))
+            resultados.append([perfiles[f.id] for f in coincidencias])
+        return resultados
+
+    def contar_facetas(
+        self,
+        especialidad_id: Optional[int] = None,
+        especialidad_nombre: Optional[str] = None,
+        provincia: Optional[str] = None,
+        departamento: Optional[str] = None,
+        barrio: Optional[str] = None,
+        dia_semana: Optional[int] = None,
+        hora_desde: Optional[time] = None,
+        hora_hasta: Optional[time] = None,
+    ) -> List[ConteoFaceta]:
+        """
+        Cantidad de profesionales de buscar_combinado por especialidad,
+        provincia y departamento, en una sola sentencia: los ids filtrados
+        van a un CTE y cada faceta es un GROUP BY sobre él, unidos con
+        UNION ALL. No carga perfiles.
+        """
+        filtrados = self._filtrar_combinado(
+            select(ProfesionalORM.id, ProfesionalORM.direccion_id),
+            especialidad_id,
+            especialidad_nombre,
+            provincia,
+            departamento,
+            barrio,
+            dia_semana,
+            hora_desde,
+            hora_hasta,
+        ).cte("filtrados")
+
+        por_especialidad = (
+            select(
+                literal(FACETA_ESPECIALIDAD, String).label("faceta"),
+                EspecialidadORM.id_especialidad.label("id"),
+                EspecialidadORM.nombre.label("nombre"),
+                cast(null(), String).label("provincia"),
+                func.count().label("cantidad"),
+            )
+            .select_from(filtrados)
+            .join(
+                profesional_especialidad,
+                profesional_especialidad.c.profesional_id == filtrados.c.id,
+            )
+            .join(
+                EspecialidadORM,
+                EspecialidadORM.id_especialidad
+                == profesional_especialidad.c.especialidad_id,
+            )
+            .group_by(EspecialidadORM.id_especialidad, EspecialidadORM.nombre)
+        )
+
+        def por_ubicacion(faceta: str, *agrupar):
+            nombre = agrupar[0]
+            provincia_col = (
+                ProvinciaORM.nombre
+                if faceta == FACETA_DEPARTAMENTO
+                else cast(null(), String)
+            )
+            return (
+                select(
+                    literal(faceta, String).label("faceta"),
+                    cast(null(), Integer).label("id"),
+                    nombre.label("nombre"),
+                    provincia_col.label("provincia"),
+                    func.count().label("cantidad"),
+                )
+                .select_from(filtrados)
+                .join(DireccionORM, DireccionORM.id == filtrados.c.direccion_id)
+                .join(DireccionORM.barrio)
+                .join(BarrioORM.departamento)
+                .join(DepartamentoORM.provincia)
+                .group_by(*agrupar)
+            )
+
+        consulta = union_all(
+            por_especialidad,
+            por_ubicacion(FACETA_PROVINCIA, ProvinciaORM.nombre, ProvinciaORM.id),
+            por_ubicacion(
+                FACETA_DEPARTAMENTO,
+                DepartamentoORM.nombre,
+                DepartamentoORM.id,
+                ProvinciaORM.nombre,
+            ),
+        )
+        return [
+            ConteoFaceta(
+                faceta=fila.faceta,
+                nombre=fila.nombre,
+                cantidad=fila.cantidad,
+                id=fila.id,
+                provincia=fila.provincia,
+            )
+            for fila in self.session.execute(consulta)
+        ]
+
+    @property
+    def _usa_full_text(self) -> bool:
+        """Las columnas tsvector sólo existen en PostgreSQL"""
+        return self.session.get_bind().dialect.name == "postgresql"
+
+    def _query_texto(self, texto: str, **filtros) -> Tuple[Query, object]:
+        """
+        (id, relevancia) de los profesionales cuyo perfil o alguna publicación
+        coincide con `texto` (websearch_to_tsquery sobre las columnas
+        `busqueda`, con índice GIN), junto con la columna de relevancia: el
+        mejor ts_rank entre sus coincidencias. ts_rank es real: se pasa a
+        double precision para que el orden, el valor devuelto y la
+        comparación con el cursor (un float de Python) usen el mismo tipo.
+        """
+        consulta = func.websearch_to_tsquery("spanish", func.unaccent(texto))
+
+        def relevancia(busqueda):
+            return cast(func.ts_rank(busqueda, consulta), Float(53)).label("relevancia")
+
+        publicaciones = select(
+            PublicacionORM.profesional_id.label("id"),
+            relevancia(PublicacionORM.busqueda),
+        ).where(PublicacionORM.busqueda.op("@@")(consulta))
+        perfiles = select(
+            ProfesionalORM.id.label("id"),
+            relevancia(ProfesionalORM.busqueda),
+        ).where(ProfesionalORM.busqueda.op("@@")(consulta))
+        coincidencias = union_all(publicaciones, perfiles).subquery()
+        ranking = (
+            select(
+                coincidencias.c.id,
+                func.max(coincidencias.c.relevancia).label("relevancia"),
+            )
+            .group_by(coincidencias.c.id)
+            .subquery()
+        )
+
+        query = self.session.query(ProfesionalORM.id, ranking.c.relevancia).join(
+            ranking, ranking.c.id == ProfesionalORM.id
+        )
+        return self._filtrar_combinado(query, **filtros), ranking.c.relevancia
+
+    def _ranking_bm25(self, texto: str, **filtros) -> List[Tuple[UUID, float]]:
+        """
+        Respaldo sin full-text (SQLite): arma un IndiceBM25 con el perfil y
+        las publicaciones de los profesionales que pasan los filtros y los
+        ordena por (puntaje desc, id). El corpus son esos candidatos.
+        """
+        candidatos = self._filtrar_combinado(
+            self.session.query(
+                ProfesionalORM.id, UsuarioORM.nombre, UsuarioORM.apellido
+            ).join(ProfesionalORM.usuario),
+            **filtros,
+        ).all()
+        if not candidatos:
+            return []
 
-            if especialidad_id:
-                query = query.filter(EspecialidadORM.id_especialidad == especialidad_id)
-            elif especialidad_nombre:
+        campos = {
+            prof_id: [(f"{nombre} {apellido}", PESO_BM25_A)]
+            for prof_id, nombre, apellido in candidatos
+        }
+        publicaciones = self.session.query(
+            PublicacionORM.profesional_id,
+            PublicacionORM.titulo,
+            PublicacionORM.descripcion,
+        ).filter(PublicacionORM.profesional_id.in_(list(campos)))
+        for prof_id, titulo, descripcion in publicaciones:
+            campos[prof_id] += [(titulo, PESO_BM25_A), (descripcion, PESO_BM25_B)]
+
+        indice = IndiceBM25()
+        for prof_id, texto_perfil in campos.items():
+            indice.agregar(prof_id, texto_perfil)
+        return indice.rankear(texto)
+
+    def buscar_por_texto(
+        self,
+        texto: str,
+        especialidad_id: Optional[int] = None,
+        especialidad_nombre: Optional[str] = None,
+        provincia: Optional[str] = None,
+        departamento: Optional[str] = None,
+        barrio: Optional[str] = None,
+        limite: Optional[int] = None,
+        despues_de: Optional[Tuple[float, UUID]] = None,
+        dia_semana: Optional[int] = None,
+        hora_desde: Optional[time] = None,
+        hora_hasta: Optional[time] = None,
+    ) -> List[Tuple[Profesional, float]]:
+        """
+        Búsqueda por texto libre sobre perfiles y publicaciones, combinable
+        con los filtros de buscar_combinado. Devuelve (profesional, relevancia)
+        ordenados por (relevancia desc, id); `despues_de` continúa desde esa
+        clave. En PostgreSQL rankea con ts_rank; en otras bases, con BM25.
+        """
+        filtros = dict(
+            especialidad_id=especialidad_id,
+            especialidad_nombre=especialidad_nombre,
+            provincia=provincia,
+            departamento=departamento,
+            barrio=barrio,
+            dia_semana=dia_semana,
+            hora_desde=hora_desde,
+            hora_hasta=hora_hasta,
+        )
+
+        if self._usa_full_text:
+            query, relevancia = self._query_texto(texto, **filtros)
+            if despues_de is not None:
+                valor, prof_id = despues_de
                 query = query.filter(
-                    EspecialidadORM.nombre.ilike(f"%{especialidad_nombre}%")
+                    or_(
+                        relevancia < valor,
+                        and_(relevancia == valor, ProfesionalORM.id > prof_id),
+                    )
                 )
+            query = query.order_by(relevancia.desc(), ProfesionalORM.id)
+            if limite:
+                query = query.limit(limite)
+            ranking = query.all()
+        else:
+            ranking = self._ranking_bm25(texto, **filtros)
+            if despues_de is not None:
+                valor, prof_id = despues_de
+                ranking = [(i, r) for i, r in ranking if (-r, i) > (-valor, prof_id)]
+            if limite:
+                ranking = ranking[:limite]
+
+        if not ranking:
+            return []
+
+        relevancias = dict(ranking)
+        orms = self._query().filter(ProfesionalORM.id.in_(list(relevancias))).all()
+        orms.sort(key=lambda orm: (-relevancias[orm.id], orm.id))
+        return [(self._to_domain(orm), relevancias[orm.id]) for orm in orms]
+
+    def contar_por_texto(
+        self,
+        texto: str,
+        especialidad_id: Optional[int] = None,
+        especialidad_nombre: Optional[str] = None,
+        provincia: Optional[str] = None,
+        departamento: Optional[str] = None,
+        barrio: Optional[str] = None,
+        dia_semana: Optional[int] = None,
+        hora_desde: Optional[time] = None,
+        hora_hasta: Optional[time] = None,
+    ) -> int:
+        """Total de buscar_por_texto sin cargar perfiles"""
+        filtros = dict(
+            especialidad_id=especialidad_id,
+            especialidad_nombre=especialidad_nombre,
+            provincia=provincia,
+            departamento=departamento,
+            barrio=barrio,
+            dia_semana=dia_semana,
+            hora_desde=hora_desde,
+            hora_hasta=hora_hasta,
+        )
+        if self._usa_full_text:
+            query, _ = self._query_texto(texto, **filtros)
+            return query.with_entities(func.count(ProfesionalORM.id)).scalar()
+        return len(self._ranking_bm25(texto, **filtros))
 
-        orms = query.all()
+    def buscar_cercanos(
+        self,
+        latitud: float,
+        longitud: float,
+        radio_km: float,
+        limite: Optional[int] = None,
+        especialidad_id: Optional[int] = None,
+        especialidad_nombre: Optional[str] = None,
+        despues_de: Optional[Tuple[float, UUID]] = None,
+        dia_semana: Optional[int] = None,
+        hora_desde: Optional[time] = None,
+        hora_hasta: Optional[time] = None,
+        provincia: Optional[str] = None,
+        departamento: Optional[str] = None,
+        barrio: Optional[str] = None,
+    ) -> List[Profesional]:
+        """
+        Profesionales activos a `radio_km` o menos del punto, ordenados por
+        (distancia, id). `despues_de` continúa desde esa clave; provincia,
+        departamento y barrio filtran como en buscar_combinado.
+
+        En dos pasos: primero sólo (id, latitud, longitud) de las direcciones
+        dentro de la caja envolvente (rango sobre ix_direccion_lat_lon, sin
+        trigonometría en SQL); la distancia exacta se calcula en Python sobre
+        esos candidatos. Después se cargan los perfiles completos únicamente
+        de los que quedan dentro del radio (y del límite).
+        """
+        lat_min, lat_max, lon_min, lon_max = caja_envolvente(
+            latitud, longitud, radio_km
+        )
+        query = (
+            self.session.query(
+                ProfesionalORM.id, DireccionORM.latitud, DireccionORM.longitud
+            )
+            .join(ProfesionalORM.direccion)
+            .filter(
+                ProfesionalORM.activo,
+                DireccionORM.latitud.between(lat_min, lat_max),
+                DireccionORM.longitud.between(lon_min, lon_max),
+            )
+        )
+
+        if provincia or departamento or barrio:
+            query = (
+                query.join(DireccionORM.barrio)
+                .join(BarrioORM.departamento)
+                .join(DepartamentoORM.provincia)
+            )
+            if provincia:
+                query = query.filter(
+                    _contiene(ProvinciaORM.nombre_normalizado, provincia)
+                )
+            if departamento:
+                query = query.filter(
+                    _contiene(DepartamentoORM.nombre_normalizado, departamento)
+                )
+            if barrio:
+                query = query.filter(_contiene(BarrioORM.nombre_normalizado, barrio))
+
+        if especialidad_id:
+            query = query.filter(
+                ProfesionalORM.especialidades.any(
+                    EspecialidadORM.id_especialidad == especialidad_id
+                )
+            )
+        elif especialidad_nombre:
+            query = query.filter(
+                ProfesionalORM.especialidades.any(
+                    _contiene(EspecialidadORM.nombre_normalizado, especialidad_nombre)
+                )
+            )
+
+        query = _filtrar_disponibilidad(query, dia_semana, hora_desde, hora_hasta)
+
+        distancias = {}
+        for prof_id, lat, lon in query.all():
+            distancia = haversine_km(latitud, longitud, lat, lon)
+            if distancia > radio_km:
+                continue
+            if despues_de is not None and (distancia, prof_id) <= despues_de:
+                continue
+            distancias[prof_id] = distancia
+
+        ids = sorted(distancias, key=lambda prof_id: (distancias[prof_id], prof_id))
+        if limite:
+            ids = ids[:limite]
+        if not ids:
+            return []
+
+        orms = self._query().filter(ProfesionalORM.id.in_(ids)).all()
+        orms.sort(key=lambda orm: (distancias[orm.id], orm.id))
         return [self._to_domain(orm) for orm in orms]
 
     def verificar(self, id: UUID) -> Optional[Profesional]:
         """Marca un profesional como verificado"""
-        orm = (
-            self.session.query(ProfesionalORM)
-            .filter(ProfesionalORM.id == str(id))
-            .first()
-        )
+        orm = self._query().filter(ProfesionalORM.id == id).first()
 
         if not orm:
             return None
 
+        anterior = self._to_domain(orm) if self.observers else None
+
         orm.verificado = True
+        orm.puntaje = puntaje_base(
+            orm.valoraciones_cantidad, orm.valoraciones_suma, orm.verificado
+        )
         self.session.commit()
-        self.session.refresh(orm)
 
-        return self._to_domain(orm)
+        actualizado = self._releer(orm.id)
+        self.notify(ProfesionalActualizado(profesional=actualizado, anterior=anterior))
+        return actualizado
 
     def contar_profesionales(
         self, solo_activos: bool = False, solo_verificados: bool = False
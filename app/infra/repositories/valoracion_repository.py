@@ -1,19 +1,62 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 from uuid import UUID
 
 from app.domain.entities.valoraciones import Valoracion
+from app.domain.ranking import puntaje_base
+from app.infra.persistence.perfiles import ProfesionalORM
 from app.infra.persistence.valoraciones import ValoracionORM
 
+if TYPE_CHECKING:
+    from app.infra.repositories.profesional_repository import ProfesionalRepository
+
 
 class ValoracionRepository:
     """
     Repositorio para gestionar la persistencia de Valoraciones.
     Implementa el patrón Repository para abstraer el acceso a datos.
+
+    Cada alta, edición o baja actualiza en la misma transacción el resumen
+    del profesional (cantidad, suma y puntaje de ranking), así ordenar una
+    búsqueda por puntaje no necesita recorrer las valoraciones. Si se pasa
+    el repositorio de profesionales, se le avisa para que sus observadores
+    (índice y cache de búsqueda) vean el puntaje nuevo.
     """
 
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        profesionales: Optional["ProfesionalRepository"] = None,
+    ):
         self.session = session
+        self.profesionales = profesionales
+
+    def _acumular(
+        self, profesional_id: UUID, delta_cantidad: int, delta_suma: int
+    ) -> None:
+        """
+        Suma los deltas al resumen del profesional y recalcula su puntaje.
+        La fila se bloquea (SELECT ... FOR UPDATE) hasta el commit para que
+        dos valoraciones simultáneas no pisen el contador.
+        """
+        orm = (
+            self.session.query(ProfesionalORM)
+            .filter(ProfesionalORM.id == profesional_id)
+            .with_for_update()
+            .populate_existing()
+            .first()
+        )
+        if not orm:
+            return
+        orm.valoraciones_cantidad += delta_cantidad
+        orm.valoraciones_suma += delta_suma
+        orm.puntaje = puntaje_base(
+            orm.valoraciones_cantidad, orm.valoraciones_suma, orm.verificado
+        )
+
+    def _avisar(self, profesional_id: UUID) -> None:
+        if self.profesionales is not None:
+            self.profesionales.refrescar(profesional_id)
 
     def _to_domain(self, orm: ValoracionORM) -> Valoracion:
         """
@@ -170,8 +213,10 @@ class ValoracionRepository:
         orm = self._to_orm(valoracion)
 
         self.session.add(orm)
+        self._acumular(orm.profesional_id, 1, orm.puntuacion)
         self.session.commit()
         self.session.refresh(orm)
+        self._avisar(orm.profesional_id)
 
         return self._to_domain(orm)
 
@@ -194,10 +239,15 @@ class ValoracionRepository:
         if not orm:
             return None
 
+        puntuacion_anterior = orm.puntuacion
         orm = self._to_orm(valoracion, orm)
+        if orm.puntuacion != puntuacion_anterior:
+            delta = orm.puntuacion - puntuacion_anterior
+            self._acumular(orm.profesional_id, 0, delta)
 
         self.session.commit()
         self.session.refresh(orm)
+        self._avisar(orm.profesional_id)
 
         return self._to_domain(orm)
 
@@ -216,8 +266,11 @@ class ValoracionRepository:
         if not orm:
             return False
 
+        profesional_id = orm.profesional_id
+        self._acumular(profesional_id, -1, -orm.puntuacion)
         self.session.delete(orm)
         self.session.commit()
+        self._avisar(profesional_id)
 
         return True
 
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request, status
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
@@ -5,6 +7,7 @@ from app.api.routers import (
     auth,
     busqueda,
     consultas,
+    eventos,
     pacientes,
     profesionales,
     valoraciones,
@@ -16,11 +19,25 @@ from app.api.exceptions import (
     ForbiddenException,
     ConflictException,
 )
+from app.api.despacho_eventos import detener_despacho, iniciar_despacho
+from app.api.event_bus import detener_bus, iniciar_bus
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Outbox de eventos de consultas: se entregan fuera de los requests
+    iniciar_bus()
+    iniciar_despacho()
+    yield
+    await detener_despacho()
+    await detener_bus()
+
 
 app = FastAPI(
     title="ATHomeRed API",
     version="0.1",
     description="API para la gestion de profesionales de la salud, pacientes y consultas",
+    lifespan=lifespan,
 )
 
 
@@ -82,6 +99,7 @@ async def value_error_exception_handler(request: Request, exc: ValueError):
 app.include_router(auth.router, tags=["Autenticación"])
 app.include_router(busqueda.router, prefix="/busqueda", tags=["Búsqueda"])
 app.include_router(consultas.router, prefix="/consultas", tags=["Consultas"])
+app.include_router(eventos.router, prefix="/eventos", tags=["Eventos"])
 app.include_router(pacientes.router, prefix="/pacientes", tags=["Pacientes"])
 app.include_router(
     profesionales.router, prefix="/profesionales", tags=["Profesionales"]
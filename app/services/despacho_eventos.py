@@ -0,0 +1,149 @@
+"""
+Despachador del outbox de eventos de consultas.
+
+Los routers no publican los eventos en el request: ConsultaRepository los
+escribe en la tabla evento en la misma transacción que el cambio de la
+consulta (si el commit falla, no hay evento; si se confirma, el evento no se
+pierde aunque el proceso caiga justo después). Este despachador los toma
+por lotes y los entrega a los suscriptores del EventBus: encola el lote
+entero (EventBus.encolar; con EventBusAsincrono lo procesan sus workers, con
+su contrapresión y métricas) y espera el acuse de cada evento.
+
+- Entrega al menos una vez: un evento se marca despachado recién cuando
+  todos sus suscriptores terminaron sin error, en el mismo commit del lote;
+  si el proceso cae antes, se vuelve a entregar.
+- Los suscriptores que acumulan para enviar agrupado (emails) se vacían al
+  final del lote con `vaciar` (devuelve los eventos no enviados y su
+  error); esos eventos cuentan como fallidos.
+- Si un suscriptor falla o el acuse no llega en `timeout_entrega_s`, el
+  evento se reintenta con espera creciente
+  (ESPERA_BASE_S · 2^(intentos-1)) hasta MAX_INTENTOS; después queda en la
+  tabla con su último error, sin reintentarse.
+- Corre como tarea asyncio dentro de la API (app.api.despacho_eventos) o
+  como proceso aparte (scripts/database/despachar_eventos.py). Consulta la
+  tabla cada `intervalo_s` mientras no haya pendientes; con pendientes,
+  encadena lotes sin esperar.
+"""
+
+import asyncio
+import time
+from concurrent.futures import TimeoutError as FuturoVencido
+from datetime import datetime, timedelta, timezone
+from logging import getLogger
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.domain.observers.observadores import EventBus
+from app.infra.repositories.evento_repository import EventoRepository
+
+logger = getLogger(__name__)
+
+TAMANO_LOTE = 100
+MAX_INTENTOS = 8
+ESPERA_BASE_S = 5.0
+INTERVALO_S = 1.0
+TIMEOUT_ENTREGA_S = 60.0
+
+
+class DespachadorEventos:
+    """Entrega los eventos pendientes del outbox a los suscriptores del bus"""
+
+    def __init__(
+        self,
+        crear_sesion: Callable[[], Session],
+        event_bus: EventBus,
+        tamano_lote: int = TAMANO_LOTE,
+        max_intentos: int = MAX_INTENTOS,
+        espera_base_s: float = ESPERA_BASE_S,
+        timeout_entrega_s: float = TIMEOUT_ENTREGA_S,
+        vaciar: Optional[Callable[[], List[Tuple[object, Exception]]]] = None,
+    ):
+        self.crear_sesion = crear_sesion
+        self.event_bus = event_bus
+        self.tamano_lote = tamano_lote
+        self.max_intentos = max_intentos
+        self.espera_base_s = espera_base_s
+        self.timeout_entrega_s = timeout_entrega_s
+        self.vaciar = vaciar
+
+    def _espera(self, intentos: int) -> timedelta:
+        return timedelta(seconds=self.espera_base_s * 2 ** max(intentos - 1, 0))
+
+    @staticmethod
+    def _esperar(entrega, limite: float) -> Optional[Exception]:
+        try:
+            entrega.result(max(limite - time.monotonic(), 0))
+        except FuturoVencido:
+            return FuturoVencido("Entrega sin acuse")
+        except Exception as e:
+            return e
+        return None
+
+    def _fallido(self, repo, orm, ahora: datetime, error: Exception) -> None:
+        repo.marcar_fallido(orm, error, ahora, self._espera(orm.intentos + 1))
+        if orm.intentos >= self.max_intentos:
+            logger.error(
+                f"Evento {orm.id} ({orm.tipo}) descartado tras "
+                f"{orm.intentos} intentos: {error}"
+            )
+
+    def despachar_lote(self) -> int:
+        """
+        Toma hasta `tamano_lote` pendientes, los entrega y confirma el
+        resultado de todos en un commit.
+
+        Returns:
+            Cantidad de eventos tomados (entregados o fallidos)
+        """
+        session = self.crear_sesion()
+        try:
+            repo = EventoRepository(session)
+            ahora = datetime.now(timezone.utc)
+            pendientes = repo.reservar_pendientes(
+                self.tamano_lote, ahora, self.max_intentos
+            )
+            eventos = [repo.a_evento(orm) for orm in pendientes]
+            entregas = [self.event_bus.encolar(evt) for evt in eventos]
+            limite = time.monotonic() + self.timeout_entrega_s
+            errores = [self._esperar(entrega, limite) for entrega in entregas]
+            if self.vaciar is not None:
+                # Lo acumulado sale antes del commit: solo se marca lo enviado
+                no_enviados = {id(evt): error for evt, error in self.vaciar()}
+                errores = [
+                    error or no_enviados.get(id(evt))
+                    for evt, error in zip(eventos, errores)
+                ]
+            for orm, error in zip(pendientes, errores):
+                if error is None:
+                    repo.marcar_despachado(orm, ahora)
+                else:
+                    self._fallido(repo, orm, ahora, error)
+            session.commit()
+            return len(pendientes)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    async def ejecutar(
+        self, detener: asyncio.Event, intervalo_s: float = INTERVALO_S
+    ) -> None:
+        """
+        Despacha hasta que se active `detener`. Cada lote corre en un hilo
+        (los suscriptores y la base son bloqueantes); un error de base se
+        registra y se reintenta en el siguiente ciclo.
+        """
+        while not detener.is_set():
+            try:
+                tomados = await asyncio.to_thread(self.despachar_lote)
+            except Exception:
+                logger.exception("Error despachando eventos del outbox")
+                tomados = 0
+
+            if tomados < self.tamano_lote:
+                try:
+                    await asyncio.wait_for(detener.wait(), timeout=intervalo_s)
+                except asyncio.TimeoutError:
+                    pass
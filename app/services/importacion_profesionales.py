@@ -0,0 +1,311 @@
+"""
+Importación masiva de profesionales desde CSV o JSONL (alta de clínicas).
+
+- Las filas se leen de a una desde el archivo (no se carga entero) y se
+  validan con el mismo schema que POST /profesionales (ProfesionalCreate).
+- Las válidas se agrupan en lotes de `tamano_lote` y cada lote se escribe con
+  ProfesionalRepository.importar_lote: una transacción y una cantidad fija de
+  sentencias por lote.
+- Los errores se informan por número de fila (1 = primera fila de datos).
+- Reanudable: cada lote confirmado informa la última fila procesada
+  (`al_confirmar`) y `desde_fila` saltea las anteriores. Además, los emails
+  ya registrados se cuentan como omitidos, así que repetir un archivo no
+  duplica profesionales.
+
+JSONL: un objeto por línea con la forma de ProfesionalCreate.
+
+CSV: columnas nombre, apellido, email, celular, provincia, departamento,
+barrio, calle, numero, latitud, longitud, especialidades, disponibilidades y
+matriculas. Las tres últimas son listas con los elementos separados por "|"
+y los campos de cada elemento por ";":
+
+    especialidades:   1|3
+    disponibilidades: "1,3;09:00;13:00|5;14:00;18:00"   (días;desde;hasta)
+    matriculas:       MP-123;Córdoba;2020-01-01|MN-9;Buenos Aires;2021-05-01;2031-05-01
+"""
+
+import csv
+import json
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+)
+from uuid import uuid4
+
+from pydantic import ValidationError
+
+from app.domain.entities.catalogo import Especialidad
+from app.domain.entities.usuarios import Profesional
+from app.domain.enumeraciones import DiaSemana
+from app.domain.value_objects.objetos_valor import (
+    Disponibilidad,
+    Matricula,
+    Ubicacion,
+)
+from app.infra.repositories.catalogo_repository import CatalogoRepository
+from app.infra.repositories.profesional_repository import ProfesionalRepository
+
+if TYPE_CHECKING:
+    from app.api.schemas import ProfesionalCreate
+
+FORMATO_CSV = "csv"
+FORMATO_JSONL = "jsonl"
+FORMATOS = (FORMATO_CSV, FORMATO_JSONL)
+
+TAMANO_LOTE = 500
+
+_SEPARADOR_ELEMENTOS = "|"
+_SEPARADOR_CAMPOS = ";"
+
+
+@dataclass
+class FilaLeida:
+    numero: int
+    datos: Optional[dict] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class ErrorFila:
+    fila: int
+    mensaje: str
+
+
+@dataclass
+class ResultadoImportacion:
+    leidas: int = 0
+    importadas: int = 0
+    omitidas: int = 0
+    errores: List[ErrorFila] = field(default_factory=list)
+    # Última fila de un lote confirmado: para retomar desde la siguiente
+    ultima_fila: int = 0
+
+
+def _lista(valor: Optional[str]) -> List[List[str]]:
+    if not valor or not valor.strip():
+        return []
+    return [
+        [campo.strip() for campo in elemento.split(_SEPARADOR_CAMPOS)]
+        for elemento in valor.split(_SEPARADOR_ELEMENTOS)
+    ]
+
+
+def fila_csv_a_datos(fila: Dict[str, str]) -> dict:
+    """Fila plana del CSV → dict con la forma de ProfesionalCreate"""
+
+    def valor(columna: str) -> Optional[str]:
+        texto = (fila.get(columna) or "").strip()
+        return texto or None
+
+    disponibilidades = []
+    for campos in _lista(fila.get("disponibilidades")):
+        if len(campos) != 3:
+            raise ValueError("disponibilidades: se espera días;desde;hasta")
+        dias, desde, hasta = campos
+        disponibilidades.append(
+            {
+                "dias_semana": [int(d) for d in dias.split(",")],
+                "hora_inicio": desde,
+                "hora_fin": hasta,
+            }
+        )
+
+    matriculas = []
+    for campos in _lista(fila.get("matriculas")):
+        if len(campos) not in (3, 4):
+            raise ValueError("matriculas: se espera número;provincia;desde[;hasta]")
+        matriculas.append(
+            {
+                "numero": campos[0],
+                "provincia": campos[1],
+                "vigente_desde": campos[2],
+                "vigente_hasta": campos[3] if len(campos) == 4 else None,
+            }
+        )
+
+    return {
+        "nombre": valor("nombre"),
+        "apellido": valor("apellido"),
+        "email": valor("email"),
+        "celular": valor("celular"),
+        "ubicacion": {
+            "provincia": valor("provincia"),
+            "departamento": valor("departamento"),
+            "barrio": valor("barrio"),
+            "calle": valor("calle"),
+            "numero": valor("numero"),
+            "latitud": valor("latitud"),
+            "longitud": valor("longitud"),
+        },
+        "especialidades": [
+            int(campos[0]) for campos in _lista(fila.get("especialidades"))
+        ],
+        "disponibilidades": disponibilidades,
+        "matriculas": matriculas,
+    }
+
+
+def leer_filas(archivo: TextIO, formato: str) -> Iterator[FilaLeida]:
+    """Recorre el archivo de a una fila; las que no se pueden leer traen `error`"""
+    if formato == FORMATO_JSONL:
+        numero = 0
+        for linea in archivo:
+            if not linea.strip():
+                continue
+            numero += 1
+            try:
+                datos = json.loads(linea)
+            except json.JSONDecodeError as e:
+                yield FilaLeida(numero, error=f"JSON inválido: {e.msg}")
+                continue
+            if not isinstance(datos, dict):
+                yield FilaLeida(numero, error="Se espera un objeto JSON por línea")
+                continue
+            yield FilaLeida(numero, datos=datos)
+    elif formato == FORMATO_CSV:
+        for numero, fila in enumerate(csv.DictReader(archivo), start=1):
+            try:
+                yield FilaLeida(numero, datos=fila_csv_a_datos(fila))
+            except ValueError as e:
+                yield FilaLeida(numero, error=str(e))
+    else:
+        raise ValueError(f"Formato '{formato}' no soportado (csv o jsonl)")
+
+
+def _mensaje_validacion(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(parte) for parte in detalle['loc'])}: {detalle['msg']}"
+        for detalle in error.errors()
+    )
+
+
+def _a_dominio(
+    datos: "ProfesionalCreate", especialidades: Dict[int, Especialidad]
+) -> Profesional:
+    ubicacion = datos.ubicacion
+    return Profesional(
+        id=uuid4(),
+        nombre=datos.nombre,
+        apellido=datos.apellido,
+        email=datos.email,
+        celular=datos.celular or "",
+        ubicacion=Ubicacion(
+            provincia=ubicacion.provincia,
+            departamento=ubicacion.departamento,
+            barrio=ubicacion.barrio,
+            calle=ubicacion.calle,
+            numero=ubicacion.numero,
+            latitud=ubicacion.latitud,
+            longitud=ubicacion.longitud,
+        ),
+        activo=True,
+        verificado=False,
+        especialidades=[especialidades[esp_id] for esp_id in datos.especialidades],
+        disponibilidades=[
+            Disponibilidad(
+                dias_semana=[DiaSemana(d) for d in disp.dias_semana],
+                hora_inicio=disp.hora_inicio,
+                hora_fin=disp.hora_fin,
+            )
+            for disp in (datos.disponibilidades or [])
+        ],
+        matriculas=[
+            Matricula(
+                numero=mat.numero,
+                provincia=mat.provincia,
+                vigente_desde=mat.vigente_desde,
+                vigente_hasta=mat.vigente_hasta,
+            )
+            for mat in (datos.matriculas or [])
+        ],
+    )
+
+
+class ImportadorProfesionales:
+    """Valida filas, las agrupa en lotes y las escribe con importar_lote"""
+
+    def __init__(
+        self,
+        repo: ProfesionalRepository,
+        catalogo_repo: CatalogoRepository,
+        tamano_lote: int = TAMANO_LOTE,
+    ):
+        self.repo = repo
+        self.catalogo_repo = catalogo_repo
+        self.tamano_lote = tamano_lote
+
+    def importar(
+        self,
+        filas: Iterable[FilaLeida],
+        desde_fila: int = 1,
+        al_confirmar: Optional[Callable[[int], None]] = None,
+    ) -> ResultadoImportacion:
+        # Import diferido: app.api importa este módulo desde el router
+        from app.api.schemas import ProfesionalCreate
+
+        especialidades = {e.id: e for e in self.catalogo_repo.listar_especialidades()}
+        resultado = ResultadoImportacion(ultima_fila=desde_fila - 1)
+        lote: List[Profesional] = []
+        numeros: List[int] = []
+
+        def confirmar(hasta_fila: int) -> None:
+            if lote:
+                ya_registrados, rechazados = self.repo.importar_lote(lote)
+                for posicion, motivo in rechazados.items():
+                    resultado.errores.append(ErrorFila(numeros[posicion], motivo))
+                resultado.omitidas += len(ya_registrados)
+                resultado.importadas += (
+                    len(lote) - len(ya_registrados) - len(rechazados)
+                )
+                lote.clear()
+                numeros.clear()
+            resultado.ultima_fila = hasta_fila
+            if al_confirmar is not None:
+                al_confirmar(hasta_fila)
+
+        numero = resultado.ultima_fila
+        for fila in filas:
+            numero = fila.numero
+            if numero < desde_fila:
+                continue
+            resultado.leidas += 1
+
+            if fila.error is not None:
+                resultado.errores.append(ErrorFila(numero, fila.error))
+                continue
+            try:
+                datos = ProfesionalCreate.model_validate(fila.datos)
+            except ValidationError as e:
+                resultado.errores.append(ErrorFila(numero, _mensaje_validacion(e)))
+                continue
+            desconocidas = [
+                esp_id
+                for esp_id in datos.especialidades
+                if esp_id not in especialidades
+            ]
+            if desconocidas:
+                resultado.errores.append(
+                    ErrorFila(numero, f"Especialidades inexistentes: {desconocidas}")
+                )
+                continue
+            try:
+                lote.append(_a_dominio(datos, especialidades))
+            except ValueError as e:
+                resultado.errores.append(ErrorFila(numero, str(e)))
+                continue
+            numeros.append(numero)
+
+            if len(lote) >= self.tamano_lote:
+                confirmar(numero)
+
+        if numero > resultado.ultima_fila:
+            confirmar(numero)
+        resultado.errores.sort(key=lambda e: e.fila)
+        return resultado
@@ -0,0 +1,328 @@
+"""
+Notificaciones por email de las consultas, agrupadas y por SMTP real.
+
+NotificadorEmailAgrupado es el observer que reemplaza al NotificadorEmail
+simulado cuando hay SMTP configurado (app.api.event_bus). update no envía:
+acumula el evento y vuelve. vaciar() busca los destinatarios de todo lo
+acumulado con una query (el profesional y el solicitante de cada consulta)
+y manda a cada destinatario un solo email con todas sus novedades: un
+profesional con 40 reservas confirmadas en un lote recibe un resumen, no
+40 emails.
+
+Los emails salen por PoolSmtp: hasta `tamano` conexiones SMTP abiertas que
+se reutilizan entre envíos (una sesión manda muchos mensajes). Una conexión
+que el servidor cerró se reabre y el mensaje se reintenta una vez.
+
+El despachador del outbox (app.services.despacho_eventos) llama a vaciar()
+al final de cada lote, antes del commit: vaciar devuelve los eventos que no
+llegaron a alguno de sus destinatarios y el despachador los deja pendientes
+para reintentarlos (al menos una vez: quien sí lo recibió puede recibirlo de
+nuevo). cerrar() (al apagar la app) manda lo pendiente y cierra las
+conexiones y los hilos de envío.
+"""
+
+import queue
+import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from logging import getLogger
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from app.domain.observers.observadores import Observer
+
+logger = getLogger(__name__)
+
+CONEXIONES_SMTP = 4
+TIMEOUT_SMTP_S = 10.0
+# Eventos por email: un resumen más largo se parte en varios
+MAX_POR_RESUMEN = 50
+
+EVENTOS_NOTIFICABLES = {
+    "cita.creada": "Nueva consulta",
+    "cita.confirmada": "Consulta confirmada",
+    "cita.cancelada": "Consulta cancelada",
+    "cita.reprogramada": "Consulta reprogramada",
+    "cita.completada": "Consulta completada",
+}
+
+# Datos de cada tipo de evento que se muestran en el email
+_DETALLES = {
+    "cita.confirmada": [("confirmado_por", "Confirmado por")],
+    "cita.cancelada": [("motivo", "Motivo"), ("cancelado_por", "Cancelado por")],
+    "cita.reprogramada": [
+        ("fecha_anterior", "Fecha anterior"),
+        ("fecha_nueva", "Fecha nueva"),
+    ],
+    "cita.completada": [("notas", "Notas")],
+}
+
+
+class PoolSmtp:
+    """Conexiones SMTP reutilizables, hasta `tamano` abiertas a la vez"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 25,
+        usuario: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = False,
+        tamano: int = CONEXIONES_SMTP,
+        timeout_s: float = TIMEOUT_SMTP_S,
+    ):
+        self.host = host
+        self.port = port
+        self.usuario = usuario
+        self.password = password
+        self.starttls = starttls
+        self.tamano = tamano
+        self.timeout_s = timeout_s
+        self._libres: "queue.LifoQueue[smtplib.SMTP]" = queue.LifoQueue()
+        self._cupos = threading.BoundedSemaphore(tamano)
+        self._lock = threading.Lock()
+        self.sesiones = 0
+        self.enviados = 0
+
+    def _conectar(self) -> smtplib.SMTP:
+        conexion = smtplib.SMTP(self.host, self.port, timeout=self.timeout_s)
+        try:
+            if self.starttls:
+                conexion.starttls()
+            if self.usuario:
+                conexion.login(self.usuario, self.password or "")
+        except Exception:
+            conexion.close()
+            raise
+        with self._lock:
+            self.sesiones += 1
+        return conexion
+
+    def _tomar(self) -> smtplib.SMTP:
+        self._cupos.acquire()
+        try:
+            return self._libres.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._conectar()
+        except Exception:
+            self._cupos.release()
+            raise
+
+    def _devolver(self, conexion: Optional[smtplib.SMTP]) -> None:
+        if conexion is not None:
+            self._libres.put(conexion)
+        self._cupos.release()
+
+    @staticmethod
+    def _descartar(conexion: smtplib.SMTP) -> None:
+        try:
+            conexion.close()
+        except Exception:
+            pass
+
+    def _mandar(self, conexion: smtplib.SMTP, mensaje: EmailMessage) -> bool:
+        try:
+            conexion.send_message(mensaje)
+            return True
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException) as e:
+            # La sesión sigue sana: el servidor rechazó solo este mensaje
+            logger.error(f"Email a {mensaje['To']} rechazado: {e}")
+            return False
+
+    def enviar(self, mensajes: Iterable[EmailMessage]) -> List[EmailMessage]:
+        """
+        Manda `mensajes` por una misma conexión.
+
+        Returns:
+            Los mensajes que el servidor rechazó (vacía si aceptó todos)
+        """
+        conexion = self._tomar()
+        enviados = 0
+        rechazados = []
+        try:
+            for mensaje in mensajes:
+                try:
+                    aceptado = self._mandar(conexion, mensaje)
+                except smtplib.SMTPServerDisconnected:
+                    # El servidor cerró la conexión ociosa: otra y un reintento
+                    self._descartar(conexion)
+                    conexion = None
+                    conexion = self._conectar()
+                    aceptado = self._mandar(conexion, mensaje)
+                if aceptado:
+                    enviados += 1
+                else:
+                    rechazados.append(mensaje)
+        except Exception:
+            if conexion is not None:
+                self._descartar(conexion)
+                conexion = None
+            raise
+        finally:
+            self._devolver(conexion)
+            with self._lock:
+                self.enviados += enviados
+        return rechazados
+
+    def cerrar(self) -> None:
+        while True:
+            try:
+                conexion = self._libres.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                conexion.quit()
+            except Exception:
+                self._descartar(conexion)
+
+
+class NotificadorEmailAgrupado(Observer):
+    """Observer que agrupa los eventos por destinatario (ver docstring del módulo)"""
+
+    def __init__(
+        self,
+        pool: PoolSmtp,
+        destinatarios: Callable[[List[UUID]], Dict[UUID, List[str]]],
+        remitente: str,
+        max_por_resumen: int = MAX_POR_RESUMEN,
+    ):
+        self.pool = pool
+        self.destinatarios = destinatarios
+        self.remitente = remitente
+        self.max_por_resumen = max_por_resumen
+
+        # Protege los pendientes y los contadores (update corre en los
+        # workers del bus, vaciar en el despachador)
+        self._lock = threading.Lock()
+        self._pendientes: list = []
+        self._envios: Optional[ThreadPoolExecutor] = None
+        self.resumenes = 0
+        self.fallidos = 0
+
+    def update(self, evt) -> None:
+        """Acumula el evento; se envía en el próximo vaciar()"""
+        if getattr(evt, "tipo", None) not in EVENTOS_NOTIFICABLES:
+            return
+        with self._lock:
+            self._pendientes.append(evt)
+
+    def _tomar_pendientes(self) -> list:
+        with self._lock:
+            eventos, self._pendientes = self._pendientes, []
+        return eventos
+
+    def _ejecutor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._envios is None:
+                self._envios = ThreadPoolExecutor(
+                    max_workers=self.pool.tamano, thread_name_prefix="smtp"
+                )
+            return self._envios
+
+    def vaciar(self) -> List[Tuple[object, Exception]]:
+        """
+        Envía ya lo pendiente (un email por destinatario) y espera el envío.
+
+        Returns:
+            Los eventos que no llegaron a alguno de sus destinatarios, con el
+            error (vacía si se envió todo)
+        """
+        eventos = self._tomar_pendientes()
+        if not eventos:
+            return []
+        try:
+            por_consulta = self.destinatarios(list({e.cita_id for e in eventos}))
+        except Exception as e:
+            logger.exception(
+                f"No se pudieron resolver destinatarios de {len(eventos)} eventos"
+            )
+            with self._lock:
+                self.fallidos += len(eventos)
+            return [(evt, e) for evt in eventos]
+
+        por_destinatario: Dict[str, list] = {}
+        for evt in eventos:
+            for email in por_consulta.get(evt.cita_id, []):
+                por_destinatario.setdefault(email, []).append(evt)
+
+        resumenes = []
+        for email, suyos in por_destinatario.items():
+            for i in range(0, len(suyos), self.max_por_resumen):
+                parte = suyos[i : i + self.max_por_resumen]
+                resumenes.append((self._mensaje(email, parte), parte))
+        # Un lote por conexión del pool, enviados en paralelo
+        tamano = self.pool.tamano
+        lotes = [resumenes[i::tamano] for i in range(tamano)]
+        envios = [
+            (lote, self._ejecutor().submit(self.pool.enviar, [m for m, _ in lote]))
+            for lote in lotes
+            if lote
+        ]
+
+        no_enviados: Dict[int, Tuple[object, Exception]] = {}
+        for lote, envio in envios:
+            try:
+                rechazados = {id(m) for m in envio.result()}
+                error = None
+            except Exception as e:
+                logger.error(f"Error enviando {len(lote)} emails: {e}")
+                rechazados = {id(m) for m, _ in lote}
+                error = e
+            for mensaje, suyos in lote:
+                if id(mensaje) not in rechazados:
+                    continue
+                motivo = error or RuntimeError(f"Email a {mensaje['To']} rechazado")
+                for evt in suyos:
+                    no_enviados.setdefault(id(evt), (evt, motivo))
+            with self._lock:
+                self.resumenes += len(lote) - len(rechazados)
+                self.fallidos += len(rechazados)
+        return list(no_enviados.values())
+
+    def _mensaje(self, email: str, eventos: list) -> EmailMessage:
+        mensaje = EmailMessage()
+        mensaje["From"] = self.remitente
+        mensaje["To"] = email
+        if len(eventos) == 1:
+            mensaje["Subject"] = f"ATHomeRed: {EVENTOS_NOTIFICABLES[eventos[0].tipo]}"
+        else:
+            mensaje["Subject"] = f"ATHomeRed: {len(eventos)} novedades de tus consultas"
+        mensaje.set_content("\n\n".join(self._describir(evt) for evt in eventos))
+        return mensaje
+
+    @staticmethod
+    def _describir(evt) -> str:
+        lineas = [
+            f"{EVENTOS_NOTIFICABLES[evt.tipo]} ({evt.timestamp:%d/%m/%Y %H:%M})",
+            f"  Consulta: {evt.cita_id}",
+        ]
+        for clave, etiqueta in _DETALLES.get(evt.tipo, []):
+            if evt.datos.get(clave):
+                lineas.append(f"  {etiqueta}: {evt.datos[clave]}")
+        return "\n".join(lineas)
+
+    def cerrar(self) -> None:
+        """
+        Envía lo pendiente y cierra las conexiones y los hilos de envío (un
+        vaciar posterior los vuelve a crear)
+        """
+        for evt, error in self.vaciar():
+            logger.error(f"Notificación de {evt.tipo} ({evt.cita_id}) perdida: {error}")
+        with self._lock:
+            envios, self._envios = self._envios, None
+        if envios is not None:
+            envios.shutdown(wait=True)
+        self.pool.cerrar()
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            return {
+                "pendientes": len(self._pendientes),
+                "resumenes": self.resumenes,
+                "fallidos": self.fallidos,
+                "sesiones_smtp": self.pool.sesiones,
+                "enviados": self.pool.enviados,
+            }
@@ -0,0 +1,95 @@
+"""
+Script para despachar el outbox de eventos de consultas como proceso aparte.
+
+Uso:
+    python -m scripts.database.despachar_eventos
+    python -m scripts.database.despachar_eventos --una-vez
+    python -m scripts.database.despachar_eventos --lote 500 --intervalo 2
+
+Entrega los eventos pendientes de la tabla evento a los suscriptores del
+EventBus (ver app.services.despacho_eventos). Pensado para correr con la API
+iniciada con EVENTOS_DESPACHO=0; igualmente, varios despachadores a la vez
+se reparten los pendientes sin entregar dos veces el mismo lote. Ctrl+C
+termina después del lote en curso.
+"""
+
+import argparse
+import asyncio
+import signal
+
+from app.api.event_bus import (
+    detener_bus,
+    event_bus,
+    iniciar_bus,
+    vaciar_notificaciones,
+)
+from app.infra.persistence.database import SessionLocal
+from app.infra.repositories.evento_repository import EventoRepository
+from app.services.despacho_eventos import (
+    INTERVALO_S,
+    MAX_INTENTOS,
+    TAMANO_LOTE,
+    DespachadorEventos,
+)
+
+
+def _pendientes() -> int:
+    session = SessionLocal()
+    try:
+        return EventoRepository(session).contar_pendientes(MAX_INTENTOS)
+    finally:
+        session.close()
+
+
+async def despachar(tamano_lote: int, intervalo_s: float) -> None:
+    despachador = DespachadorEventos(
+        SessionLocal, event_bus, tamano_lote=tamano_lote, vaciar=vaciar_notificaciones
+    )
+    detener = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for senal in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(senal, detener.set)
+
+    print("=" * 80)
+    print(f"DESPACHANDO EVENTOS ({_pendientes()} pendientes)")
+    print("=" * 80)
+    iniciar_bus()
+    try:
+        await despachador.ejecutar(detener, intervalo_s)
+    finally:
+        await detener_bus()
+    print(f"\n✓ Detenido ({_pendientes()} pendientes)")
+
+
+def despachar_una_vez(tamano_lote: int) -> None:
+    despachador = DespachadorEventos(
+        SessionLocal, event_bus, tamano_lote=tamano_lote, vaciar=vaciar_notificaciones
+    )
+
+    print("=" * 80)
+    print("DESPACHANDO EVENTOS PENDIENTES")
+    print("=" * 80)
+    total = 0
+    while True:
+        tomados = despachador.despachar_lote()
+        total += tomados
+        if tomados < tamano_lote:
+            break
+    print(f"  tomados:    {total}")
+    print(f"  pendientes: {_pendientes()} (fallidos a reintentar)")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE)
+    parser.add_argument("--intervalo", type=float, default=INTERVALO_S)
+    parser.add_argument(
+        "--una-vez", action="store_true", help="Vacía los pendientes y termina"
+    )
+    args = parser.parse_args()
+
+    if args.una_vez:
+        despachar_una_vez(args.lote)
+    else:
+        asyncio.run(despachar(args.lote, args.intervalo))
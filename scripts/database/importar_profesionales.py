@@ -0,0 +1,96 @@
+"""
+Script para importar profesionales en masa desde un CSV o JSONL.
+
+Uso:
+    python -m scripts.database.importar_profesionales archivo.csv
+    python -m scripts.database.importar_profesionales archivo.jsonl --lote 1000
+
+El formato de cada fila está descripto en app.services.importacion_profesionales.
+Después de cada lote confirmado se guarda la última fila en
+`<archivo>.checkpoint`; si el proceso se corta, volver a ejecutarlo retoma
+desde la fila siguiente (o desde --desde-fila). Al terminar sin cortes el
+checkpoint se borra.
+"""
+
+import argparse
+from pathlib import Path
+
+from app.infra.persistence.database import SessionLocal
+from app.infra.repositories.catalogo_repository import CatalogoRepository
+from app.infra.repositories.profesional_repository import ProfesionalRepository
+from app.services.importacion_profesionales import (
+    FORMATO_CSV,
+    FORMATO_JSONL,
+    FORMATOS,
+    TAMANO_LOTE,
+    ImportadorProfesionales,
+    leer_filas,
+)
+
+
+def _formato(archivo: Path, formato: str) -> str:
+    if formato:
+        return formato
+    return FORMATO_CSV if archivo.suffix.lower() == ".csv" else FORMATO_JSONL
+
+
+def importar(archivo: Path, formato: str, tamano_lote: int, desde_fila: int) -> None:
+    checkpoint = archivo.with_name(archivo.name + ".checkpoint")
+    if desde_fila is None:
+        desde_fila = (
+            int(checkpoint.read_text().strip()) + 1 if checkpoint.exists() else 1
+        )
+
+    print("=" * 80)
+    print(f"IMPORTANDO PROFESIONALES DESDE {archivo.name} (fila {desde_fila})")
+    print("=" * 80)
+
+    session = SessionLocal()
+    try:
+        importador = ImportadorProfesionales(
+            ProfesionalRepository(session),
+            CatalogoRepository(session),
+            tamano_lote=tamano_lote,
+        )
+
+        def al_confirmar(fila: int) -> None:
+            checkpoint.write_text(str(fila))
+            print(f"  ✓ confirmado hasta la fila {fila}")
+
+        with open(archivo, "r", encoding="utf-8-sig", newline="") as f:
+            resultado = importador.importar(
+                leer_filas(f, _formato(archivo, formato)),
+                desde_fila=desde_fila,
+                al_confirmar=al_confirmar,
+            )
+    except Exception as e:
+        session.rollback()
+        print(f"\n✗ ERROR al importar: {e}")
+        print(f"  Se puede retomar desde el checkpoint {checkpoint.name}")
+        raise
+    finally:
+        session.close()
+
+    checkpoint.unlink(missing_ok=True)
+
+    print("\n" + "=" * 80)
+    print("RESUMEN")
+    print("=" * 80)
+    print(f"  leídas:     {resultado.leidas}")
+    print(f"  importadas: {resultado.importadas}")
+    print(f"  omitidas:   {resultado.omitidas} (email ya registrado)")
+    print(f"  con error:  {len(resultado.errores)}")
+    for error in resultado.errores:
+        print(f"    fila {error.fila}: {error.mensaje}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("archivo", type=Path)
+    parser.add_argument("--formato", choices=FORMATOS, default=None)
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE)
+    parser.add_argument("--desde-fila", type=int, default=None)
+    args = parser.parse_args()
+
+    importar(args.archivo, args.formato, args.lote, args.desde_fila)
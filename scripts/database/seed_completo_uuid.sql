@@ -305,13 +305,14 @@ DO $$
 DECLARE
   prof RECORD;
   horarios TEXT[][] := ARRAY[
-    ARRAY['Lunes,Martes,Miércoles,Jueves,Viernes', '08:00', '14:00'],
-    ARRAY['Lunes,Martes,Miércoles,Jueves,Viernes', '14:00', '20:00'],
-    ARRAY['Lunes,Miércoles,Viernes', '09:00', '17:00'],
-    ARRAY['Martes,Jueves', '08:00', '16:00'],
-    ARRAY['Sábado,Domingo', '10:00', '18:00'],
-    ARRAY['Lunes,Martes,Miércoles', '07:00', '15:00'],
-    ARRAY['Jueves,Viernes,Sábado', '10:00', '18:00']
+    -- dias_mascara: bit (dia - 1) por día; lunes = 1, ..., domingo = 64
+    ARRAY['31', '08:00', '14:00'],  -- lunes a viernes
+    ARRAY['31', '14:00', '20:00'],  -- lunes a viernes
+    ARRAY['21', '09:00', '17:00'],  -- lunes, miércoles, viernes
+    ARRAY['10', '08:00', '16:00'],  -- martes, jueves
+    ARRAY['96', '10:00', '18:00'],  -- sábado, domingo
+    ARRAY['7', '07:00', '15:00'],   -- lunes, martes, miércoles
+    ARRAY['56', '10:00', '18:00']    -- jueves, viernes, sábado
   ];
   num_disponibilidades INT;
   idx INT;
@@ -330,10 +331,10 @@ BEGIN
       END LOOP;
       horario_usado := array_append(horario_usado, idx);
       
-      INSERT INTO athome.disponibilidad (profesional_id, dias_semana, hora_inicio, hora_fin)
+      INSERT INTO athome.disponibilidad (profesional_id, dias_mascara, hora_inicio, hora_fin)
       VALUES (
         prof.id,
-        horarios[idx][1],
+        horarios[idx][1]::smallint,
         horarios[idx][2]::time,
         horarios[idx][3]::time
       );
@@ -3,6 +3,8 @@ Tests de integración para el endpoint de búsqueda de profesionales
 """
 
 import pytest
+from dataclasses import replace
+from datetime import date, time
 from fastapi.testclient import TestClient
 from unittest.mock import Mock
 from uuid import uuid4
@@ -12,7 +14,22 @@ from app.api.dependencies import (
     get_profesional_repository,
     get_catalogo_repository,
     get_direccion_repository,
+    get_consulta_repository,
 )
+from app.api.cache_busqueda import get_cache_busquedas
+from app.api.autocompletado import get_trie_autocompletado
+from app.api.catalogo_referencia import get_cache_catalogo
+from app.domain.entities.catalogo import (
+    SUGERENCIA_BARRIO,
+    SUGERENCIA_ESPECIALIDAD,
+    ConteoFaceta,
+    NodoUbicacion,
+    Sugerencia,
+)
+from app.domain.strategies.autocompletado import TrieAutocompletado
+from app.domain.entities.usuarios import ResumenProfesional
+from app.domain.strategies.cache import CacheBusquedas
+from app.domain.strategies.snapshot import CacheCatalogo
 
 
 @pytest.fixture
@@ -43,10 +60,19 @@ def mock_repos(profesional_enfermeria, especialidad_enfermeria, ubicacion_buenos
     mock_prof_repo.buscar_por_especialidad.return_value = [profesional_enfermeria]
     mock_prof_repo.buscar_por_ubicacion.return_value = [profesional_enfermeria]
     mock_prof_repo.buscar_combinado.return_value = [profesional_enfermeria]
+    mock_prof_repo.buscar_cercanos.return_value = [profesional_enfermeria]
 
     mock_dir_repo.listar_provincias.return_value = [provincia_mock]
+    mock_dir_repo.listar_jerarquia.return_value = (
+        [NodoUbicacion(provincia_mock.id, provincia_mock.nombre)],
+        [],
+        [],
+    )
+
+    cache_catalogo = CacheCatalogo()
 
     app.dependency_overrides[get_profesional_repository] = lambda: mock_prof_repo
+    app.dependency_overrides[get_cache_catalogo] = lambda: cache_catalogo
     app.dependency_overrides[get_catalogo_repository] = lambda: mock_catalogo_repo
     app.dependency_overrides[get_direccion_repository] = lambda: mock_dir_repo
 
@@ -160,6 +186,515 @@ class TestBusquedaProfesionalesEndpoint:
         assert data["total"] == 0
         assert data["profesionales"] == []
 
+    def test_busqueda_por_cercania(self, client, mock_repos):
+        """Punto + radio usa la búsqueda por cercanía"""
+        payload = {
+            "nombre_especialidad": "Enfermería",
+            "latitud": -34.6,
+            "longitud": -58.38,
+            "radio_km": 5,
+            "limite": 3,
+        }
+
+        response = client.post("/busqueda/profesionales", json=payload)
+
+        assert response.status_code == 200
+        assert len(response.json()["profesionales"]) == 1
+        assert response.json()["siguiente_cursor"] is None
+        # un elemento de más para saber si hay página siguiente
+        mock_repos["profesional"].buscar_cercanos.assert_called_once_with(
+            latitud=-34.6,
+            longitud=-58.38,
+            radio_km=5,
+            limite=4,
+            especialidad_id=1,
+            especialidad_nombre="Enfermería",
+            provincia=None,
+            departamento=None,
+            barrio=None,
+        )
+
+    def test_busqueda_latitud_sin_longitud(self, client, mock_repos):
+        """Debe rechazar un punto incompleto"""
+        payload = {"latitud": -34.6, "radio_km": 5}
+
+        response = client.post("/busqueda/profesionales", json=payload)
+
+        assert response.status_code == 400
+
+    def test_ordenar_por_distancia_sin_punto(self, client, mock_repos):
+        """Debe rechazar ordenar por distancia sin punto de referencia"""
+        payload = {"provincia": "Buenos Aires", "ordenar_por_distancia": True}
+
+        response = client.post("/busqueda/profesionales", json=payload)
+
+        assert response.status_code == 400
+
+    def test_busqueda_por_disponibilidad(self, client, mock_repos):
+        """Día + franja llegan al repositorio como filtro de disponibilidad"""
+        payload = {"dia_semana": 1, "hora_desde": "09:30", "hora_hasta": "12:00"}
+
+        response = client.post("/busqueda/profesionales", json=payload)
+
+        assert response.status_code == 200
+        kwargs = mock_repos["profesional"].buscar_combinado.call_args.kwargs
+        assert kwargs["dia_semana"] == 1
+        assert kwargs["hora_desde"] == time(9, 30)
+        assert kwargs["hora_hasta"] == time(12, 0)
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"provincia": "Buenos Aires", "hora_desde": "09:00"},
+            {"dia_semana": 1, "hora_desde": "12:00", "hora_hasta": "09:00"},
+        ],
+    )
+    def test_franja_horaria_invalida(self, client, mock_repos, payload):
+        """Franja sin día o invertida se rechaza"""
+        response = client.post("/busqueda/profesionales", json=payload)
+
+        assert response.status_code == 400
+
+
+class TestBusquedaLibresEnFecha:
+    """Tests de POST /busqueda/profesionales con `fecha`"""
+
+    LUNES = "2030-03-04"
+
+    @pytest.fixture
+    def consulta_repo(self, mock_repos):
+        repo = Mock()
+        repo.ocupadas_en_fecha.return_value = {}
+        app.dependency_overrides[get_consulta_repository] = lambda: repo
+        return repo
+
+    def test_descarta_a_los_ocupados(
+        self,
+        client,
+        mock_repos,
+        consulta_repo,
+        profesional_enfermeria,
+        profesional_acompanante,
+    ):
+        """Candidatos del día de la semana, sin franja, menos los ocupados"""
+        repo = mock_repos["profesional"]
+        repo.buscar_por_ubicacion.return_value = [
+            profesional_enfermeria,
+            profesional_acompanante,
+        ]
+        repo.franjas_del_dia.return_value = {
+            profesional_enfermeria.id: [(time(9), time(13))],
+            profesional_acompanante.id: [(time(9), time(13))],
+        }
+        consulta_repo.ocupadas_en_fecha.return_value = {
+            profesional_acompanante.id: [(time(9), time(12, 30))]
+        }
+
+        response = client.post(
+            "/busqueda/profesionales",
+            json={
+                "provincia": "Buenos Aires",
+                "fecha": self.LUNES,
+                "hora_desde": "09:00",
+                "hora_hasta": "13:00",
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [p["id"] for p in data["profesionales"]] == [
+            str(profesional_enfermeria.id)
+        ]
+        assert data["criterios_aplicados"]["duracion_minutos"] == 60
+        kwargs = repo.buscar_por_ubicacion.call_args.kwargs
+        assert kwargs["dia_semana"] == 1
+        assert kwargs["hora_desde"] is None
+        assert repo.franjas_del_dia.call_args.args[1] == 1
+        assert consulta_repo.ocupadas_en_fecha.call_args.args[1] == date(2030, 3, 4)
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"provincia": "Buenos Aires", "fecha": LUNES, "dia_semana": 1},
+            {"provincia": "Buenos Aires", "duracion_minutos": 60},
+            {"provincia": "Buenos Aires", "fecha": LUNES, "incluir_total": True},
+        ],
+    )
+    def test_combinaciones_invalidas(self, client, mock_repos, payload):
+        """fecha excluye dia_semana y el total; la duración requiere fecha"""
+        response = client.post("/busqueda/profesionales", json=payload)
+
+        assert response.status_code == 400
+
+    def test_facetas_sin_fecha(self, client, mock_repos):
+        response = client.post(
+            "/busqueda/facetas", json={"provincia": "Buenos Aires", "fecha": self.LUNES}
+        )
+
+        assert response.status_code == 400
+
+
+class TestBusquedaPorTexto:
+    """Tests para la búsqueda por texto libre de POST /busqueda/profesionales"""
+
+    def test_texto_ordena_por_relevancia_y_pagina(
+        self, client, mock_repos, profesional_enfermeria, profesional_acompanante
+    ):
+        """El cursor de la búsqueda por texto lleva (relevancia, id)"""
+        repo = mock_repos["profesional"]
+        repo.buscar_por_texto.return_value = [
+            (profesional_enfermeria, 0.75),
+            (profesional_acompanante, 0.5),
+        ]
+        payload = {"texto": " curaciones ", "provincia": "Buenos Aires", "limite": 1}
+
+        data = client.post("/busqueda/profesionales", json=payload).json()
+        assert [p["id"] for p in data["profesionales"]] == [
+            str(profesional_enfermeria.id)
+        ]
+        assert repo.buscar_por_texto.call_args.kwargs["texto"] == "curaciones"
+
+        repo.buscar_por_texto.return_value = [(profesional_acompanante, 0.5)]
+        response = client.post(
+            "/busqueda/profesionales",
+            json={**payload, "cursor": data["siguiente_cursor"]},
+        )
+
+        assert response.status_code == 200
+        assert repo.buscar_por_texto.call_args.kwargs["despues_de"] == (
+            0.75,
+            profesional_enfermeria.id,
+        )
+
+    def test_texto_con_cercania_se_rechaza(self, client, mock_repos):
+        payload = {
+            "texto": "heridas",
+            "latitud": -34.6,
+            "longitud": -58.38,
+            "radio_km": 5,
+        }
+
+        response = client.post("/busqueda/profesionales", json=payload)
+
+        assert response.status_code == 400
+
+
+class TestBusquedaPorPuntaje:
+    """Tests para ordenar_por_puntaje de POST /busqueda/profesionales"""
+
+    def test_pagina_por_puntaje(
+        self, client, mock_repos, profesional_enfermeria, profesional_acompanante
+    ):
+        """El cursor del ranking lleva (puntaje, id) y el repo recibe el orden"""
+        repo = mock_repos["profesional"]
+        mejor = replace(profesional_acompanante, puntaje=0.8)
+        repo.buscar_por_ubicacion.return_value = [mejor, profesional_enfermeria]
+        payload = {
+            "provincia": "Buenos Aires",
+            "ordenar_por_puntaje": True,
+            "limite": 1,
+        }
+
+        data = client.post("/busqueda/profesionales", json=payload).json()
+        assert data["profesionales"][0]["puntaje"] == 0.8
+        assert repo.buscar_por_ubicacion.call_args.kwargs["por_puntaje"] is True
+
+        repo.buscar_por_ubicacion.return_value = [profesional_enfermeria]
+        response = client.post(
+            "/busqueda/profesionales",
+            json={**payload, "cursor": data["siguiente_cursor"]},
+        )
+
+        assert response.status_code == 200
+        assert repo.buscar_por_ubicacion.call_args.kwargs["despues_de"] == (
+            0.8,
+            mejor.id,
+        )
+
+    @pytest.mark.parametrize(
+        "extra",
+        [
+            {"ordenar_por_distancia": True, "latitud": -34.6, "longitud": -58.38},
+            {"texto": "heridas", "limite": 5},
+            {"latitud": -34.6, "longitud": -58.38, "radio_km": 5, "limite": 5},
+        ],
+    )
+    def test_combinaciones_invalidas(self, client, mock_repos, extra):
+        payload = {"provincia": "Buenos Aires", "ordenar_por_puntaje": True, **extra}
+
+        response = client.post("/busqueda/profesionales", json=payload)
+
+        assert response.status_code == 400
+
+
+class TestBusquedaVistaResumen:
+    """Tests para ?vista=resumen de POST /busqueda/profesionales"""
+
+    def test_resumen_usa_proyeccion_del_repositorio(
+        self, client, mock_repos, profesional_enfermeria
+    ):
+        repo = mock_repos["profesional"]
+        repo.buscar_resumen.return_value = [
+            ResumenProfesional.desde_profesional(profesional_enfermeria)
+        ]
+
+        response = client.post(
+            "/busqueda/profesionales?vista=resumen",
+            json={"nombre_especialidad": "Enfermería", "provincia": "Buenos Aires"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert data["profesionales"][0]["especialidades"] == ["Enfermería"]
+        assert "matriculas" not in data["profesionales"][0]
+        repo.buscar_combinado.assert_not_called()
+
+    def test_resumen_por_cercania_resume_perfiles(
+        self, client, mock_repos, profesional_enfermeria
+    ):
+        """La cercanía pagina por distancia: busca completo y resume"""
+        payload = {"latitud": -34.6, "longitud": -58.38, "radio_km": 5, "limite": 5}
+
+        response = client.post("/busqueda/profesionales?vista=resumen", json=payload)
+
+        assert response.status_code == 200
+        assert response.json()["profesionales"][0]["barrio"] == "Flores"
+        mock_repos["profesional"].buscar_resumen.assert_not_called()
+
+
+class TestBusquedaLoteEndpoint:
+    """Tests para POST /busqueda/lote"""
+
+    def test_resultados_en_orden_de_los_filtros(
+        self, client, mock_repos, profesional_enfermeria, profesional_acompanante
+    ):
+        repo = mock_repos["profesional"]
+        repo.buscar_lote.return_value = [
+            [profesional_enfermeria],
+            [profesional_enfermeria, profesional_acompanante],
+        ]
+        payload = {
+            "filtros": [
+                {"nombre_especialidad": "Enfermería", "limite": 10},
+                {"provincia": "Buenos Aires"},
+            ]
+        }
+
+        response = client.post("/busqueda/lote", json=payload)
+
+        assert response.status_code == 200
+        resultados = response.json()["resultados"]
+        assert [len(r["profesionales"]) for r in resultados] == [1, 2]
+        assert [r["total"] for r in resultados] == [None, 2]
+        (criterios,) = repo.buscar_lote.call_args.args
+        assert criterios[0]["especialidad_id"] == 1
+
+    def test_filtro_invalido_indica_posicion(self, client, mock_repos):
+        payload = {"filtros": [{"provincia": "Mendoza"}, {"texto": "heridas"}]}
+
+        response = client.post("/busqueda/lote", json=payload)
+
+        assert response.status_code == 400
+        assert "Filtro 1" in response.text
+
+    def test_lote_vacio(self, client, mock_repos):
+        response = client.post("/busqueda/lote", json={"filtros": []})
+
+        assert response.status_code == 422
+
+
+class TestFacetasEndpoint:
+    """Tests para POST /busqueda/facetas"""
+
+    def test_facetas_agrupadas(self, client, mock_repos):
+        repo = mock_repos["profesional"]
+        repo.contar_facetas.return_value = [
+            ConteoFaceta("especialidad", "Enfermería", 2, id=1),
+            ConteoFaceta("departamento", "CABA", 2, provincia="Buenos Aires"),
+        ]
+
+        response = client.post(
+            "/busqueda/facetas", json={"nombre_especialidad": "Enfermería"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["especialidad"] == [
+            {"nombre": "Enfermería", "cantidad": 2, "id": 1, "provincia": None}
+        ]
+        assert data["provincia"] == []
+        assert data["departamento"][0]["provincia"] == "Buenos Aires"
+        assert repo.contar_facetas.call_args.kwargs["especialidad_id"] == 1
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"texto": "heridas"},
+            {"latitud": -34.6, "longitud": -58.38, "radio_km": 5},
+            {"barrio": "Flores"},
+        ],
+    )
+    def test_criterios_invalidos(self, client, mock_repos, payload):
+        response = client.post("/busqueda/facetas", json=payload)
+
+        assert response.status_code == 400
+
+
+class TestBusquedaPaginada:
+    """Tests para la paginación por cursor de POST /busqueda/profesionales"""
+
+    def test_primera_pagina_emite_cursor(
+        self, client, mock_repos, profesional_enfermeria, profesional_acompanante
+    ):
+        """Si vuelve un elemento de más hay siguiente página"""
+        mock_repos["profesional"].buscar_por_especialidad.return_value = [
+            profesional_enfermeria,
+            profesional_acompanante,
+        ]
+
+        response = client.post(
+            "/busqueda/profesionales",
+            json={"nombre_especialidad": "Enfermería", "limite": 1},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["profesionales"]) == 1
+        assert data["total"] is None
+        assert data["siguiente_cursor"]
+        assert (
+            mock_repos["profesional"].buscar_por_especialidad.call_args.kwargs["limite"]
+            == 2
+        )
+
+    def test_cursor_se_traduce_en_clave(
+        self, client, mock_repos, profesional_enfermeria, profesional_acompanante
+    ):
+        """El cursor devuelto llega al repositorio como (apellido, id)"""
+        repo = mock_repos["profesional"]
+        repo.buscar_por_especialidad.return_value = [
+            profesional_enfermeria,
+            profesional_acompanante,
+        ]
+        payload = {"nombre_especialidad": "Enfermería", "limite": 1}
+        cursor = client.post("/busqueda/profesionales", json=payload).json()[
+            "siguiente_cursor"
+        ]
+
+        repo.buscar_por_especialidad.return_value = [profesional_acompanante]
+        response = client.post(
+            "/busqueda/profesionales", json={**payload, "cursor": cursor}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["siguiente_cursor"] is None
+        assert repo.buscar_por_especialidad.call_args.kwargs["despues_de"] == (
+            profesional_enfermeria.apellido,
+            profesional_enfermeria.id,
+        )
+
+    def test_incluir_total_usa_conteo(self, client, mock_repos):
+        """incluir_total calcula el total con contar_combinado"""
+        mock_repos["profesional"].contar_combinado.return_value = 57
+
+        response = client.post(
+            "/busqueda/profesionales",
+            json={"provincia": "Buenos Aires", "limite": 10, "incluir_total": True},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["total"] == 57
+
+    @pytest.mark.parametrize("cursor", ["no-es-un-cursor", "WyJkaXN0YW5jaWEiXQ"])
+    def test_cursor_invalido(self, client, mock_repos, cursor):
+        """Un cursor corrupto o de otro orden se rechaza"""
+        response = client.post(
+            "/busqueda/profesionales",
+            json={"provincia": "Buenos Aires", "limite": 10, "cursor": cursor},
+        )
+
+        assert response.status_code == 400
+
+
+class TestCacheBusquedasEndpoint:
+    """Tests para la cache de búsquedas desde la API"""
+
+    def test_estadisticas_con_cache_deshabilitada(self, client, mock_repos):
+        """Sin BUSQUEDA_CACHE_TTL la cache no está activa"""
+        response = client.get("/busqueda/cache/estadisticas")
+
+        assert response.status_code == 200
+        assert response.json() == {"habilitada": False}
+
+    def test_busqueda_repetida_sale_de_cache(self, client, mock_repos):
+        """La segunda búsqueda idéntica no llega al repositorio"""
+        app.dependency_overrides[get_cache_busquedas] = lambda: cache
+        cache = CacheBusquedas()
+        payload = {"nombre_especialidad": "Enfermería", "provincia": "Buenos Aires"}
+
+        client.post("/busqueda/profesionales", json=payload)
+        response = client.post("/busqueda/profesionales", json=payload)
+
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+        mock_repos["profesional"].buscar_combinado.assert_called_once()
+        estadisticas = client.get("/busqueda/cache/estadisticas").json()
+        assert estadisticas["aciertos"] == 1
+        assert estadisticas["fallos"] == 1
+
+
+class TestAutocompletarEndpoint:
+    """Tests para GET /busqueda/autocompletar"""
+
+    def test_construye_una_vez_y_sugiere(self, client, mock_repos):
+        trie = TrieAutocompletado()
+        app.dependency_overrides[get_trie_autocompletado] = lambda: trie
+        barrio_id = uuid4()
+        mock_repos["direccion"].listar_sugerencias.return_value = [
+            Sugerencia(
+                SUGERENCIA_BARRIO,
+                barrio_id,
+                "Flores",
+                provincia="Buenos Aires",
+                departamento="Caba",
+            )
+        ]
+        mock_repos["catalogo"].listar_sugerencias.return_value = [
+            Sugerencia(SUGERENCIA_ESPECIALIDAD, 1, "Fonoaudiología")
+        ]
+
+        response = client.get("/busqueda/autocompletar", params={"q": "FLO"})
+        client.get("/busqueda/autocompletar", params={"q": "fono"})
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "consulta": "FLO",
+            "sugerencias": [
+                {
+                    "tipo": "barrio",
+                    "id": str(barrio_id),
+                    "nombre": "Flores",
+                    "provincia": "Buenos Aires",
+                    "departamento": "Caba",
+                }
+            ],
+        }
+        mock_repos["direccion"].listar_sugerencias.assert_called_once()
+
+        response = client.get(
+            "/busqueda/autocompletar", params={"q": "f", "tipo": "especialidad"}
+        )
+        assert [s["id"] for s in response.json()["sugerencias"]] == [1]
+
+    @pytest.mark.parametrize(
+        "params", [{"q": ""}, {"q": "a", "tipo": "calle"}, {"q": "a", "limite": 0}]
+    )
+    def test_parametros_invalidos(self, client, mock_repos, params):
+        response = client.get("/busqueda/autocompletar", params=params)
+
+        assert response.status_code == 422
+
 
 class TestEspecialidadesEndpoint:
     """Tests para GET /busqueda/especialidades"""
@@ -199,6 +734,7 @@ class TestProvinciasEndpoint:
     def test_listar_provincias_vacio(self, client, mock_repos):
         """Sin provincias debe retornar lista vacía"""
         mock_repos["direccion"].listar_provincias.return_value = []
+        mock_repos["direccion"].listar_jerarquia.return_value = ([], [], [])
 
         response = client.get("/busqueda/ubicaciones/provincias")
 
@@ -207,6 +743,54 @@ class TestProvinciasEndpoint:
         assert data["provincias"] == []
 
 
+class TestDatosDeReferenciaConEtag:
+    """ETag / If-None-Match sobre el snapshot de datos de referencia"""
+
+    def test_304_sin_consultar_repositorios(self, client, mock_repos):
+        primera = client.get("/busqueda/especialidades")
+        etag = primera.headers["etag"]
+
+        segunda = client.get(
+            "/busqueda/ubicaciones/provincias", headers={"If-None-Match": etag}
+        )
+
+        assert primera.status_code == 200
+        assert segunda.status_code == 304
+        assert segunda.headers["etag"] == etag
+        mock_repos["catalogo"].listar_especialidades.assert_called_once()
+        mock_repos["direccion"].listar_jerarquia.assert_called_once()
+
+    def test_etag_distinto_devuelve_contenido(self, client, mock_repos):
+        response = client.get(
+            "/busqueda/especialidades", headers={"If-None-Match": '"viejo"'}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["especialidades"] == [{"id": 1, "nombre": "Enfermería"}]
+
+    def test_departamentos_y_barrios_agrupados(self, client, mock_repos):
+        provincia_id, departamento_id, barrio_id = uuid4(), uuid4(), uuid4()
+        mock_repos["direccion"].listar_jerarquia.return_value = (
+            [NodoUbicacion(provincia_id, "Córdoba")],
+            [NodoUbicacion(departamento_id, "Capital", provincia_id)],
+            [NodoUbicacion(barrio_id, "Centro", departamento_id)],
+        )
+
+        departamentos = client.get(
+            f"/busqueda/ubicaciones/provincias/{provincia_id}/departamentos"
+        ).json()
+        barrios = client.get(
+            f"/busqueda/ubicaciones/departamentos/{departamento_id}/barrios"
+        ).json()
+        otra = client.get(f"/busqueda/ubicaciones/provincias/{uuid4()}/departamentos")
+
+        assert departamentos == {
+            "departamentos": [{"id": str(departamento_id), "nombre": "Capital"}]
+        }
+        assert barrios == {"barrios": [{"id": str(barrio_id), "nombre": "Centro"}]}
+        assert otra.json() == {"departamentos": []}
+
+
 class TestBusquedaErrores:
     """Tests de manejo de errores"""
 
@@ -0,0 +1,231 @@
+"""
+Tests para el listado paginado de GET /profesionales/
+"""
+
+import json
+import pytest
+from datetime import date, time
+from fastapi.testclient import TestClient
+from types import SimpleNamespace
+from unittest.mock import Mock
+from uuid import uuid4
+
+from app.main import app
+from app.api import dependencies
+from app.api.dependencies import (
+    get_catalogo_repository,
+    get_consulta_repository,
+    get_current_user,
+    get_profesional_repository,
+)
+from app.domain.entities.usuarios import ResumenProfesional
+from app.domain.enumeraciones import DiaSemana
+from app.domain.value_objects.objetos_valor import Disponibilidad
+
+
+@pytest.fixture
+def client():
+    """Cliente para hacer requests HTTP a la API"""
+    return TestClient(app)
+
+
+@pytest.fixture
+def mock_repo(profesional_enfermeria, profesional_acompanante):
+    """Repositorio con dos profesionales activos"""
+    repo = Mock()
+    repo.listar_activos.return_value = [profesional_enfermeria, profesional_acompanante]
+    repo.listar_pagina.return_value = [profesional_enfermeria, profesional_acompanante]
+    repo.contar.return_value = 2
+
+    app.dependency_overrides[get_profesional_repository] = lambda: repo
+    yield repo
+    app.dependency_overrides.clear()
+
+
+class TestListadoProfesionales:
+    """Tests para GET /profesionales/"""
+
+    def test_sin_limite_lista_completa(self, client, mock_repo):
+        """Sin limite se mantiene la respuesta de siempre"""
+        response = client.get("/profesionales/")
+
+        assert response.status_code == 200
+        assert len(response.json()) == 2
+        assert "X-Siguiente-Cursor" not in response.headers
+        mock_repo.listar_pagina.assert_not_called()
+
+    def test_pagina_con_cursor_y_total_en_headers(
+        self, client, mock_repo, profesional_enfermeria
+    ):
+        """Con limite devuelve la página y el cursor/total en headers"""
+        response = client.get("/profesionales/?limite=1&incluir_total=true")
+
+        assert response.status_code == 200
+        assert [p["id"] for p in response.json()] == [str(profesional_enfermeria.id)]
+        assert response.headers["X-Total-Count"] == "2"
+        mock_repo.listar_pagina.assert_called_once_with(
+            2, despues_de=None, solo_activos=True
+        )
+
+        cursor = response.headers["X-Siguiente-Cursor"]
+        client.get(f"/profesionales/?limite=1&cursor={cursor}")
+
+        assert mock_repo.listar_pagina.call_args.kwargs["despues_de"] == (
+            profesional_enfermeria.apellido,
+            profesional_enfermeria.id,
+        )
+
+
+class TestListadoVistaResumen:
+    """Tests para GET /profesionales/?vista=resumen"""
+
+    def test_resumen_paginado_sin_perfiles_completos(
+        self, client, mock_repo, profesional_enfermeria, profesional_acompanante
+    ):
+        mock_repo.listar_resumen.return_value = [
+            ResumenProfesional.desde_profesional(profesional_enfermeria),
+            ResumenProfesional.desde_profesional(profesional_acompanante),
+        ]
+
+        response = client.get("/profesionales/?vista=resumen&limite=1")
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {
+                "id": str(profesional_enfermeria.id),
+                "nombre": "Ana",
+                "apellido": "López",
+                "verificado": True,
+                "provincia": "Buenos Aires",
+                "barrio": "Flores",
+                "especialidades": ["Enfermería"],
+                "cantidad_valoraciones": 0,
+                "promedio_valoraciones": 0.0,
+                "puntaje": profesional_enfermeria.puntaje,
+            }
+        ]
+        assert response.headers["X-Siguiente-Cursor"]
+        mock_repo.listar_pagina.assert_not_called()
+
+    def test_vista_invalida(self, client, mock_repo):
+        response = client.get("/profesionales/?vista=mini")
+
+        assert response.status_code == 422
+
+
+class TestImportacionProfesionales:
+    """Tests para POST /profesionales/importar"""
+
+    @pytest.fixture
+    def importacion(self, mock_repo, especialidad_enfermeria, monkeypatch):
+        monkeypatch.setattr(dependencies, "ADMIN_EMAILS", {"admin@athomered.com"})
+        mock_repo.importar_lote.return_value = ({1}, {})
+        catalogo = Mock()
+        catalogo.listar_especialidades.return_value = [especialidad_enfermeria]
+        app.dependency_overrides[get_catalogo_repository] = lambda: catalogo
+        app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+            email="Admin@athomered.com"
+        )
+        return mock_repo
+
+    @staticmethod
+    def _archivo(filas):
+        fila = {
+            "nombre": "Ana",
+            "apellido": "Paz",
+            "ubicacion": {
+                "provincia": "Córdoba",
+                "departamento": "Capital",
+                "barrio": "Centro",
+                "calle": "Av. Colón",
+                "numero": "1",
+            },
+            "especialidades": [1],
+        }
+        contenido = "".join(json.dumps({**fila, **cambios}) + "\n" for cambios in filas)
+        return {"archivo": ("alta.jsonl", contenido.encode(), "application/x-ndjson")}
+
+    def test_importa_en_lotes_e_informa_errores(self, client, importacion):
+        response = client.post(
+            "/profesionales/importar?tamano_lote=2",
+            files=self._archivo(
+                [
+                    {"email": "ana@athomered.com"},
+                    {"email": "ya@athomered.com"},
+                    {"email": "mal"},
+                    {"email": "luis@athomered.com", "especialidades": [7]},
+                ]
+            ),
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["leidas"], body["importadas"], body["omitidas"]) == (4, 1, 1)
+        assert [e["fila"] for e in body["errores"]] == [3, 4]
+        assert body["ultima_fila"] == 4
+        importacion.importar_lote.assert_called_once()
+
+    def test_formato_desconocido(self, client, importacion):
+        response = client.post(
+            "/profesionales/importar",
+            files={"archivo": ("alta.txt", b"", "text/plain")},
+        )
+
+        assert response.status_code == 400
+
+    def test_requiere_administrador(self, client, importacion, monkeypatch):
+        monkeypatch.setattr(dependencies, "ADMIN_EMAILS", set())
+
+        response = client.post(
+            "/profesionales/importar", files=self._archivo([{"email": "a@b.com"}])
+        )
+
+        assert response.status_code == 403
+        importacion.importar_lote.assert_not_called()
+
+
+class TestHuecosProfesional:
+    """Tests para GET /profesionales/{id}/huecos"""
+
+    @pytest.fixture
+    def consultas(self, mock_repo):
+        mock_repo.obtener_disponibilidades.return_value = [
+            Disponibilidad([DiaSemana.LUNES], time(9), time(12))
+        ]
+        consulta_repo = Mock()
+        consulta_repo.listar_ocupadas.return_value = [
+            (date(2030, 3, 4), time(10), time(11))
+        ]
+        app.dependency_overrides[get_consulta_repository] = lambda: consulta_repo
+        return consulta_repo
+
+    def test_huecos_del_rango(self, client, mock_repo, consultas):
+        url = f"/profesionales/{uuid4()}/huecos"
+        response = client.get(f"{url}?desde=2030-03-04&hasta=2030-03-11&duracion=60")
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"fecha": "2030-03-04", "hora_inicio": "09:00:00", "hora_fin": "10:00:00"},
+            {"fecha": "2030-03-04", "hora_inicio": "11:00:00", "hora_fin": "12:00:00"},
+            {"fecha": "2030-03-11", "hora_inicio": "09:00:00", "hora_fin": "12:00:00"},
+        ]
+        consultas.listar_ocupadas.assert_called_once()
+
+    def test_profesional_inexistente(self, client, mock_repo, consultas):
+        mock_repo.obtener_disponibilidades.return_value = None
+
+        response = client.get(
+            f"/profesionales/{uuid4()}/huecos?desde=2030-03-04&hasta=2030-03-11"
+        )
+
+        assert response.status_code == 404
+        consultas.listar_ocupadas.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "rango",
+        ["desde=2030-03-11&hasta=2030-03-04", "desde=2030-01-01&hasta=2030-06-01"],
+    )
+    def test_rango_invalido(self, client, mock_repo, consultas, rango):
+        response = client.get(f"/profesionales/{uuid4()}/huecos?{rango}")
+
+        assert response.status_code == 400
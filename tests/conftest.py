@@ -2,13 +2,25 @@
 Fixtures compartidas para tests
 """
 
+import os
 import pytest
 from unittest.mock import MagicMock
 from uuid import uuid4
 from datetime import date, time
 from decimal import Decimal
 
-from app.domain.entities.usuarios import (
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateColumn, DefaultClause
+from sqlalchemy.sql.elements import TextClause
+
+# Sin despachador del outbox en segundo plano: usaría la base configurada
+# (SessionLocal), no la de cada test. Los tests lo ejecutan explícitamente.
+os.environ.setdefault("EVENTOS_DESPACHO", "0")
+
+from app.domain.entities.usuarios import (  # noqa: E402
     Profesional,
     Solicitante,
     Paciente,
@@ -25,6 +37,77 @@ from app.domain.value_objects.objetos_valor import (
     Matricula,
 )
 from app.infra.repositories.profesional_repository import ProfesionalRepository
+from app.infra.persistence.base import Base, SCHEMA
+
+
+@compiles(CreateColumn, "sqlite")
+def _sqlite_default_con_funcion(element, compiler, **kw):
+    """
+    SQLite solo acepta funciones en DEFAULT si van entre paréntesis
+    (ej: `DEFAULT (gen_random_uuid())`). Los modelos ORM usan el default
+    de Postgres tal cual, así que se envuelve solo al generar DDL de SQLite.
+    """
+    columna = element.element
+    default = columna.server_default
+    arg = getattr(default, "arg", None)
+    if not (isinstance(arg, TextClause) and arg.text.endswith(")")):
+        return compiler.visit_create_column(element, **kw)
+
+    columna.server_default = DefaultClause(text(f"({arg.text})"))
+    try:
+        return compiler.visit_create_column(element, **kw)
+    finally:
+        columna.server_default = default
+
+
+@pytest.fixture
+def sqlite_engine():
+    """
+    Engine SQLite en memoria con el esquema ORM real (`athome`).
+
+    - Adjunta una base en memoria con el nombre del esquema.
+    - Registra `gen_random_uuid()` para los defaults de las PK UUID.
+    """
+    import uuid
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _preparar_conexion(dbapi_connection, connection_record):
+        dbapi_connection.execute(f"ATTACH DATABASE ':memory:' AS {SCHEMA}")
+        dbapi_connection.create_function("gen_random_uuid", 0, lambda: uuid.uuid4().hex)
+
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_session(sqlite_engine):
+    """Sesión sobre el engine SQLite en memoria (mismo setup que SessionLocal)"""
+    TestingSessionLocal = sessionmaker(
+        bind=sqlite_engine, autoflush=False, autocommit=False, expire_on_commit=False
+    )
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def contador_queries(sqlite_engine):
+    """Cuenta las sentencias SQL ejecutadas sobre el engine SQLite"""
+    sentencias = []
+
+    def _registrar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append(statement)
+
+    event.listen(sqlite_engine, "before_cursor_execute", _registrar)
+    yield sentencias
+    event.remove(sqlite_engine, "before_cursor_execute", _registrar)
 
 
 @pytest.fixture
@@ -0,0 +1,113 @@
+"""
+Tests unitarios de la Agenda de un profesional (conflictos de horario)
+"""
+
+from datetime import date, time
+
+import pytest
+from uuid import uuid4
+
+from app.domain.entities.agenda import Agenda, Cita, HorarioNoDisponible
+from app.domain.enumeraciones import EstadoCita
+
+LUNES = date(2030, 3, 4)
+MARTES = date(2030, 3, 5)
+PROFESIONAL_ID = uuid4()
+
+
+def _cita(desde: time, hasta: time, fecha: date = LUNES, **cambios) -> Cita:
+    return Cita(
+        id=uuid4(),
+        paciente_id=uuid4(),
+        profesional_id=PROFESIONAL_ID,
+        fecha=fecha,
+        hora_inicio=desde,
+        hora_fin=hasta,
+        ubicacion=None,
+        **cambios,
+    )
+
+
+@pytest.fixture
+def agenda():
+    return Agenda.de_citas(
+        PROFESIONAL_ID,
+        [
+            _cita(time(9), time(10)),
+            _cita(time(11), time(13)),
+            _cita(time(14), time(15), estado=EstadoCita.CANCELADA),
+            _cita(time(9), time(10), fecha=MARTES),
+        ],
+    )
+
+
+class TestAgenda:
+    def test_ignora_las_canceladas(self, agenda):
+        assert len(agenda) == 3
+        assert agenda.disponible(LUNES, time(14), time(15))
+
+    @pytest.mark.parametrize(
+        "desde, hasta, libre",
+        [
+            (time(8), time(9), True),
+            (time(10), time(11), True),
+            (time(9, 30), time(10, 30), False),
+            (time(12, 30), time(14), False),
+            (time(8), time(14), False),
+            (time(10, 15), time(10, 45), True),
+        ],
+    )
+    def test_solapamiento_semiabierto(self, agenda, desde, hasta, libre):
+        assert agenda.disponible(LUNES, desde, hasta) is libre
+
+    def test_conflictos_en_lote(self, agenda):
+        candidatos = [
+            (LUNES, time(10), time(11)),
+            (LUNES, time(12), time(12, 30)),
+            (MARTES, time(9, 30), time(10)),
+            (MARTES, time(10), time(12)),
+        ]
+
+        assert agenda.conflictos(candidatos) == [False, True, True, False]
+
+    def test_agregar_rechaza_solapamiento(self, agenda):
+        with pytest.raises(HorarioNoDisponible) as error:
+            agenda.agregar(_cita(time(12), time(14)))
+
+        assert error.value.profesional_id == PROFESIONAL_ID
+        assert len(agenda) == 3
+
+    def test_reprogramar_mueve_el_horario(self):
+        cita = _cita(time(9), time(10))
+        agenda = Agenda.de_citas(PROFESIONAL_ID, [cita])
+
+        cita.reprogramar(LUNES, time(9, 30), time(10, 30))
+        agenda.agregar(cita)
+
+        assert len(agenda) == 1
+        assert agenda.disponible(LUNES, time(9), time(9, 30))
+        assert not agenda.disponible(LUNES, time(10), time(11))
+        assert agenda.disponible(LUNES, time(10), time(11), excluir_id=cita.id)
+
+        cita.cancelar()
+        agenda.agregar(cita)
+        assert cita.id not in agenda
+        assert agenda.disponible(LUNES, time(9), time(11))
+
+    def test_quitar_entre_inicios_iguales(self):
+        """Datos previos a la restricción: la agenda cargada puede solaparse"""
+        primera, segunda = _cita(time(9), time(13)), _cita(time(9), time(10))
+        agenda = Agenda.de_citas(PROFESIONAL_ID, [primera, segunda])
+
+        assert agenda.quitar(segunda.id)
+        assert not agenda.quitar(segunda.id)
+        assert not agenda.disponible(LUNES, time(12), time(13))
+
+        agenda.quitar(primera.id)
+        assert len(agenda) == 0
+
+    def test_validar_conflicto_horario_de_la_cita(self):
+        otras = [_cita(time(9), time(10)), _cita(time(10), time(11), fecha=MARTES)]
+
+        assert _cita(time(9, 30), time(10, 30)).validar_conflicto_horario(otras)
+        assert not _cita(time(10), time(11)).validar_conflicto_horario(otras)
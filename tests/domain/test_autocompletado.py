@@ -0,0 +1,93 @@
+"""
+Tests unitarios para el trie de autocompletado
+"""
+
+from uuid import uuid4
+
+from app.domain.entities.catalogo import (
+    SUGERENCIA_BARRIO,
+    SUGERENCIA_DEPARTAMENTO,
+    SUGERENCIA_ESPECIALIDAD,
+    SUGERENCIA_PROVINCIA,
+    Sugerencia,
+)
+from app.domain.eventos import CatalogoAmpliado
+from app.domain.strategies.autocompletado import LIMITE_MAXIMO, TrieAutocompletado
+
+CORDOBA = Sugerencia(SUGERENCIA_PROVINCIA, uuid4(), "Córdoba")
+CAPITAL = Sugerencia(SUGERENCIA_DEPARTAMENTO, uuid4(), "Capital", provincia="Córdoba")
+VILLA_CRESPO = Sugerencia(
+    SUGERENCIA_BARRIO,
+    uuid4(),
+    "Villa Crespo",
+    provincia="Buenos Aires",
+    departamento="Caba",
+)
+CARDIOLOGIA = Sugerencia(SUGERENCIA_ESPECIALIDAD, 3, "Cardiología")
+
+
+def _trie(*sugerencias):
+    trie = TrieAutocompletado()
+    trie.construir(sugerencias)
+    return trie
+
+
+class TestTrieAutocompletado:
+    def test_prefijo_sin_acentos_ni_mayusculas(self):
+        trie = _trie(CORDOBA, CAPITAL, CARDIOLOGIA)
+
+        assert trie.sugerir("CORD") == [CORDOBA]
+        assert trie.sugerir("cardio") == [CARDIOLOGIA]
+        assert trie.sugerir("xyz") == []
+
+    def test_mas_cortas_primero(self):
+        trie = _trie(CORDOBA, CAPITAL, CARDIOLOGIA)
+
+        assert trie.sugerir("c") == [CAPITAL, CORDOBA, CARDIOLOGIA]
+        assert trie.sugerir("c", limite=2) == [CAPITAL, CORDOBA]
+
+    def test_coincide_desde_cualquier_palabra(self):
+        trie = _trie(VILLA_CRESPO)
+
+        assert trie.sugerir("cres") == [VILLA_CRESPO]
+        assert trie.sugerir("villa  c") == [VILLA_CRESPO]
+        assert trie.sugerir("a crespo") == []
+
+    def test_palabras_con_igual_prefijo_no_duplican(self):
+        san_salvador = Sugerencia(SUGERENCIA_DEPARTAMENTO, uuid4(), "San Salvador")
+        trie = _trie(san_salvador)
+
+        assert trie.sugerir("sa") == [san_salvador]
+
+    def test_filtro_por_tipo(self):
+        trie = _trie(CORDOBA, CAPITAL, CARDIOLOGIA)
+
+        assert trie.sugerir("c", tipos=(SUGERENCIA_ESPECIALIDAD,)) == [CARDIOLOGIA]
+
+    def test_limite_por_nodo_conserva_los_mejores(self):
+        barrios = [
+            Sugerencia(SUGERENCIA_BARRIO, uuid4(), "B" + "a" * n)
+            for n in range(LIMITE_MAXIMO + 5, 0, -1)
+        ]
+        trie = _trie(*barrios)
+
+        sugeridas = trie.sugerir("b", limite=LIMITE_MAXIMO + 10)
+
+        assert sugeridas == barrios[::-1][:LIMITE_MAXIMO]
+
+    def test_observer_agrega_nodos_creados(self):
+        trie = _trie(CORDOBA)
+
+        trie.update(CatalogoAmpliado(CARDIOLOGIA))
+        trie.update(CatalogoAmpliado(CARDIOLOGIA))
+
+        assert len(trie) == 2
+        assert trie.sugerir("car") == [CARDIOLOGIA]
+
+    def test_observer_ignora_eventos_antes_de_construir(self):
+        trie = TrieAutocompletado()
+
+        trie.update(CatalogoAmpliado(CARDIOLOGIA))
+
+        assert not trie.listo
+        assert len(trie) == 0
@@ -0,0 +1,52 @@
+"""
+Tests unitarios para el ranking BM25 en memoria (respaldo de la búsqueda por texto)
+"""
+
+from app.domain.bm25 import IndiceBM25, terminos
+
+
+def _indice():
+    indice = IndiceBM25()
+    indice.agregar("a", [("Curación de heridas", 2.0), ("Atención a domicilio", 1.0)])
+    indice.agregar("b", [("Acompañamiento terapéutico", 2.0), ("Heridas leves", 1.0)])
+    indice.agregar("c", [("Cuidado de adultos mayores", 2.0)])
+    return indice
+
+
+class TestTerminos:
+    def test_normaliza_y_descarta_palabras_vacias(self):
+        assert terminos("Atención de la PIEL, en domicilio") == [
+            "atencion",
+            "piel",
+            "domicilio",
+        ]
+
+
+class TestIndiceBM25:
+    def test_sin_acentos_ni_mayusculas(self):
+        assert [doc for doc, _ in _indice().rankear("TERAPEUTICO")] == ["b"]
+
+    def test_el_peso_del_campo_ordena(self):
+        """'heridas' en el título (peso 2) rankea sobre la descripción"""
+        ranking = _indice().rankear("heridas")
+
+        assert [doc for doc, _ in ranking] == ["a", "b"]
+        assert ranking[0][1] > ranking[1][1]
+
+    def test_mas_terminos_coincidentes_suman(self):
+        ranking = _indice().rankear("heridas domicilio")
+
+        assert ranking[0][0] == "a"
+
+    def test_consulta_sin_terminos_utiles(self):
+        assert _indice().rankear("de la") == []
+        assert _indice().rankear("inexistente") == []
+
+    def test_quitar_y_reemplazar(self):
+        indice = _indice()
+        indice.quitar("a")
+        indice.agregar("c", [("Heridas crónicas", 1.0)])
+
+        assert len(indice) == 2
+        assert sorted(doc for doc, _ in indice.rankear("heridas")) == ["b", "c"]
+        assert indice.rankear("adultos") == []
@@ -0,0 +1,246 @@
+"""
+Tests del EventBus asincrónico: cola acotada, workers, políticas de cola
+llena, drenaje al detener y métricas
+"""
+
+import json
+import threading
+from uuid import uuid4
+
+import pytest
+
+from app.domain.eventos import CitaCreada, Event
+from app.domain.observers.bus_asincrono import EventBusAsincrono
+
+
+def _evento(n: int = 0) -> Event:
+    return Event(tipo="cita.creada", cita_id=uuid4(), datos={"n": n})
+
+
+class _Compuerta:
+    """Handler que se queda esperando hasta que se lo libera"""
+
+    def __init__(self):
+        self.liberar = threading.Event()
+        self.entro = threading.Event()
+        self.recibidos = []
+
+    def __call__(self, evt):
+        self.entro.set()
+        self.liberar.wait(5)
+        self.recibidos.append(evt.datos["n"])
+
+
+@pytest.fixture
+def compuerta():
+    compuerta = _Compuerta()
+    yield compuerta
+    compuerta.liberar.set()
+
+
+class TestEventBusAsincrono:
+    def test_sin_iniciar_publica_en_linea(self):
+        bus = EventBusAsincrono()
+        recibidos = []
+        bus.suscribir("cita.creada", recibidos.append)
+
+        evento = _evento()
+        bus.publicar(evento)
+
+        assert recibidos == [evento]
+        assert not bus.activo
+
+    def test_publicar_no_espera_al_handler(self, compuerta):
+        bus = EventBusAsincrono(workers=1)
+        bus.suscribir("cita.creada", compuerta)
+        bus.iniciar()
+
+        bus.publicar(_evento(1))
+        bus.publicar(_evento(2))
+        assert compuerta.entro.wait(5)
+        assert compuerta.recibidos == []
+
+        compuerta.liberar.set()
+        assert bus.detener(timeout_s=5) == 0
+        assert compuerta.recibidos == [1, 2]
+        assert bus.estadisticas()["procesados"] == 2
+
+    def test_detener_drena_la_cola(self):
+        bus = EventBusAsincrono(workers=3)
+        recibidos = []
+        bus.suscribir("cita.creada", lambda evt: recibidos.append(evt.datos["n"]))
+        bus.iniciar()
+
+        for n in range(50):
+            bus.publicar(_evento(n))
+        bus.detener(timeout_s=5)
+
+        assert sorted(recibidos) == list(range(50))
+        assert bus.estadisticas()["profundidad"] == 0
+
+        # Se puede volver a iniciar (un lifespan por TestClient)
+        bus.iniciar()
+        bus.publicar(_evento(50))
+        bus.detener(timeout_s=5)
+        assert 50 in recibidos
+
+    def test_descartar_antiguo(self, compuerta):
+        bus = EventBusAsincrono(capacidad=2, workers=1, politica="descartar_antiguo")
+        bus.suscribir("cita.creada", compuerta)
+        bus.iniciar()
+
+        bus.publicar(_evento(0))
+        assert compuerta.entro.wait(5)
+        for n in range(1, 5):
+            bus.publicar(_evento(n))
+
+        compuerta.liberar.set()
+        bus.detener(timeout_s=5)
+
+        assert compuerta.recibidos == [0, 3, 4]
+        assert bus.estadisticas()["descartados"] == 2
+
+    def test_volcar_conserva_el_orden(self, compuerta, tmp_path):
+        archivo = str(tmp_path / "volcado.jsonl")
+        bus = EventBusAsincrono(
+            capacidad=2, workers=1, politica="volcar", archivo_volcado=archivo
+        )
+        bus.suscribir("cita.creada", compuerta)
+        bus.iniciar()
+
+        bus.publicar(_evento(0))
+        assert compuerta.entro.wait(5)
+        for n in range(1, 8):
+            bus.publicar(_evento(n))
+        estadisticas = bus.estadisticas()
+        assert estadisticas["volcados"] == 5
+        assert estadisticas["volcados_pendientes"] == 5
+
+        compuerta.liberar.set()
+        bus.detener(timeout_s=5)
+
+        assert compuerta.recibidos == list(range(8))
+        assert bus.estadisticas()["volcados_pendientes"] == 0
+
+    def test_volcado_sobrevive_al_reinicio(self, tmp_path):
+        """Lo que no se drenó al apagar se entrega en el próximo inicio"""
+        archivo = str(tmp_path / "volcado.jsonl")
+        compuerta = _Compuerta()
+        bus = EventBusAsincrono(
+            capacidad=1, workers=1, politica="volcar", archivo_volcado=archivo
+        )
+        bus.suscribir("cita.creada", compuerta)
+        bus.iniciar()
+        bus.publicar(_evento(0))
+        assert compuerta.entro.wait(5)
+        for n in range(1, 4):
+            bus.publicar(_evento(n))
+
+        assert bus.detener(timeout_s=0.2) == 3
+        compuerta.liberar.set()
+
+        otro = EventBusAsincrono(
+            capacidad=1, workers=1, politica="volcar", archivo_volcado=archivo
+        )
+        recibidos = []
+        otro.suscribir("cita.creada", lambda evt: recibidos.append(evt.datos["n"]))
+        otro.iniciar()
+        otro.detener(timeout_s=5)
+
+        assert recibidos == [1, 2, 3]
+
+    def test_volcado_en_json(self, compuerta, tmp_path):
+        archivo = tmp_path / "volcado.jsonl"
+        bus = EventBusAsincrono(
+            capacidad=1, workers=1, politica="volcar", archivo_volcado=str(archivo)
+        )
+        bus.suscribir("cita.creada", compuerta)
+        bus.iniciar()
+        bus.publicar(_evento(0))
+        assert compuerta.entro.wait(5)
+        bus.publicar(_evento(1))
+        evento = _evento(2)
+        bus.publicar(evento)
+
+        registro = json.loads(archivo.read_text().splitlines()[0])
+        assert registro == {
+            "tipo": "cita.creada",
+            "cita_id": str(evento.cita_id),
+            "datos": {"n": 2},
+            "timestamp": evento.timestamp.isoformat(),
+        }
+        compuerta.liberar.set()
+        bus.detener(timeout_s=5)
+        assert compuerta.recibidos == [0, 1, 2]
+
+    def test_volcar_requiere_archivo(self):
+        with pytest.raises(ValueError):
+            EventBusAsincrono(politica="volcar")
+        with pytest.raises(ValueError):
+            EventBusAsincrono(politica="ignorar")
+
+    def test_encolar_resuelve_al_terminar_los_handlers(self, compuerta):
+        bus = EventBusAsincrono(workers=1)
+        bus.suscribir("cita.creada", compuerta)
+        bus.iniciar()
+
+        entrega = bus.encolar(_evento(1))
+        assert compuerta.entro.wait(5)
+        assert not entrega.done()
+
+        compuerta.liberar.set()
+        assert entrega.result(5) is None
+        bus.detener(timeout_s=5)
+        assert bus.estadisticas()["procesados"] == 1
+
+    def test_encolar_informa_el_error(self):
+        bus = EventBusAsincrono(workers=1)
+        bus.suscribir("cita.creada", lambda evt: 1 / 0)
+        bus.iniciar()
+
+        entrega = bus.encolar(_evento())
+
+        with pytest.raises(ZeroDivisionError):
+            entrega.result(5)
+        bus.detener(timeout_s=5)
+        # Sin iniciar se entrega en línea
+        assert isinstance(bus.encolar(_evento()).exception(), ZeroDivisionError)
+
+    def test_encolar_descartado_falla(self, compuerta):
+        bus = EventBusAsincrono(capacidad=1, workers=1, politica="descartar_antiguo")
+        bus.suscribir("cita.creada", compuerta)
+        bus.iniciar()
+        bus.publicar(_evento(0))
+        assert compuerta.entro.wait(5)
+
+        descartada = bus.encolar(_evento(1))
+        entregada = bus.encolar(_evento(2))
+
+        assert isinstance(descartada.exception(5), RuntimeError)
+        compuerta.liberar.set()
+        assert entregada.result(5) is None
+        bus.detener(timeout_s=5)
+        assert compuerta.recibidos == [0, 2]
+
+    def test_latencia_por_handler(self):
+        bus = EventBusAsincrono()
+
+        def handler_falla(evt):
+            raise RuntimeError("SMTP caído")
+
+        bus.suscribir("cita.creada", handler_falla)
+        bus.suscribir("cita.creada", lambda evt: None)
+
+        evento = CitaCreada(
+            cita_id=uuid4(), profesional_id=uuid4(), paciente_id=uuid4()
+        )
+        bus.publicar(evento)
+        with pytest.raises(RuntimeError):
+            bus.entregar(evento)
+
+        handlers = bus.estadisticas()["handlers"]
+        falla = next(v for k, v in handlers.items() if "handler_falla" in k)
+        assert falla["llamadas"] == 2
+        assert falla["errores"] == 2
+        assert all(v["llamadas"] == 2 for v in handlers.values())
+        assert all(v["maxima_ms"] >= v["p50_ms"] for v in handlers.values())
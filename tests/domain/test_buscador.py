@@ -2,6 +2,8 @@
 Tests unitarios para el Buscador
 """
 
+from dataclasses import replace
+
 from app.domain.strategies.buscador import Buscador
 from app.domain.strategies.estrategia import (
     BusquedaPorZona,
@@ -112,6 +114,82 @@ class TestBuscador:
         mock_profesional_repository_con_datos.buscar_por_especialidad.assert_called_once()
 
 
+class TestBuscadorOrdenPorDistancia:
+    """ordenar_por_distancia reordena el resultado de cualquier estrategia"""
+
+    def test_ordena_del_mas_cercano_al_mas_lejano(
+        self,
+        mock_profesional_repository,
+        profesional_enfermeria,
+        profesional_acompanante,
+    ):
+        mock_profesional_repository.buscar_por_especialidad.return_value = [
+            profesional_acompanante,
+            profesional_enfermeria,
+        ]
+        buscador = Buscador(
+            repo=mock_profesional_repository, estrategia=BusquedaPorEspecialidad()
+        )
+
+        filtro = FiltroBusqueda(
+            id_especialidad=1,
+            latitud=-34.6,
+            longitud=-58.38,
+            ordenar_por_distancia=True,
+        )
+
+        assert buscador.buscar(filtro) == [
+            profesional_enfermeria,
+            profesional_acompanante,
+        ]
+
+    def test_sin_punto_conserva_orden(
+        self,
+        mock_profesional_repository,
+        profesional_enfermeria,
+        profesional_acompanante,
+    ):
+        mock_profesional_repository.buscar_por_especialidad.return_value = [
+            profesional_acompanante,
+            profesional_enfermeria,
+        ]
+        buscador = Buscador(
+            repo=mock_profesional_repository, estrategia=BusquedaPorEspecialidad()
+        )
+
+        filtro = FiltroBusqueda(id_especialidad=1, ordenar_por_distancia=True)
+
+        assert buscador.buscar(filtro) == [
+            profesional_acompanante,
+            profesional_enfermeria,
+        ]
+
+
+class TestBuscadorOrdenPorPuntaje:
+    """ordenar_por_puntaje pide el orden al repositorio y lo respeta"""
+
+    def test_ordena_por_puntaje_precalculado(
+        self,
+        mock_profesional_repository,
+        profesional_enfermeria,
+        profesional_acompanante,
+    ):
+        mejor = replace(profesional_acompanante, puntaje=0.9)
+        peor = replace(profesional_enfermeria, puntaje=0.3)
+        mock_profesional_repository.buscar_por_especialidad.return_value = [peor, mejor]
+        buscador = Buscador(
+            repo=mock_profesional_repository, estrategia=BusquedaPorEspecialidad()
+        )
+
+        resultado = buscador.buscar(
+            FiltroBusqueda(id_especialidad=1, ordenar_por_puntaje=True)
+        )
+
+        assert resultado == [mejor, peor]
+        kwargs = mock_profesional_repository.buscar_por_especialidad.call_args.kwargs
+        assert kwargs["por_puntaje"] is True
+
+
 class TestBuscadorIntegracion:
     """Tests de integración: Buscador + Estrategias"""
 
@@ -0,0 +1,61 @@
+"""
+Tests unitarios para la búsqueda en lote
+"""
+
+from unittest.mock import Mock
+
+from app.domain.entities.catalogo import FiltroBusqueda
+from app.domain.strategies.cache import CacheBusquedas
+from app.domain.strategies.indice import IndiceProfesionales
+from app.domain.strategies.lote import BusquedaEnLote
+
+
+class TestBusquedaEnLote:
+    def test_filtros_repetidos_se_resuelven_una_vez(
+        self, profesional_enfermeria, profesional_acompanante
+    ):
+        repo = Mock()
+        repo.buscar_lote.return_value = [
+            [profesional_enfermeria],
+            [profesional_acompanante],
+        ]
+        enfermeria = FiltroBusqueda(id_especialidad=1, limite=5)
+        mendoza = FiltroBusqueda(provincia="Mendoza", ordenar_por_puntaje=True)
+
+        resultados = BusquedaEnLote(repo).buscar([enfermeria, mendoza, enfermeria])
+
+        assert resultados == [
+            [profesional_enfermeria],
+            [profesional_acompanante],
+            [profesional_enfermeria],
+        ]
+        (criterios,) = repo.buscar_lote.call_args.args
+        assert len(criterios) == 2
+        assert criterios[0]["limite"] == 5
+        assert criterios[1]["por_puntaje"] is True
+
+    def test_cacheados_no_van_al_repositorio(self, profesional_enfermeria):
+        repo = Mock()
+        repo.buscar_lote.return_value = [[profesional_enfermeria]]
+        cache = CacheBusquedas()
+        filtro = FiltroBusqueda(id_especialidad=1)
+
+        BusquedaEnLote(repo, cache=cache).buscar([filtro])
+        resultados = BusquedaEnLote(repo, cache=cache).buscar([filtro])
+
+        assert resultados == [[profesional_enfermeria]]
+        repo.buscar_lote.assert_called_once()
+
+    def test_usa_indice_si_esta_listo(
+        self, profesional_enfermeria, profesional_acompanante
+    ):
+        repo = Mock()
+        indice = IndiceProfesionales()
+        indice.construir([profesional_enfermeria, profesional_acompanante])
+
+        resultados = BusquedaEnLote(repo, indice=indice).buscar(
+            [FiltroBusqueda(provincia="Mendoza"), FiltroBusqueda(id_especialidad=1)]
+        )
+
+        assert resultados == [[profesional_acompanante], [profesional_enfermeria]]
+        repo.buscar_lote.assert_not_called()
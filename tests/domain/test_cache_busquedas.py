@@ -0,0 +1,163 @@
+"""
+Tests unitarios para la cache de resultados de búsqueda
+"""
+
+from dataclasses import replace
+from unittest.mock import Mock
+from uuid import uuid4
+
+from app.domain.entities.catalogo import FiltroBusqueda
+from app.domain.eventos import ProfesionalActualizado, ProfesionalEliminado
+from app.domain.strategies.buscador import Buscador
+from app.domain.strategies.cache import CacheBusquedas
+from app.domain.strategies.estrategia import BusquedaCombinada, BusquedaPorTexto
+
+
+class RelojFalso:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self) -> float:
+        return self.ahora
+
+
+def _clave(**criterios):
+    return ("BusquedaCombinada", FiltroBusqueda(**criterios))
+
+
+class TestCacheBusquedas:
+    """TTL, LRU y contadores"""
+
+    def test_acierto_y_fallo(self, profesional_enfermeria):
+        cache = CacheBusquedas()
+        clave = _clave(id_especialidad=1, provincia="Buenos Aires")
+
+        assert cache.obtener(clave) is None
+        cache.guardar(clave, [profesional_enfermeria])
+
+        assert cache.obtener(clave) == [profesional_enfermeria]
+        assert cache.obtener(_clave(id_especialidad=1, provincia="Buenos Aires")) == [
+            profesional_enfermeria
+        ]
+        assert cache.estadisticas()["aciertos"] == 2
+        assert cache.estadisticas()["fallos"] == 1
+
+    def test_vence_por_ttl(self, profesional_enfermeria):
+        reloj = RelojFalso()
+        cache = CacheBusquedas(ttl_segundos=30, reloj=reloj)
+        clave = _clave(id_especialidad=1)
+        cache.guardar(clave, [profesional_enfermeria])
+
+        reloj.ahora = 29.9
+        assert cache.obtener(clave) is not None
+        reloj.ahora = 30.0
+        assert cache.obtener(clave) is None
+        assert cache.estadisticas()["vencidas"] == 1
+        assert len(cache) == 0
+
+    def test_desaloja_la_menos_usada(self):
+        cache = CacheBusquedas(capacidad=2)
+        a, b, c = (
+            _clave(id_especialidad=1),
+            _clave(id_especialidad=2),
+            _clave(id_especialidad=3),
+        )
+        cache.guardar(a, [])
+        cache.guardar(b, [])
+
+        cache.obtener(a)
+        cache.guardar(c, [])
+
+        assert cache.obtener(b) is None
+        assert cache.obtener(a) == []
+        assert cache.obtener(c) == []
+        assert cache.estadisticas()["desalojos"] == 1
+
+    def test_devuelve_copia_de_la_lista(self, profesional_enfermeria):
+        cache = CacheBusquedas()
+        clave = _clave(id_especialidad=1)
+        cache.guardar(clave, [profesional_enfermeria])
+
+        cache.obtener(clave).clear()
+
+        assert cache.obtener(clave) == [profesional_enfermeria]
+
+
+class TestInvalidacionPorEtiquetas:
+    """Los cambios de perfil invalidan sólo las búsquedas afectadas"""
+
+    def _cache_poblada(self):
+        cache = CacheBusquedas()
+        claves = {
+            "enfermeria_ba": _clave(id_especialidad=1, provincia="Buenos Aires"),
+            "enfermeria_mendoza": _clave(id_especialidad=1, provincia="Mendoza"),
+            "acompanante_ba": _clave(id_especialidad=2, provincia="Buenos Aires"),
+            "nombre_enfermeria": _clave(nombre_especialidad="enfermer"),
+            "solo_ba": _clave(provincia="buenos"),
+            "cercania": _clave(latitud=-34.6, longitud=-58.4, radio_km=5),
+        }
+        for clave in claves.values():
+            cache.guardar(clave, [])
+        return cache, claves
+
+    def test_actualizacion_invalida_por_especialidad_y_provincia(
+        self, profesional_enfermeria
+    ):
+        cache, claves = self._cache_poblada()
+
+        cache.update(ProfesionalActualizado(profesional=profesional_enfermeria))
+
+        vigentes = {n for n, c in claves.items() if cache.obtener(c) is not None}
+        assert vigentes == {"enfermeria_mendoza", "acompanante_ba"}
+
+    def test_mudanza_invalida_provincia_anterior_y_nueva(
+        self, profesional_enfermeria, ubicacion_mendoza
+    ):
+        cache, claves = self._cache_poblada()
+        mudado = replace(profesional_enfermeria, ubicacion=ubicacion_mendoza)
+
+        cache.update(
+            ProfesionalActualizado(profesional=mudado, anterior=profesional_enfermeria)
+        )
+
+        assert cache.obtener(claves["enfermeria_mendoza"]) is None
+        assert cache.obtener(claves["enfermeria_ba"]) is None
+        assert cache.obtener(claves["acompanante_ba"]) is not None
+        assert cache.estadisticas()["invalidaciones"] == 5
+
+    def test_eliminacion_sin_perfil_anterior_vacia_todo(self):
+        cache, _ = self._cache_poblada()
+
+        cache.update(ProfesionalEliminado(profesional_id=uuid4()))
+
+        assert len(cache) == 0
+
+
+class TestBuscadorConCache:
+    """El Buscador consulta la cache antes que la estrategia"""
+
+    def test_segunda_busqueda_no_consulta_repositorio(self, profesional_enfermeria):
+        repo = Mock()
+        repo.buscar_combinado.return_value = [profesional_enfermeria]
+        cache = CacheBusquedas()
+        filtro = FiltroBusqueda(id_especialidad=1, provincia="Buenos Aires")
+
+        for _ in range(3):
+            resultado = Buscador(repo, BusquedaCombinada(), cache=cache).buscar(filtro)
+
+        assert resultado == [profesional_enfermeria]
+        repo.buscar_combinado.assert_called_once()
+        assert cache.estadisticas()["aciertos"] == 2
+
+    def test_busqueda_por_texto_no_se_cachea(self, profesional_enfermeria):
+        """Las publicaciones no invalidan la cache: el texto siempre se resuelve"""
+        repo = Mock()
+        repo.buscar_por_texto.return_value = [(profesional_enfermeria, 0.5)]
+        cache = CacheBusquedas()
+        filtro = FiltroBusqueda(texto="heridas")
+
+        for _ in range(2):
+            Buscador(repo, BusquedaPorTexto(), cache=cache).buscar(filtro)
+
+        assert repo.buscar_por_texto.call_count == 2
+        assert len(cache) == 0
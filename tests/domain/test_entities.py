@@ -2,16 +2,20 @@
 Tests unitarios para las entities del domain
 """
 
-from datetime import date
+from datetime import date, time
 from uuid import uuid4
 
+import pytest
+
 from app.domain.entities.usuarios import (
     Usuario,
     Profesional,
     Solicitante,
     Paciente,
 )
+from app.domain.enumeraciones import DiaSemana
 from app.domain.value_objects.objetos_valor import (
+    Disponibilidad,
     Ubicacion,
 )
 
@@ -50,6 +54,37 @@ class TestUbicacion:
         assert ub1 == ub2
 
 
+class TestDisponibilidad:
+    """Tests para Disponibilidad (Value Object) y su máscara de días"""
+
+    def test_mascara_ida_y_vuelta(self):
+        """La máscara tiene el bit (dia - 1) de cada día"""
+        disp = Disponibilidad(
+            dias_semana=[DiaSemana.LUNES, DiaSemana.MIERCOLES, DiaSemana.DOMINGO],
+            hora_inicio=time(9, 0),
+            hora_fin=time(13, 0),
+        )
+
+        assert disp.mascara == 0b1000101
+        assert (
+            Disponibilidad.desde_mascara(disp.mascara, time(9, 0), time(13, 0)) == disp
+        )
+
+    @pytest.mark.parametrize(
+        "dia, desde, hasta, esperado",
+        [
+            (DiaSemana.LUNES, None, None, True),
+            (DiaSemana.MARTES, None, None, False),
+            (DiaSemana.LUNES, time(9, 0), time(13, 0), True),
+            (DiaSemana.LUNES, time(8, 0), None, False),
+            (DiaSemana.LUNES, None, time(13, 30), False),
+        ],
+    )
+    def test_cubre(self, disponibilidad_lunes_manana, dia, desde, hasta, esperado):
+        """Atiende ese día y la franja entra en su horario"""
+        assert disponibilidad_lunes_manana.cubre(dia, desde, hasta) is esperado
+
+
 class TestEspecialidad:
     """Tests para Especialidad"""
 
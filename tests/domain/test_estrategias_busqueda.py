@@ -4,12 +4,15 @@ Tests unitarios para las estrategias de búsqueda
 
 import pytest
 from unittest.mock import Mock
+from uuid import uuid4
 
 from app.domain.strategies.estrategia import (
     EstrategiaBusqueda,
     BusquedaPorZona,
     BusquedaPorEspecialidad,
     BusquedaCombinada,
+    BusquedaPorCercania,
+    BusquedaPorTexto,
 )
 
 from app.domain.entities.catalogo import FiltroBusqueda
@@ -108,6 +111,126 @@ class TestBusquedaCombinada:
         assert isinstance(resultado, list)
 
 
+class TestBusquedaPorCercania:
+    """Tests para la estrategia de búsqueda por cercanía"""
+
+    def test_delega_en_buscar_cercanos(self):
+        """Punto, radio, límite y especialidad llegan al repositorio"""
+        estrategia = BusquedaPorCercania()
+        repo = Mock()
+        repo.buscar_cercanos.return_value = []
+
+        filtro = FiltroBusqueda(
+            id_especialidad=1, latitud=-34.6, longitud=-58.38, radio_km=5, limite=3
+        )
+
+        estrategia.buscar(repo, filtro)
+
+        repo.buscar_cercanos.assert_called_once_with(
+            latitud=-34.6,
+            longitud=-58.38,
+            radio_km=5,
+            limite=3,
+            especialidad_id=1,
+            especialidad_nombre=None,
+            provincia=None,
+            departamento=None,
+            barrio=None,
+        )
+
+    def test_sin_punto_o_radio_retorna_vacio(self):
+        """Sin punto o sin radio no se consulta el repositorio"""
+        estrategia = BusquedaPorCercania()
+        repo = Mock()
+
+        assert estrategia.buscar(repo, FiltroBusqueda(radio_km=5)) == []
+        assert (
+            estrategia.buscar(repo, FiltroBusqueda(latitud=-34.6, longitud=-58.38))
+            == []
+        )
+        repo.buscar_cercanos.assert_not_called()
+
+
+class TestBusquedaPorTexto:
+    """Tests para la estrategia de búsqueda por texto libre"""
+
+    def test_delega_y_guarda_relevancias(self):
+        """Texto, filtros y paginación llegan al repositorio"""
+        estrategia = BusquedaPorTexto()
+        repo = Mock()
+        primero, segundo = Mock(id=uuid4()), Mock(id=uuid4())
+        repo.buscar_por_texto.return_value = [(primero, 0.9), (segundo, 0.4)]
+
+        resultado = estrategia.buscar(
+            repo, FiltroBusqueda(texto="heridas", provincia="Mendoza", limite=5)
+        )
+
+        assert resultado == [primero, segundo]
+        assert estrategia.relevancias == {primero.id: 0.9, segundo.id: 0.4}
+        repo.buscar_por_texto.assert_called_once_with(
+            texto="heridas",
+            especialidad_id=None,
+            especialidad_nombre=None,
+            provincia="Mendoza",
+            departamento=None,
+            barrio=None,
+            limite=5,
+            despues_de=None,
+        )
+
+    def test_texto_vacio_no_consulta(self):
+        repo = Mock()
+
+        assert BusquedaPorTexto().buscar(repo, FiltroBusqueda(texto="  ")) == []
+        assert BusquedaPorTexto().contar(repo, FiltroBusqueda(texto=None)) == 0
+        assert repo.method_calls == []
+
+
+class TestPaginacionEnEstrategias:
+    """limite/despues_de llegan al repositorio y contar usa COUNT"""
+
+    def test_pasa_paginacion_al_repositorio(self):
+        repo = Mock()
+        despues_de = ("Gómez", uuid4())
+        filtro = FiltroBusqueda(provincia="Mendoza", limite=11, despues_de=despues_de)
+
+        BusquedaPorZona().buscar(repo, filtro)
+
+        repo.buscar_por_ubicacion.assert_called_once_with(
+            provincia="Mendoza",
+            departamento=None,
+            barrio=None,
+            limite=11,
+            despues_de=despues_de,
+        )
+
+    def test_contar_usa_conteo_del_repositorio(self):
+        repo = Mock()
+        repo.contar_combinado.return_value = 42
+
+        total = BusquedaCombinada().contar(
+            repo, FiltroBusqueda(id_especialidad=1, provincia="Mendoza", limite=10)
+        )
+
+        assert total == 42
+        repo.contar_combinado.assert_called_once_with(
+            especialidad_id=1,
+            especialidad_nombre=None,
+            provincia="Mendoza",
+            departamento=None,
+            barrio=None,
+        )
+        repo.buscar_combinado.assert_not_called()
+
+    def test_contar_por_defecto_busca_sin_paginar(self):
+        repo = Mock()
+        repo.buscar_cercanos.return_value = [Mock(), Mock(), Mock()]
+        filtro = FiltroBusqueda(latitud=-34.6, longitud=-58.38, radio_km=5, limite=1)
+
+        assert BusquedaPorCercania().contar(repo, filtro) == 3
+        assert repo.buscar_cercanos.call_args.kwargs["limite"] is None
+
+
 class TestEstrategiaBusquedaAbstracta:
     """Tests para la clase abstracta EstrategiaBusqueda"""
 
@@ -0,0 +1,127 @@
+"""
+Tests unitarios para el cálculo de huecos libres de la agenda
+"""
+
+from datetime import date, time
+
+import pytest
+
+from app.domain.entities.agenda import Hueco
+from app.domain.enumeraciones import DiaSemana
+from app.domain.huecos import (
+    calcular_huecos,
+    libres_en_fecha,
+    mascara_ranuras,
+    restar,
+    tiene_racha,
+    unir,
+)
+from app.domain.value_objects.objetos_valor import Disponibilidad
+
+LUNES = date(2030, 3, 4)
+MARTES = date(2030, 3, 5)
+MIERCOLES = date(2030, 3, 6)
+
+
+class TestIntervalos:
+    def test_unir_ordena_y_junta_los_que_se_tocan(self):
+        assert unir([(600, 660), (540, 600), (700, 720), (710, 730)]) == [
+            (540, 660),
+            (700, 730),
+        ]
+
+    @pytest.mark.parametrize(
+        "libres, ocupados, esperado",
+        [
+            ([(540, 780)], [], [(540, 780)]),
+            ([(540, 780)], [(540, 600)], [(600, 780)]),
+            ([(540, 780)], [(600, 660), (720, 780)], [(540, 600), (660, 720)]),
+            ([(540, 780)], [(500, 800)], []),
+            # Un ocupado que cruza dos franjas recorta las dos
+            ([(540, 600), (620, 700)], [(580, 640)], [(540, 580), (640, 700)]),
+            ([(540, 600)], [(400, 500), (900, 960)], [(540, 600)]),
+        ],
+    )
+    def test_restar(self, libres, ocupados, esperado):
+        assert restar(libres, ocupados) == esperado
+
+
+class TestCalcularHuecos:
+    @pytest.fixture
+    def disponibilidades(self):
+        return [
+            Disponibilidad([DiaSemana.LUNES, DiaSemana.MIERCOLES], time(9), time(13)),
+            Disponibilidad([DiaSemana.LUNES], time(12), time(15)),
+        ]
+
+    def test_resta_consultas_por_dia(self, disponibilidades):
+        ocupadas = [
+            (LUNES, time(10), time(11)),
+            (LUNES, time(14, 30), time(15)),
+            (MIERCOLES, time(9), time(13)),
+        ]
+
+        huecos = calcular_huecos(disponibilidades, ocupadas, LUNES, MIERCOLES, 30)
+
+        assert huecos == [
+            Hueco(LUNES, time(9), time(10)),
+            Hueco(LUNES, time(11), time(14, 30)),
+        ]
+
+    def test_descarta_huecos_mas_cortos_que_la_duracion(self, disponibilidades):
+        ocupadas = [(LUNES, time(9, 45), time(14))]
+
+        huecos = calcular_huecos(disponibilidades, ocupadas, LUNES, MARTES, 60)
+
+        assert huecos == [Hueco(LUNES, time(14), time(15))]
+
+    def test_rango_de_un_mes(self, disponibilidades):
+        huecos = calcular_huecos(
+            disponibilidades, [], date(2030, 3, 1), date(2030, 3, 31), 60
+        )
+
+        # 4 lunes (9-15) y 4 miércoles (9-13) en marzo de 2030
+        assert len(huecos) == 8
+        assert {h.fecha.isoweekday() for h in huecos} == {1, 3}
+
+
+class TestLibresEnFecha:
+    def test_mascara_de_ranuras(self):
+        # 9:10 a 10:20: completas 9:15-10:15, tocadas 9:00-10:30
+        assert mascara_ranuras(550, 620) == 0b1111 << 37
+        assert mascara_ranuras(550, 620, completas=False) == 0b111111 << 36
+        assert mascara_ranuras(550, 560) == 0
+
+    @pytest.mark.parametrize(
+        "bits, largo, esperado",
+        [
+            (0b1110111, 3, True),
+            (0b1110111, 4, False),
+            (0b1 << 95, 1, True),
+            ((1 << 96) - 1, 96, True),
+            (0b1011011011, 3, False),
+        ],
+    )
+    def test_racha_de_unos(self, bits, largo, esperado):
+        assert tiene_racha(bits, largo) is esperado
+
+    def test_franjas_menos_consultas_en_la_ventana(self):
+        franjas = {
+            "ana": [(time(9), time(13))],
+            "beto": [(time(9), time(11)), (time(15), time(18))],
+            "carla": [(time(14), time(16))],
+        }
+        ocupadas = {
+            "ana": [(time(9, 30), time(10, 30)), (time(11), time(12, 10))],
+            "beto": [(time(10), time(11))],
+        }
+
+        libres = libres_en_fecha(franjas, ocupadas, 60, time(9), time(13))
+
+        # Ana sólo tiene 30 minutos seguidos, Carla atiende fuera de la ventana
+        assert libres == {"beto"}
+        assert libres_en_fecha(franjas, ocupadas, 60) == {"beto", "carla"}
+        assert libres_en_fecha(franjas, ocupadas, 30, time(9), time(13)) == {
+            "ana",
+            "beto",
+        }
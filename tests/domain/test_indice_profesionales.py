@@ -0,0 +1,426 @@
+"""
+Tests unitarios para el índice invertido de búsqueda en memoria
+"""
+
+import random
+from dataclasses import replace
+from datetime import time
+from unittest.mock import Mock
+from uuid import uuid4
+
+import pytest
+
+from app.domain.entities.catalogo import ConteoFaceta, FiltroBusqueda
+from app.domain.geo import distancia_a
+from app.domain.eventos import ProfesionalActualizado, ProfesionalEliminado
+from app.domain.strategies.cache import CacheBusquedas
+from app.domain.strategies.facetas import Facetador
+from app.domain.strategies.indice import IndiceProfesionales
+from app.domain.strategies.estrategia import (
+    BusquedaPorZona,
+    BusquedaPorEspecialidad,
+    BusquedaCombinada,
+    BusquedaPorCercania,
+)
+
+
+def _indice(*profesionales):
+    indice = IndiceProfesionales()
+    indice.construir(profesionales)
+    return indice
+
+
+class TestIndiceProfesionales:
+    """Posting lists e intersecciones"""
+
+    def test_no_listo_hasta_construir(self):
+        indice = IndiceProfesionales()
+
+        assert not indice.listo
+        indice.construir([])
+        assert indice.listo
+
+    def test_busca_por_especialidad_id(
+        self, profesional_enfermeria, profesional_acompanante
+    ):
+        indice = _indice(profesional_enfermeria, profesional_acompanante)
+
+        assert indice.buscar(especialidad_id=1) == [profesional_enfermeria]
+        assert indice.buscar(especialidad_id=2) == [profesional_acompanante]
+        assert indice.buscar(especialidad_id=99) == []
+
+    def test_busca_por_nombre_sin_acentos_y_subcadena(
+        self, profesional_enfermeria, profesional_acompanante
+    ):
+        indice = _indice(profesional_enfermeria, profesional_acompanante)
+
+        assert indice.buscar(especialidad_nombre="enfermeria") == [
+            profesional_enfermeria
+        ]
+        assert indice.buscar(provincia="MENDO") == [profesional_acompanante]
+
+    def test_interseccion_especialidad_y_zona(
+        self, profesional_enfermeria, profesional_acompanante
+    ):
+        indice = _indice(profesional_enfermeria, profesional_acompanante)
+
+        assert indice.buscar(especialidad_id=1, provincia="Buenos Aires") == [
+            profesional_enfermeria
+        ]
+        assert indice.buscar(especialidad_id=1, provincia="Mendoza") == []
+        assert indice.buscar(
+            provincia="Buenos Aires", departamento="CABA", barrio="Flores"
+        ) == [profesional_enfermeria]
+
+    def test_sin_filtros_devuelve_todos(
+        self, profesional_enfermeria, profesional_acompanante
+    ):
+        indice = _indice(profesional_enfermeria, profesional_acompanante)
+
+        assert len(indice.buscar()) == 2
+
+    def test_no_indexa_inactivos(self, profesional_enfermeria):
+        profesional_enfermeria.activo = False
+        indice = _indice(profesional_enfermeria)
+
+        assert len(indice) == 0
+
+
+class TestIndiceComoObserver:
+    """Actualización incremental a partir de eventos del repositorio"""
+
+    def test_actualizacion_mueve_posting_lists(
+        self, profesional_enfermeria, ubicacion_mendoza
+    ):
+        indice = _indice(profesional_enfermeria)
+        mudado = replace(profesional_enfermeria, ubicacion=ubicacion_mendoza)
+
+        indice.update(ProfesionalActualizado(profesional=mudado))
+
+        assert indice.buscar(provincia="Buenos Aires") == []
+        assert indice.buscar(provincia="Mendoza") == [mudado]
+
+    def test_desactivacion_quita_del_indice(self, profesional_enfermeria):
+        indice = _indice(profesional_enfermeria)
+        inactivo = replace(profesional_enfermeria, activo=False)
+
+        indice.update(ProfesionalActualizado(profesional=inactivo))
+
+        assert indice.buscar(especialidad_id=1) == []
+        assert len(indice) == 0
+
+    def test_eliminacion_y_reuso_de_documento(
+        self, profesional_enfermeria, profesional_acompanante
+    ):
+        indice = _indice(profesional_enfermeria)
+
+        indice.update(ProfesionalEliminado(profesional_id=profesional_enfermeria.id))
+        indice.update(ProfesionalActualizado(profesional=profesional_acompanante))
+
+        assert indice.buscar() == [profesional_acompanante]
+        assert indice.buscar(especialidad_id=1) == []
+
+    def test_ignora_eventos_si_no_esta_construido(self, profesional_enfermeria):
+        indice = IndiceProfesionales()
+
+        indice.update(ProfesionalActualizado(profesional=profesional_enfermeria))
+
+        assert len(indice) == 0
+
+
+class TestEstrategiasConIndice:
+    """Las estrategias usan el índice en lugar del repositorio"""
+
+    def test_estrategias_no_consultan_repositorio(
+        self, profesional_enfermeria, profesional_acompanante
+    ):
+        indice = _indice(profesional_enfermeria, profesional_acompanante)
+        repo = Mock()
+
+        zona = BusquedaPorZona(indice).buscar(repo, FiltroBusqueda(provincia="Mendoza"))
+        especialidad = BusquedaPorEspecialidad(indice).buscar(
+            repo, FiltroBusqueda(id_especialidad=1)
+        )
+        combinada = BusquedaCombinada(indice).buscar(
+            repo, FiltroBusqueda(id_especialidad=2, provincia="Mendoza")
+        )
+
+        assert zona == [profesional_acompanante]
+        assert especialidad == [profesional_enfermeria]
+        assert combinada == [profesional_acompanante]
+        assert repo.method_calls == []
+
+    def test_cercania_usa_grilla_del_indice(
+        self, profesional_enfermeria, profesional_acompanante
+    ):
+        indice = _indice(profesional_enfermeria, profesional_acompanante)
+        repo = Mock()
+
+        resultado = BusquedaPorCercania(indice).buscar(
+            repo,
+            FiltroBusqueda(latitud=-34.60, longitud=-58.38, radio_km=50),
+        )
+
+        assert resultado == [profesional_enfermeria]
+        assert repo.method_calls == []
+
+    def test_indice_no_construido_delega_en_repositorio(self):
+        repo = Mock()
+        repo.buscar_por_ubicacion.return_value = []
+
+        BusquedaPorZona(IndiceProfesionales()).buscar(
+            repo, FiltroBusqueda(provincia="Mendoza")
+        )
+
+        repo.buscar_por_ubicacion.assert_called_once()
+
+
+class TestIndiceDisponibilidad:
+    """Posting lists por día de la semana + verificación de la franja"""
+
+    def test_filtra_por_dia(self, profesional_enfermeria, profesional_acompanante):
+        indice = _indice(profesional_enfermeria, profesional_acompanante)
+
+        assert indice.buscar(dia_semana=1) == [profesional_enfermeria]
+        assert indice.buscar(dia_semana=3) == [profesional_acompanante]
+        assert indice.buscar(dia_semana=7) == []
+
+    @pytest.mark.parametrize(
+        "desde, hasta, esperados",
+        [
+            (time(9, 0), time(13, 0), 1),
+            (time(10, 0), None, 1),
+            (time(8, 0), time(10, 0), 0),
+            (None, time(14, 0), 0),
+        ],
+    )
+    def test_franja_debe_quedar_cubierta(
+        self, profesional_enfermeria, desde, hasta, esperados
+    ):
+        indice = _indice(profesional_enfermeria)
+
+        assert indice.contar(dia_semana=1, hora_desde=desde, hora_hasta=hasta) == (
+            esperados
+        )
+
+    def test_combinada_con_especialidad(
+        self, profesional_enfermeria, profesional_acompanante
+    ):
+        indice = _indice(profesional_enfermeria, profesional_acompanante)
+        repo = Mock()
+
+        resultado = BusquedaCombinada(indice).buscar(
+            repo, FiltroBusqueda(id_especialidad=2, dia_semana=1)
+        )
+
+        assert resultado == []
+        assert repo.method_calls == []
+
+
+def _en(profesional, latitud, longitud, **cambios):
+    """Copia del profesional ubicado en (latitud, longitud)"""
+    return replace(
+        profesional,
+        id=uuid4(),
+        ubicacion=replace(profesional.ubicacion, latitud=latitud, longitud=longitud),
+        **cambios,
+    )
+
+
+class TestIndiceCercania:
+    """k más cercanos sobre la grilla de celdas"""
+
+    def test_ordena_por_distancia_y_respeta_radio(self, profesional_enfermeria):
+        obelisco = (-34.6037, -58.3816)
+        cerca = _en(profesional_enfermeria, -34.6100, -58.3900)
+        medio = _en(profesional_enfermeria, -34.6500, -58.4500)
+        lejos = _en(profesional_enfermeria, -32.8895, -68.8458)
+        indice = _indice(lejos, medio, cerca)
+
+        assert indice.cercanos(*obelisco, radio_km=20) == [cerca, medio]
+        assert indice.cercanos(*obelisco, radio_km=20, limite=1) == [cerca]
+
+    def test_filtra_por_especialidad(
+        self, profesional_enfermeria, profesional_acompanante
+    ):
+        enfermera = _en(profesional_enfermeria, -34.60, -58.38)
+        acompanante = _en(profesional_acompanante, -34.60, -58.38)
+        indice = _indice(enfermera, acompanante)
+
+        assert indice.cercanos(-34.6, -58.38, radio_km=5, especialidad_id=2) == [
+            acompanante
+        ]
+        assert indice.cercanos(
+            -34.6, -58.38, radio_km=5, especialidad_nombre="enfermeria"
+        ) == [enfermera]
+
+    def test_filtra_por_ubicacion(
+        self, profesional_enfermeria, profesional_acompanante
+    ):
+        enfermera = _en(profesional_enfermeria, -34.60, -58.38)
+        acompanante = _en(profesional_acompanante, -34.60, -58.38)
+        indice = _indice(enfermera, acompanante)
+
+        assert indice.cercanos(-34.6, -58.38, radio_km=5, provincia="buenos aires") == [
+            enfermera
+        ]
+
+    def test_ignora_no_geolocalizados(self, profesional_enfermeria):
+        sin_coordenadas = _en(profesional_enfermeria, None, None)
+        indice = _indice(sin_coordenadas)
+
+        assert len(indice) == 1
+        assert indice.cercanos(-34.6, -58.38, radio_km=1000) == []
+
+    def test_mudanza_actualiza_celda(self, profesional_enfermeria, ubicacion_mendoza):
+        indice = _indice(profesional_enfermeria)
+        mudado = replace(profesional_enfermeria, ubicacion=ubicacion_mendoza)
+
+        indice.update(ProfesionalActualizado(profesional=mudado))
+
+        assert indice.cercanos(-34.6037, -58.3816, radio_km=10) == []
+        assert indice.cercanos(-32.89, -68.85, radio_km=10) == [mudado]
+
+    @pytest.mark.parametrize("radio_km,limite", [(3, None), (25, 5), (400, 10)])
+    def test_coincide_con_fuerza_bruta(self, profesional_enfermeria, radio_km, limite):
+        azar = random.Random(7)
+        profesionales = [
+            _en(
+                profesional_enfermeria,
+                azar.uniform(-35.0, -34.2),
+                azar.uniform(-58.9, -58.0),
+            )
+            for _ in range(300)
+        ]
+        indice = _indice(*profesionales)
+        punto = (-34.6, -58.45)
+
+        esperados = sorted(
+            (p for p in profesionales if distancia_a(p, *punto) <= radio_km),
+            key=lambda p: distancia_a(p, *punto),
+        )
+        if limite:
+            esperados = esperados[:limite]
+
+        assert indice.cercanos(*punto, radio_km=radio_km, limite=limite) == esperados
+
+
+class TestIndicePaginacion:
+    """Páginas por (apellido, id) y conteo por popcount"""
+
+    def test_recorre_paginas_en_orden(self, profesional_enfermeria):
+        profesionales = [
+            replace(profesional_enfermeria, id=uuid4(), apellido=apellido)
+            for apellido in ["Ruiz", "Alvarez", "Gomez", "Alvarez", "Perez"]
+        ]
+        indice = _indice(*profesionales)
+
+        primera = indice.buscar(especialidad_id=1, limite=2)
+        ultimo = primera[-1]
+        resto = indice.buscar(
+            especialidad_id=1, despues_de=(ultimo.apellido, ultimo.id)
+        )
+
+        assert [p.apellido for p in primera + resto] == [
+            "Alvarez",
+            "Alvarez",
+            "Gomez",
+            "Perez",
+            "Ruiz",
+        ]
+        assert indice.contar(especialidad_id=1) == 5
+        assert indice.contar(especialidad_id=2) == 0
+
+    def test_recorre_paginas_por_puntaje(self, profesional_enfermeria):
+        profesionales = [
+            replace(profesional_enfermeria, id=uuid4(), puntaje=puntaje)
+            for puntaje in [0.5, 0.9, 0.7, 0.9, 0.2]
+        ]
+        indice = _indice(*profesionales)
+
+        primera = indice.buscar(especialidad_id=1, limite=2, por_puntaje=True)
+        ultimo = primera[-1]
+        resto = indice.buscar(
+            especialidad_id=1, despues_de=(ultimo.puntaje, ultimo.id), por_puntaje=True
+        )
+
+        assert [p.puntaje for p in primera + resto] == [0.9, 0.9, 0.7, 0.5, 0.2]
+        assert len({p.id for p in primera + resto}) == 5
+
+    def test_cercanos_continua_desde_cursor(self, profesional_enfermeria):
+        punto = (-34.6037, -58.3816)
+        profesionales = [
+            _en(profesional_enfermeria, -34.6037 + i * 0.01, -58.3816) for i in range(6)
+        ]
+        indice = _indice(*profesionales)
+
+        primera = indice.cercanos(*punto, radio_km=50, limite=4)
+        cursor = (distancia_a(primera[-1], *punto), primera[-1].id)
+        segunda = indice.cercanos(*punto, radio_km=50, limite=4, despues_de=cursor)
+
+        assert primera + segunda == profesionales
+
+
+class TestIndiceFacetas:
+    """Conteos por faceta con popcount sobre las posting lists"""
+
+    def test_cuenta_por_especialidad_y_ubicacion(
+        self, profesional_enfermeria, profesional_acompanante
+    ):
+        indice = _indice(profesional_enfermeria, profesional_acompanante)
+
+        conteos = indice.facetas(dia_semana=1)
+
+        assert conteos == [
+            ConteoFaceta("especialidad", "Enfermería", 1, id=1),
+            ConteoFaceta("provincia", "Buenos Aires", 1),
+            ConteoFaceta("departamento", "CABA", 1, provincia="Buenos Aires"),
+        ]
+
+    def test_baja_quita_etiquetas(
+        self, profesional_enfermeria, profesional_acompanante
+    ):
+        indice = _indice(profesional_enfermeria, profesional_acompanante)
+
+        indice.quitar(profesional_acompanante.id)
+
+        assert {c.nombre for c in indice.facetas()} == {
+            "Enfermería",
+            "Buenos Aires",
+            "CABA",
+        }
+
+
+class TestFacetador:
+    """Índice si está listo, repositorio si no; cacheado como una búsqueda"""
+
+    def test_usa_repositorio_y_cachea(self, profesional_enfermeria):
+        repo = Mock()
+        repo.contar_facetas.return_value = [
+            ConteoFaceta("provincia", "Mendoza", 1),
+            ConteoFaceta("provincia", "Buenos Aires", 3),
+        ]
+        cache = CacheBusquedas()
+        facetador = Facetador(repo, cache=cache)
+
+        primera = facetador.contar(FiltroBusqueda(id_especialidad=1, limite=5))
+        segunda = facetador.contar(FiltroBusqueda(id_especialidad=1))
+
+        assert [c.nombre for c in primera["provincia"]] == ["Buenos Aires", "Mendoza"]
+        assert primera == segunda
+        assert primera["especialidad"] == []
+        repo.contar_facetas.assert_called_once()
+
+        cache.update(ProfesionalActualizado(profesional=profesional_enfermeria))
+        facetador.contar(FiltroBusqueda(id_especialidad=1))
+
+        assert repo.contar_facetas.call_count == 2
+
+    def test_indice_listo_no_consulta_repositorio(self, profesional_enfermeria):
+        repo = Mock()
+        facetador = Facetador(repo, indice=_indice(profesional_enfermeria))
+
+        facetas = facetador.contar(FiltroBusqueda())
+
+        assert facetas["especialidad"][0].cantidad == 1
+        repo.contar_facetas.assert_not_called()
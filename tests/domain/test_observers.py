@@ -3,6 +3,7 @@ Tests para el patrón Observer y Event Bus
 Valida Subject, Observer, NotificadorEmail, AuditLogger y EventBus
 """
 
+import pytest
 from uuid import uuid4
 from datetime import datetime
 
@@ -20,6 +21,8 @@ from app.domain.eventos import (
     CitaCancelada,
     CitaReprogramada,
     CitaCompletada,
+    ProfesionalActualizado,
+    ProfesionalEliminado,
 )
 
 
@@ -366,6 +369,24 @@ class TestEventBus:
             "Error procesando evento" in record.message for record in caplog.records
         )
 
+    def test_entregar_corre_todos_y_lanza_el_error(self):
+        """entregar (despachador del outbox) informa la falla para reintentar"""
+        eventos_procesados = []
+
+        def handler_falla(evt):
+            raise RuntimeError("SMTP caído")
+
+        self.bus.suscribir("cita.creada", handler_falla)
+        self.bus.suscribir("cita.creada", eventos_procesados.append)
+
+        evento = CitaCreada(
+            cita_id=uuid4(), profesional_id=uuid4(), paciente_id=uuid4()
+        )
+
+        with pytest.raises(RuntimeError, match="SMTP caído"):
+            self.bus.entregar(evento)
+        assert eventos_procesados == [evento]
+
 
 class TestIntegracionObserverEventBus:
     """Tests de integración entre Observer pattern y EventBus"""
@@ -479,3 +500,21 @@ class TestEventosDominio:
         assert evento.cita_id == cita_id
         assert evento.datos["profesional_id"] == str(prof_id)
         assert evento.datos["paciente_id"] == str(pac_id)
+
+    def test_eventos_de_profesional_pasan_por_el_bus(self, profesional_enfermeria):
+        """Los eventos de perfil también son Event: tipo, datos y timestamp"""
+        bus = EventBus()
+        recibidos = []
+        bus.suscribir("profesional.actualizado", recibidos.append)
+        bus.suscribir("profesional.eliminado", recibidos.append)
+
+        actualizado = ProfesionalActualizado(profesional=profesional_enfermeria)
+        eliminado = ProfesionalEliminado(profesional_id=profesional_enfermeria.id)
+        bus.publicar(actualizado)
+        bus.publicar(eliminado)
+
+        assert recibidos == [actualizado, eliminado]
+        assert all(isinstance(e, Event) for e in recibidos)
+        assert actualizado.datos == {"profesional_id": str(profesional_enfermeria.id)}
+        assert actualizado.profesional is profesional_enfermeria
+        assert eliminado.anterior is None
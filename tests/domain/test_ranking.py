@@ -0,0 +1,61 @@
+"""
+Tests unitarios para el puntaje de ranking de profesionales
+"""
+
+from dataclasses import replace
+
+import pytest
+
+from app.domain.ranking import (
+    PROMEDIO_PREVIO,
+    PUNTAJE_INICIAL,
+    ordenar_por_puntaje,
+    promedio_bayesiano,
+    puntaje_base,
+    puntaje_compuesto,
+)
+
+
+class TestPuntajeBase:
+    def test_sin_valoraciones_usa_el_previo(self):
+        assert promedio_bayesiano(0, 0) == PROMEDIO_PREVIO
+        assert PUNTAJE_INICIAL == puntaje_base(0, 0, False)
+
+    def test_pocas_valoraciones_no_superan_a_muchas(self):
+        """Dos 5 pesan menos que cuarenta valoraciones de 4,8"""
+        assert puntaje_base(2, 10, False) < puntaje_base(40, 192, False)
+
+    def test_verificado_suma_bono(self):
+        assert puntaje_base(3, 12, True) > puntaje_base(3, 12, False)
+
+    @pytest.mark.parametrize("cantidad, suma", [(1000, 1000), (1000, 5000)])
+    def test_queda_entre_0_y_1(self, cantidad, suma):
+        for verificado in (False, True):
+            assert 0.0 <= puntaje_base(cantidad, suma, verificado) <= 1.0
+
+
+class TestOrdenarPorPuntaje:
+    def test_sin_punto_ordena_por_puntaje_e_id(
+        self, profesional_enfermeria, profesional_acompanante
+    ):
+        alto = replace(profesional_acompanante, puntaje=0.9)
+        bajo = replace(profesional_enfermeria, puntaje=0.4)
+
+        assert ordenar_por_puntaje([bajo, alto]) == [alto, bajo]
+
+    def test_con_punto_pondera_cercania(
+        self, profesional_enfermeria, profesional_acompanante
+    ):
+        """Con igual puntaje gana el más cercano; la cercanía no lo es todo"""
+        cerca = replace(profesional_enfermeria, puntaje=0.6)
+        lejos = replace(profesional_acompanante, puntaje=0.6)
+        punto = (
+            profesional_enfermeria.ubicacion.latitud,
+            profesional_enfermeria.ubicacion.longitud,
+        )
+
+        assert ordenar_por_puntaje([lejos, cerca], *punto) == [cerca, lejos]
+        assert puntaje_compuesto(cerca, *punto) > puntaje_compuesto(lejos, *punto)
+        assert puntaje_compuesto(replace(lejos, puntaje=1.0), *punto) > (
+            puntaje_compuesto(replace(cerca, puntaje=0.2), *punto)
+        )
@@ -0,0 +1,69 @@
+"""
+Tests unitarios para el snapshot versionado de datos de referencia
+"""
+
+from uuid import uuid4
+
+import pytest
+
+from app.domain.entities.catalogo import NodoUbicacion, Sugerencia
+from app.domain.eventos import CatalogoAmpliado
+from app.domain.strategies.snapshot import CacheCatalogo, SnapshotCatalogo
+
+PROVINCIA = NodoUbicacion(uuid4(), "Córdoba")
+DEPARTAMENTO = NodoUbicacion(uuid4(), "Capital", PROVINCIA.id)
+BARRIO = NodoUbicacion(uuid4(), "Centro", DEPARTAMENTO.id)
+
+
+def _carga(*especialidades):
+    return list(especialidades), [PROVINCIA], [DEPARTAMENTO], [BARRIO]
+
+
+class TestSnapshotCatalogo:
+    def test_agrupa_por_nivel_superior(self):
+        snapshot = SnapshotCatalogo.armar(1, *_carga((1, "Enfermería")))
+
+        assert snapshot.departamentos_de(PROVINCIA.id) == (DEPARTAMENTO,)
+        assert snapshot.barrios_de(DEPARTAMENTO.id) == (BARRIO,)
+        assert snapshot.barrios_de(uuid4()) == ()
+        with pytest.raises(TypeError):
+            snapshot.departamentos[uuid4()] = ()
+
+    def test_etag_depende_del_contenido_y_no_de_la_version(self):
+        a = SnapshotCatalogo.armar(1, *_carga((1, "Enfermería")))
+        b = SnapshotCatalogo.armar(7, *_carga((1, "Enfermería")))
+        c = SnapshotCatalogo.armar(1, *_carga((1, "Enfermería"), (2, "Kinesiología")))
+
+        assert a.etag == b.etag
+        assert a.etag != c.etag
+        assert a.etag.startswith('"') and a.etag.endswith('"')
+
+
+class TestCacheCatalogo:
+    def test_carga_una_vez_hasta_invalidar(self):
+        cargas = []
+
+        def cargar():
+            cargas.append(1)
+            return _carga((1, "Enfermería"))
+
+        cache = CacheCatalogo()
+        primero = cache.obtener(cargar)
+        assert cache.obtener(cargar) is primero
+
+        cache.update(CatalogoAmpliado(Sugerencia("especialidad", 2, "Kinesiología")))
+        segundo = cache.obtener(cargar)
+
+        assert len(cargas) == 2
+        assert (primero.version, segundo.version) == (1, 2)
+        assert cache.invalidaciones == 1
+
+    def test_vence_con_ttl(self):
+        ahora = [0.0]
+        cache = CacheCatalogo(ttl_segundos=10, reloj=lambda: ahora[0])
+        cache.obtener(lambda: _carga())
+
+        ahora[0] = 9.0
+        assert cache.vigente() is not None
+        ahora[0] = 10.0
+        assert cache.vigente() is None
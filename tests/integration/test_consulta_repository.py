@@ -0,0 +1,253 @@
+"""
+Tests de ConsultaRepository sobre SQLite en memoria (y el camino de Postgres
+con una sesión simulada).
+"""
+
+import pytest
+from datetime import date, time
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.domain.entities.agenda import AgendaOcupada, Cita, HorarioNoDisponible
+from app.domain.enumeraciones import EstadoCita
+from app.infra.persistence.agenda import (
+    EXCLUSION_SOLAPAMIENTO,
+    ConsultaORM,
+    EstadoConsultaORM,
+)
+from app.infra.repositories import consulta_repository
+from app.infra.repositories.consulta_repository import (
+    ConsultaRepository,
+    clave_agenda,
+)
+
+FECHA = date(2030, 3, 4)
+
+
+def _cita(profesional_id, desde: time, hasta: time, **cambios) -> Cita:
+    datos = dict(
+        id=uuid4(),
+        paciente_id=uuid4(),
+        profesional_id=profesional_id,
+        fecha=FECHA,
+        hora_inicio=desde,
+        hora_fin=hasta,
+        ubicacion=None,
+    )
+    datos.update(cambios)
+    return Cita(**datos)
+
+
+@pytest.mark.integration
+class TestSolapamientoDeConsultas:
+    """Sin Postgres (sin restricción de exclusión) el repositorio verifica antes"""
+
+    @pytest.fixture
+    def repo(self, sqlite_session):
+        return ConsultaRepository(sqlite_session)
+
+    @pytest.fixture
+    def profesional_id(self):
+        return uuid4()
+
+    def _crear(self, repo, cita):
+        return repo.crear(cita, direccion_id=uuid4())
+
+    def test_rechaza_solapamiento(self, repo, profesional_id, sqlite_session):
+        self._crear(repo, _cita(profesional_id, time(9), time(10)))
+
+        with pytest.raises(HorarioNoDisponible) as error:
+            self._crear(repo, _cita(profesional_id, time(9, 30), time(11)))
+
+        assert error.value.profesional_id == profesional_id
+        assert sqlite_session.query(ConsultaORM).count() == 1
+
+    def test_contiguas_otro_profesional_o_cancelada_no_chocan(
+        self, repo, profesional_id, sqlite_session
+    ):
+        cancelada = _cita(
+            profesional_id, time(11), time(12), estado=EstadoCita.CANCELADA
+        )
+        self._crear(repo, _cita(profesional_id, time(9), time(10)))
+        self._crear(repo, _cita(profesional_id, time(10), time(11)))
+        self._crear(repo, _cita(uuid4(), time(9), time(10)))
+        self._crear(repo, cancelada)
+        self._crear(repo, _cita(profesional_id, time(11), time(12)))
+
+        assert sqlite_session.query(ConsultaORM).count() == 5
+        assert repo.obtener_por_id(cancelada.id).esta_cancelada
+
+    def test_reprogramar_sobre_otra_consulta(self, repo, profesional_id):
+        self._crear(repo, _cita(profesional_id, time(9), time(10)))
+        cita = self._crear(repo, _cita(profesional_id, time(14), time(15)))
+
+        cita.reprogramar(FECHA, time(14, 30), time(15, 30))
+        repo.actualizar(cita)
+        cita.reprogramar(FECHA, time(9, 30), time(10, 30))
+
+        with pytest.raises(HorarioNoDisponible):
+            repo.actualizar(cita)
+        assert repo.obtener_por_id(cita.id).hora_inicio == time(14, 30)
+
+    def test_cancelar_libera_el_horario(self, repo, profesional_id):
+        cita = self._crear(repo, _cita(profesional_id, time(9), time(10)))
+        assert not repo.verificar_disponibilidad(
+            profesional_id, FECHA, time(9), time(10)
+        )
+        assert repo.verificar_disponibilidad(
+            profesional_id, FECHA, time(9), time(10), excluir_id=cita.id
+        )
+
+        cita.cancelar()
+        repo.actualizar(cita)
+
+        assert repo.verificar_disponibilidad(profesional_id, FECHA, time(9), time(10))
+        self._crear(repo, _cita(profesional_id, time(9), time(10)))
+
+    def test_confirmar_no_revisa_la_agenda(self, repo, profesional_id, sqlite_session):
+        """Datos previos a la restricción: confirmar no choca con el solapamiento"""
+        self._crear(repo, _cita(profesional_id, time(9), time(10)))
+        cita = self._crear(repo, _cita(profesional_id, time(14), time(15)))
+        orm = sqlite_session.get(ConsultaORM, cita.id)
+        orm.hora_inicio, orm.hora_fin = time(9, 30), time(10, 30)
+        sqlite_session.commit()
+
+        cita = repo.obtener_por_id(cita.id)
+        cita.confirmar()
+        repo.actualizar(cita)
+
+        assert repo.obtener_por_id(cita.id).estado == EstadoCita.CONFIRMADA
+
+
+@pytest.mark.integration
+class TestCatalogoDeEstados:
+    """Código ↔ id de estado_consulta leído una vez por base"""
+
+    @pytest.fixture
+    def repo(self, sqlite_session):
+        return ConsultaRepository(sqlite_session)
+
+    def test_transiciones_y_listados_sin_leer_estados(
+        self, repo, sqlite_session, contador_queries
+    ):
+        profesional_id = uuid4()
+        citas = [
+            repo.crear(_cita(profesional_id, time(h), time(h + 1)), uuid4())
+            for h in (9, 10, 11)
+        ]
+        citas[0].cancelar()
+        repo.actualizar(citas[0])
+        citas[1].confirmar()
+        repo.actualizar(citas[1])
+        citas[1].completar()
+        repo.actualizar(citas[1])
+
+        contador_queries.clear()
+        citas[2].confirmar()
+        repo.actualizar(citas[2])
+        activas = repo.listar_por_profesional(profesional_id, solo_activas=True)
+        todas = repo.listar_por_profesional(profesional_id)
+
+        assert not any("estado_consulta" in q for q in contador_queries)
+        assert [c.id for c in activas] == [citas[2].id]
+        assert [c.estado for c in todas] == [
+            EstadoCita.CANCELADA,
+            EstadoCita.COMPLETADA,
+            EstadoCita.CONFIRMADA,
+        ]
+        assert sqlite_session.query(EstadoConsultaORM).count() == 4
+
+    def test_estado_creado_por_otra_sesion(self, repo, sqlite_session):
+        assert repo._estados() == {}
+        sqlite_session.add(EstadoConsultaORM(codigo="pendiente", descripcion="P"))
+        sqlite_session.commit()
+
+        cita = repo.crear(_cita(uuid4(), time(9), time(10)), uuid4())
+
+        assert sqlite_session.query(EstadoConsultaORM).count() == 1
+        assert repo.obtener_por_id(cita.id).estado == EstadoCita.PENDIENTE
+
+
+class _ErrorPostgres(Exception):
+    def __init__(self, pgcode, mensaje=""):
+        super().__init__(mensaje)
+        self.pgcode = pgcode
+
+
+class TestReintentosDeReserva:
+    """Camino de Postgres: advisory lock por profesional y día, y reintentos"""
+
+    @pytest.fixture
+    def session(self, monkeypatch):
+        monkeypatch.setattr(consulta_repository, "PAUSA_REINTENTO_S", 0)
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+        return session
+
+    @staticmethod
+    def _error(pgcode, mensaje="", tipo=OperationalError):
+        return tipo("COMMIT", {}, _ErrorPostgres(pgcode, mensaje))
+
+    def test_clave_por_profesional_y_dia(self):
+        profesional_id = uuid4()
+
+        assert clave_agenda(profesional_id, FECHA) == clave_agenda(
+            profesional_id, FECHA
+        )
+        assert clave_agenda(profesional_id, FECHA) != clave_agenda(
+            profesional_id, date(2030, 3, 5)
+        )
+        assert -(2**63) <= clave_agenda(profesional_id, FECHA) < 2**63
+
+    def test_reintenta_la_transaccion_completa(self, session):
+        session.commit.side_effect = [self._error("40001"), self._error("55P03"), None]
+        cita = _cita(uuid4(), time(9), time(10))
+        aplicar = MagicMock()
+
+        ConsultaRepository(session)._guardar(cita, aplicar)
+
+        assert aplicar.call_count == 3
+        assert session.rollback.call_count == 2
+        # SET LOCAL lock_timeout + pg_advisory_xact_lock en cada intento
+        assert session.execute.call_count == 6
+        assert "pg_advisory_xact_lock" in str(session.execute.call_args.args[0])
+
+    def test_sin_agenda_tras_los_reintentos(self, session):
+        session.commit.side_effect = self._error("55P03")
+
+        with pytest.raises(AgendaOcupada):
+            ConsultaRepository(session)._guardar(
+                _cita(uuid4(), time(9), time(10)), MagicMock()
+            )
+        assert session.commit.call_count == consulta_repository.REINTENTOS_RESERVA
+
+    def test_solapamiento_no_se_reintenta(self, session):
+        session.commit.side_effect = self._error(
+            "23P01",
+            f'violates exclusion constraint "{EXCLUSION_SOLAPAMIENTO}"',
+            tipo=IntegrityError,
+        )
+
+        with pytest.raises(HorarioNoDisponible) as error:
+            ConsultaRepository(session)._guardar(
+                _cita(uuid4(), time(9), time(10)), MagicMock()
+            )
+        assert not isinstance(error.value, AgendaOcupada)
+        assert session.commit.call_count == 1
+
+    def test_sin_cambio_de_horario_no_toma_la_agenda(self, session):
+        cita = _cita(uuid4(), time(9), time(10), estado=EstadoCita.CONFIRMADA)
+
+        ConsultaRepository(session)._guardar(cita, MagicMock(), ocupa_agenda=False)
+
+        session.execute.assert_not_called()
+        session.commit.assert_called_once()
+
+    def test_cancelar_no_toma_la_agenda(self, session):
+        cita = _cita(uuid4(), time(9), time(10), estado=EstadoCita.CANCELADA)
+
+        ConsultaRepository(session)._guardar(cita, MagicMock())
+
+        session.execute.assert_not_called()
@@ -0,0 +1,244 @@
+"""
+Outbox de eventos de consultas sobre SQLite en memoria: los eventos se
+escriben con el cambio de la consulta y el despachador los entrega.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from datetime import date, datetime, time, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.entities.agenda import Cita, HorarioNoDisponible
+from app.domain.eventos import CitaCancelada, CitaCreada
+from app.domain.observers.bus_asincrono import EventBusAsincrono
+from app.domain.observers.observadores import EventBus
+from app.infra.persistence.agenda import EventoORM
+from app.infra.repositories.consulta_repository import ConsultaRepository
+from app.services.despacho_eventos import DespachadorEventos
+
+FECHA = date(2030, 3, 4)
+
+pytestmark = pytest.mark.integration
+
+
+def _cita(profesional_id, desde: time, hasta: time) -> Cita:
+    return Cita(
+        id=uuid4(),
+        paciente_id=uuid4(),
+        profesional_id=profesional_id,
+        fecha=FECHA,
+        hora_inicio=desde,
+        hora_fin=hasta,
+        ubicacion=None,
+    )
+
+
+def _creada(cita: Cita) -> CitaCreada:
+    return CitaCreada(
+        cita_id=cita.id, profesional_id=cita.profesional_id, paciente_id=uuid4()
+    )
+
+
+@pytest.fixture
+def crear_sesion(sqlite_engine):
+    return sessionmaker(bind=sqlite_engine, expire_on_commit=False)
+
+
+@pytest.fixture
+def repo(sqlite_session):
+    return ConsultaRepository(sqlite_session)
+
+
+class TestOutboxDeConsultas:
+    def test_evento_en_la_transaccion_del_cambio(self, repo, sqlite_session):
+        profesional_id = uuid4()
+        cita = _cita(profesional_id, time(9), time(10))
+        repo.crear(cita, uuid4(), eventos=[_creada(cita)])
+
+        cita.cancelar()
+        repo.actualizar(cita, eventos=[CitaCancelada(cita_id=cita.id)])
+
+        eventos = sqlite_session.query(EventoORM).order_by(EventoORM.creado_en).all()
+        assert [e.tipo for e in eventos] == ["cita.creada", "cita.cancelada"]
+        assert all(e.despachado_en is None and e.intentos == 0 for e in eventos)
+
+    def test_sin_cambio_no_hay_evento(self, repo, sqlite_session):
+        profesional_id = uuid4()
+        repo.crear(_cita(profesional_id, time(9), time(10)), uuid4())
+        rechazada = _cita(profesional_id, time(9, 30), time(10, 30))
+
+        with pytest.raises(HorarioNoDisponible):
+            repo.crear(rechazada, uuid4(), eventos=[_creada(rechazada)])
+
+        assert sqlite_session.query(EventoORM).count() == 0
+
+
+class TestDespachadorEventos:
+    @pytest.fixture
+    def pendientes(self, repo):
+        citas = [_cita(uuid4(), time(9), time(10)) for _ in range(5)]
+        for cita in citas:
+            repo.crear(cita, uuid4(), eventos=[_creada(cita)])
+        return citas
+
+    def test_entrega_por_lotes_y_marca_despachados(
+        self, crear_sesion, pendientes, sqlite_session
+    ):
+        bus = EventBus()
+        recibidos = []
+        bus.suscribir("cita.creada", recibidos.append)
+        despachador = DespachadorEventos(crear_sesion, bus, tamano_lote=3)
+
+        assert despachador.despachar_lote() == 3
+        assert despachador.despachar_lote() == 2
+        assert despachador.despachar_lote() == 0
+
+        assert {e.cita_id for e in recibidos} == {c.id for c in pendientes}
+        assert recibidos[0].datos["profesional_id"] == str(pendientes[0].profesional_id)
+        sqlite_session.expire_all()
+        assert all(e.despachado_en for e in sqlite_session.query(EventoORM))
+
+    def test_entrega_por_la_cola_del_bus_asincrono(
+        self, crear_sesion, pendientes, sqlite_session
+    ):
+        bus = EventBusAsincrono(workers=2)
+        fallar = {pendientes[0].id}
+
+        def enviar(evento):
+            if evento.cita_id in fallar:
+                raise RuntimeError("SMTP caído")
+
+        bus.suscribir("cita.creada", enviar)
+        bus.iniciar()
+        despachador = DespachadorEventos(crear_sesion, bus, espera_base_s=60)
+
+        assert despachador.despachar_lote() == 5
+        bus.detener(timeout_s=5)
+
+        estadisticas = bus.estadisticas()
+        assert (estadisticas["publicados"], estadisticas["procesados"]) == (5, 5)
+        sqlite_session.expire_all()
+        fallido = sqlite_session.get(EventoORM, _evento_id(sqlite_session, fallar))
+        assert (fallido.intentos, fallido.despachado_en) == (1, None)
+        despachados = sqlite_session.query(EventoORM).filter(
+            EventoORM.despachado_en.isnot(None)
+        )
+        assert despachados.count() == 4
+
+    def test_vacia_lo_acumulado_antes_del_commit(
+        self, crear_sesion, pendientes, sqlite_session
+    ):
+        """Un suscriptor que envía agrupado informa lo no enviado al vaciar"""
+        acumulados = []
+        bus = EventBus()
+        bus.suscribir("cita.creada", acumulados.append)
+
+        def vaciar():
+            enviados, acumulados[:] = list(acumulados), []
+            return [
+                (evento, RuntimeError("Email rechazado"))
+                for evento in enviados
+                if evento.cita_id == pendientes[0].id
+            ]
+
+        despachador = DespachadorEventos(
+            crear_sesion, bus, espera_base_s=60, vaciar=vaciar
+        )
+
+        assert despachador.despachar_lote() == 5
+        assert acumulados == []
+        sqlite_session.expire_all()
+        fallido = sqlite_session.get(
+            EventoORM, _evento_id(sqlite_session, {pendientes[0].id})
+        )
+        assert (fallido.intentos, fallido.ultimo_error) == (1, "Email rechazado")
+        despachados = sqlite_session.query(EventoORM).filter(
+            EventoORM.despachado_en.isnot(None)
+        )
+        assert despachados.count() == 4
+
+    def test_sin_acuse_se_reintenta(self, crear_sesion, pendientes, sqlite_session):
+        bus = EventBusAsincrono(workers=1)
+        liberar = threading.Event()
+        bus.suscribir("cita.creada", lambda evento: liberar.wait(5))
+        bus.iniciar()
+        despachador = DespachadorEventos(
+            crear_sesion, bus, espera_base_s=60, timeout_entrega_s=0.05
+        )
+
+        try:
+            assert despachador.despachar_lote() == 5
+        finally:
+            liberar.set()
+            bus.detener(timeout_s=5)
+
+        sqlite_session.expire_all()
+        eventos = sqlite_session.query(EventoORM).all()
+        assert all(e.despachado_en is None and e.intentos == 1 for e in eventos)
+        assert eventos[0].ultimo_error == "Entrega sin acuse"
+
+    def test_reintenta_con_espera_y_descarta(
+        self, crear_sesion, pendientes, sqlite_session
+    ):
+        bus = EventBus()
+        fallar = {pendientes[0].id}
+
+        def enviar(evento):
+            if evento.cita_id in fallar:
+                raise RuntimeError("SMTP caído")
+
+        bus.suscribir("cita.creada", enviar)
+        despachador = DespachadorEventos(
+            crear_sesion, bus, max_intentos=2, espera_base_s=0
+        )
+
+        assert despachador.despachar_lote() == 5
+        fallido = sqlite_session.get(EventoORM, _evento_id(sqlite_session, fallar))
+        assert (fallido.intentos, fallido.despachado_en) == (1, None)
+        assert fallido.ultimo_error == "SMTP caído"
+
+        # Segundo intento fallido: llega a max_intentos y no se toma más
+        assert despachador.despachar_lote() == 1
+        assert despachador.despachar_lote() == 0
+
+    def test_espera_antes_de_reintentar(self, crear_sesion, pendientes):
+        bus = EventBus()
+        bus.suscribir("cita.creada", lambda evento: 1 / 0)
+        despachador = DespachadorEventos(crear_sesion, bus, espera_base_s=60)
+        antes = datetime.now(timezone.utc)
+
+        assert despachador.despachar_lote() == 5
+        assert despachador.despachar_lote() == 0
+
+        session = crear_sesion()
+        proximo = session.query(EventoORM).first().proximo_intento
+        session.close()
+        assert proximo.replace(tzinfo=timezone.utc) >= antes + timedelta(seconds=60)
+
+    def test_ejecutar_hasta_detener(self, crear_sesion, pendientes):
+        bus = EventBus()
+        recibidos = []
+        bus.suscribir("cita.creada", recibidos.append)
+        despachador = DespachadorEventos(crear_sesion, bus, tamano_lote=2)
+
+        async def correr():
+            detener = asyncio.Event()
+            tarea = asyncio.create_task(despachador.ejecutar(detener, intervalo_s=0.01))
+            while len(recibidos) < len(pendientes):
+                await asyncio.sleep(0.01)
+            detener.set()
+            await asyncio.wait_for(tarea, timeout=1)
+
+        asyncio.run(correr())
+
+        assert len(recibidos) == len(pendientes)
+
+
+def _evento_id(session, cita_ids):
+    return (
+        session.query(EventoORM.id).filter(EventoORM.consulta_id.in_(cita_ids)).scalar()
+    )
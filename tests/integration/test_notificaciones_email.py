@@ -0,0 +1,331 @@
+"""
+Notificaciones por email agrupadas contra un servidor SMTP local (aiosmtpd,
+dependencia de desarrollo) y destinatarios de las consultas sobre SQLite.
+"""
+
+import socket
+import smtplib
+import time as reloj
+from datetime import date, time
+from email import message_from_bytes
+from email.message import EmailMessage
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.entities.agenda import Cita
+from app.domain.eventos import CitaCancelada, CitaConfirmada
+from app.domain.observers.observadores import EventBus
+from app.infra.persistence.agenda import EventoORM
+from app.infra.persistence.paciente import PacienteORM
+from app.infra.persistence.perfiles import ProfesionalORM, SolicitanteORM
+from app.infra.persistence.usuarios import UsuarioORM
+from app.infra.repositories.consulta_repository import ConsultaRepository
+from app.services.despacho_eventos import DespachadorEventos
+from app.services.notificaciones_email import NotificadorEmailAgrupado, PoolSmtp
+
+pytestmark = pytest.mark.integration
+
+PROFESIONAL = "prof@athomered.com"
+
+
+class _Buzon:
+    """Handler de aiosmtpd: guarda los mensajes y cuenta las sesiones"""
+
+    def __init__(self):
+        self.mensajes = []
+        self.sesiones = set()
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("rechazado"):
+            return "550 Destinatario inexistente"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.sesiones.add(id(session))
+        self.mensajes.append(message_from_bytes(envelope.content))
+        return "250 OK"
+
+    def para(self, email: str) -> list:
+        return [m for m in self.mensajes if m["To"] == email]
+
+
+@pytest.fixture
+def servidor_smtp():
+    controller_mod = pytest.importorskip("aiosmtpd.controller")
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        puerto = s.getsockname()[1]
+    buzon = _Buzon()
+    controller = controller_mod.Controller(buzon, hostname="127.0.0.1", port=puerto)
+    controller.start()
+    yield buzon, puerto
+    controller.stop()
+
+
+@pytest.fixture
+def pool(servidor_smtp):
+    _, puerto = servidor_smtp
+    pool = PoolSmtp("127.0.0.1", puerto, tamano=2)
+    yield pool
+    pool.cerrar()
+
+
+def _mensaje(n: int) -> EmailMessage:
+    mensaje = EmailMessage()
+    mensaje["From"] = "notificaciones@athomered.com"
+    mensaje["To"] = f"destino{n}@athomered.com"
+    mensaje["Subject"] = f"Mensaje {n}"
+    mensaje.set_content("Prueba")
+    return mensaje
+
+
+class TestPoolSmtp:
+    def test_reutiliza_la_conexion(self, servidor_smtp, pool):
+        buzon, _ = servidor_smtp
+
+        assert pool.enviar([_mensaje(n) for n in range(10)]) == []
+        assert pool.enviar([_mensaje(n) for n in range(10, 20)]) == []
+
+        assert len(buzon.mensajes) == 20
+        assert len(buzon.sesiones) == 1
+        assert pool.sesiones == 1
+
+    def test_reconecta_si_el_servidor_cerro(self, servidor_smtp, pool):
+        buzon, _ = servidor_smtp
+        pool.enviar([_mensaje(0)])
+        pool._libres.queue[0].close()
+
+        assert pool.enviar([_mensaje(1)]) == []
+        assert len(buzon.mensajes) == 2
+        assert pool.sesiones == 2
+
+
+class TestNotificadorEmailAgrupado:
+    @pytest.fixture
+    def consultas(self):
+        """40 consultas de un profesional, cada una de un solicitante distinto"""
+        return {uuid4(): [PROFESIONAL, f"sol{n}@athomered.com"] for n in range(40)}
+
+    @pytest.fixture
+    def notificador(self, pool, consultas):
+        notificador = NotificadorEmailAgrupado(
+            pool,
+            lambda ids: {i: consultas[i] for i in ids if i in consultas},
+            remitente="notificaciones@athomered.com",
+        )
+        yield notificador
+        notificador.cerrar()
+
+    def test_un_resumen_por_destinatario(self, servidor_smtp, notificador, consultas):
+        buzon, _ = servidor_smtp
+        for cita_id in consultas:
+            notificador.update(CitaConfirmada(cita_id=cita_id))
+
+        notificador.cerrar()
+
+        resumen = buzon.para(PROFESIONAL)
+        assert len(resumen) == 1
+        assert resumen[0]["Subject"] == "ATHomeRed: 40 novedades de tus consultas"
+        assert resumen[0].get_payload().count("Consulta confirmada") == 40
+        assert len(buzon.mensajes) == 41
+        assert buzon.para("sol0@athomered.com")[0]["Subject"] == (
+            "ATHomeRed: Consulta confirmada"
+        )
+        assert len(buzon.sesiones) <= 2
+        assert notificador.resumenes == 41
+
+    def test_resumen_largo_se_parte(self, servidor_smtp, notificador, consultas):
+        buzon, _ = servidor_smtp
+        notificador.max_por_resumen = 15
+        for cita_id in consultas:
+            notificador.update(CitaConfirmada(cita_id=cita_id))
+
+        assert notificador.vaciar() == []
+        assert len(buzon.para(PROFESIONAL)) == 3
+        assert notificador.resumenes == 43
+
+    def test_acumula_hasta_vaciar(self, servidor_smtp, notificador, consultas):
+        buzon, _ = servidor_smtp
+        cita_id = next(iter(consultas))
+        notificador.update(CitaCancelada(cita_id=cita_id, motivo="Viaje"))
+        notificador.update(CitaConfirmada(cita_id=uuid4()))  # sin destinatarios
+        assert buzon.mensajes == []
+
+        assert notificador.vaciar() == []
+        assert len(buzon.mensajes) == 2
+        assert "Motivo: Viaje" in buzon.para(PROFESIONAL)[0].get_payload()
+
+    def test_cerrar_libera_los_hilos_de_envio(self, servidor_smtp, notificador):
+        buzon, _ = servidor_smtp
+        notificador.update(CitaConfirmada(cita_id=uuid4()))
+        notificador.destinatarios = lambda ids: {i: [PROFESIONAL] for i in ids}
+        notificador.vaciar()
+        envios = notificador._envios
+
+        notificador.cerrar()
+
+        assert notificador._envios is None and envios._shutdown
+        # Se puede seguir usando (un lifespan por TestClient)
+        notificador.update(CitaConfirmada(cita_id=uuid4()))
+        assert notificador.vaciar() == []
+        assert len(buzon.mensajes) == 2
+
+    def test_rechazo_se_cuenta_sin_cortar_el_lote(self, servidor_smtp, notificador):
+        buzon, _ = servidor_smtp
+        notificador.destinatarios = lambda ids: {
+            i: ["rechazado@athomered.com", PROFESIONAL] for i in ids
+        }
+        evento = CitaConfirmada(cita_id=uuid4())
+        notificador.update(evento)
+
+        (no_enviado, error), *resto = notificador.vaciar()
+
+        assert no_enviado is evento and resto == []
+        assert "rechazado@athomered.com" in str(error)
+        assert len(buzon.para(PROFESIONAL)) == 1
+        assert notificador.fallidos == 1
+
+    def test_sin_destinatarios_no_se_envia_nada(self, notificador):
+        def caida(ids):
+            raise RuntimeError("Base caída")
+
+        notificador.destinatarios = caida
+        eventos = [CitaConfirmada(cita_id=uuid4()) for _ in range(3)]
+        for evento in eventos:
+            notificador.update(evento)
+
+        no_enviados = notificador.vaciar()
+
+        assert [evt for evt, _ in no_enviados] == eventos
+        assert notificador.fallidos == 3
+
+
+def test_despachador_reintenta_lo_no_enviado(pool, sqlite_engine, sqlite_session):
+    """El outbox marca despachado solo lo que llegó a todos sus destinatarios"""
+    citas = [
+        Cita(
+            id=uuid4(),
+            paciente_id=uuid4(),
+            profesional_id=uuid4(),
+            fecha=date(2030, 3, 4),
+            hora_inicio=time(9),
+            hora_fin=time(10),
+            ubicacion=None,
+        )
+        for _ in range(3)
+    ]
+    repo = ConsultaRepository(sqlite_session)
+    for cita in citas:
+        repo.crear(cita, uuid4(), eventos=[CitaConfirmada(cita_id=cita.id)])
+    rechazada = citas[0].id
+    notificador = NotificadorEmailAgrupado(
+        pool,
+        lambda ids: {
+            i: ["rechazado@athomered.com" if i == rechazada else PROFESIONAL]
+            for i in ids
+        },
+        remitente="notificaciones@athomered.com",
+    )
+    bus = EventBus()
+    bus.suscribir_observer("cita.confirmada", notificador)
+    despachador = DespachadorEventos(
+        sessionmaker(bind=sqlite_engine, expire_on_commit=False),
+        bus,
+        vaciar=notificador.vaciar,
+    )
+
+    assert despachador.despachar_lote() == 3
+    notificador.cerrar()
+
+    sqlite_session.expire_all()
+    eventos = {e.consulta_id: e for e in sqlite_session.query(EventoORM)}
+    assert eventos[rechazada].despachado_en is None
+    assert eventos[rechazada].intentos == 1
+    assert all(eventos[c.id].despachado_en for c in citas[1:])
+
+
+@pytest.mark.slow
+def test_rendimiento_pool_contra_sesion_por_email(servidor_smtp, capsys):
+    """Benchmark: 200 emails con conexiones reutilizadas o una sesión por email"""
+    buzon, puerto = servidor_smtp
+    mensajes = [_mensaje(n) for n in range(200)]
+
+    inicio = reloj.perf_counter()
+    for mensaje in mensajes:
+        with smtplib.SMTP("127.0.0.1", puerto) as conexion:
+            conexion.send_message(mensaje)
+    sesion_por_email = reloj.perf_counter() - inicio
+
+    pool = PoolSmtp("127.0.0.1", puerto, tamano=1)
+    inicio = reloj.perf_counter()
+    pool.enviar(mensajes)
+    reutilizando = reloj.perf_counter() - inicio
+    pool.cerrar()
+
+    with capsys.disabled():
+        print(
+            f"\n  sesión por email: {len(mensajes) / sesion_por_email:8.0f} emails/s"
+            f"\n  pool:             {len(mensajes) / reutilizando:8.0f} emails/s"
+        )
+    assert len(buzon.mensajes) == 400
+    assert reutilizando < sesion_por_email
+
+
+class TestDestinatarios:
+    def test_profesional_y_solicitante_de_cada_consulta(self, sqlite_session):
+        repo = ConsultaRepository(sqlite_session)
+        profesional = ProfesionalORM(
+            usuario=UsuarioORM(
+                nombre="Ana",
+                apellido="Pérez",
+                email=PROFESIONAL,
+                es_profesional=True,
+                es_solicitante=False,
+            )
+        )
+        sqlite_session.add(profesional)
+        pacientes = []
+        for n in range(2):
+            usuario = UsuarioORM(
+                nombre="Sol", apellido=f"Apellido{n}", email=f"sol{n}@athomered.com"
+            )
+            sqlite_session.add(usuario)
+            sqlite_session.flush()
+            solicitante = SolicitanteORM(usuario_id=usuario.id)
+            sqlite_session.add(solicitante)
+            sqlite_session.flush()
+            paciente = PacienteORM(
+                nombre="Paciente",
+                apellido="X",
+                solicitante_id=solicitante.id,
+                relacion_id=1,
+            )
+            sqlite_session.add(paciente)
+            pacientes.append(paciente)
+        sqlite_session.commit()
+
+        citas = [
+            Cita(
+                id=uuid4(),
+                paciente_id=paciente.id,
+                profesional_id=profesional.id,
+                fecha=date(2030, 3, 4),
+                hora_inicio=time(9 + n),
+                hora_fin=time(10 + n),
+                ubicacion=None,
+            )
+            for n, paciente in enumerate(pacientes)
+        ]
+        for cita in citas:
+            repo.crear(cita, uuid4())
+
+        destinatarios = repo.destinatarios([c.id for c in citas] + [uuid4()])
+
+        assert destinatarios == {
+            citas[0].id: [PROFESIONAL, "sol0@athomered.com"],
+            citas[1].id: [PROFESIONAL, "sol1@athomered.com"],
+        }
+        assert repo.destinatarios([]) == {}
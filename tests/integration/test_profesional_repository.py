@@ -0,0 +1,1158 @@
+"""
+Tests de ProfesionalRepository contra el esquema ORM real en SQLite en memoria.
+Verifican que las lecturas usen el plan de carga (sin N+1) y que las
+escrituras notifiquen a los observadores (índice en memoria).
+"""
+
+import io
+import json
+import pytest
+from dataclasses import replace
+from datetime import date, time
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.api.paginacion import clave_apellido
+from app.infra.persistence.ubicacion import (
+    ProvinciaORM,
+    DepartamentoORM,
+    BarrioORM,
+    DireccionORM,
+)
+from app.infra.persistence.usuarios import UsuarioORM
+from app.infra.persistence.perfiles import ProfesionalORM
+from app.infra.persistence.servicios import EspecialidadORM
+from app.infra.persistence.agenda import (
+    ConsultaORM,
+    DisponibilidadORM,
+    EstadoConsultaORM,
+)
+from app.infra.persistence.matriculas import MatriculaORM
+from app.infra.persistence.publicaciones import PublicacionORM
+from app.infra.repositories.profesional_repository import ProfesionalRepository
+from app.infra.repositories.catalogo_repository import CatalogoRepository
+from app.infra.repositories.consulta_repository import ConsultaRepository
+from app.infra.repositories.direccion_repository import DireccionRepository
+from app.infra.repositories.valoracion_repository import ValoracionRepository
+from app.domain.entities.catalogo import FiltroBusqueda
+from app.domain.strategies.autocompletado import TrieAutocompletado
+from app.domain.strategies.buscador import Buscador
+from app.domain.strategies.cache import CacheBusquedas
+from app.domain.strategies.snapshot import CacheCatalogo
+from app.domain.strategies.estrategia import (
+    BusquedaCombinada,
+    BusquedaPorEspecialidad,
+)
+from app.domain.strategies.indice import IndiceProfesionales
+from app.domain.strategies.libres import BuscadorLibres
+from app.domain.entities.usuarios import ResumenProfesional
+from app.domain.entities.valoraciones import Valoracion
+from app.domain.enumeraciones import DiaSemana
+from app.domain.geo import distancia_a
+from app.domain.huecos import calcular_huecos
+from app.domain.ranking import puntaje_base
+from app.domain.value_objects.objetos_valor import Ubicacion
+from app.services.importacion_profesionales import (
+    FORMATO_CSV,
+    FORMATO_JSONL,
+    ImportadorProfesionales,
+    leer_filas,
+)
+
+
+def _cargar_profesionales(session, cantidad: int) -> None:
+    """Crea `cantidad` profesionales activos con todas sus relaciones"""
+    provincia = ProvinciaORM(nombre="Córdoba")
+    departamento = DepartamentoORM(nombre="Capital", provincia=provincia)
+    barrio = BarrioORM(nombre="Centro", departamento=departamento)
+    enfermeria = EspecialidadORM(
+        nombre="Enfermería", descripcion="Enfermería", tarifa=Decimal("2500")
+    )
+    geriatria = EspecialidadORM(
+        nombre="Enfermería Geriátrica", descripcion="Geriatría", tarifa=Decimal("2800")
+    )
+    session.add_all([provincia, departamento, barrio, enfermeria, geriatria])
+
+    for i in range(cantidad):
+        usuario = UsuarioORM(
+            nombre=f"Nombre{i}",
+            apellido=f"Apellido{i}",
+            email=f"prof{i}@athomered.com",
+            es_profesional=True,
+            es_solicitante=False,
+        )
+        direccion = DireccionORM(calle="Av. Colón", numero=100 + i, barrio=barrio)
+        profesional = ProfesionalORM(
+            usuario=usuario,
+            direccion=direccion,
+            activo=True,
+            verificado=True,
+            puntaje=puntaje_base(0, 0, True),
+            especialidades=[enfermeria, geriatria],
+        )
+        profesional.disponibilidades.append(
+            DisponibilidadORM(
+                dias_semana=[DiaSemana.LUNES, DiaSemana.MIERCOLES],
+                hora_inicio=time(9, 0),
+                hora_fin=time(13, 0),
+            )
+        )
+        profesional.matriculas.append(
+            MatriculaORM(
+                provincia=provincia,
+                nro_matricula=f"MP-{i}",
+                vigente_desde=date(2020, 1, 1),
+                vigente_hasta=date(2030, 1, 1),
+            )
+        )
+        session.add(profesional)
+
+    session.commit()
+    session.expunge_all()
+
+
+@pytest.mark.integration
+class TestPlanDeCargaProfesional:
+    """Las lecturas ejecutan una cantidad fija de queries"""
+
+    @pytest.mark.parametrize(
+        "buscar",
+        [
+            lambda repo: repo.listar_activos(),
+            lambda repo: repo.buscar_por_especialidad(especialidad_nombre="Enfermería"),
+            lambda repo: repo.buscar_por_ubicacion(provincia="Córdoba"),
+            lambda repo: repo.buscar_combinado(
+                especialidad_nombre="Enfermería", barrio="Centro"
+            ),
+        ],
+    )
+    @pytest.mark.parametrize("cantidad", [3, 40])
+    def test_queries_constantes(
+        self, sqlite_session, contador_queries, buscar, cantidad
+    ):
+        _cargar_profesionales(sqlite_session, cantidad)
+        repo = ProfesionalRepository(sqlite_session)
+
+        contador_queries.clear()
+        profesionales = buscar(repo)
+
+        assert len(profesionales) == cantidad
+        # principal (+ usuario y dirección por JOIN) + especialidades
+        # + disponibilidades + matrículas (con provincia por JOIN)
+        assert len(contador_queries) == 4
+
+    def test_to_domain_no_dispara_lazy_loads(self, sqlite_session, contador_queries):
+        _cargar_profesionales(sqlite_session, 5)
+        repo = ProfesionalRepository(sqlite_session)
+
+        contador_queries.clear()
+        profesionales = repo.listar_activos()
+        queries_busqueda = len(contador_queries)
+
+        prof = profesionales[0]
+        assert prof.ubicacion.provincia == "Córdoba"
+        assert prof.ubicacion.barrio == "Centro"
+        assert {e.nombre for e in prof.especialidades} == {
+            "Enfermería",
+            "Enfermería Geriátrica",
+        }
+        assert prof.matriculas[0].provincia == "Córdoba"
+        assert len(prof.disponibilidades[0].dias_semana) == 2
+        assert len(contador_queries) == queries_busqueda
+
+    def test_especialidades_multiples_no_duplican_resultados(self, sqlite_session):
+        """Un profesional con dos especialidades que coinciden aparece una vez"""
+        _cargar_profesionales(sqlite_session, 2)
+        repo = ProfesionalRepository(sqlite_session)
+
+        resultado = repo.buscar_combinado(
+            especialidad_nombre="Enfermería", provincia="Córdoba"
+        )
+
+        assert len(resultado) == 2
+
+    def test_obtener_por_id(self, sqlite_session, contador_queries):
+        _cargar_profesionales(sqlite_session, 1)
+        repo = ProfesionalRepository(sqlite_session)
+        prof_id = repo.listar_todos()[0].id
+
+        contador_queries.clear()
+        prof = repo.obtener_por_id(prof_id)
+
+        assert prof.id == prof_id
+        assert len(contador_queries) == 4
+
+
+@pytest.mark.integration
+class TestIndiceSincronizadoConRepositorio:
+    """Las escrituras del repositorio mantienen el índice en memoria"""
+
+    def test_desactivar_y_verificar_actualizan_indice(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 3)
+        repo = ProfesionalRepository(sqlite_session)
+        indice = IndiceProfesionales()
+        indice.construir(repo.listar_activos())
+        repo.attach(indice)
+
+        prof_id = indice.buscar(barrio="centro")[0].id
+        repo.verificar(prof_id)
+        repo.desactivar(prof_id)
+
+        assert len(indice) == 2
+        assert prof_id not in {p.id for p in indice.buscar(provincia="cordoba")}
+
+    def test_actualizar_reindexa_ubicacion(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 2)
+        repo = ProfesionalRepository(sqlite_session)
+        indice = IndiceProfesionales()
+        indice.construir(repo.listar_activos())
+        repo.attach(indice)
+
+        profesional = repo.listar_activos()[0]
+        profesional.ubicacion = Ubicacion(
+            provincia="Mendoza",
+            departamento="Capital",
+            barrio="Centro",
+            calle="San Martín",
+            numero="500",
+        )
+        repo.actualizar(profesional)
+
+        assert [p.id for p in indice.buscar(provincia="Mendoza")] == [profesional.id]
+        assert len(indice.buscar(provincia="Córdoba")) == 1
+
+
+@pytest.mark.integration
+class TestBuscarCercanos:
+    """Prefiltro por caja envolvente en SQL y distancia exacta en Python"""
+
+    def _geolocalizar(self, session):
+        """Aleja cada dirección ~1 km más que la anterior hacia el norte"""
+        direcciones = session.query(DireccionORM).order_by(DireccionORM.numero).all()
+        for i, direccion in enumerate(direcciones):
+            direccion.latitud = -31.4201 + i * 0.009
+            direccion.longitud = -64.1888
+        session.commit()
+        session.expunge_all()
+
+    def test_ordena_y_corta_por_radio(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 6)
+        self._geolocalizar(sqlite_session)
+        repo = ProfesionalRepository(sqlite_session)
+
+        resultado = repo.buscar_cercanos(-31.4201, -64.1888, radio_km=3.5)
+
+        assert [p.ubicacion.calle for p in resultado] == ["Av. Colón"] * 4
+        assert [p.ubicacion.numero for p in resultado] == ["100", "101", "102", "103"]
+
+    def test_limite_y_especialidad(self, sqlite_session, contador_queries):
+        _cargar_profesionales(sqlite_session, 6)
+        self._geolocalizar(sqlite_session)
+        repo = ProfesionalRepository(sqlite_session)
+
+        contador_queries.clear()
+        resultado = repo.buscar_cercanos(
+            -31.4201 + 0.045,
+            -64.1888,
+            radio_km=50,
+            limite=2,
+            especialidad_nombre="Geriátrica",
+        )
+
+        assert [p.ubicacion.numero for p in resultado] == ["105", "104"]
+        # candidatos (id, lat, lon) + plan de carga de los elegidos
+        assert len(contador_queries) == 5
+
+    def test_filtra_por_ubicacion(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 3)
+        self._geolocalizar(sqlite_session)
+        repo = ProfesionalRepository(sqlite_session)
+        punto = (-31.4201, -64.1888)
+
+        assert len(repo.buscar_cercanos(*punto, radio_km=10, barrio="centro")) == 3
+        assert repo.buscar_cercanos(*punto, radio_km=10, provincia="Mendoza") == []
+
+    def test_sin_coordenadas_no_aparece(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 2)
+        repo = ProfesionalRepository(sqlite_session)
+
+        assert repo.buscar_cercanos(-31.4201, -64.1888, radio_km=100) == []
+
+
+@pytest.mark.integration
+class TestPaginacionPorClave:
+    """LIMIT y predicado (apellido, id) > cursor resueltos en SQL"""
+
+    def _recorrer(self, pagina_siguiente, limite):
+        """Pide páginas hasta agotar y devuelve todas concatenadas"""
+        vistos, despues_de = [], None
+        while True:
+            pagina = pagina_siguiente(limite, despues_de)
+            vistos.extend(pagina)
+            if len(pagina) < limite:
+                return vistos
+            despues_de = (pagina[-1].apellido, pagina[-1].id)
+
+    def test_listar_pagina_recorre_todo_en_orden(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 11)
+        repo = ProfesionalRepository(sqlite_session)
+
+        vistos = self._recorrer(
+            lambda limite, despues_de: repo.listar_pagina(limite, despues_de), 4
+        )
+
+        assert [(p.apellido, p.id) for p in vistos] == sorted(
+            (p.apellido, p.id) for p in repo.listar_activos()
+        )
+        assert repo.contar() == 11
+
+    def test_pagina_con_limit_en_sql(self, sqlite_session, contador_queries):
+        _cargar_profesionales(sqlite_session, 10)
+        repo = ProfesionalRepository(sqlite_session)
+        primera = repo.listar_pagina(3)
+
+        contador_queries.clear()
+        segunda = repo.listar_pagina(3, (primera[-1].apellido, primera[-1].id))
+
+        assert len(segunda) == 3
+        assert segunda[0].apellido > primera[-1].apellido
+        principal = contador_queries[0].upper()
+        assert "LIMIT" in principal and "ORDER BY" in principal
+        assert len(contador_queries) == 4
+
+    def test_busqueda_combinada_paginada_y_conteo(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 7)
+        repo = ProfesionalRepository(sqlite_session)
+
+        vistos = self._recorrer(
+            lambda limite, despues_de: repo.buscar_combinado(
+                especialidad_nombre="Geriátrica",
+                provincia="Córdoba",
+                limite=limite,
+                despues_de=despues_de,
+            ),
+            3,
+        )
+
+        assert len({p.id for p in vistos}) == 7
+        assert (
+            repo.contar_combinado(especialidad_nombre="Geriátrica", provincia="Córdoba")
+            == 7
+        )
+        assert repo.contar_combinado(especialidad_id=999) == 0
+
+    def test_cercanos_continua_desde_cursor(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 5)
+        for i, direccion in enumerate(
+            sqlite_session.query(DireccionORM).order_by(DireccionORM.numero)
+        ):
+            direccion.latitud = -31.4201 + i * 0.009
+            direccion.longitud = -64.1888
+        sqlite_session.commit()
+        repo = ProfesionalRepository(sqlite_session)
+        punto = (-31.4201, -64.1888)
+
+        primera = repo.buscar_cercanos(*punto, radio_km=10, limite=2)
+        cursor = (distancia_a(primera[-1], *punto), primera[-1].id)
+        segunda = repo.buscar_cercanos(*punto, radio_km=10, limite=2, despues_de=cursor)
+
+        assert [p.ubicacion.numero for p in primera + segunda] == [
+            "100",
+            "101",
+            "102",
+            "103",
+        ]
+
+
+@pytest.mark.integration
+class TestBusquedaSinAcentos:
+    """Filtros sobre las columnas nombre_normalizado"""
+
+    def test_columna_normalizada_se_mantiene_al_escribir(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 1)
+        provincia = sqlite_session.query(ProvinciaORM).one()
+
+        assert provincia.nombre_normalizado == "cordoba"
+        provincia.nombre = "SANTA FÉ"
+        sqlite_session.commit()
+
+        assert (
+            sqlite_session.query(ProvinciaORM.nombre_normalizado).scalar() == "santa fe"
+        )
+
+    @pytest.mark.parametrize(
+        "criterios",
+        [
+            {"provincia": "Cordoba"},
+            {"provincia": "CÓRDOBA", "departamento": "capital"},
+            {"especialidad_nombre": "enfermeria geriatrica"},
+            {"especialidad_nombre": "GERIÁTRICA", "barrio": "centro"},
+        ],
+    )
+    def test_busqueda_ignora_acentos_y_mayusculas(self, sqlite_session, criterios):
+        _cargar_profesionales(sqlite_session, 2)
+        repo = ProfesionalRepository(sqlite_session)
+
+        assert len(repo.buscar_combinado(**criterios)) == 2
+
+    def test_comodines_del_usuario_se_escapan(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 2)
+        repo = ProfesionalRepository(sqlite_session)
+
+        assert repo.buscar_por_ubicacion(provincia="%") == []
+        assert repo.buscar_por_especialidad(especialidad_nombre="_") == []
+
+    def test_catalogo_resuelve_especialidad_sin_acentos(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 1)
+
+        especialidad = CatalogoRepository(
+            sqlite_session
+        ).obtener_especialidad_por_nombre("ENFERMERIA")
+
+        assert especialidad.nombre == "Enfermería"
+
+
+@pytest.mark.integration
+class TestFiltroDisponibilidad:
+    """Filtro por día (AND sobre dias_mascara) y franja horaria en SQL"""
+
+    def test_columna_guarda_mascara(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 1)
+
+        mascara = sqlite_session.query(DisponibilidadORM.dias_mascara).scalar()
+
+        assert mascara == 0b101
+
+    @pytest.mark.parametrize(
+        "criterios, esperados",
+        [
+            ({"dia_semana": DiaSemana.LUNES}, 2),
+            ({"dia_semana": DiaSemana.MARTES}, 0),
+            ({"dia_semana": DiaSemana.MIERCOLES, "hora_desde": time(10, 0)}, 2),
+            (
+                {
+                    "dia_semana": DiaSemana.LUNES,
+                    "hora_desde": time(9, 0),
+                    "hora_hasta": time(14, 0),
+                },
+                0,
+            ),
+        ],
+    )
+    def test_buscar_y_contar(self, sqlite_session, criterios, esperados):
+        _cargar_profesionales(sqlite_session, 2)
+        repo = ProfesionalRepository(sqlite_session)
+
+        resultado = repo.buscar_combinado(provincia="Córdoba", **criterios)
+
+        assert len(resultado) == esperados
+        assert repo.contar_combinado(provincia="Córdoba", **criterios) == esperados
+
+    def test_especialidad_y_disponibilidad(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 2)
+        repo = ProfesionalRepository(sqlite_session)
+
+        resultado = repo.buscar_por_especialidad(
+            especialidad_nombre="Geriátrica", dia_semana=DiaSemana.MIERCOLES
+        )
+
+        assert len(resultado) == 2
+        assert resultado[0].disponibilidades[0].dias_semana == [
+            DiaSemana.LUNES,
+            DiaSemana.MIERCOLES,
+        ]
+
+
+@pytest.mark.integration
+class TestBusquedaPorTexto:
+    """Texto libre sobre perfiles y publicaciones (BM25 de respaldo en SQLite)"""
+
+    def _publicar(self, session):
+        profesionales = session.query(ProfesionalORM).order_by(ProfesionalORM.id).all()
+        especialidad = session.query(EspecialidadORM).first()
+        textos = [
+            ("Curación de heridas", "Atención domiciliaria de heridas crónicas"),
+            ("Cuidado nocturno", "Acompañamiento de adultos mayores"),
+            ("Control de signos vitales", "Curación de heridas leves"),
+        ]
+        for profesional, (titulo, descripcion) in zip(profesionales, textos):
+            session.add(
+                PublicacionORM(
+                    profesional_id=profesional.id,
+                    especialidad_id=especialidad.id_especialidad,
+                    titulo=titulo,
+                    descripcion=descripcion,
+                    fecha_publicacion=date(2025, 11, 1),
+                )
+            )
+        session.commit()
+        return [p.id for p in profesionales]
+
+    def test_rankea_publicaciones_y_perfiles(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 4)
+        ids = self._publicar(sqlite_session)
+        repo = ProfesionalRepository(sqlite_session)
+
+        heridas = repo.buscar_por_texto("HERIDAS")
+        por_nombre = repo.buscar_por_texto("apellido3")
+
+        assert [p.id for p, _ in heridas] == [ids[0], ids[2]]
+        assert heridas[0][1] > heridas[1][1]
+        assert [p.apellido for p, _ in por_nombre] == ["Apellido3"]
+        assert repo.contar_por_texto("heridas", provincia="Córdoba") == 2
+
+    def test_pagina_por_relevancia_y_filtra(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 4)
+        ids = self._publicar(sqlite_session)
+        repo = ProfesionalRepository(sqlite_session)
+
+        primera = repo.buscar_por_texto("curacion heridas", limite=1)
+        ((profesional, relevancia),) = primera
+        segunda = repo.buscar_por_texto(
+            "curacion heridas", limite=1, despues_de=(relevancia, profesional.id)
+        )
+
+        assert [p.id for p, _ in primera + segunda] == [ids[0], ids[2]]
+        assert repo.buscar_por_texto("heridas", dia_semana=DiaSemana.MARTES) == []
+        assert repo.buscar_por_texto("de la") == []
+
+    def test_relevancia_en_doble_precision_en_postgres(self, sqlite_session):
+        """ts_rank es real: el cursor (float8) se compara contra el mismo tipo"""
+        query, _ = ProfesionalRepository(sqlite_session)._query_texto("heridas")
+
+        sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+        assert sql.count("CAST(ts_rank(") == 2
+        assert sql.count("AS FLOAT(53)) AS relevancia") == 2
+
+
+@pytest.mark.integration
+class TestPuntajeProfesional:
+    """Resumen de valoraciones por profesional y ranking por puntaje"""
+
+    def _valorar(self, repo, profesional_id, *puntuaciones):
+        return [
+            repo.crear(
+                Valoracion(
+                    id=uuid4(),
+                    id_profesional=profesional_id,
+                    id_paciente=uuid4(),
+                    puntuacion=puntuacion,
+                )
+            )
+            for puntuacion in puntuaciones
+        ]
+
+    def test_valoraciones_mantienen_resumen(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 1)
+        profesionales = ProfesionalRepository(sqlite_session)
+        valoraciones = ValoracionRepository(sqlite_session, profesionales)
+        prof_id = profesionales.listar_activos()[0].id
+
+        primera, _ = self._valorar(valoraciones, prof_id, 5, 3)
+        valoraciones.actualizar(replace(primera, puntuacion=4))
+        self._valorar(valoraciones, prof_id, 2)
+        valoraciones.eliminar(primera.id)
+
+        profesional = profesionales.obtener_por_id(prof_id)
+        assert profesional.cantidad_valoraciones == 2
+        assert profesional.promedio_valoraciones == 2.5
+        assert profesional.puntaje == pytest.approx(puntaje_base(2, 5, True))
+
+    def test_top_k_en_una_query(self, sqlite_session, contador_queries):
+        _cargar_profesionales(sqlite_session, 4)
+        profesionales = ProfesionalRepository(sqlite_session)
+        valoraciones = ValoracionRepository(sqlite_session, profesionales)
+        ids = [p.id for p in profesionales.listar_activos()]
+        self._valorar(valoraciones, ids[2], 5, 5, 5)
+        self._valorar(valoraciones, ids[0], 1)
+        self._valorar(valoraciones, ids[3], 5)
+
+        contador_queries.clear()
+        primera = profesionales.buscar_por_ubicacion(
+            provincia="Córdoba", limite=2, por_puntaje=True
+        )
+        queries = len(contador_queries)
+        ultimo = primera[-1]
+        resto = profesionales.buscar_por_ubicacion(
+            provincia="Córdoba",
+            despues_de=(ultimo.puntaje, ultimo.id),
+            por_puntaje=True,
+        )
+
+        assert [p.id for p in primera + resto] == [ids[2], ids[3], ids[1], ids[0]]
+        # Query principal + una por colección del plan de carga
+        assert queries == 4
+
+    def test_valoracion_actualiza_indice(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 2)
+        profesionales = ProfesionalRepository(sqlite_session)
+        indice = IndiceProfesionales()
+        indice.construir(profesionales.listar_activos())
+        profesionales.attach(indice)
+        valoraciones = ValoracionRepository(sqlite_session, profesionales)
+        ultimo = indice.buscar(por_puntaje=True)[-1]
+
+        self._valorar(valoraciones, ultimo.id, 5, 5)
+
+        assert indice.buscar(por_puntaje=True)[0].id == ultimo.id
+
+
+@pytest.mark.integration
+class TestVistaResumen:
+    """Proyección de columnas para listados, sin hidratar perfiles"""
+
+    def test_resumen_coincide_con_perfil_completo(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 3)
+        repo = ProfesionalRepository(sqlite_session)
+
+        resumenes = repo.buscar_resumen(especialidad_nombre="geriatrica", limite=2)
+        completos = repo.buscar_combinado(especialidad_nombre="geriatrica", limite=2)
+
+        assert resumenes == [ResumenProfesional.desde_profesional(p) for p in completos]
+
+    def test_dos_queries_sin_importar_cantidad(self, sqlite_session, contador_queries):
+        _cargar_profesionales(sqlite_session, 25)
+        repo = ProfesionalRepository(sqlite_session)
+
+        contador_queries.clear()
+        resumenes = repo.listar_resumen()
+        ultimo = max(resumenes, key=lambda r: (r.apellido, r.id))
+
+        assert len(resumenes) == 25
+        assert len(contador_queries) == 2
+        assert sqlite_session.identity_map.keys() == set()
+        assert repo.buscar_resumen(provincia="Córdoba", barrio="Centro") != []
+        assert (
+            repo.listar_resumen(limite=5, despues_de=(ultimo.apellido, ultimo.id)) == []
+        )
+
+
+@pytest.mark.integration
+class TestFacetas:
+    """Conteos por faceta en una consulta agregada, iguales a los del índice"""
+
+    def _mudar_a_mendoza(self, repo):
+        profesional = repo.listar_activos()[0]
+        profesional.ubicacion = Ubicacion(
+            provincia="Mendoza",
+            departamento="Capital",
+            barrio="Centro",
+            calle="San Martín",
+            numero="500",
+        )
+        repo.actualizar(profesional)
+
+    def test_una_consulta(self, sqlite_session, contador_queries):
+        _cargar_profesionales(sqlite_session, 4)
+        repo = ProfesionalRepository(sqlite_session)
+        self._mudar_a_mendoza(repo)
+
+        contador_queries.clear()
+        conteos = repo.contar_facetas(dia_semana=DiaSemana.LUNES)
+
+        assert len(contador_queries) == 1
+        assert {(c.faceta, c.nombre, c.provincia, c.cantidad) for c in conteos} == {
+            ("especialidad", "Enfermería", None, 4),
+            ("especialidad", "Enfermería Geriátrica", None, 4),
+            ("provincia", "Córdoba", None, 3),
+            ("provincia", "Mendoza", None, 1),
+            ("departamento", "Capital", "Córdoba", 3),
+            ("departamento", "Capital", "Mendoza", 1),
+        }
+        assert repo.contar_facetas(dia_semana=DiaSemana.MARTES) == []
+
+    @pytest.mark.parametrize(
+        "criterios",
+        [{}, {"provincia": "mendoza"}, {"especialidad_nombre": "geriatrica"}],
+    )
+    def test_coincide_con_indice(self, sqlite_session, criterios):
+        _cargar_profesionales(sqlite_session, 3)
+        repo = ProfesionalRepository(sqlite_session)
+        self._mudar_a_mendoza(repo)
+        indice = IndiceProfesionales()
+        indice.construir(repo.listar_activos())
+
+        assert sorted(repo.contar_facetas(**criterios), key=repr) == sorted(
+            indice.facetas(**criterios), key=repr
+        )
+
+
+@pytest.mark.integration
+class TestBuscarLote:
+    """Varios filtros en una consulta y cada perfil hidratado una vez"""
+
+    def test_dos_queries_para_todo_el_lote(self, sqlite_session, contador_queries):
+        _cargar_profesionales(sqlite_session, 5)
+        repo = ProfesionalRepository(sqlite_session)
+        filtros = [
+            {"especialidad_nombre": "Enfermería", "limite": 2},
+            {"provincia": "Córdoba", "barrio": "Centro"},
+            {"especialidad_nombre": "Geriátrica", "dia_semana": DiaSemana.MARTES},
+            {"provincia": "Córdoba", "limite": 3, "por_puntaje": True},
+        ]
+
+        contador_queries.clear()
+        resultados = repo.buscar_lote(filtros)
+        # UNION ALL de ids + perfil principal y una por colección del plan
+        assert len(contador_queries) == 5
+
+        assert [[p.apellido for p in r] for r in resultados[:3]] == [
+            ["Apellido0", "Apellido1"],
+            ["Apellido0", "Apellido1", "Apellido2", "Apellido3", "Apellido4"],
+            [],
+        ]
+        assert len(resultados[3]) == 3
+        assert resultados[0][0] is resultados[1][0]
+
+    def test_coincide_con_buscar_combinado(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 4)
+        repo = ProfesionalRepository(sqlite_session)
+        criterios = {"especialidad_nombre": "enfermeria", "limite": 3}
+
+        (lote,) = repo.buscar_lote([criterios])
+
+        assert [p.id for p in lote] == [
+            p.id for p in repo.buscar_combinado(**criterios)
+        ]
+
+
+@pytest.mark.integration
+class TestCacheInvalidadaPorRepositorio:
+    """Las escrituras del repositorio invalidan la cache de búsquedas"""
+
+    def test_desactivar_invalida_busqueda_cacheada(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 3)
+        repo = ProfesionalRepository(sqlite_session)
+        cache = CacheBusquedas()
+        repo.attach(cache)
+        filtro = FiltroBusqueda(nombre_especialidad="Enfermería", provincia="Córdoba")
+
+        antes = Buscador(repo, BusquedaCombinada(), cache=cache).buscar(filtro)
+        repo.desactivar(antes[0].id)
+        despues = Buscador(repo, BusquedaCombinada(), cache=cache).buscar(filtro)
+
+        assert len(antes) == 3
+        assert len(despues) == 2
+        assert cache.estadisticas()["invalidaciones"] == 1
+
+
+@pytest.mark.integration
+class TestAutocompletadoSincronizado:
+    """El trie se arma desde los repositorios y sigue a las altas de nodos"""
+
+    def test_construir_y_agregar_nodos_creados(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 1)
+        direcciones = DireccionRepository(sqlite_session)
+        catalogo = CatalogoRepository(sqlite_session)
+        trie = TrieAutocompletado()
+        trie.construir(direcciones.listar_sugerencias() + catalogo.listar_sugerencias())
+        direcciones.attach(trie)
+        catalogo.attach(trie)
+
+        assert [s.nombre for s in trie.sugerir("enf")] == [
+            "Enfermería",
+            "Enfermería Geriátrica",
+        ]
+        (centro,) = trie.sugerir("centro")
+        assert (centro.provincia, centro.departamento) == ("Córdoba", "Capital")
+
+        direcciones.crear_con_jerarquia(
+            Ubicacion(
+                provincia="Córdoba",
+                departamento="Capital",
+                barrio="Güemes",
+                calle="Belgrano",
+                numero="800",
+            )
+        )
+        catalogo.crear_especialidad("Kinesiología", "Kinesiología", Decimal("3000"))
+
+        assert len(trie) == 7
+        (guemes,) = trie.sugerir("GUEM")
+        assert guemes.departamento == "Capital"
+        assert [s.nombre for s in trie.sugerir("kine")] == ["Kinesiología"]
+
+
+@pytest.mark.integration
+class TestSnapshotCatalogoInvalidado:
+    """Las altas de nodos de la jerarquía descartan el snapshot de referencia"""
+
+    def test_nuevo_barrio_cambia_etag(self, sqlite_session, contador_queries):
+        _cargar_profesionales(sqlite_session, 1)
+        direcciones = DireccionRepository(sqlite_session)
+        catalogo = CatalogoRepository(sqlite_session)
+        cache = CacheCatalogo()
+        direcciones.attach(cache)
+
+        def cargar():
+            especialidades = [
+                (e.id, e.nombre) for e in catalogo.listar_especialidades()
+            ]
+            return (especialidades, *direcciones.listar_jerarquia())
+
+        contador_queries.clear()
+        antes = cache.obtener(cargar)
+        assert len(contador_queries) == 4
+        (departamento,) = antes.departamentos_de(antes.provincias[0].id)
+
+        direcciones.crear_con_jerarquia(
+            Ubicacion(
+                provincia="Córdoba",
+                departamento="Capital",
+                barrio="Alberdi",
+                calle="Colón",
+                numero="1500",
+            )
+        )
+        despues = cache.obtener(cargar)
+
+        assert despues.etag != antes.etag
+        assert [b.nombre for b in despues.barrios_de(departamento.id)] == [
+            "Alberdi",
+            "Centro",
+        ]
+
+
+@pytest.mark.integration
+class TestResolucionDeJerarquia:
+    """Nodos memorizados por sesión y resolución de muchas direcciones a la vez"""
+
+    @staticmethod
+    def _ubicacion(barrio="Centro", numero="100", provincia="Córdoba"):
+        return Ubicacion(
+            provincia=provincia,
+            departamento="Capital",
+            barrio=barrio,
+            calle="Av. Colón",
+            numero=numero,
+        )
+
+    def test_ubicacion_repetida_no_consulta(self, sqlite_session, contador_queries):
+        _cargar_profesionales(sqlite_session, 1)
+        repo = DireccionRepository(sqlite_session)
+
+        primera = repo.crear_con_jerarquia(self._ubicacion(provincia="cordoba"))
+        contador_queries.clear()
+        segunda = repo.crear_con_jerarquia(self._ubicacion())
+        otro_repo = DireccionRepository(sqlite_session)
+        tercera = otro_repo.crear_con_jerarquia(self._ubicacion())
+
+        assert contador_queries == []
+        assert primera is segunda is tercera
+        assert primera.barrio.departamento.provincia.nombre == "Córdoba"
+
+    def test_rollback_descarta_lo_memorizado(self, sqlite_session):
+        repo = DireccionRepository(sqlite_session)
+        antes = repo.crear_con_jerarquia(self._ubicacion(barrio="Alberdi"))
+        sqlite_session.rollback()
+
+        despues = repo.crear_con_jerarquia(self._ubicacion(barrio="Alberdi"))
+        sqlite_session.commit()
+
+        assert despues.id != antes.id
+        assert sqlite_session.query(BarrioORM).count() == 1
+
+    def test_resolver_muchas_con_queries_fijas(self, sqlite_session, contador_queries):
+        _cargar_profesionales(sqlite_session, 1)
+        repo = DireccionRepository(sqlite_session)
+        trie = TrieAutocompletado()
+        trie.construir([])
+        repo.attach(trie)
+        ubicaciones = [
+            self._ubicacion(numero="100"),  # ya existe
+            self._ubicacion(barrio="güemes", numero="1"),
+            self._ubicacion(barrio="Güemes", numero="1"),  # repetida
+            *(self._ubicacion(barrio=f"Barrio {i}", numero="5") for i in range(20)),
+            Ubicacion(
+                provincia="Mendoza",
+                departamento="Capital",
+                barrio="Centro",
+                calle="San Martín",
+                numero="10",
+            ),
+        ]
+
+        contador_queries.clear()
+        direcciones = repo.resolver_muchas(ubicaciones)
+
+        # Por nivel SELECT + INSERT, direcciones SELECT + INSERT y la carga
+        assert len(contador_queries) == 9
+        assert len(direcciones) == len(ubicaciones)
+        assert direcciones[1] is direcciones[2]
+        assert direcciones[0].numero == 100
+        assert [d.barrio.nombre for d in direcciones[1:4]] == [
+            "Güemes",
+            "Güemes",
+            "Barrio 0",
+        ]
+        assert direcciones[-1].barrio.departamento.provincia.nombre == "Mendoza"
+        assert sqlite_session.query(BarrioORM).count() == 23
+        assert sqlite_session.query(DireccionORM).count() == 23
+        # Mendoza, su departamento Capital y 22 barrios nuevos
+        assert len(trie) == 24
+
+        contador_queries.clear()
+        repo.resolver_muchas(ubicaciones)
+        assert len(contador_queries) == 1
+
+
+def _fila_importacion(i: int, **cambios) -> dict:
+    fila = {
+        "nombre": f"Importado{i}",
+        "apellido": f"Apellido{i}",
+        "email": f"importado{i}@athomered.com",
+        "celular": "3510000000",
+        "ubicacion": {
+            "provincia": "Córdoba",
+            "departamento": "Capital",
+            "barrio": f"Barrio {i % 3}",
+            "calle": "Av. Colón",
+            "numero": str(i),
+        },
+        "especialidades": [1],
+        "disponibilidades": [
+            {"dias_semana": [1, 3], "hora_inicio": "09:00", "hora_fin": "13:00"}
+        ],
+        "matriculas": [
+            {
+                "numero": f"MP-I{i}",
+                "provincia": "cordoba",
+                "vigente_desde": "2020-01-01",
+            }
+        ],
+    }
+    fila.update(cambios)
+    return fila
+
+
+@pytest.mark.integration
+class TestImportacionMasiva:
+    """Importación por lotes con errores por fila y reanudación"""
+
+    @staticmethod
+    def _importar(session, filas, **opciones):
+        texto = io.StringIO("".join(json.dumps(f) + "\n" for f in filas))
+        importador = ImportadorProfesionales(
+            ProfesionalRepository(session),
+            CatalogoRepository(session),
+            tamano_lote=opciones.pop("tamano_lote", 500),
+        )
+        return importador.importar(leer_filas(texto, FORMATO_JSONL), **opciones)
+
+    @staticmethod
+    def _por_email(session, email):
+        repo = ProfesionalRepository(session)
+        return next(p for p in repo.listar_todos() if p.email == email)
+
+    def test_importa_validas_e_informa_errores_por_fila(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 1)
+        filas = [
+            _fila_importacion(0),
+            _fila_importacion(1, email="no-es-un-email"),
+            _fila_importacion(2, especialidades=[99]),
+            _fila_importacion(3, email="importado0@athomered.com"),
+            _fila_importacion(
+                4,
+                matriculas=[
+                    {
+                        "numero": "X",
+                        "provincia": "Atlántida",
+                        "vigente_desde": "2020-01-01",
+                    }
+                ],
+            ),
+            _fila_importacion(5),
+        ]
+
+        resultado = self._importar(sqlite_session, filas)
+
+        assert (resultado.leidas, resultado.importadas, resultado.omitidas) == (6, 2, 0)
+        assert [e.fila for e in resultado.errores] == [2, 3, 4, 5]
+        assert "email" in resultado.errores[0].mensaje
+        assert "99" in resultado.errores[1].mensaje
+        assert "repetido" in resultado.errores[2].mensaje
+        assert "Atlántida" in resultado.errores[3].mensaje
+
+        profesional = self._por_email(sqlite_session, "importado5@athomered.com")
+        assert profesional.ubicacion.barrio == "Barrio 2"
+        assert [e.nombre for e in profesional.especialidades] == ["Enfermería"]
+        assert profesional.disponibilidades[0].dias_semana == [
+            DiaSemana.LUNES,
+            DiaSemana.MIERCOLES,
+        ]
+        assert profesional.matriculas[0].provincia == "Córdoba"
+
+    def test_queries_fijas_por_lote(self, sqlite_session, contador_queries):
+        _cargar_profesionales(sqlite_session, 1)
+        self._importar(sqlite_session, [_fila_importacion(0)])
+
+        contador_queries.clear()
+        self._importar(sqlite_session, [_fila_importacion(i) for i in range(1, 3)])
+        pocas = len(contador_queries)
+        contador_queries.clear()
+        resultado = self._importar(
+            sqlite_session, [_fila_importacion(i) for i in range(3, 63)]
+        )
+
+        assert resultado.importadas == 60
+        assert len(contador_queries) <= pocas + 1
+        assert sqlite_session.query(ProfesionalORM).count() == 64
+
+    def test_repetir_y_retomar_no_duplica(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 1)
+        filas = [_fila_importacion(i) for i in range(10)]
+        confirmadas = []
+
+        primera = self._importar(
+            sqlite_session, filas[:7], tamano_lote=3, al_confirmar=confirmadas.append
+        )
+        assert confirmadas == [3, 6, 7]
+        assert primera.ultima_fila == 7
+
+        retomada = self._importar(sqlite_session, filas, desde_fila=6, tamano_lote=3)
+        assert (retomada.leidas, retomada.importadas, retomada.omitidas) == (5, 3, 2)
+        assert sqlite_session.query(UsuarioORM).count() == 11
+
+    def test_csv(self, sqlite_session):
+        _cargar_profesionales(sqlite_session, 1)
+        texto = io.StringIO(
+            "nombre,apellido,email,celular,provincia,departamento,barrio,calle,"
+            "numero,latitud,longitud,especialidades,disponibilidades,matriculas\n"
+            "Ana,Paz,ana@athomered.com,351,Córdoba,Capital,Centro,Av. Colón,9,,,"
+            '1|2,"1,3;09:00;13:00|5;14:00;18:00",MP-1;Córdoba;2020-01-01\n'
+            "Luis,Sol,luis@athomered.com,351,Córdoba,Capital,Centro,Av. Colón,9,,,"
+            "1,1;09:00,MP-2;Córdoba;2020-01-01\n"
+        )
+        importador = ImportadorProfesionales(
+            ProfesionalRepository(sqlite_session), CatalogoRepository(sqlite_session)
+        )
+
+        resultado = importador.importar(leer_filas(texto, FORMATO_CSV))
+
+        assert resultado.importadas == 1
+        assert [e.fila for e in resultado.errores] == [2]
+        ana = self._por_email(sqlite_session, "ana@athomered.com")
+        assert len(ana.especialidades) == 2
+        assert len(ana.disponibilidades) == 2
+        assert ana.ubicacion.numero == "9"
+
+
+@pytest.mark.integration
+class TestHuecosDeAgenda:
+    """Un mes de huecos sale de dos queries"""
+
+    def test_dos_queries_por_rango(self, sqlite_session, contador_queries):
+        _cargar_profesionales(sqlite_session, 1)
+        profesional = sqlite_session.query(ProfesionalORM).one()
+        pendiente = EstadoConsultaORM(codigo="pendiente", descripcion="PENDIENTE")
+        cancelada = EstadoConsultaORM(codigo="cancelada", descripcion="CANCELADA")
+        lunes = date(2030, 3, 4)
+        for hora, estado in ((9, pendiente), (11, cancelada)):
+            sqlite_session.add(
+                ConsultaORM(
+                    paciente_id=uuid4(),
+                    profesional_id=profesional.id,
+                    direccion_servicio_id=profesional.direccion_id,
+                    fecha=lunes,
+                    hora_inicio=time(hora),
+                    hora_fin=time(hora + 1),
+                    estado=estado,
+                    cancelada=estado is cancelada,
+                )
+            )
+        sqlite_session.commit()
+
+        contador_queries.clear()
+        disponibilidades = ProfesionalRepository(
+            sqlite_session
+        ).obtener_disponibilidades(profesional.id)
+        ocupadas = ConsultaRepository(sqlite_session).listar_ocupadas(
+            profesional.id, date(2030, 3, 1), date(2030, 3, 31)
+        )
+        huecos = calcular_huecos(
+            disponibilidades, ocupadas, date(2030, 3, 1), date(2030, 3, 31), 60
+        )
+
+        assert len(contador_queries) == 2
+        assert ocupadas == [(lunes, time(9), time(10))]
+        # Lunes y miércoles de 9 a 13; el primer lunes empieza a las 10
+        assert len(huecos) == 8
+        assert (huecos[0].fecha, huecos[0].hora_inicio) == (lunes, time(10))
+
+    def test_profesional_inexistente(self, sqlite_session):
+        repo = ProfesionalRepository(sqlite_session)
+
+        assert repo.obtener_disponibilidades(uuid4()) is None
+
+
+@pytest.mark.integration
+class TestLibresEnFecha:
+    """Libres en una fecha: dos queries por lote de candidatos"""
+
+    LUNES = date(2030, 3, 4)
+
+    def _ocupar(self, session, profesional, desde: time, hasta: time):
+        session.add(
+            ConsultaORM(
+                paciente_id=uuid4(),
+                profesional_id=profesional.id,
+                direccion_servicio_id=profesional.direccion_id,
+                fecha=self.LUNES,
+                hora_inicio=desde,
+                hora_fin=hasta,
+                estado=self.pendiente,
+            )
+        )
+
+    @pytest.fixture
+    def agenda(self, sqlite_session):
+        """Apellido0..Apellido5; los tres primeros con el lunes de 9 a 13 lleno"""
+        _cargar_profesionales(sqlite_session, 6)
+        self.pendiente = EstadoConsultaORM(codigo="pendiente", descripcion="PENDIENTE")
+        profesionales = (
+            sqlite_session.query(ProfesionalORM)
+            .join(ProfesionalORM.usuario)
+            .order_by(UsuarioORM.apellido)
+            .all()
+        )
+        for profesional in profesionales[:3]:
+            self._ocupar(sqlite_session, profesional, time(9), time(13))
+        # El cuarto sólo tiene libre de 12:30 a 13
+        self._ocupar(sqlite_session, profesionales[3], time(9), time(12, 30))
+        sqlite_session.commit()
+        return [p.id for p in profesionales]
+
+    def test_dos_queries_para_todos_los_candidatos(
+        self, sqlite_session, contador_queries, agenda
+    ):
+        contador_queries.clear()
+        franjas = ProfesionalRepository(sqlite_session).franjas_del_dia(agenda, 1)
+        ocupadas = ConsultaRepository(sqlite_session).ocupadas_en_fecha(
+            agenda, self.LUNES
+        )
+
+        assert len(contador_queries) == 2
+        assert franjas[agenda[0]] == [(time(9), time(13))]
+        assert ProfesionalRepository(sqlite_session).franjas_del_dia(agenda, 2) == {}
+        assert set(ocupadas) == set(agenda[:4])
+
+    def test_llena_la_pagina_con_lotes_siguientes(self, sqlite_session, agenda):
+        repo = ProfesionalRepository(sqlite_session)
+        libres = BuscadorLibres(
+            Buscador(repo, BusquedaPorEspecialidad()),
+            ConsultaRepository(sqlite_session),
+            tamano_lote=2,
+        )
+        filtro = FiltroBusqueda(
+            id_especialidad=1, limite=2, fecha=self.LUNES, duracion_minutos=60
+        )
+
+        # Los dos primeros lotes no tienen a nadie libre una hora
+        resultado = libres.buscar(filtro, clave_apellido)
+        assert [p.id for p in resultado] == agenda[4:]
+
+        resultado = libres.buscar(replace(filtro, duracion_minutos=30), clave_apellido)
+        assert [p.id for p in resultado] == agenda[3:5]